@@ -5,6 +5,7 @@ import java.nio.file.Path;
 
 import edu.kit.kastel.sdq.lissa.cli.command.EvaluateCommand;
 import edu.kit.kastel.sdq.lissa.cli.command.OptimizeCommand;
+import edu.kit.kastel.sdq.lissa.cli.command.ServeCommand;
 import edu.kit.kastel.sdq.lissa.cli.command.TransitiveTraceCommand;
 
 import picocli.CommandLine;
@@ -17,12 +18,19 @@ import picocli.CommandLine;
  *     <li>{@link EvaluateCommand} - Evaluates trace link analysis configurations</li>
  *     <li>{@link TransitiveTraceCommand} - Performs transitive trace link analysis</li>
  *     <li>{@link OptimizeCommand} - Optimize a single prompt for better trace link analysis classification results</li>
+ *     <li>{@link ServeCommand} - Runs the other commands as jobs of a long-running daemon</li>
  * </ul>
  *
  * The CLI supports various command-line options and provides help information
  * through the standard help options (--help, -h).
  */
-@CommandLine.Command(subcommands = {EvaluateCommand.class, TransitiveTraceCommand.class, OptimizeCommand.class})
+@CommandLine.Command(
+        subcommands = {
+            EvaluateCommand.class,
+            TransitiveTraceCommand.class,
+            OptimizeCommand.class,
+            ServeCommand.class
+        })
 public final class MainCLI {
 
     /**
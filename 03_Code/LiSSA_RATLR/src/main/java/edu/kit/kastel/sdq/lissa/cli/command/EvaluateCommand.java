@@ -7,11 +7,13 @@ import java.nio.file.Files;
 import java.nio.file.Path;
 import java.util.LinkedList;
 import java.util.List;
+import java.util.Objects;
 
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
 
 import edu.kit.kastel.sdq.lissa.ratlr.Evaluation;
+import edu.kit.kastel.sdq.lissa.ratlr.StoreRegistry;
 
 import picocli.CommandLine;
 
@@ -28,6 +30,28 @@ import picocli.CommandLine;
 public class EvaluateCommand implements Runnable {
     private static final Logger logger = LoggerFactory.getLogger(EvaluateCommand.class);
 
+    /**
+     * Registry of the element stores shared by the runs of this command.
+     */
+    private final StoreRegistry storeRegistry;
+
+    /**
+     * Creates a new command whose runs share their element stores.
+     */
+    public EvaluateCommand() {
+        this(new StoreRegistry());
+    }
+
+    /**
+     * Creates a new command that shares its element stores with the other commands of a session, e.g., the jobs of
+     * the {@link ServeCommand}.
+     *
+     * @param storeRegistry The registry of the element stores of the session
+     */
+    public EvaluateCommand(StoreRegistry storeRegistry) {
+        this.storeRegistry = Objects.requireNonNull(storeRegistry);
+    }
+
     /**
      * Array of configuration file paths to be processed.
      * If a path points to a directory, all files within that directory will be processed.
@@ -40,6 +64,12 @@ public class EvaluateCommand implements Runnable {
                     "Specifies one or more config paths to be invoked by the pipeline iteratively. If the path points to a directory, all files inside are chosen to get invoked.")
     private Path[] configs;
 
+    @CommandLine.Mixin
+    private OfflineOption offlineOption = new OfflineOption();
+
+    @CommandLine.Mixin
+    private MetricsOption metricsOption = new MetricsOption();
+
     public static List<Path> loadConfigs(Path[] configs) {
         List<Path> configsToEvaluate = new LinkedList<>();
         if (configs == null) {
@@ -94,18 +124,24 @@ public class EvaluateCommand implements Runnable {
      * This method:
      * 1. Loads the specified configuration files (or uses default if none specified)
      * 2. Processes each configuration file sequentially
-     * 3. Runs the trace link analysis pipeline for each configuration
+     * 3. Runs the trace link analysis pipeline for each configuration, reusing the element stores of previous
+     *    configurations with the same inputs
      * 4. Handles any exceptions that occur during processing
+     * With {@code --offline}, all configurations run in offline replay mode.
      */
     @Override
     public void run() {
+        metricsOption.run(() -> offlineOption.run(this::evaluate));
+    }
+
+    private void evaluate() {
         List<Path> configsToEvaluate = loadConfigs(configs);
         logger.info("Found {} config files to invoke", configsToEvaluate.size());
 
         for (Path config : configsToEvaluate) {
             logger.info("Invoking the pipeline with '{}'", config);
             try {
-                var evaluation = new Evaluation(config);
+                var evaluation = new Evaluation(config, storeRegistry);
                 evaluation.run();
             } catch (Exception e) {
                 logger.warn("Configuration '{}' threw an exception: {}", config, e.getMessage());
@@ -0,0 +1,110 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.cli.command;
+
+import java.io.IOException;
+import java.nio.file.Path;
+import java.util.LinkedHashMap;
+import java.util.Map;
+import java.util.TreeMap;
+
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+
+import com.fasterxml.jackson.databind.ObjectMapper;
+
+import edu.kit.kastel.sdq.lissa.ratlr.cache.SingleFlight;
+import edu.kit.kastel.sdq.lissa.ratlr.classifier.ChatDispatcher;
+import edu.kit.kastel.sdq.lissa.ratlr.classifier.ChatLanguageModelPlatform;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.RunMetrics;
+
+import picocli.CommandLine;
+
+/**
+ * The {@code --metrics} option of the commands that run pipelines.
+ * With the option, the command writes the wall time, the peak heap usage, the time of each stage (see
+ * {@link RunMetrics}), and the language model requests of the command as JSON, e.g., for benchmarks.
+ * The counters only cover the command, even if earlier commands ran in the same process.
+ */
+public class MetricsOption {
+    private static final Logger logger = LoggerFactory.getLogger(MetricsOption.class);
+
+    @CommandLine.Option(
+            names = {"--metrics"},
+            paramLabel = "FILE",
+            description = "Writes the wall time, peak heap usage, stage timings, and language model requests of the "
+                    + "command as JSON to the given file.")
+    private Path metricsFile;
+
+    /**
+     * Runs a command and writes its metrics if the option is given.
+     *
+     * @param command The command to run
+     */
+    void run(Runnable command) {
+        if (metricsFile == null) {
+            command.run();
+            return;
+        }
+        RunMetrics.reset();
+        Map<String, Long> requestsBefore = languageModelRequests();
+        Map<String, Map<String, Long>> dispatchersBefore = dispatchers();
+        long start = System.nanoTime();
+        try {
+            command.run();
+        } finally {
+            double wallMillis = (System.nanoTime() - start) / 1_000_000.0;
+            Map<String, Long> requests = difference(languageModelRequests(), requestsBefore);
+            Map<String, Map<String, Long>> dispatchers = new TreeMap<>();
+            for (var entry : dispatchers().entrySet()) {
+                dispatchers.put(
+                        entry.getKey(),
+                        difference(entry.getValue(), dispatchersBefore.getOrDefault(entry.getKey(), Map.of())));
+            }
+            long dispatched = dispatchers.values().stream()
+                    .mapToLong(counters -> counters.get("requests"))
+                    .sum();
+
+            Map<String, Object> report = new LinkedHashMap<>();
+            report.put("wall_time_ms", wallMillis);
+            report.put("peak_heap_bytes", RunMetrics.getPeakHeapBytes());
+            report.put("requests_per_second", wallMillis > 0 ? dispatched * 1000.0 / wallMillis : 0.0);
+            report.put("stages", RunMetrics.getStages());
+            report.put("language_model_requests", requests);
+            report.put("dispatchers", dispatchers);
+            try {
+                new ObjectMapper().writerWithDefaultPrettyPrinter().writeValue(metricsFile.toFile(), report);
+            } catch (IOException e) {
+                logger.warn("Could not write metrics to {}", metricsFile, e);
+            }
+        }
+    }
+
+    private static Map<String, Long> languageModelRequests() {
+        Map<String, Long> requests = new LinkedHashMap<>();
+        requests.put("issued", SingleFlight.getRequests());
+        requests.put("coalesced", SingleFlight.getCoalesced());
+        requests.put("cache_hits", SingleFlight.getCacheHits());
+        return requests;
+    }
+
+    private static Map<String, Map<String, Long>> dispatchers() {
+        Map<String, Map<String, Long>> dispatchers = new TreeMap<>();
+        for (Map.Entry<ChatLanguageModelPlatform, ChatDispatcher> entry :
+                ChatDispatcher.getDispatchers().entrySet()) {
+            Map<String, Long> counters = new LinkedHashMap<>();
+            counters.put("requests", entry.getValue().getRequests());
+            counters.put("throttled", entry.getValue().getThrottled());
+            counters.put("retries", entry.getValue().getRetries());
+            dispatchers.put(entry.getKey().name(), counters);
+        }
+        return dispatchers;
+    }
+
+    private static Map<String, Long> difference(Map<String, Long> after, Map<String, Long> before) {
+        Map<String, Long> difference = new LinkedHashMap<>();
+        for (var entry : after.entrySet()) {
+            difference.put(entry.getKey(), entry.getValue() - before.getOrDefault(entry.getKey(), 0L));
+        }
+        return difference;
+    }
+}
@@ -0,0 +1,63 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.cli.command;
+
+import java.nio.file.Path;
+import java.util.Locale;
+
+import edu.kit.kastel.sdq.lissa.ratlr.cache.OfflineReplay;
+
+import picocli.CommandLine;
+
+/**
+ * The {@code --offline} option of the commands that run pipelines.
+ * With the option, the command runs in {@link OfflineReplay offline replay mode} and writes the report of the
+ * uncached requests to {@value OfflineReplay#REPORT_FILE} in the working directory.
+ * <p>
+ * Pass the policy in the form {@code --offline=skip}, so it cannot be mistaken for a config path.
+ */
+public class OfflineOption {
+    @CommandLine.Option(
+            names = {"--offline"},
+            arity = "0..1",
+            fallbackValue = "fail",
+            paramLabel = "POLICY",
+            converter = PolicyConverter.class,
+            description = "Serves all model responses from the cache without creating any remote client. Uncached "
+                    + "requests either fail the run ('fail', default) or are recorded and skipped ('skip'). The "
+                    + "uncached requests are reported in " + OfflineReplay.REPORT_FILE + ".")
+    private OfflineReplay.Policy policy;
+
+    /**
+     * Runs a command, in offline replay mode if the option is given.
+     *
+     * @param command The command to run
+     */
+    void run(Runnable command) {
+        if (policy == null) {
+            command.run();
+            return;
+        }
+        OfflineReplay.enable(policy);
+        try {
+            command.run();
+        } finally {
+            OfflineReplay.writeReport(Path.of(OfflineReplay.REPORT_FILE));
+            OfflineReplay.disable();
+        }
+    }
+
+    /**
+     * Parses the policy case-insensitively.
+     */
+    public static final class PolicyConverter implements CommandLine.ITypeConverter<OfflineReplay.Policy> {
+        @Override
+        public OfflineReplay.Policy convert(String value) {
+            try {
+                return OfflineReplay.Policy.valueOf(value.toUpperCase(Locale.ROOT));
+            } catch (IllegalArgumentException e) {
+                throw new CommandLine.TypeConversionException(
+                        "Unknown offline policy '" + value + "', expected 'fail' or 'skip'");
+            }
+        }
+    }
+}
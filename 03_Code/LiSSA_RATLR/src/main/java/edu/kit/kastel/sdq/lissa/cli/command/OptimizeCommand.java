@@ -6,12 +6,14 @@ import static edu.kit.kastel.sdq.lissa.cli.command.EvaluateCommand.loadConfigs;
 import java.io.IOException;
 import java.nio.file.Path;
 import java.util.List;
+import java.util.Objects;
 
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
 
 import edu.kit.kastel.sdq.lissa.ratlr.Evaluation;
 import edu.kit.kastel.sdq.lissa.ratlr.Optimization;
+import edu.kit.kastel.sdq.lissa.ratlr.StoreRegistry;
 
 import picocli.CommandLine;
 
@@ -29,6 +31,28 @@ public class OptimizeCommand implements Runnable {
 
     private static final Logger LOGGER = LoggerFactory.getLogger(OptimizeCommand.class);
 
+    /**
+     * Registry of the element stores shared by the runs of this command.
+     */
+    private final StoreRegistry storeRegistry;
+
+    /**
+     * Creates a new command whose runs share their element stores.
+     */
+    public OptimizeCommand() {
+        this(new StoreRegistry());
+    }
+
+    /**
+     * Creates a new command that shares its element stores with the other commands of a session, e.g., the jobs of
+     * the {@link ServeCommand}.
+     *
+     * @param storeRegistry The registry of the element stores of the session
+     */
+    public OptimizeCommand(StoreRegistry storeRegistry) {
+        this.storeRegistry = Objects.requireNonNull(storeRegistry);
+    }
+
     /**
      * Array of optimization configuration file paths to be processed.
      * If a path points to a directory, all files within that directory will be processed.
@@ -55,16 +79,37 @@ public class OptimizeCommand implements Runnable {
                     + "If the path points to a directory, all files inside are chosen to get invoked.")
     private Path[] evaluationConfigs;
 
+    /**
+     * Whether each optimization resumes from the last checkpoint of a previous run with the same configuration.
+     */
+    @CommandLine.Option(
+            names = {"--resume"},
+            description = "Resumes each optimization after its last completed round, if a previous run with the same "
+                    + "configuration wrote a checkpoint to the cache directory.")
+    private boolean resume;
+
+    @CommandLine.Mixin
+    private OfflineOption offlineOption = new OfflineOption();
+
+    @CommandLine.Mixin
+    private MetricsOption metricsOption = new MetricsOption();
+
     /**
      * Runs the optimization and evaluation pipelines based on the provided configuration files.
      * It first loads the optimization and evaluation configurations, then executes the evaluation
      * pipeline for each evaluation configuration. This is the unoptimized baseline evaluation. <br>
      * After that, it runs the optimization pipeline for
      * each optimization configuration, and subsequently evaluates the optimized prompt using each
-     * evaluation configuration once more with the optimized prompt instead of the original one.
+     * evaluation configuration once more with the optimized prompt instead of the original one. <br>
+     * All runs share a {@link StoreRegistry}, so runs with the same artifacts, preprocessors, and embeddings
+     * load them only once. With {@code --offline}, all runs are in offline replay mode.
      */
     @Override
     public void run() {
+        metricsOption.run(() -> offlineOption.run(this::optimize));
+    }
+
+    private void optimize() {
         List<Path> configsToOptimize = loadConfigs(optimizationConfigs);
         List<Path> configsToEvaluate = loadConfigs(evaluationConfigs);
         LOGGER.info(
@@ -80,7 +125,7 @@ public class OptimizeCommand implements Runnable {
             LOGGER.info("Invoking the optimization pipeline with '{}'", optimizationConfig);
             String optimizedPrompt = "";
             try {
-                var optimization = new Optimization(optimizationConfig);
+                var optimization = new Optimization(optimizationConfig, resume, storeRegistry);
                 optimizedPrompt = optimization.run();
             } catch (IOException e) {
                 LOGGER.warn(
@@ -94,10 +139,10 @@ public class OptimizeCommand implements Runnable {
         }
     }
 
-    private static void runEvaluation(Path evaluationConfig, String optimizedPrompt) {
+    private void runEvaluation(Path evaluationConfig, String optimizedPrompt) {
         LOGGER.info("Invoking the evaluation pipeline with '{}'", evaluationConfig);
         try {
-            var evaluation = new Evaluation(evaluationConfig, optimizedPrompt);
+            var evaluation = new Evaluation(evaluationConfig, optimizedPrompt, storeRegistry);
             evaluation.run();
         } catch (IOException e) {
             LOGGER.warn(
@@ -0,0 +1,81 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.cli.command;
+
+import java.io.IOException;
+import java.util.Map;
+import java.util.function.Supplier;
+
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+
+import edu.kit.kastel.sdq.lissa.cli.server.JobServer;
+import edu.kit.kastel.sdq.lissa.ratlr.StoreRegistry;
+
+import picocli.CommandLine;
+
+/**
+ * Command implementation for a long-running daemon that runs {@code eval}, {@code optimize}, and {@code transitive}
+ * commands as jobs submitted via a local JSON API (see {@link JobServer}).
+ * All jobs run in the same JVM, so they share the open caches and element stores and do not pay for the startup of a
+ * new JVM. Relative paths are resolved against the working directory of the daemon, so it should be started in the
+ * directory the commands would otherwise be invoked from.
+ */
+@CommandLine.Command(
+        name = "serve",
+        mixinStandardHelpOptions = true,
+        description = "Runs a local daemon that accepts eval, optimize, and transitive jobs via a JSON API")
+public class ServeCommand implements Runnable {
+    private static final Logger logger = LoggerFactory.getLogger(ServeCommand.class);
+
+    /**
+     * The port on the loopback interface the daemon listens on.
+     */
+    @CommandLine.Option(
+            names = {"-p", "--port"},
+            defaultValue = "8765",
+            description = "Specifies the local port to listen on (default: ${DEFAULT-VALUE}).")
+    private int port;
+
+    /**
+     * The maximum number of concurrently running jobs.
+     */
+    @CommandLine.Option(
+            names = {"--max-jobs"},
+            defaultValue = "2",
+            description = "Specifies how many jobs may run at the same time (default: ${DEFAULT-VALUE}). Jobs only run "
+                    + "concurrently if they use the same cache directory.")
+    private int maxJobs;
+
+    /**
+     * The maximum number of distinct element stores kept between jobs.
+     */
+    @CommandLine.Option(
+            names = {"--max-stores"},
+            defaultValue = "16",
+            description = "Specifies how many distinct source and target stores are kept warm between jobs "
+                    + "(default: ${DEFAULT-VALUE}).")
+    private int maxStores;
+
+    /**
+     * Starts the daemon and blocks until it is shut down via the API.
+     */
+    @Override
+    public void run() {
+        StoreRegistry storeRegistry = new StoreRegistry(maxStores);
+        Map<String, Supplier<Runnable>> commands = Map.of(
+                "eval", () -> new EvaluateCommand(storeRegistry),
+                "optimize", () -> new OptimizeCommand(storeRegistry),
+                "transitive", () -> new TransitiveTraceCommand(storeRegistry));
+        try {
+            JobServer server = new JobServer(port, maxJobs, commands);
+            server.start();
+            server.awaitShutdown();
+            logger.info("Daemon stopped");
+        } catch (IOException e) {
+            logger.error("Could not start the daemon on port {}: {}", port, e.getMessage());
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            logger.warn("Interrupted while serving jobs");
+        }
+    }
+}
@@ -4,27 +4,36 @@ package edu.kit.kastel.sdq.lissa.cli.command;
 import java.io.IOException;
 import java.nio.file.Path;
 import java.util.*;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
 import java.util.stream.Collectors;
 
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
 
+import com.fasterxml.jackson.databind.ObjectMapper;
+
 import edu.kit.kastel.sdq.lissa.ratlr.Evaluation;
 import edu.kit.kastel.sdq.lissa.ratlr.Statistics;
+import edu.kit.kastel.sdq.lissa.ratlr.StoreRegistry;
+import edu.kit.kastel.sdq.lissa.ratlr.cache.CacheManager;
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.Configuration;
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.GoldStandardConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.TraceLink;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.TraceLinkSet;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.Futures;
 import edu.kit.kastel.sdq.lissa.ratlr.utils.KeyGenerator;
 
 import picocli.CommandLine;
 
 /**
  * Command implementation for performing transitive trace link analysis.
- * This command processes multiple configuration files sequentially to create and evaluate
+ * This command processes multiple configuration files to create and evaluate
  * transitive trace links between artifacts. It supports:
  * <ul>
- *     <li>Sequential processing of multiple configurations</li>
- *     <li>Transitive trace link calculation</li>
+ *     <li>Concurrent processing of multiple configurations</li>
+ *     <li>Transitive trace link calculation, optionally with the paths of each link</li>
  *     <li>Optional evaluation against a gold standard</li>
  *     <li>Statistics generation and result storage</li>
  * </ul>
@@ -33,6 +42,7 @@ import picocli.CommandLine;
  * <pre>
  * transitive -c config1.json config2.json [config3.json ...]
  * transitive -c config1.json config2.json -e gold_standard.json
+ * transitive -c config1.json config2.json config3.json --provenance
  * </pre>
  */
 @CommandLine.Command(
@@ -43,14 +53,36 @@ public class TransitiveTraceCommand implements Runnable {
     private static final Logger logger = LoggerFactory.getLogger(TransitiveTraceCommand.class);
 
     /**
-     * Array of configuration file paths to be processed sequentially for transitive trace link analysis.
+     * Registry of the element stores shared by the runs of this command.
+     */
+    private final StoreRegistry storeRegistry;
+
+    /**
+     * Creates a new command whose runs share their element stores.
+     */
+    public TransitiveTraceCommand() {
+        this(new StoreRegistry());
+    }
+
+    /**
+     * Creates a new command that shares its element stores with the other commands of a session, e.g., the jobs of
+     * the {@link ServeCommand}.
+     *
+     * @param storeRegistry The registry of the element stores of the session
+     */
+    public TransitiveTraceCommand(StoreRegistry storeRegistry) {
+        this.storeRegistry = Objects.requireNonNull(storeRegistry);
+    }
+
+    /**
+     * Array of configuration file paths to be processed for transitive trace link analysis.
      * This option requires at least two configuration paths to create transitive links.
-     * The configurations will be processed in the order they are provided.
+     * The trace links of the configurations will be joined in the order they are provided.
      */
     @CommandLine.Option(
             names = {"-c", "--configs"},
             arity = "2..*",
-            description = "Specifies two or more config paths to be invoked sequentially.")
+            description = "Specifies two or more config paths whose trace links are joined in the given order.")
     private Path[] transitiveTraceConfigs;
 
     /**
@@ -63,21 +95,41 @@ public class TransitiveTraceCommand implements Runnable {
             description = "Specifies the evaluation config path to be invoked after the transitive trace link.")
     private Path evaluationConfig;
 
+    /**
+     * Whether to additionally store every path of artifact ids that yields a transitive trace link.
+     */
+    @CommandLine.Option(
+            names = {"--provenance"},
+            description = "Additionally stores the paths of intermediate artifacts that lead to each transitive trace "
+                    + "link.")
+    private boolean provenance;
+
+    @CommandLine.Mixin
+    private OfflineOption offlineOption = new OfflineOption();
+
+    @CommandLine.Mixin
+    private MetricsOption metricsOption = new MetricsOption();
+
     /**
      * Executes the transitive trace link analysis pipeline.
      * This method:
      * <ol>
      *     <li>Validates the input configurations</li>
-     *     <li>Processes each configuration sequentially</li>
+     *     <li>Processes each configuration</li>
      *     <li>Calculates transitive trace links</li>
      *     <li>Optionally evaluates results against a gold standard</li>
      *     <li>Generates and saves statistics</li>
      * </ol>
      *
      * The method handles various error conditions and provides appropriate logging.
+     * With {@code --offline}, all configurations run in offline replay mode.
      */
     @Override
     public void run() {
+        metricsOption.run(() -> offlineOption.run(this::runTransitive));
+    }
+
+    private void runTransitive() {
         if (transitiveTraceConfigs == null || transitiveTraceConfigs.length < 2) {
             logger.error("At least two config paths are required for transitive trace link");
             return;
@@ -93,7 +145,7 @@ public class TransitiveTraceCommand implements Runnable {
         }
 
         List<Evaluation> evaluations = new ArrayList<>();
-        Queue<Set<TraceLink>> traceLinks = new ArrayDeque<>();
+        List<Set<TraceLink>> traceLinks = new ArrayList<>();
         createNontransitiveTraceLinks(evaluations, traceLinks);
 
         if (evaluations.size() != traceLinks.size()) {
@@ -105,6 +157,10 @@ public class TransitiveTraceCommand implements Runnable {
 
         String key = createKey(evaluations, goldStandardConfiguration);
         Statistics.saveTraceLinks(transitiveTraceLinks, "transitive-trace-links_" + key + ".csv");
+        if (provenance) {
+            Statistics.saveTraceLinkPaths(
+                    calculateTransitivePaths(traceLinks), "transitive-trace-link-paths_" + key + ".csv");
+        }
 
         if (goldStandardConfiguration != null) {
             int sourceArtifacts = evaluations.getFirst().getSourceArtifactCount();
@@ -120,29 +176,29 @@ public class TransitiveTraceCommand implements Runnable {
     }
 
     /**
-     * Calculates transitive trace links from a queue of trace link sets.
+     * Calculates transitive trace links from a list of trace link sets.
      * This method:
      * <ol>
      *     <li>Starts with the first set of trace links</li>
      *     <li>Iteratively combines with subsequent sets</li>
      *     <li>Creates new links where target of one link matches source of another</li>
      * </ol>
+     * Each combination is a hash join on the shared artifact id, so it takes time linear in the number of input and
+     * resulting links.
      *
-     * @param traceLinks Queue of trace link sets to process
+     * @param traceLinks List of trace link sets to process, one per hop
      * @return Set of transitive trace links
      */
-    private Set<TraceLink> calculateTransitiveTraceLinks(Queue<Set<TraceLink>> traceLinks) {
-        Set<TraceLink> transitiveTraceLinks = new LinkedHashSet<>(traceLinks.poll());
-        while (!traceLinks.isEmpty()) {
-            Set<TraceLink> currentLinks = transitiveTraceLinks;
-            Set<TraceLink> nextLinks = traceLinks.poll();
-            transitiveTraceLinks = new LinkedHashSet<>();
+    static Set<TraceLink> calculateTransitiveTraceLinks(List<Set<TraceLink>> traceLinks) {
+        TraceLinkSet transitiveTraceLinks = new TraceLinkSet(traceLinks.getFirst());
+        for (Set<TraceLink> nextLinks : traceLinks.subList(1, traceLinks.size())) {
+            TraceLinkSet currentLinks = transitiveTraceLinks;
+            transitiveTraceLinks = TraceLinkSet.derivedFrom(currentLinks);
             logger.info("Joining trace links of size {} and {}", currentLinks.size(), nextLinks.size());
+            Map<String, List<String>> nextTargetsBySource = targetsBySource(nextLinks);
             for (TraceLink currentLink : currentLinks) {
-                for (TraceLink nextLink : nextLinks) {
-                    if (currentLink.targetId().equals(nextLink.sourceId())) {
-                        transitiveTraceLinks.add(new TraceLink(currentLink.sourceId(), nextLink.targetId()));
-                    }
+                for (String nextTarget : nextTargetsBySource.getOrDefault(currentLink.targetId(), List.of())) {
+                    transitiveTraceLinks.add(currentLink.sourceId(), nextTarget);
                 }
             }
             logger.info("Found transitive links of size {}", transitiveTraceLinks.size());
@@ -150,31 +206,116 @@ public class TransitiveTraceCommand implements Runnable {
         return transitiveTraceLinks;
     }
 
+    /**
+     * Calculates all paths of artifact ids that lead to the transitive trace links.
+     * Each path starts with the source id of a link of the first hop and contains one further id per hop, so the
+     * first and last id of a path form a transitive trace link. A transitive trace link may result from several paths.
+     *
+     * @param traceLinks List of trace link sets to process, one per hop
+     * @return The paths in the order of the links of the hops
+     */
+    static List<List<String>> calculateTransitivePaths(List<Set<TraceLink>> traceLinks) {
+        List<List<String>> paths = new ArrayList<>();
+        for (TraceLink link : traceLinks.getFirst()) {
+            paths.add(List.of(link.sourceId(), link.targetId()));
+        }
+        for (Set<TraceLink> nextLinks : traceLinks.subList(1, traceLinks.size())) {
+            Map<String, List<String>> nextTargetsBySource = targetsBySource(nextLinks);
+            List<List<String>> extendedPaths = new ArrayList<>();
+            for (List<String> path : paths) {
+                for (String nextTarget : nextTargetsBySource.getOrDefault(path.getLast(), List.of())) {
+                    List<String> extendedPath = new ArrayList<>(path.size() + 1);
+                    extendedPath.addAll(path);
+                    extendedPath.add(nextTarget);
+                    extendedPaths.add(Collections.unmodifiableList(extendedPath));
+                }
+            }
+            paths = extendedPaths;
+        }
+        logger.info("Found {} paths for transitive links", paths.size());
+        return paths;
+    }
+
+    private static Map<String, List<String>> targetsBySource(Set<TraceLink> links) {
+        Map<String, List<String>> targetsBySource = new HashMap<>();
+        for (TraceLink link : links) {
+            targetsBySource
+                    .computeIfAbsent(link.sourceId(), key -> new ArrayList<>())
+                    .add(link.targetId());
+        }
+        return targetsBySource;
+    }
+
     /**
      * Creates non-transitive trace links by processing each configuration.
      * This method:
      * <ol>
-     *     <li>Processes each configuration file sequentially</li>
-     *     <li>Runs the evaluation pipeline for each configuration</li>
-     *     <li>Collects the resulting trace links</li>
+     *     <li>Sets up the evaluation pipeline of each configuration file</li>
+     *     <li>Runs the evaluation pipelines, concurrently if all of them use the same cache directory</li>
+     *     <li>Collects the resulting trace links in the order of the configurations</li>
      * </ol>
+     * The hops only depend on each other in the join, so they can run concurrently. Pipelines with different cache
+     * directories are set up and run one after another, as setting up a pipeline switches the process-wide default
+     * cache manager to its cache directory.
      *
      * @param evaluations List to store evaluation instances
-     * @param traceLinks Queue to store trace link sets
+     * @param traceLinks List to store trace link sets
      */
-    private void createNontransitiveTraceLinks(List<Evaluation> evaluations, Queue<Set<TraceLink>> traceLinks) {
+    private void createNontransitiveTraceLinks(List<Evaluation> evaluations, List<Set<TraceLink>> traceLinks) {
         try {
+            if (!shareCacheDirectory(transitiveTraceConfigs)) {
+                logger.info("The configurations use different cache directories, so the pipelines run sequentially");
+                for (Path traceConfig : transitiveTraceConfigs) {
+                    logger.info("Invoking the pipeline with '{}'", traceConfig);
+                    Evaluation evaluation = new Evaluation(traceConfig, storeRegistry);
+                    evaluations.add(evaluation);
+                    traceLinks.add(runHop(evaluation));
+                }
+                return;
+            }
             for (Path traceConfig : transitiveTraceConfigs) {
-                logger.info("Invoking the pipeline with '{}'", traceConfig);
-                Evaluation evaluation = new Evaluation(traceConfig);
-                evaluations.add(evaluation);
-                var traceLinksForRun = evaluation.run();
-                logger.info("Found {} trace links", traceLinksForRun.size());
-                traceLinks.add(traceLinksForRun);
+                logger.info("Setting up the pipeline with '{}'", traceConfig);
+                evaluations.add(new Evaluation(traceConfig, storeRegistry));
             }
         } catch (IOException e) {
             logger.warn("Configuration threw an exception: {}", e.getMessage());
+            return;
+        }
+
+        try (ExecutorService executor = Executors.newVirtualThreadPerTaskExecutor()) {
+            List<Future<Set<TraceLink>>> hops = new ArrayList<>();
+            for (Evaluation evaluation : evaluations) {
+                hops.add(executor.submit(() -> runHop(evaluation)));
+            }
+            for (Future<Set<TraceLink>> hop : hops) {
+                traceLinks.add(Futures.getLogged(hop, logger));
+            }
+        }
+    }
+
+    private static Set<TraceLink> runHop(Evaluation evaluation) {
+        var traceLinksForRun = evaluation.run();
+        logger.info("Found {} trace links", traceLinksForRun.size());
+        return traceLinksForRun;
+    }
+
+    /**
+     * Checks whether all configurations use the same cache directory.
+     * The configurations are only parsed, so the default cache manager is not changed.
+     *
+     * @param configs The configuration files
+     * @return Whether all configurations use the same cache directory
+     * @throws IOException If a configuration file cannot be read
+     */
+    private static boolean shareCacheDirectory(Path[] configs) throws IOException {
+        ObjectMapper mapper = new ObjectMapper();
+        Set<Path> cacheDirectories = new HashSet<>();
+        for (Path config : configs) {
+            String cacheDir = mapper.readValue(config.toFile(), Configuration.class).cacheDir();
+            Path directory = Path.of(cacheDir == null ? CacheManager.DEFAULT_CACHE_DIRECTORY : cacheDir);
+            cacheDirectories.add(directory.toAbsolutePath().normalize());
         }
+        return cacheDirectories.size() <= 1;
     }
 
     /**
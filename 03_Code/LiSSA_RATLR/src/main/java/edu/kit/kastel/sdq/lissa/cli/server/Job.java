@@ -0,0 +1,151 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.cli.server;
+
+import java.time.Instant;
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Set;
+
+import com.fasterxml.jackson.annotation.JsonProperty;
+
+/**
+ * A job of the {@link JobServer} together with its progress.
+ * Every state change is recorded as an event, so clients can follow the progress of a job from its submission on.
+ */
+final class Job {
+    private final String id;
+    private final JobRequest request;
+    private final Set<String> cacheDirectories;
+    private final boolean exclusive;
+    private final List<Event> events = new ArrayList<>();
+    private State state;
+
+    /**
+     * Creates a new queued job.
+     *
+     * @param id The identifier of the job
+     * @param request The command and arguments of the job
+     * @param cacheDirectories The normalized cache directories the configurations of the job use
+     */
+    Job(String id, JobRequest request, Set<String> cacheDirectories) {
+        this.id = id;
+        this.request = request;
+        this.cacheDirectories = Set.copyOf(cacheDirectories);
+        this.exclusive = request.args().stream().anyMatch(Job::isExclusiveOption);
+        transition(State.QUEUED, null);
+    }
+
+    String getId() {
+        return id;
+    }
+
+    JobRequest getRequest() {
+        return request;
+    }
+
+    Set<String> getCacheDirectories() {
+        return cacheDirectories;
+    }
+
+    /**
+     * Checks whether the job must run alone.
+     * Offline replay mode is switched and run metrics are collected for the whole process, so jobs with
+     * {@code --offline} or {@code --metrics} run exclusively.
+     *
+     * @return true if no other job may run at the same time
+     */
+    boolean isExclusive() {
+        return exclusive;
+    }
+
+    private static boolean isExclusiveOption(String arg) {
+        return arg.startsWith("--offline") || arg.startsWith("--metrics");
+    }
+
+    synchronized State getState() {
+        return state;
+    }
+
+    /**
+     * Changes the state of this job and records the change as event.
+     *
+     * @param newState The new state
+     * @param message An optional message describing the change, may be null
+     */
+    synchronized void transition(State newState, String message) {
+        this.state = newState;
+        events.add(new Event(id, newState, Instant.now().toString(), message));
+        notifyAll();
+    }
+
+    /**
+     * Waits for events after the given number of already seen events.
+     *
+     * @param seen The number of events the caller has already seen
+     * @return The new events, or an empty list if the job is finished and there are no new events
+     * @throws InterruptedException If the thread is interrupted while waiting
+     */
+    synchronized List<Event> awaitEvents(int seen) throws InterruptedException {
+        while (events.size() <= seen && !state.isFinished()) {
+            wait();
+        }
+        return List.copyOf(events.subList(Math.min(seen, events.size()), events.size()));
+    }
+
+    /**
+     * Returns a snapshot of this job for clients.
+     *
+     * @return The current status of this job
+     */
+    synchronized Status status() {
+        return new Status(id, request.command(), request.args(), state, List.copyOf(events));
+    }
+
+    /**
+     * The states of a job.
+     */
+    enum State {
+        /** The job waits for a free slot or for jobs with other cache directories to finish */
+        QUEUED,
+        /** The command of the job runs */
+        RUNNING,
+        /** The command finished with exit code 0 */
+        SUCCEEDED,
+        /** The command finished with another exit code or could not be run */
+        FAILED;
+
+        boolean isFinished() {
+            return this == SUCCEEDED || this == FAILED;
+        }
+    }
+
+    /**
+     * A state change of a job.
+     *
+     * @param job The identifier of the job
+     * @param state The new state
+     * @param time The time of the change in ISO-8601 format
+     * @param message An optional message describing the change
+     */
+    record Event(
+            @JsonProperty("job") String job,
+            @JsonProperty("state") State state,
+            @JsonProperty("time") String time,
+            @JsonProperty("message") String message) {}
+
+    /**
+     * A snapshot of a job.
+     *
+     * @param id The identifier of the job
+     * @param command The command of the job
+     * @param args The arguments of the command
+     * @param state The current state of the job
+     * @param events All events of the job so far
+     */
+    record Status(
+            @JsonProperty("id") String id,
+            @JsonProperty("command") String command,
+            @JsonProperty("args") List<String> args,
+            @JsonProperty("state") State state,
+            @JsonProperty("events") List<Event> events) {}
+}
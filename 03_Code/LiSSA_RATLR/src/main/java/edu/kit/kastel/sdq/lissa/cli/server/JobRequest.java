@@ -0,0 +1,19 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.cli.server;
+
+import java.util.List;
+
+import com.fasterxml.jackson.annotation.JsonProperty;
+
+/**
+ * A job submitted to the {@link JobServer}.
+ * The job runs a CLI command with the given arguments, exactly as if they were passed on the command line.
+ *
+ * @param command The name of the command, i.e., {@code eval}, {@code optimize}, or {@code transitive}
+ * @param args The arguments of the command, e.g., {@code ["-c", "configs/simple.json"]}
+ */
+public record JobRequest(@JsonProperty("command") String command, @JsonProperty("args") List<String> args) {
+    public JobRequest {
+        args = args == null ? List.of() : List.copyOf(args);
+    }
+}
@@ -0,0 +1,87 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.cli.server;
+
+import java.util.ArrayDeque;
+import java.util.Deque;
+import java.util.Set;
+
+/**
+ * Decides when queued jobs of the {@link JobServer} may run.
+ * <p>
+ * At most {@code maxJobs} jobs run at the same time. As the caches are opened through the process-wide default
+ * {@link edu.kit.kastel.sdq.lissa.ratlr.cache.CacheManager}, jobs only run concurrently if all of them use the same
+ * single cache directory; a job with another cache directory waits until the running jobs are finished.
+ * Jobs that switch process-wide modes, e.g., offline replay, run exclusively (see {@link Job#isExclusive()}).
+ * Jobs start in the order of their submission, so no job starves.
+ */
+final class JobScheduler {
+    private final int maxJobs;
+    private final Deque<Job> queue = new ArrayDeque<>();
+    private Set<String> activeCacheDirectories = Set.of();
+    private boolean exclusiveRunning;
+    private int running;
+
+    /**
+     * Creates a new scheduler.
+     *
+     * @param maxJobs The maximum number of concurrently running jobs
+     * @throws IllegalArgumentException If maxJobs is less than 1
+     */
+    JobScheduler(int maxJobs) {
+        if (maxJobs < 1) {
+            throw new IllegalArgumentException("At least one job must be allowed to run, but was " + maxJobs);
+        }
+        this.maxJobs = maxJobs;
+    }
+
+    /**
+     * Waits until the given job may run and reserves a slot for it.
+     * Every successful call must be followed by a call to {@link #release()} once the job is finished.
+     *
+     * @param job The job to run
+     * @throws InterruptedException If the thread is interrupted while waiting; no slot is reserved then
+     */
+    synchronized void acquire(Job job) throws InterruptedException {
+        queue.addLast(job);
+        try {
+            while (queue.peekFirst() != job || !canStart(job)) {
+                wait();
+            }
+        } finally {
+            queue.remove(job);
+            notifyAll();
+        }
+        if (running == 0) {
+            activeCacheDirectories = job.getCacheDirectories();
+            exclusiveRunning = job.isExclusive();
+        }
+        running++;
+    }
+
+    /**
+     * Releases the slot of a finished job.
+     */
+    synchronized void release() {
+        running--;
+        notifyAll();
+    }
+
+    synchronized int getRunning() {
+        return running;
+    }
+
+    synchronized int getQueued() {
+        return queue.size();
+    }
+
+    private boolean canStart(Job job) {
+        if (running == 0) {
+            return true;
+        }
+        if (exclusiveRunning || job.isExclusive()) {
+            return false;
+        }
+        Set<String> cacheDirectories = job.getCacheDirectories();
+        return running < maxJobs && cacheDirectories.size() == 1 && cacheDirectories.equals(activeCacheDirectories);
+    }
+}
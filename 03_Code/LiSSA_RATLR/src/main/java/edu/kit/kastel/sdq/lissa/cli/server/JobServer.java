@@ -0,0 +1,324 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.cli.server;
+
+import java.io.IOException;
+import java.io.OutputStream;
+import java.net.InetAddress;
+import java.net.InetSocketAddress;
+import java.nio.file.Path;
+import java.util.ArrayList;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.Set;
+import java.util.TreeSet;
+import java.util.concurrent.CountDownLatch;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.RejectedExecutionException;
+import java.util.concurrent.atomic.AtomicLong;
+import java.util.function.Supplier;
+
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.core.JsonProcessingException;
+import com.fasterxml.jackson.databind.JsonNode;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.sun.net.httpserver.HttpExchange;
+import com.sun.net.httpserver.HttpServer;
+
+import edu.kit.kastel.sdq.lissa.cli.command.EvaluateCommand;
+import edu.kit.kastel.sdq.lissa.ratlr.cache.CacheManager;
+
+import picocli.CommandLine;
+
+/**
+ * A local HTTP server that runs CLI commands as jobs within one long-running JVM.
+ * Compared to starting a new JVM per command, the jobs share the open caches, the element stores (see
+ * {@link edu.kit.kastel.sdq.lissa.ratlr.StoreRegistry}), and the loaded classes.
+ * <p>
+ * The server only listens on the loopback interface and offers the following JSON API:
+ * <ul>
+ *     <li>{@code GET /status}: The working directory of the server and the number of running and queued jobs</li>
+ *     <li>{@code POST /jobs}: Submits a {@link JobRequest} and returns the status of the new job</li>
+ *     <li>{@code GET /jobs}: The status of all jobs</li>
+ *     <li>{@code GET /jobs/{id}}: The status of a job</li>
+ *     <li>{@code GET /jobs/{id}/events}: Streams the events of a job as JSON lines until the job is finished</li>
+ *     <li>{@code POST /shutdown}: Stops accepting jobs, waits for the submitted jobs, and stops the server</li>
+ * </ul>
+ * Relative paths in the arguments and configurations of the jobs are resolved against the working directory of the
+ * server, as for the CLI.
+ */
+public final class JobServer {
+    private static final Logger logger = LoggerFactory.getLogger(JobServer.class);
+    private static final String JOBS_PATH = "/jobs";
+    private static final String EVENTS_SUFFIX = "/events";
+
+    private final ObjectMapper mapper = new ObjectMapper();
+    private final HttpServer server;
+    private final Map<String, Supplier<Runnable>> commands;
+    private final JobScheduler scheduler;
+    private final ExecutorService jobExecutor = Executors.newVirtualThreadPerTaskExecutor();
+    private final Map<String, Job> jobs = new LinkedHashMap<>();
+    private final AtomicLong jobCounter = new AtomicLong();
+    private final CountDownLatch stopped = new CountDownLatch(1);
+
+    /**
+     * Creates a new server. The server does not accept connections before {@link #start()} is called.
+     *
+     * @param port The port on the loopback interface, or 0 to choose a free port
+     * @param maxJobs The maximum number of concurrently running jobs
+     * @param commands Creates a fresh command instance by command name for each job
+     * @throws IOException If the server cannot be bound to the port
+     */
+    public JobServer(int port, int maxJobs, Map<String, Supplier<Runnable>> commands) throws IOException {
+        this.commands = Map.copyOf(commands);
+        this.scheduler = new JobScheduler(maxJobs);
+        this.server = HttpServer.create(new InetSocketAddress(InetAddress.getLoopbackAddress(), port), 0);
+        server.setExecutor(Executors.newVirtualThreadPerTaskExecutor());
+        server.createContext("/status", this::handleStatus);
+        server.createContext(JOBS_PATH, this::handleJobs);
+        server.createContext("/shutdown", this::handleShutdown);
+    }
+
+    /**
+     * Starts accepting connections.
+     */
+    public void start() {
+        server.start();
+        logger.info("Serving jobs on http://{}:{}", server.getAddress().getHostString(), getPort());
+    }
+
+    /**
+     * Returns the port the server listens on.
+     *
+     * @return The port
+     */
+    public int getPort() {
+        return server.getAddress().getPort();
+    }
+
+    /**
+     * Blocks until the server was shut down via {@code POST /shutdown}.
+     *
+     * @throws InterruptedException If the thread is interrupted while waiting
+     */
+    public void awaitShutdown() throws InterruptedException {
+        stopped.await();
+    }
+
+    private void handleStatus(HttpExchange exchange) throws IOException {
+        if (!"GET".equals(exchange.getRequestMethod())) {
+            sendError(exchange, 405, "Method not allowed");
+            return;
+        }
+        int total;
+        synchronized (jobs) {
+            total = jobs.size();
+        }
+        sendJson(
+                exchange,
+                200,
+                new ServerStatus(
+                        Path.of("").toAbsolutePath().toString(),
+                        scheduler.getRunning(),
+                        scheduler.getQueued(),
+                        total));
+    }
+
+    private void handleJobs(HttpExchange exchange) throws IOException {
+        String path = exchange.getRequestURI().getPath();
+        String method = exchange.getRequestMethod();
+        if (path.equals(JOBS_PATH) || path.equals(JOBS_PATH + "/")) {
+            switch (method) {
+                case "POST" -> submit(exchange);
+                case "GET" -> sendJson(exchange, 200, allStatuses());
+                default -> sendError(exchange, 405, "Method not allowed");
+            }
+            return;
+        }
+        if (!"GET".equals(method)) {
+            sendError(exchange, 405, "Method not allowed");
+            return;
+        }
+
+        String id = path.substring(JOBS_PATH.length() + 1);
+        boolean streamEvents = id.endsWith(EVENTS_SUFFIX);
+        if (streamEvents) {
+            id = id.substring(0, id.length() - EVENTS_SUFFIX.length());
+        }
+        Job job;
+        synchronized (jobs) {
+            job = jobs.get(id);
+        }
+        if (job == null) {
+            sendError(exchange, 404, "Unknown job " + id);
+        } else if (streamEvents) {
+            streamEvents(exchange, job);
+        } else {
+            sendJson(exchange, 200, job.status());
+        }
+    }
+
+    private void submit(HttpExchange exchange) throws IOException {
+        JobRequest request;
+        try {
+            request = mapper.readValue(exchange.getRequestBody(), JobRequest.class);
+        } catch (JsonProcessingException e) {
+            sendError(exchange, 400, "Invalid job request: " + e.getOriginalMessage());
+            return;
+        }
+        if (request.command() == null || !commands.containsKey(request.command())) {
+            sendError(exchange, 400, "Unknown command " + request.command() + ", expected one of " + commands.keySet());
+            return;
+        }
+
+        Job job = new Job("job-" + jobCounter.incrementAndGet(), request, cacheDirectoriesOf(request.args()));
+        try {
+            jobExecutor.execute(() -> run(job));
+        } catch (RejectedExecutionException e) {
+            sendError(exchange, 503, "The server is shutting down");
+            return;
+        }
+        synchronized (jobs) {
+            jobs.put(job.getId(), job);
+        }
+        logger.info("Accepted {}: {} {}", job.getId(), request.command(), request.args());
+        sendJson(exchange, 202, job.status());
+    }
+
+    private void run(Job job) {
+        try {
+            scheduler.acquire(job);
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            job.transition(Job.State.FAILED, "Interrupted while waiting to run");
+            return;
+        }
+        try {
+            job.transition(Job.State.RUNNING, null);
+            Runnable command = commands.get(job.getRequest().command()).get();
+            int exitCode = new CommandLine(command)
+                    .registerConverter(Path.class, Path::of)
+                    .execute(job.getRequest().args().toArray(String[]::new));
+            job.transition(exitCode == 0 ? Job.State.SUCCEEDED : Job.State.FAILED, "Exit code " + exitCode);
+        } catch (RuntimeException e) {
+            logger.warn("{} failed: {}", job.getId(), e.getMessage(), e);
+            job.transition(Job.State.FAILED, e.getMessage());
+        } finally {
+            scheduler.release();
+        }
+    }
+
+    private void streamEvents(HttpExchange exchange, Job job) throws IOException {
+        exchange.getResponseHeaders().set("Content-Type", "application/x-ndjson");
+        exchange.sendResponseHeaders(200, 0);
+        try (OutputStream out = exchange.getResponseBody()) {
+            int seen = 0;
+            List<Job.Event> events = job.awaitEvents(seen);
+            while (!events.isEmpty()) {
+                for (Job.Event event : events) {
+                    out.write(mapper.writeValueAsBytes(event));
+                    out.write('\n');
+                }
+                out.flush();
+                seen += events.size();
+                events = job.awaitEvents(seen);
+            }
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+        }
+    }
+
+    private void handleShutdown(HttpExchange exchange) throws IOException {
+        if (!"POST".equals(exchange.getRequestMethod())) {
+            sendError(exchange, 405, "Method not allowed");
+            return;
+        }
+        logger.info("Shutting down after {} queued and running jobs", scheduler.getQueued() + scheduler.getRunning());
+        jobExecutor.shutdown();
+        sendJson(exchange, 202, Map.of("message", "Shutting down"));
+        Thread.startVirtualThread(this::stop);
+    }
+
+    private void stop() {
+        // Waits for all submitted jobs
+        jobExecutor.close();
+        if (CacheManager.hasDefaultInstance()) {
+            CacheManager.getDefaultInstance().flush();
+        }
+        // Give clients streaming events a moment to receive the last events
+        server.stop(1);
+        stopped.countDown();
+    }
+
+    private List<Job.Status> allStatuses() {
+        List<Job> snapshot;
+        synchronized (jobs) {
+            snapshot = new ArrayList<>(jobs.values());
+        }
+        return snapshot.stream().map(Job::status).toList();
+    }
+
+    /**
+     * Determines the cache directories of the configurations in the arguments of a job.
+     * Every argument that is not an option is treated as a configuration path (or directory of configurations), as for
+     * the CLI commands. Files without a {@code cache_dir} are ignored; if no configuration specifies one, the default
+     * cache directory is used.
+     */
+    private Set<String> cacheDirectoriesOf(List<String> args) {
+        Path[] paths = args.stream()
+                .filter(arg -> !arg.startsWith("-"))
+                .map(Path::of)
+                .toArray(Path[]::new);
+        Set<String> cacheDirectories = new TreeSet<>();
+        for (Path config : EvaluateCommand.loadConfigs(paths.length == 0 ? null : paths)) {
+            try {
+                JsonNode cacheDir = mapper.readTree(config.toFile()).get("cache_dir");
+                if (cacheDir != null && !cacheDir.isNull()) {
+                    cacheDirectories.add(normalize(cacheDir.asText()));
+                }
+            } catch (IOException e) {
+                // Not a configuration, the command reports invalid configurations itself
+                logger.debug("Could not read the cache directory of '{}': {}", config, e.getMessage());
+            }
+        }
+        if (cacheDirectories.isEmpty()) {
+            cacheDirectories.add(normalize(CacheManager.DEFAULT_CACHE_DIRECTORY));
+        }
+        return cacheDirectories;
+    }
+
+    private static String normalize(String directory) {
+        return Path.of(directory).toAbsolutePath().normalize().toString();
+    }
+
+    private void sendJson(HttpExchange exchange, int status, Object body) throws IOException {
+        byte[] bytes = mapper.writeValueAsBytes(body);
+        exchange.getResponseHeaders().set("Content-Type", "application/json");
+        exchange.sendResponseHeaders(status, bytes.length);
+        try (OutputStream out = exchange.getResponseBody()) {
+            out.write(bytes);
+        }
+    }
+
+    private void sendError(HttpExchange exchange, int status, String message) throws IOException {
+        sendJson(exchange, status, Map.of("error", message));
+    }
+
+    /**
+     * The status of the server.
+     *
+     * @param workingDirectory The working directory relative paths of jobs are resolved against
+     * @param running The number of running jobs
+     * @param queued The number of queued jobs
+     * @param jobs The number of jobs submitted so far
+     */
+    record ServerStatus(
+            @JsonProperty("working_directory") String workingDirectory,
+            @JsonProperty("running") int running,
+            @JsonProperty("queued") int queued,
+            @JsonProperty("jobs") int jobs) {}
+}
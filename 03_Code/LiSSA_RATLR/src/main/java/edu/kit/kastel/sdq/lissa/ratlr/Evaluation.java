@@ -6,6 +6,7 @@ import static edu.kit.kastel.sdq.lissa.ratlr.classifier.SimpleClassifier.PROMPT_
 
 import java.io.IOException;
 import java.nio.file.Path;
+import java.util.HashSet;
 import java.util.List;
 import java.util.Objects;
 import java.util.Set;
@@ -17,17 +18,22 @@ import com.fasterxml.jackson.databind.ObjectMapper;
 
 import edu.kit.kastel.sdq.lissa.ratlr.artifactprovider.ArtifactProvider;
 import edu.kit.kastel.sdq.lissa.ratlr.cache.CacheManager;
+import edu.kit.kastel.sdq.lissa.ratlr.cache.SingleFlight;
+import edu.kit.kastel.sdq.lissa.ratlr.classifier.ClassificationResult;
 import edu.kit.kastel.sdq.lissa.ratlr.classifier.Classifier;
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.Configuration;
 import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
+import edu.kit.kastel.sdq.lissa.ratlr.elementstore.CandidateMatrix;
 import edu.kit.kastel.sdq.lissa.ratlr.elementstore.SourceElementStore;
 import edu.kit.kastel.sdq.lissa.ratlr.elementstore.TargetElementStore;
+import edu.kit.kastel.sdq.lissa.ratlr.elementstore.strategy.RetrievalStrategy;
 import edu.kit.kastel.sdq.lissa.ratlr.embeddingcreator.EmbeddingCreator;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.TraceLink;
 import edu.kit.kastel.sdq.lissa.ratlr.postprocessor.TraceLinkIdPostprocessor;
 import edu.kit.kastel.sdq.lissa.ratlr.preprocessor.Preprocessor;
 import edu.kit.kastel.sdq.lissa.ratlr.resultaggregator.ResultAggregator;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.RunMetrics;
 
 import lombok.Getter;
 
@@ -68,6 +74,9 @@ public class Evaluation {
     @Getter
     private final Configuration configuration;
 
+    /** Registry of the element stores shared with other runs of the same session */
+    private final StoreRegistry storeRegistry;
+
     /** Provider for source artifacts */
     private ArtifactProvider sourceArtifactProvider;
     /** Provider for target artifacts */
@@ -114,9 +123,20 @@ public class Evaluation {
      * @throws NullPointerException If configFile is null
      */
     public Evaluation(Path configFile) throws IOException {
-        this.configFile = Objects.requireNonNull(configFile);
-        configuration = new ObjectMapper().readValue(configFile.toFile(), Configuration.class);
-        setup("");
+        this(configFile, "");
+    }
+
+    /**
+     * Creates a new evaluation instance with the specified configuration file that shares its element stores with
+     * the other runs of a session.
+     *
+     * @param configFile Path to the configuration file
+     * @param storeRegistry The registry of the element stores of the session
+     * @throws IOException If there are issues reading the configuration file
+     * @throws NullPointerException If configFile or storeRegistry is null
+     */
+    public Evaluation(Path configFile, StoreRegistry storeRegistry) throws IOException {
+        this(configFile, "", storeRegistry);
     }
 
     /**
@@ -136,7 +156,22 @@ public class Evaluation {
      * @throws NullPointerException If configFile is null
      */
     public Evaluation(Path configFile, String prompt) throws IOException {
+        this(configFile, prompt, new StoreRegistry());
+    }
+
+    /**
+     * Creates a new evaluation instance with the specified configuration file that shares its element stores with
+     * the other runs of a session. Overwrites the prompt used for classification, unless it is empty.
+     *
+     * @param configFile Path to the configuration file
+     * @param prompt The prompt to use for classification, or an empty string to keep the configured prompt
+     * @param storeRegistry The registry of the element stores of the session
+     * @throws IOException If there are issues reading the configuration file
+     * @throws NullPointerException If configFile or storeRegistry is null
+     */
+    public Evaluation(Path configFile, String prompt, StoreRegistry storeRegistry) throws IOException {
         this.configFile = Objects.requireNonNull(configFile);
+        this.storeRegistry = Objects.requireNonNull(storeRegistry);
         configuration = new ObjectMapper().readValue(configFile.toFile(), Configuration.class);
         setup(prompt);
     }
@@ -152,9 +187,23 @@ public class Evaluation {
      * @throws IOException If there are issues setting up the cache
      */
     public Evaluation(Configuration config) throws IOException {
+        this(config, new StoreRegistry());
+    }
+
+    /**
+     * Creates a new evaluation instance with the specified configuration object that shares its element stores with
+     * the other runs of a session.
+     *
+     * @param config The configuration object
+     * @param storeRegistry The registry of the element stores of the session
+     * @throws IOException If there are issues setting up the cache
+     * @throws NullPointerException If storeRegistry is null
+     */
+    public Evaluation(Configuration config, StoreRegistry storeRegistry) throws IOException {
         this.configuration = config;
         // TODO maybe dont?
         this.configFile = null;
+        this.storeRegistry = Objects.requireNonNull(storeRegistry);
         setup("");
     }
 
@@ -234,58 +283,153 @@ public class Evaluation {
         setupSourceAndTargetStores();
 
         LOGGER.info("Classifying Tracelinks");
-        var llmResults = classifier.classify(sourceStore, targetStore);
-        var traceLinks = aggregator.aggregate(sourceElements, targetElements, llmResults);
+        var llmResults = RunMetrics.time("classify", () -> classifier.classify(sourceStore, targetStore));
+        LOGGER.info(
+                "Language model requests so far: {} issued, {} coalesced with identical in-flight requests, {} cached",
+                SingleFlight.getRequests(),
+                SingleFlight.getCoalesced(),
+                SingleFlight.getCacheHits());
+        var aggregatedTraceLinks = RunMetrics.time(
+                "aggregate", () -> aggregator.aggregate(sourceElements, targetElements, llmResults));
 
         LOGGER.info("Postprocessing Tracelinks");
-        traceLinks = traceLinkIdPostProcessor.postprocess(traceLinks);
+        var traceLinks =
+                RunMetrics.time("postprocess", () -> traceLinkIdPostProcessor.postprocess(aggregatedTraceLinks));
 
         LOGGER.info("Evaluating Results");
-        Statistics.generateStatistics(
-                traceLinks, configFile.toFile(), configuration, sourceArtifcatsSize, targetArtifactsSize);
-        Statistics.saveTraceLinks(traceLinks, configFile.toFile(), configuration);
-
-        CacheManager.getDefaultInstance().flush();
+        RunMetrics.time("statistics", () -> {
+            Statistics.generateStatistics(
+                    traceLinks, configFile.toFile(), configuration, sourceArtifcatsSize, targetArtifactsSize);
+            Statistics.saveTraceLinks(traceLinks, configFile.toFile(), configuration);
+            targetStore
+                    .getRetrievalStrategy()
+                    .getUnprunedStrategy()
+                    .ifPresent(this::reportCandidatePruning);
+        });
+
+        RunMetrics.time("cache_flush", () -> CacheManager.getDefaultInstance().flush());
 
         return traceLinks;
     }
 
+    /**
+     * Reports how many retrieval candidates were pruned by the retrieval strategy of the target store.
+     * If a gold standard is configured, the report also contains the candidate recall with and without pruning,
+     * i.e., the share of gold standard trace links that could at most be found if all candidates were classified
+     * as related. The difference between both is the recall cost of the pruning.
+     *
+     * @param unprunedStrategy The retrieval strategy without pruning
+     */
+    private void reportCandidatePruning(RetrievalStrategy unprunedStrategy) {
+        CandidateMatrix pruned = targetStore.getCandidateMatrix(sourceStore);
+        CandidateMatrix unpruned = CandidateMatrix.of(sourceStore, targetStore, unprunedStrategy);
+        int prunedCandidates = unpruned.size() - pruned.size();
+        LOGGER.info(
+                "Retrieval pruned {} of {} candidates, {} classification tasks remain",
+                prunedCandidates,
+                unpruned.size(),
+                pruned.size());
+
+        Double recallWithoutPruning = null;
+        Double recallWithPruning = null;
+        var goldStandardConfiguration = configuration.goldStandardConfiguration();
+        if (goldStandardConfiguration != null && goldStandardConfiguration.path() != null) {
+            Set<TraceLink> validTraceLinks = Statistics.getTraceLinksFromGoldStandard(goldStandardConfiguration);
+            recallWithoutPruning = candidateRecall(unpruned, validTraceLinks);
+            recallWithPruning = candidateRecall(pruned, validTraceLinks);
+            LOGGER.info(
+                    "Candidate recall is {} with pruning and {} without pruning",
+                    recallWithPruning,
+                    recallWithoutPruning);
+        }
+
+        Statistics.generateCandidatePruningStatistics(
+                configuration.getConfigurationIdentifierForFile(configFile.toFile().getName()),
+                unpruned.size(),
+                pruned.size(),
+                recallWithoutPruning,
+                recallWithPruning);
+    }
+
+    /**
+     * Calculates the share of valid trace links that result from classifying all candidates as related.
+     */
+    private double candidateRecall(CandidateMatrix candidates, Set<TraceLink> validTraceLinks) {
+        if (validTraceLinks.isEmpty()) {
+            return 1.0;
+        }
+        List<ClassificationResult> allRelated = candidates.getPairs().stream()
+                .map(pair -> ClassificationResult.of(pair.first(), pair.second()))
+                .toList();
+        Set<TraceLink> reachable = new HashSet<>(traceLinkIdPostProcessor.postprocess(
+                aggregator.aggregate(sourceElements, targetElements, allRelated)));
+        reachable.retainAll(validTraceLinks);
+        return (double) reachable.size() / validTraceLinks.size();
+    }
+
+    /**
+     * Sets up the source and target stores, or reuses the stores of a previous run of the session with the same
+     * artifacts, preprocessors, embedding creator, and store configurations.
+     */
     /*package-private*/ void setupSourceAndTargetStores() {
-        LOGGER.info("Loading artifacts");
-        var sourceArtifacts = sourceArtifactProvider.getArtifacts();
-        var targetArtifacts = targetArtifactProvider.getArtifacts();
+        var key = StoreRegistry.StoreKey.of(configuration, sourceArtifactProvider, targetArtifactProvider);
+        var loaded = storeRegistry.getOrLoad(key, this::loadStores);
+        sourceStore = loaded.sourceStore();
+        targetStore = loaded.targetStore();
+        sourceElements = loaded.sourceElements();
+        targetElements = loaded.targetElements();
+        sourceArtifcatsSize = loaded.sourceArtifactCount();
+        targetArtifactsSize = loaded.targetArtifactCount();
+    }
 
-        sourceArtifcatsSize = sourceArtifacts.size();
-        targetArtifactsSize = targetArtifacts.size();
+    private StoreRegistry.LoadedStores loadStores() {
+        LOGGER.info("Loading artifacts");
+        var sourceArtifacts = RunMetrics.time("load_artifacts", sourceArtifactProvider::getArtifacts);
+        var targetArtifacts = RunMetrics.time("load_artifacts", targetArtifactProvider::getArtifacts);
 
         LOGGER.info("Preprocessing artifacts");
-        sourceElements = sourcePreprocessor.preprocess(sourceArtifacts);
-        targetElements = targetPreprocessor.preprocess(targetArtifacts);
+        var preprocessedSourceElements =
+                RunMetrics.time("preprocess", () -> sourcePreprocessor.preprocess(sourceArtifacts));
+        var preprocessedTargetElements =
+                RunMetrics.time("preprocess", () -> targetPreprocessor.preprocess(targetArtifacts));
 
         LOGGER.info("Calculating embeddings");
-        var sourceEmbeddings = embeddingCreator.calculateEmbeddings(sourceElements);
-        var targetEmbeddings = embeddingCreator.calculateEmbeddings(targetElements);
+        var sourceEmbeddings =
+                RunMetrics.time("embed", () -> embeddingCreator.calculateEmbeddings(preprocessedSourceElements));
+        var targetEmbeddings =
+                RunMetrics.time("embed", () -> embeddingCreator.calculateEmbeddings(preprocessedTargetElements));
 
         LOGGER.info("Building element stores");
-        sourceStore.setup(sourceElements, sourceEmbeddings);
-        targetStore.setup(targetElements, targetEmbeddings);
+        RunMetrics.time("build_stores", () -> {
+            sourceStore.setup(preprocessedSourceElements, sourceEmbeddings);
+            targetStore.setup(preprocessedTargetElements, targetEmbeddings);
+        });
+        return new StoreRegistry.LoadedStores(
+                sourceStore,
+                targetStore,
+                preprocessedSourceElements,
+                preprocessedTargetElements,
+                sourceArtifacts.size(),
+                targetArtifacts.size());
     }
 
     /**
      * Gets the number of source artifacts in this evaluation.
+     * The number is known once the stores are set up, so the artifacts are not loaded again.
      *
      * @return Number of source artifacts
      */
     public int getSourceArtifactCount() {
-        return sourceArtifactProvider.getArtifacts().size();
+        return sourceElements == null ? sourceArtifactProvider.getArtifacts().size() : sourceArtifcatsSize;
     }
 
     /**
      * Gets the number of target artifacts in this evaluation.
+     * The number is known once the stores are set up, so the artifacts are not loaded again.
      *
      * @return Number of target artifacts
      */
     public int getTargetArtifactCount() {
-        return targetArtifactProvider.getArtifacts().size();
+        return targetElements == null ? targetArtifactProvider.getArtifacts().size() : targetArtifactsSize;
     }
 }
@@ -19,8 +19,10 @@ import edu.kit.kastel.sdq.lissa.ratlr.evaluator.AbstractEvaluator;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.TraceLink;
 import edu.kit.kastel.sdq.lissa.ratlr.promptmetric.Metric;
 import edu.kit.kastel.sdq.lissa.ratlr.promptmetric.MetricFactory;
+import edu.kit.kastel.sdq.lissa.ratlr.promptoptimizer.CheckpointStore;
 import edu.kit.kastel.sdq.lissa.ratlr.promptoptimizer.OptimizerFactory;
 import edu.kit.kastel.sdq.lissa.ratlr.promptoptimizer.PromptOptimizer;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.RunMetrics;
 
 /**
  * Represents a single prompt optimization run of the LiSSA framework.
@@ -35,6 +37,16 @@ public class Optimization {
     private static final Logger LOGGER = LoggerFactory.getLogger(Optimization.class);
     private final Path configFile;
 
+    /**
+     * Whether the optimization resumes from the last checkpoint of a previous run with the same configuration.
+     */
+    private final boolean resume;
+
+    /**
+     * Registry of the element stores shared with other runs of the same session.
+     */
+    private final StoreRegistry storeRegistry;
+
     private OptimizerConfiguration configuration;
 
     /**
@@ -61,7 +73,35 @@ public class Optimization {
      * @throws NullPointerException If configFile is null
      */
     public Optimization(Path configFile) throws IOException {
+        this(configFile, false);
+    }
+
+    /**
+     * Creates a new optimization instance with the specified configuration file that optionally resumes from the last
+     * checkpoint of a previous run with the same configuration (see {@link CheckpointStore}).
+     *
+     * @param configFile Path to the configuration file
+     * @param resume Whether to resume from the last checkpoint
+     * @throws IOException          If there are issues reading the configuration file
+     * @throws NullPointerException If configFile is null
+     */
+    public Optimization(Path configFile, boolean resume) throws IOException {
+        this(configFile, resume, new StoreRegistry());
+    }
+
+    /**
+     * Creates a new optimization instance that shares its element stores with the other runs of a session.
+     *
+     * @param configFile Path to the configuration file
+     * @param resume Whether to resume from the last checkpoint
+     * @param storeRegistry The registry of the element stores of the session
+     * @throws IOException          If there are issues reading the configuration file
+     * @throws NullPointerException If configFile or storeRegistry is null
+     */
+    public Optimization(Path configFile, boolean resume, StoreRegistry storeRegistry) throws IOException {
         this.configFile = Objects.requireNonNull(configFile);
+        this.resume = resume;
+        this.storeRegistry = Objects.requireNonNull(storeRegistry);
         setup();
     }
 
@@ -72,13 +112,14 @@ public class Optimization {
      *     <li>Loads the configuration from the specified file</li>
      *     <li>Initializes the evaluation pipeline</li>
      *     <li>Creates the Metric, Evaluator and Optimizer</li>
+     *     <li>Sets up the checkpoints of the optimizer, identified by the serialized configuration</li>
      * </ol>
      *
      * @throws IOException If there are issues reading the configuration
      */
     private void setup() throws IOException {
         configuration = new ObjectMapper().readValue(configFile.toFile(), OptimizerConfiguration.class);
-        evaluationPipeline = new Evaluation(configuration.evaluationConfiguration());
+        evaluationPipeline = new Evaluation(configuration.evaluationConfiguration(), storeRegistry);
         Set<TraceLink> goldStandard = getTraceLinksFromGoldStandard(
                 configuration.evaluationConfiguration().goldStandardConfiguration());
 
@@ -91,7 +132,8 @@ public class Optimization {
 
         promptOptimizer =
                 OptimizerFactory.createOptimizer(configuration.promptOptimizer(), goldStandard, metric, evaluator);
-        configuration.serializeAndDestroyConfiguration();
+        String serializedConfiguration = configuration.serializeAndDestroyConfiguration();
+        promptOptimizer.setCheckpointStore(new CheckpointStore(serializedConfiguration, resume));
     }
 
     /**
@@ -110,8 +152,10 @@ public class Optimization {
         evaluationPipeline.setupSourceAndTargetStores();
 
         LOGGER.info("Optimizing Prompt");
-        String result =
-                promptOptimizer.optimize(evaluationPipeline.getSourceStore(), evaluationPipeline.getTargetStore());
+        String result = RunMetrics.time(
+                "optimize",
+                () -> promptOptimizer.optimize(
+                        evaluationPipeline.getSourceStore(), evaluationPipeline.getTargetStore()));
         LOGGER.info("Optimized Prompt: {}", result);
 
         Statistics.generateOptimizationStatistics(configFile.toFile(), configuration, result);
@@ -19,6 +19,7 @@ import edu.kit.kastel.sdq.lissa.ratlr.configuration.Configuration;
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.GoldStandardConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.OptimizerConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.TraceLink;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.TraceLinkSet;
 
 /**
  * Utility class for generating and saving statistics about trace link analysis results.
@@ -148,6 +149,57 @@ public final class Statistics {
         }
     }
 
+    /**
+     * Generates statistics about the candidates pruned by the retrieval strategy.
+     * This method:
+     * <ol>
+     *     <li>Generates a report with the number of candidates before and after pruning</li>
+     *     <li>Adds the candidate recall with and without pruning if available</li>
+     *     <li>Saves the report to a markdown file</li>
+     * </ol>
+     *
+     * @param configurationIdentifier Unique identifier for the configuration
+     * @param candidates Number of candidates without pruning
+     * @param retainedCandidates Number of candidates retained after pruning
+     * @param recallWithoutPruning Candidate recall without pruning, or null if no gold standard is configured
+     * @param recallWithPruning Candidate recall with pruning, or null if no gold standard is configured
+     * @throws UncheckedIOException If there are issues writing the statistics file
+     */
+    public static void generateCandidatePruningStatistics(
+            String configurationIdentifier,
+            int candidates,
+            int retainedCandidates,
+            Double recallWithoutPruning,
+            Double recallWithPruning)
+            throws UncheckedIOException {
+        var resultFile = new File("results-pruning-" + configurationIdentifier + ".md");
+        StringBuilder result = new StringBuilder();
+        result.append("## Candidate Pruning (").append(configurationIdentifier).append(")\n");
+        result.append("* #Candidates: ").append(candidates).append("\n");
+        result.append("* #Retained Candidates: ").append(retainedCandidates).append("\n");
+        result.append("* #Pruned Candidates: ")
+                .append(candidates - retainedCandidates)
+                .append("\n");
+        if (recallWithoutPruning != null && recallWithPruning != null) {
+            result.append("* Candidate Recall (without pruning): ")
+                    .append(recallWithoutPruning)
+                    .append("\n");
+            result.append("* Candidate Recall (with pruning): ")
+                    .append(recallWithPruning)
+                    .append("\n");
+            result.append("* Recall Cost: ")
+                    .append(recallWithoutPruning - recallWithPruning)
+                    .append("\n");
+        }
+
+        logger.info("Storing pruning statistics to {}", resultFile.getName());
+        try {
+            Files.writeString(resultFile.toPath(), result.toString(), StandardOpenOption.CREATE);
+        } catch (IOException e) {
+            throw new UncheckedIOException(e);
+        }
+    }
+
     /**
      * Loads trace links from a gold standard file.
      * This method:
@@ -175,7 +227,7 @@ public final class Statistics {
                     .map(it -> goldStandardConfiguration.swapColumns()
                             ? new TraceLink(it[1], it[0])
                             : new TraceLink(it[0], it[1]))
-                    .collect(Collectors.toSet());
+                    .collect(Collectors.toCollection(TraceLinkSet::new));
         } catch (IOException e) {
             throw new UncheckedIOException(e);
         }
@@ -230,6 +282,25 @@ public final class Statistics {
         }
     }
 
+    /**
+     * Saves the paths of transitive trace links to a CSV file.
+     * Each line lists the artifact ids of one path from the source to the target artifact.
+     *
+     * @param paths The paths to save
+     * @param destination Path to the output file
+     * @throws UncheckedIOException If there are issues writing the paths file
+     */
+    public static void saveTraceLinkPaths(List<List<String>> paths, String destination) throws UncheckedIOException {
+        logger.info("Storing trace link paths to {}", destination);
+
+        List<String> lines = paths.stream().map(path -> String.join(",", path)).sorted().toList();
+        try {
+            Files.writeString(new File(destination).toPath(), String.join("\n", lines));
+        } catch (IOException e) {
+            throw new UncheckedIOException(e);
+        }
+    }
+
     /**
      * Generates statistics for prompt optimization.
      *
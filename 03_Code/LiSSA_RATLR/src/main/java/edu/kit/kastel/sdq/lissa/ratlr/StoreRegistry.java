@@ -0,0 +1,147 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr;
+
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.CompletableFuture;
+import java.util.function.Supplier;
+
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+
+import edu.kit.kastel.sdq.lissa.ratlr.artifactprovider.ArtifactProvider;
+import edu.kit.kastel.sdq.lissa.ratlr.configuration.Configuration;
+import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
+import edu.kit.kastel.sdq.lissa.ratlr.elementstore.SourceElementStore;
+import edu.kit.kastel.sdq.lissa.ratlr.elementstore.TargetElementStore;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.Futures;
+
+/**
+ * Shares the element stores of evaluations and optimizations within one session (e.g., one CLI command).
+ * Loading artifacts, preprocessing them, and calculating their embeddings only depends on the artifact providers,
+ * the content of their artifacts, and the preprocessors, embedding creator, and store configurations. Runs that agree
+ * on these inputs reuse the stores of the first run, so only the classification is repeated. As element stores are
+ * read-only after their setup, they can safely be shared.
+ * <p>
+ * Use the same instance for all runs of a session, and a new instance to disable sharing. A long-running session
+ * (see the {@code serve} command) should limit the number of kept stores.
+ */
+public final class StoreRegistry {
+    private static final Logger LOGGER = LoggerFactory.getLogger(StoreRegistry.class);
+
+    /** The stores by their inputs in access order, completed once they are loaded */
+    private final LinkedHashMap<StoreKey, CompletableFuture<LoadedStores>> stores;
+
+    /**
+     * Creates a registry that keeps the stores of all runs.
+     */
+    public StoreRegistry() {
+        this(Integer.MAX_VALUE);
+    }
+
+    /**
+     * Creates a registry that keeps the stores of at most the given number of distinct inputs.
+     * If more inputs are loaded, the least recently used stores are dropped.
+     *
+     * @param capacity The maximum number of kept stores
+     * @throws IllegalArgumentException If the capacity is less than 1
+     */
+    public StoreRegistry(int capacity) {
+        if (capacity < 1) {
+            throw new IllegalArgumentException("The capacity must be at least 1, but was " + capacity);
+        }
+        this.stores = new LinkedHashMap<>(16, 0.75f, true) {
+            @Override
+            protected boolean removeEldestEntry(Map.Entry<StoreKey, CompletableFuture<LoadedStores>> eldest) {
+                return size() > capacity;
+            }
+        };
+    }
+
+    /**
+     * Returns the stores for the given inputs, loading them on first use.
+     * Concurrent runs with the same inputs wait for the first one to load the stores, while runs with other inputs
+     * are not blocked.
+     *
+     * @param key The inputs of the stores
+     * @param loader Loads the stores if no run of this session loaded them before
+     * @return The (possibly shared) stores
+     */
+    LoadedStores getOrLoad(StoreKey key, Supplier<LoadedStores> loader) {
+        CompletableFuture<LoadedStores> loading;
+        boolean load;
+        synchronized (this) {
+            loading = stores.get(key);
+            load = loading == null;
+            if (load) {
+                loading = new CompletableFuture<>();
+                stores.put(key, loading);
+            }
+        }
+        if (!load) {
+            LOGGER.info("Reusing the element stores of a previous run with the same inputs");
+            return Futures.getLogged(loading, LOGGER);
+        }
+
+        try {
+            LoadedStores loaded = loader.get();
+            loading.complete(loaded);
+            return loaded;
+        } catch (RuntimeException e) {
+            synchronized (this) {
+                stores.remove(key, loading);
+            }
+            loading.completeExceptionally(e);
+            throw e;
+        }
+    }
+
+    /**
+     * The inputs that determine the content of the element stores.
+     * The module configurations must be finalized, so their arguments include all defaults and compare canonically.
+     * The fingerprints of the artifacts (see {@link ArtifactProvider#getFingerprint()}) make sure that a long-running
+     * session does not reuse stores of artifacts that changed in the meantime.
+     */
+    record StoreKey(
+            String cacheDir,
+            ModuleConfiguration sourceArtifactProvider,
+            String sourceArtifactFingerprint,
+            ModuleConfiguration targetArtifactProvider,
+            String targetArtifactFingerprint,
+            ModuleConfiguration sourcePreprocessor,
+            ModuleConfiguration targetPreprocessor,
+            ModuleConfiguration embeddingCreator,
+            ModuleConfiguration sourceStore,
+            ModuleConfiguration targetStore) {
+
+        static StoreKey of(
+                Configuration configuration,
+                ArtifactProvider sourceArtifactProvider,
+                ArtifactProvider targetArtifactProvider) {
+            return new StoreKey(
+                    configuration.cacheDir(),
+                    configuration.sourceArtifactProvider(),
+                    sourceArtifactProvider.getFingerprint(),
+                    configuration.targetArtifactProvider(),
+                    targetArtifactProvider.getFingerprint(),
+                    configuration.sourcePreprocessor(),
+                    configuration.targetPreprocessor(),
+                    configuration.embeddingCreator(),
+                    configuration.sourceStore(),
+                    configuration.targetStore());
+        }
+    }
+
+    /**
+     * The element stores of a run together with the elements and artifact counts the rest of the pipeline needs.
+     */
+    record LoadedStores(
+            SourceElementStore sourceStore,
+            TargetElementStore targetStore,
+            List<Element> sourceElements,
+            List<Element> targetElements,
+            int sourceArtifactCount,
+            int targetArtifactCount) {}
+}
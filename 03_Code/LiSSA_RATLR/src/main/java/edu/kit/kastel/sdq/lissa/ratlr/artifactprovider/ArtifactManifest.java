@@ -0,0 +1,164 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.artifactprovider;
+
+import java.io.IOException;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.StandardCopyOption;
+import java.nio.file.attribute.BasicFileAttributes;
+import java.security.MessageDigest;
+import java.security.NoSuchAlgorithmException;
+import java.util.HexFormat;
+import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.atomic.AtomicBoolean;
+
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+
+import com.fasterxml.jackson.core.type.TypeReference;
+import com.fasterxml.jackson.databind.ObjectMapper;
+
+import edu.kit.kastel.sdq.lissa.ratlr.cache.CacheManager;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.KeyGenerator;
+
+/**
+ * Remembers the size, modification time, and content hash of the files below an artifact root.
+ * The manifest is stored in the {@code artifact-manifests} directory of the cache directory, so later runs can
+ * fingerprint an unchanged tree by only reading the file attributes. Without a cache directory, the manifest is kept
+ * in memory only.
+ * <p>
+ * The manifest is an optimization: if it cannot be read or written, the files are hashed again.
+ * This class is thread-safe.
+ */
+final class ArtifactManifest {
+    private static final Logger logger = LoggerFactory.getLogger(ArtifactManifest.class);
+    private static final String MANIFEST_DIRECTORY = "artifact-manifests";
+
+    private final ObjectMapper mapper = new ObjectMapper();
+    /** The manifest file, or null if the manifest is not persisted */
+    private final Path manifestFile;
+    /** The entries by the absolute path of their file */
+    private final Map<String, Entry> entries = new ConcurrentHashMap<>();
+
+    private final AtomicBoolean dirty = new AtomicBoolean();
+
+    private ArtifactManifest(Path manifestFile) {
+        this.manifestFile = manifestFile;
+        if (manifestFile != null && Files.isRegularFile(manifestFile)) {
+            try {
+                entries.putAll(mapper.readValue(manifestFile.toFile(), new TypeReference<Map<String, Entry>>() {}));
+            } catch (IOException e) {
+                logger.warn("Could not read artifact manifest {}, hashing all files again", manifestFile, e);
+            }
+        }
+    }
+
+    /**
+     * Loads the manifest of the given artifact root from the cache directory of the default {@link CacheManager}.
+     *
+     * @param root The file or directory the artifacts are loaded from
+     * @return The manifest of the root
+     */
+    static ArtifactManifest forRoot(Path root) {
+        if (!CacheManager.hasDefaultInstance()) {
+            return new ArtifactManifest(null);
+        }
+        String name = KeyGenerator.generateKey(root.toAbsolutePath().normalize().toString()) + ".json";
+        return new ArtifactManifest(CacheManager.getDefaultInstance()
+                .getCacheDirectory()
+                .resolve(MANIFEST_DIRECTORY)
+                .resolve(name));
+    }
+
+    /**
+     * Returns the content hash of a file if the file did not change since it was recorded.
+     *
+     * @param file The file
+     * @param attributes The current attributes of the file
+     * @return The content hash, or null if the file is unknown or changed
+     */
+    String cachedHash(Path file, BasicFileAttributes attributes) {
+        Entry entry = entries.get(keyOf(file));
+        if (entry == null
+                || entry.size() != attributes.size()
+                || entry.modified() != attributes.lastModifiedTime().toMillis()) {
+            return null;
+        }
+        return entry.hash();
+    }
+
+    /**
+     * Records the content of a file.
+     * The attributes must be read before the content, so a concurrent change of the file is detected by a later run.
+     *
+     * @param file The file
+     * @param attributes The attributes of the file, read before its content
+     * @param content The content of the file
+     * @return The content hash
+     */
+    String record(Path file, BasicFileAttributes attributes, byte[] content) {
+        String hash = sha256(content);
+        Entry entry = new Entry(attributes.size(), attributes.lastModifiedTime().toMillis(), hash);
+        if (!entry.equals(entries.put(keyOf(file), entry))) {
+            dirty.set(true);
+        }
+        return hash;
+    }
+
+    /**
+     * Writes the manifest to the cache directory if it changed.
+     */
+    void save() {
+        if (manifestFile == null || !dirty.getAndSet(false)) {
+            return;
+        }
+        try {
+            Files.createDirectories(manifestFile.getParent());
+            Path tempFile = Files.createTempFile(
+                    manifestFile.getParent(), manifestFile.getFileName().toString(), ".tmp");
+            mapper.writeValue(tempFile.toFile(), Map.copyOf(entries));
+            Files.move(tempFile, manifestFile, StandardCopyOption.REPLACE_EXISTING);
+        } catch (IOException e) {
+            logger.warn("Could not write artifact manifest {}", manifestFile, e);
+        }
+    }
+
+    /**
+     * Calculates the hex-encoded SHA-256 hash of the given bytes.
+     *
+     * @param content The bytes to hash
+     * @return The hash
+     */
+    static String sha256(byte[] content) {
+        try {
+            return HexFormat.of().formatHex(MessageDigest.getInstance("SHA-256").digest(content));
+        } catch (NoSuchAlgorithmException e) {
+            throw new IllegalStateException("SHA-256 is not available", e);
+        }
+    }
+
+    /**
+     * Calculates the hex-encoded SHA-256 hash of the UTF-8 encoding of the given text.
+     *
+     * @param content The text to hash
+     * @return The hash
+     */
+    static String sha256(String content) {
+        return sha256(content.getBytes(StandardCharsets.UTF_8));
+    }
+
+    private static String keyOf(Path file) {
+        return file.toAbsolutePath().normalize().toString();
+    }
+
+    /**
+     * The recorded state of a file.
+     *
+     * @param size The size in bytes
+     * @param modified The modification time in milliseconds since the epoch
+     * @param hash The hex-encoded SHA-256 hash of the content
+     */
+    record Entry(long size, long modified, String hash) {}
+}
@@ -57,6 +57,15 @@ public abstract class ArtifactProvider {
      */
     public abstract Artifact getArtifact(String identifier);
 
+    /**
+     * Calculates a fingerprint of the provided artifacts.
+     * The fingerprint changes if and only if the content of the artifacts changes (up to hash collisions), so it can
+     * be used to detect whether artifacts that were processed before are still up to date.
+     *
+     * @return The fingerprint of the artifacts
+     */
+    public abstract String getFingerprint();
+
     /**
      * Creates an appropriate artifact provider based on the given configuration.
      * The factory method supports different types of artifact providers:
@@ -2,10 +2,9 @@
 package edu.kit.kastel.sdq.lissa.ratlr.artifactprovider;
 
 import java.io.IOException;
-import java.io.UncheckedIOException;
 import java.nio.file.Files;
 import java.nio.file.Path;
-import java.util.Scanner;
+import java.util.List;
 import java.util.stream.Stream;
 
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
@@ -47,46 +46,38 @@ public class RecursiveTextArtifactProvider extends TextArtifactProvider {
     }
 
     /**
-     * Recursively loads text files from the configured directory and its subdirectories.
-     * Only files with the specified extensions are processed. The relative path of each file
-     * is used as the artifact identifier. These artifacts will later be processed into elements
-     * by preprocessors.
+     * Recursively lists the files in the configured directory and its subdirectories.
+     * Only files with the specified extensions are listed.
      *
-     * @throws UncheckedIOException If there are issues reading the files
+     * @return The files to load artifacts from
+     * @throws IOException If the directory cannot be walked
      */
     @Override
-    protected void loadFiles() {
+    protected List<Path> listFiles() throws IOException {
         try (Stream<Path> fileStream = Files.walk(this.path.toPath())) {
-            for (Path file : fileStream.toList()) {
-                if (Files.isRegularFile(file) && hasCorrectExtension(file)) {
-                    readFile(file);
-                }
-            }
-        } catch (IOException e) {
-            throw new UncheckedIOException(e);
+            return fileStream
+                    .filter(file -> Files.isRegularFile(file) && hasCorrectExtension(file))
+                    .toList();
         }
     }
 
     /**
-     * Reads a single file and creates an artifact from its contents.
+     * Creates the artifact of a file.
      * The artifact's identifier is set to the relative path of the file,
-     * with path separators normalized to forward slashes. This artifact will later
-     * be processed into elements by preprocessors.
+     * with path separators normalized to forward slashes. Empty files do not result in an artifact.
      *
-     * @param file The path to the file to read
-     * @throws UncheckedIOException If there are issues reading the file
+     * @param file The file the artifact is loaded from
+     * @param content The content of the file
+     * @return The artifact, or null if the file is empty
      */
-    private void readFile(Path file) {
-        try (Scanner scan = new Scanner(file.toFile()).useDelimiter("\\A")) {
-            if (scan.hasNext()) {
-                String content = scan.next();
-                var relativePath = this.path.toPath().relativize(file);
-                String pathWithDefinedSeparators = relativePath.toString().replace("\\", "/");
-                artifacts.add(new Artifact(pathWithDefinedSeparators, artifactType, content));
-            }
-        } catch (IOException e) {
-            throw new UncheckedIOException(e);
+    @Override
+    protected Artifact createArtifact(Path file, String content) {
+        if (content.isEmpty()) {
+            return null;
         }
+        var relativePath = this.path.toPath().relativize(file);
+        String pathWithDefinedSeparators = relativePath.toString().replace("\\", "/");
+        return new Artifact(pathWithDefinedSeparators, artifactType, content);
     }
 
     /**
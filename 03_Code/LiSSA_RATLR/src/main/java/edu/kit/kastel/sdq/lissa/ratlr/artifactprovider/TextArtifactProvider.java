@@ -1,18 +1,26 @@
 /* Licensed under MIT 2025. */
 package edu.kit.kastel.sdq.lissa.ratlr.artifactprovider;
 
-import java.io.*;
+import java.io.File;
+import java.io.IOException;
+import java.io.UncheckedIOException;
 import java.nio.charset.StandardCharsets;
 import java.nio.file.Files;
 import java.nio.file.Path;
+import java.nio.file.attribute.BasicFileAttributes;
 import java.util.*;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
 
-import org.apache.commons.io.IOUtils;
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
 
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Artifact;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Knowledge;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.Futures;
 
 /**
  * Provides text-based artifacts from a configured file or directory.
@@ -27,6 +35,10 @@ import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Knowledge;
  * </ul>
  */
 public class TextArtifactProvider extends ArtifactProvider {
+    private static final Logger logger = LoggerFactory.getLogger(TextArtifactProvider.class);
+
+    /** The maximum number of files read in parallel */
+    private static final int MAX_READER_THREADS = 8;
 
     /**
      * The file or directory path from which artifacts are loaded.
@@ -43,6 +55,12 @@ public class TextArtifactProvider extends ArtifactProvider {
      */
     protected final List<Artifact> artifacts;
 
+    /** Whether the artifacts are loaded */
+    private boolean loaded;
+
+    /** The manifest of the files below the path, created on first use */
+    private ArtifactManifest manifest;
+
     /**
      * Creates a new text artifact provider with the specified configuration.
      *
@@ -61,39 +79,141 @@ public class TextArtifactProvider extends ArtifactProvider {
     }
 
     /**
-     * Loads text files from the configured path and creates artifacts.
-     * If the path is a file, it creates a single artifact.
-     * If the path is a directory, it creates artifacts for all text files in the directory.
+     * Lists the files to load artifacts from.
+     * If the path is a file, only the file is listed.
+     * If the path is a directory, all regular files in the directory are listed.
+     *
+     * @return The files to load artifacts from
+     * @throws IOException If the directory cannot be listed
+     */
+    protected List<Path> listFiles() throws IOException {
+        if (this.path.isFile()) {
+            return List.of(this.path.toPath());
+        }
+        List<Path> files = new ArrayList<>();
+        for (File file : Objects.requireNonNull(this.path.listFiles())) {
+            if (Files.isRegularFile(file.toPath())) {
+                files.add(file.toPath());
+            }
+        }
+        return files;
+    }
+
+    /**
+     * Creates the artifact of a file.
+     * The artifact uses the filename as its identifier.
+     *
+     * @param file The file the artifact is loaded from
+     * @param content The content of the file
+     * @return The artifact, or null if the file does not result in an artifact
+     */
+    protected Artifact createArtifact(Path file, String content) {
+        return new Artifact(file.getFileName().toString(), artifactType, content);
+    }
+
+    /**
+     * Loads the listed files in parallel and creates artifacts.
+     * The content hashes of the files are recorded in the {@link ArtifactManifest} of the path.
      * These artifacts will later be processed into elements by preprocessors.
      *
      * @throws UncheckedIOException If there are issues reading the files
      */
     protected void loadFiles() {
-        List<File> files = new ArrayList<>();
-        if (this.path.isFile()) {
-            files.add(this.path);
-        } else {
-            files.addAll(Arrays.asList(Objects.requireNonNull(this.path.listFiles())));
+        List<Path> files;
+        try {
+            files = listFiles();
+        } catch (IOException e) {
+            throw new UncheckedIOException(e);
         }
+        logger.info("Loading {} files from {}", files.size(), path);
+        ArtifactManifest artifactManifest = getManifest();
+        int threads = Math.clamp(files.size(), 1, MAX_READER_THREADS);
+        try (ExecutorService executor = Executors.newFixedThreadPool(threads)) {
+            List<Future<Artifact>> futureArtifacts = new ArrayList<>();
+            for (Path file : files) {
+                futureArtifacts.add(executor.submit(() -> readFile(file, artifactManifest)));
+            }
+            for (Future<Artifact> futureArtifact : futureArtifacts) {
+                Artifact artifact = Futures.getLogged(futureArtifact, logger);
+                if (artifact != null) {
+                    artifacts.add(artifact);
+                }
+            }
+        }
+        artifactManifest.save();
+    }
+
+    /**
+     * Reads a single file, records it in the manifest, and creates its artifact.
+     *
+     * @param file The file to read
+     * @param artifactManifest The manifest to record the file in
+     * @return The artifact, or null if the file does not result in an artifact
+     * @throws UncheckedIOException If there are issues reading the file
+     */
+    private Artifact readFile(Path file, ArtifactManifest artifactManifest) {
+        try {
+            BasicFileAttributes attributes = Files.readAttributes(file, BasicFileAttributes.class);
+            byte[] content = Files.readAllBytes(file);
+            artifactManifest.record(file, attributes, content);
+            return createArtifact(file, new String(content, StandardCharsets.UTF_8));
+        } catch (IOException e) {
+            throw new UncheckedIOException(e);
+        }
+    }
 
-        for (File file : files) {
-            Path it = file.toPath();
-            if (Files.isRegularFile(it)) {
-                ByteArrayOutputStream bos = new ByteArrayOutputStream();
-                try (BufferedReader reader = new BufferedReader(new FileReader(it.toFile()))) {
-                    IOUtils.copy(reader, bos, StandardCharsets.UTF_8);
-                    String content = bos.toString(StandardCharsets.UTF_8);
-                    artifacts.add(new Artifact(it.getFileName().toString(), artifactType, content));
-                } catch (IOException e) {
-                    throw new UncheckedIOException(e);
+    /**
+     * Calculates the fingerprint of the listed files from their relative paths and content hashes.
+     * Files that did not change since the manifest recorded them are not read. If a file changed and the artifacts
+     * are not loaded yet, they are loaded, so a tree is read only once per run.
+     *
+     * @return The fingerprint of the files
+     * @throws UncheckedIOException If there are issues reading the files
+     */
+    @Override
+    public synchronized String getFingerprint() {
+        try {
+            List<Path> files = new ArrayList<>(listFiles());
+            files.sort(Comparator.naturalOrder());
+            ArtifactManifest artifactManifest = getManifest();
+            StringBuilder fingerprint = new StringBuilder();
+            for (Path file : files) {
+                BasicFileAttributes attributes = Files.readAttributes(file, BasicFileAttributes.class);
+                String hash = artifactManifest.cachedHash(file, attributes);
+                if (hash == null && !loaded) {
+                    ensureLoaded();
+                    hash = artifactManifest.cachedHash(file, attributes);
                 }
+                if (hash == null) {
+                    hash = artifactManifest.record(file, attributes, Files.readAllBytes(file));
+                }
+                String relativePath = this.path.toPath().relativize(file).toString().replace("\\", "/");
+                fingerprint.append(relativePath).append('\0').append(hash).append('\n');
             }
+            artifactManifest.save();
+            return ArtifactManifest.sha256(fingerprint.toString());
+        } catch (IOException e) {
+            throw new UncheckedIOException(e);
+        }
+    }
+
+    private synchronized ArtifactManifest getManifest() {
+        if (manifest == null) {
+            manifest = ArtifactManifest.forRoot(this.path.toPath());
+        }
+        return manifest;
+    }
+
+    private synchronized void ensureLoaded() {
+        if (!loaded) {
+            loadFiles();
+            loaded = true;
         }
     }
 
     /**
      * Retrieves all artifacts from the configured path.
-     * The artifacts are loaded if they haven't been loaded yet, and returned in alphabetical order
+     * The artifacts are loaded once, and returned in alphabetical order
      * by their identifiers. These artifacts represent the original documents that will be
      * processed into elements by preprocessors.
      *
@@ -101,7 +221,7 @@ public class TextArtifactProvider extends ArtifactProvider {
      */
     @Override
     public List<Artifact> getArtifacts() {
-        if (artifacts.isEmpty()) this.loadFiles();
+        ensureLoaded();
         var orderedArtifacts = new ArrayList<>(this.artifacts);
         orderedArtifacts.sort(Comparator.comparing(Knowledge::getIdentifier));
         return orderedArtifacts;
@@ -109,7 +229,7 @@ public class TextArtifactProvider extends ArtifactProvider {
 
     /**
      * Retrieves a specific artifact by its identifier.
-     * The artifacts are loaded if they haven't been loaded yet.
+     * The artifacts are loaded once.
      *
      * @param identifier The filename of the artifact to retrieve
      * @return The artifact with the specified identifier
@@ -117,7 +237,7 @@ public class TextArtifactProvider extends ArtifactProvider {
      */
     @Override
     public Artifact getArtifact(String identifier) {
-        if (artifacts.isEmpty()) this.loadFiles();
+        ensureLoaded();
         return artifacts.stream()
                 .filter(it -> it.getIdentifier().equals(identifier))
                 .findFirst()
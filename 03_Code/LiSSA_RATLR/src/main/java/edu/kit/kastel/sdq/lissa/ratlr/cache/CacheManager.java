@@ -27,12 +27,23 @@ public final class CacheManager {
     /**
      * Sets the cache directory for the default cache manager instance.
      * This method must be called before using the default instance.
+     * If the default instance already uses the directory, it is kept along with its open caches, so consecutive runs
+     * of a session do not parse the cache files again. Otherwise, the caches of the previous instance are flushed.
      *
      * @param directory The path to the cache directory, or null to use the default directory
      * @throws IOException If the cache directory cannot be created
      */
     public static synchronized void setCacheDir(String directory) throws IOException {
-        defaultInstanceManager = new CacheManager(Path.of(directory == null ? DEFAULT_CACHE_DIRECTORY : directory));
+        Path cacheDir = Path.of(directory == null ? DEFAULT_CACHE_DIRECTORY : directory);
+        if (defaultInstanceManager != null) {
+            Path currentCacheDir = defaultInstanceManager.directoryOfCaches.toAbsolutePath();
+            if (currentCacheDir.normalize().equals(cacheDir.toAbsolutePath().normalize())
+                    && Files.isDirectory(cacheDir)) {
+                return;
+            }
+            defaultInstanceManager.flush();
+        }
+        defaultInstanceManager = new CacheManager(cacheDir);
     }
 
     /**
@@ -64,6 +75,35 @@ public final class CacheManager {
         return defaultInstanceManager;
     }
 
+    /**
+     * Checks whether the default cache manager instance has been initialized via {@link #setCacheDir(String)}.
+     *
+     * @return true if the default instance is available
+     */
+    public static synchronized boolean hasDefaultInstance() {
+        return defaultInstanceManager != null;
+    }
+
+    /**
+     * Flushes and removes the default cache manager instance, so it has to be set again via
+     * {@link #setCacheDir(String)}. This is used to clean up after runs with a temporary cache directory.
+     */
+    public static synchronized void resetDefaultInstance() {
+        if (defaultInstanceManager != null) {
+            defaultInstanceManager.flush();
+            defaultInstanceManager = null;
+        }
+    }
+
+    /**
+     * Gets the directory that contains the caches of this cache manager.
+     *
+     * @return The cache directory
+     */
+    public Path getCacheDirectory() {
+        return directoryOfCaches;
+    }
+
     /**
      * Gets a cache instance for the specified name.
      * This method is designed for internal use by model implementations.
@@ -109,7 +149,7 @@ public final class CacheManager {
      * @param appendEnding Whether to append the .json extension to the cache name
      * @return A cache instance for the specified name
      */
-    private Cache getCache(String name, boolean appendEnding) {
+    private synchronized Cache getCache(String name, boolean appendEnding) {
         name = name.replace(":", "__");
 
         if (caches.containsKey(name)) {
@@ -142,7 +182,7 @@ public final class CacheManager {
      * Flushes all caches managed by this cache manager.
      * This ensures that all pending changes are written to disk.
      */
-    public void flush() {
+    public synchronized void flush() {
         for (Cache cache : caches.values()) {
             cache.flush();
         }
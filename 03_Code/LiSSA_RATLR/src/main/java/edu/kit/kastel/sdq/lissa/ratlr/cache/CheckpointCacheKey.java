@@ -0,0 +1,43 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.cache;
+
+import com.fasterxml.jackson.annotation.JsonIgnore;
+import com.fasterxml.jackson.core.JsonProcessingException;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.fasterxml.jackson.databind.SerializationFeature;
+
+import edu.kit.kastel.sdq.lissa.ratlr.utils.KeyGenerator;
+
+/**
+ * Represents a key for the checkpoints of optimization runs in the LiSSA framework.
+ * A checkpoint belongs to exactly one configuration, so it is identified by the hash of the serialized configuration.
+ * <p>
+ * Please always use the {@link #of(String)} method to create a new instance.
+ *
+ * @param configuration The hash of the serialized configuration of the run
+ * @param localKey A local key for additional identification, not included in JSON serialization.
+ */
+public record CheckpointCacheKey(String configuration, @JsonIgnore String localKey) implements CacheKey {
+
+    /**
+     * ObjectMapper instance configured for JSON serialization with indentation.
+     */
+    private static final ObjectMapper MAPPER = new ObjectMapper().configure(SerializationFeature.INDENT_OUTPUT, true);
+
+    public static CheckpointCacheKey of(String serializedConfiguration) {
+        String configuration = KeyGenerator.generateKey(serializedConfiguration);
+        return new CheckpointCacheKey(configuration, configuration);
+    }
+
+    /**
+     * @throws IllegalArgumentException If the key cannot be serialized to JSON
+     */
+    @Override
+    public String toJsonKey() {
+        try {
+            return MAPPER.writeValueAsString(this);
+        } catch (JsonProcessingException e) {
+            throw new IllegalArgumentException("Could not serialize key", e);
+        }
+    }
+}
@@ -11,6 +11,8 @@ import java.util.*;
 import com.fasterxml.jackson.core.type.TypeReference;
 import com.fasterxml.jackson.databind.ObjectMapper;
 
+import edu.kit.kastel.sdq.lissa.ratlr.utils.RunMetrics;
+
 /**
  * Implements a local file-based cache for storing key-value pairs.
  * This class provides a thread-safe implementation of a cache that persists its contents
@@ -74,6 +76,7 @@ class LocalCache {
      */
     private void createLocalStore() {
         if (cacheFile.exists()) {
+            long start = System.nanoTime();
             try {
                 if (Files.readString(cacheFile.toPath()).isBlank()) {
                     cacheFile.delete();
@@ -82,6 +85,8 @@ class LocalCache {
                 }
             } catch (IOException e) {
                 throw new IllegalArgumentException("Could not read cache file (" + cacheFile.getName() + ")", e);
+            } finally {
+                RunMetrics.record("cache_load", System.nanoTime() - start);
             }
         }
     }
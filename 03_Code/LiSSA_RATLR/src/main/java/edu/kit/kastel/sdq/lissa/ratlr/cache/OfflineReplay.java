@@ -0,0 +1,189 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.cache;
+
+import java.io.IOException;
+import java.nio.file.Path;
+import java.util.Comparator;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
+
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+
+import com.fasterxml.jackson.databind.ObjectMapper;
+
+import edu.kit.kastel.sdq.lissa.ratlr.utils.KeyGenerator;
+
+/**
+ * Process-wide switch of the offline replay mode.
+ * <p>
+ * While the mode is enabled, no remote chat or embedding model is constructed. All responses are served from the
+ * caches, and every request that is not cached is recorded as a miss and fails with an
+ * {@link UncachedRequestException}. With {@link Policy#SKIP}, classifiers treat such a pair as unrelated and
+ * continue, so a single run reports all missing responses. Requests that cannot be skipped, e.g., embeddings or the
+ * requests of optimizers and summaries, fail with both policies.
+ * <p>
+ * The misses are deduplicated by kind, model, and request and can be written as a JSON report.
+ */
+public final class OfflineReplay {
+    /**
+     * The default name of the report of the misses, written to the working directory.
+     */
+    public static final String REPORT_FILE = "offline-misses.json";
+
+    private static final Logger logger = LoggerFactory.getLogger(OfflineReplay.class);
+    private static final int MAX_EXCERPT_LENGTH = 200;
+    private static final Map<String, Miss> MISSES = new ConcurrentHashMap<>();
+
+    private static volatile Policy policy;
+
+    private OfflineReplay() {
+        throw new IllegalAccessError("Utility class");
+    }
+
+    /**
+     * How uncached requests are handled in offline mode.
+     */
+    public enum Policy {
+        /**
+         * Fails the run on the first uncached request.
+         */
+        FAIL,
+        /**
+         * Records the uncached request and continues without its response wherever possible.
+         */
+        SKIP
+    }
+
+    /**
+     * Enables the offline replay mode and forgets the misses of previous runs.
+     *
+     * @param newPolicy How uncached requests are handled
+     */
+    public static synchronized void enable(Policy newPolicy) {
+        MISSES.clear();
+        policy = newPolicy;
+        logger.info("Offline replay enabled, uncached requests {}", newPolicy == Policy.SKIP ? "are skipped" : "fail");
+    }
+
+    /**
+     * Disables the offline replay mode. The recorded misses are kept until the mode is enabled again.
+     */
+    public static synchronized void disable() {
+        policy = null;
+    }
+
+    /**
+     * Checks whether the offline replay mode is enabled.
+     *
+     * @return true if responses must be served from the caches
+     */
+    public static boolean isEnabled() {
+        return policy != null;
+    }
+
+    /**
+     * Records an uncached request and creates the exception that signals it.
+     *
+     * @param kind The kind of the request, e.g., {@code chat} or {@code embedding}
+     * @param model The name of the model the request was meant for
+     * @param request The content of the request
+     * @return The exception to throw
+     */
+    public static UncachedRequestException miss(String kind, String model, String request) {
+        String key = KeyGenerator.generateKey(kind + "\0" + model + "\0" + request);
+        String excerpt =
+                request.length() <= MAX_EXCERPT_LENGTH ? request : request.substring(0, MAX_EXCERPT_LENGTH) + "...";
+        MISSES.merge(
+                key,
+                new Miss(kind, model, key, excerpt, 1),
+                (existing, added) -> existing.withCount(existing.count() + added.count()));
+        return new UncachedRequestException(
+                "Offline replay: %s request for model %s is not cached (%s)".formatted(kind, model, key));
+    }
+
+    /**
+     * Checks whether a failure was caused by an uncached request in offline mode.
+     * Failures of other threads are usually wrapped, so the causes are checked as well.
+     *
+     * @param failure The failure
+     * @return true if the failure or one of its causes is an {@link UncachedRequestException}
+     */
+    public static boolean isMiss(Throwable failure) {
+        for (Throwable cause = failure; cause != null; cause = cause.getCause()) {
+            if (cause instanceof UncachedRequestException) {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    /**
+     * Checks whether a failure was caused by an uncached request that may be skipped.
+     *
+     * @param failure The failure
+     * @return true if the failure is a miss and uncached requests are skipped
+     */
+    public static boolean isSkipped(Throwable failure) {
+        return policy == Policy.SKIP && isMiss(failure);
+    }
+
+    /**
+     * Returns the recorded misses ordered by kind, model, and key.
+     *
+     * @return The recorded misses
+     */
+    public static List<Miss> getMisses() {
+        return MISSES.values().stream()
+                .sorted(Comparator.comparing(Miss::kind)
+                        .thenComparing(Miss::model)
+                        .thenComparing(Miss::key))
+                .toList();
+    }
+
+    /**
+     * Logs a summary of the recorded misses and writes them to the given file.
+     *
+     * @param file The JSON file to write the report to
+     */
+    public static void writeReport(Path file) {
+        List<Miss> misses = getMisses();
+        int requests = misses.stream().mapToInt(Miss::count).sum();
+        if (misses.isEmpty()) {
+            logger.info("Offline replay served all requests from the cache");
+        } else {
+            logger.warn(
+                    "Offline replay missed {} distinct uncached requests ({} in total), see {}",
+                    misses.size(),
+                    requests,
+                    file);
+        }
+        Map<String, Object> report = new LinkedHashMap<>();
+        report.put("policy", policy == null ? null : policy.name());
+        report.put("distinct_misses", misses.size());
+        report.put("total_misses", requests);
+        report.put("misses", misses);
+        try {
+            new ObjectMapper().writerWithDefaultPrettyPrinter().writeValue(file.toFile(), report);
+        } catch (IOException e) {
+            logger.warn("Could not write offline replay report {}", file, e);
+        }
+    }
+
+    /**
+     * An uncached request.
+     *
+     * @param kind The kind of the request
+     * @param model The name of the model
+     * @param key The key identifying kind, model, and request
+     * @param excerpt The beginning of the request
+     * @param count How often the request was issued
+     */
+    public record Miss(String kind, String model, String key, String excerpt, int count) {
+        private Miss withCount(int newCount) {
+            return new Miss(kind, model, key, excerpt, newCount);
+        }
+    }
+}
@@ -0,0 +1,50 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.cache;
+
+import com.fasterxml.jackson.annotation.JsonIgnore;
+import com.fasterxml.jackson.core.JsonProcessingException;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.fasterxml.jackson.databind.SerializationFeature;
+
+import edu.kit.kastel.sdq.lissa.ratlr.utils.KeyGenerator;
+
+/**
+ * Represents a key for cached retrieval results in the LiSSA framework.
+ * A retrieval result only depends on the content of the source and target stores and on the retrieval strategy,
+ * so it is identified by the content hashes of both stores and the identifier of the strategy.
+ * <p>
+ * Please always use the {@link #of(String, String, String)} method to create a new instance.
+ *
+ * @param sourceStore The content hash of the source store
+ * @param targetStore The content hash of the target store
+ * @param strategy The identifier of the retrieval strategy including its parameters
+ * @param localKey A local key for additional identification, not included in JSON serialization.
+ */
+public record RetrievalCacheKey(String sourceStore, String targetStore, String strategy, @JsonIgnore String localKey)
+        implements CacheKey {
+
+    /**
+     * ObjectMapper instance configured for JSON serialization with indentation.
+     */
+    private static final ObjectMapper MAPPER = new ObjectMapper().configure(SerializationFeature.INDENT_OUTPUT, true);
+
+    public static RetrievalCacheKey of(String sourceStore, String targetStore, String strategy) {
+        return new RetrievalCacheKey(
+                sourceStore,
+                targetStore,
+                strategy,
+                KeyGenerator.generateKey(sourceStore + "_" + targetStore + "_" + strategy));
+    }
+
+    /**
+     * @throws IllegalArgumentException If the key cannot be serialized to JSON
+     */
+    @Override
+    public String toJsonKey() {
+        try {
+            return MAPPER.writeValueAsString(this);
+        } catch (JsonProcessingException e) {
+            throw new IllegalArgumentException("Could not serialize key", e);
+        }
+    }
+}
@@ -0,0 +1,155 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.cache;
+
+import java.util.Map;
+import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.CompletionException;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.atomic.AtomicLong;
+import java.util.function.Predicate;
+import java.util.function.Supplier;
+
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+
+import edu.kit.kastel.sdq.lissa.ratlr.utils.Pair;
+
+/**
+ * Coalesces concurrent requests to a language model that share the same {@link ClassifierCacheKey} and cache.
+ * <p>
+ * If a response is not cached yet, the first caller issues the request, while all callers that request the same key
+ * in the meantime wait for the response of the first caller instead of issuing their own request. The response is
+ * written to the cache once by the first caller. This avoids duplicate requests when identical prompts are requested
+ * in parallel, e.g., by classifier copies working on the same pair or by several optimizer branches.
+ * Requests for the same key in different caches are not coalesced, as each cache has to receive its response.
+ * <p>
+ * The counters of cache hits, coalesced requests, and issued requests are shared by the whole process.
+ */
+public final class SingleFlight {
+    private static final Logger logger = LoggerFactory.getLogger(SingleFlight.class);
+
+    private static final Map<Pair<Cache, ClassifierCacheKey>, CompletableFuture<Object>> IN_FLIGHT =
+            new ConcurrentHashMap<>();
+
+    private static final AtomicLong CACHE_HITS = new AtomicLong();
+    private static final AtomicLong COALESCED = new AtomicLong();
+    private static final AtomicLong REQUESTS = new AtomicLong();
+
+    private SingleFlight() {
+        throw new IllegalAccessError("Utility class");
+    }
+
+    /**
+     * Returns the cached value of the key, or computes, caches, and returns it.
+     * Concurrent calls for the same key compute the value only once.
+     *
+     * @param <T> The type of the value
+     * @param cache The cache to look up and store the value
+     * @param key The cache key of the request
+     * @param clazz The class of the value
+     * @param request Issues the request if the value is neither cached nor requested by another caller
+     * @return The cached or computed value
+     * @throws IllegalStateException If the request of another caller for the same key failed
+     */
+    public static <T> T getOrCompute(Cache cache, ClassifierCacheKey key, Class<T> clazz, Supplier<T> request) {
+        return getOrCompute(cache, key, clazz, value -> true, request);
+    }
+
+    /**
+     * Returns the cached value of the key if it is usable, or computes, caches, and returns it.
+     * Concurrent calls for the same key compute the value only once.
+     *
+     * @param <T> The type of the value
+     * @param cache The cache to look up and store the value
+     * @param key The cache key of the request
+     * @param clazz The class of the value
+     * @param usable Decides whether a cached value can be used or has to be computed again
+     * @param request Issues the request if the value is neither cached nor requested by another caller
+     * @return The cached or computed value
+     * @throws IllegalStateException If the request of another caller for the same key failed
+     */
+    public static <T> T getOrCompute(
+            Cache cache, ClassifierCacheKey key, Class<T> clazz, Predicate<? super T> usable, Supplier<T> request) {
+        T cached = cache.get(key, clazz);
+        if (cached != null && usable.test(cached)) {
+            CACHE_HITS.incrementAndGet();
+            return cached;
+        }
+
+        Pair<Cache, ClassifierCacheKey> flightKey = new Pair<>(cache, key);
+        CompletableFuture<Object> flight = new CompletableFuture<>();
+        CompletableFuture<Object> existingFlight = IN_FLIGHT.putIfAbsent(flightKey, flight);
+        if (existingFlight != null) {
+            COALESCED.incrementAndGet();
+            logger.debug("Waiting for identical in-flight request of model {}", key.model());
+            return clazz.cast(await(existingFlight));
+        }
+
+        try {
+            // Another caller may have completed the same request between the cache lookup and the registration
+            T value = cache.get(key, clazz);
+            if (value != null && usable.test(value)) {
+                CACHE_HITS.incrementAndGet();
+            } else {
+                REQUESTS.incrementAndGet();
+                value = request.get();
+                put(cache, key, value);
+            }
+            flight.complete(value);
+            return value;
+        } catch (RuntimeException e) {
+            flight.completeExceptionally(e);
+            throw e;
+        } finally {
+            IN_FLIGHT.remove(flightKey, flight);
+        }
+    }
+
+    /**
+     * Waits for the response of the first caller. A failure of the request is thrown to the first caller as well, so
+     * the waiting callers rethrow it without logging it, and a failed request is reported once instead of per caller.
+     */
+    private static Object await(CompletableFuture<Object> flight) {
+        try {
+            return flight.join();
+        } catch (CompletionException e) {
+            throw new IllegalStateException("The identical in-flight request failed", e.getCause());
+        }
+    }
+
+    private static <T> void put(Cache cache, ClassifierCacheKey key, T value) {
+        // Strings are stored as they are, like responses that are cached directly
+        if (value instanceof String text) {
+            cache.put(key, text);
+        } else {
+            cache.put(key, value);
+        }
+    }
+
+    /**
+     * Returns the number of values that were served from the cache.
+     *
+     * @return The number of cache hits
+     */
+    public static long getCacheHits() {
+        return CACHE_HITS.get();
+    }
+
+    /**
+     * Returns the number of callers that waited for an identical in-flight request instead of issuing their own.
+     *
+     * @return The number of coalesced requests
+     */
+    public static long getCoalesced() {
+        return COALESCED.get();
+    }
+
+    /**
+     * Returns the number of requests that were actually issued.
+     *
+     * @return The number of issued requests
+     */
+    public static long getRequests() {
+        return REQUESTS.get();
+    }
+}
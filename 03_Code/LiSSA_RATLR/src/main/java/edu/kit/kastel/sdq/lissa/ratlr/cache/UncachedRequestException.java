@@ -0,0 +1,16 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.cache;
+
+/**
+ * Signals that a request to a language or embedding model is not cached while {@link OfflineReplay} is enabled.
+ */
+public final class UncachedRequestException extends IllegalStateException {
+    /**
+     * Creates a new exception.
+     *
+     * @param message The description of the uncached request
+     */
+    public UncachedRequestException(String message) {
+        super(message);
+    }
+}
@@ -0,0 +1,93 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.classifier;
+
+import java.util.Locale;
+import java.util.regex.Matcher;
+import java.util.regex.Pattern;
+
+/**
+ * Extracts the yes/no verdict from the response of a language model.
+ * The thinking of reasoning models (e.g., deepseek-r1) enclosed in {@code <think>} tags is removed before extraction.
+ */
+enum AnswerExtractor {
+    /**
+     * The response is related if it contains "yes" anywhere (the original behavior of the simple classifier).
+     */
+    CONTAINS {
+        @Override
+        boolean isRelated(String answer) {
+            return answer.toLowerCase(Locale.ROOT).contains("yes");
+        }
+    },
+
+    /**
+     * The response is related if its first {@code <trace>} tag contains exactly "yes".
+     */
+    TRACE {
+        @Override
+        boolean isRelated(String answer) {
+            Matcher matcher = TRACE_PATTERN.matcher(answer);
+            return matcher.find() && matcher.group(1).equalsIgnoreCase("yes");
+        }
+    },
+
+    /**
+     * The response is related if its final word is "yes".
+     */
+    FINAL_TOKEN {
+        @Override
+        boolean isRelated(String answer) {
+            Matcher matcher = FINAL_WORD_PATTERN.matcher(answer);
+            return matcher.find() && matcher.group(1).equalsIgnoreCase("yes");
+        }
+    };
+
+    private static final String THINK_END = "</think>";
+    private static final Pattern TRACE_PATTERN =
+            Pattern.compile("<trace>\\s*(\\w+)\\s*</trace>", Pattern.CASE_INSENSITIVE);
+    private static final Pattern FINAL_WORD_PATTERN = Pattern.compile("(\\w+)\\W*$");
+
+    /**
+     * Decides whether the answer (without thinking) indicates a trace link.
+     *
+     * @param answer The answer of the language model without thinking
+     * @return true if the answer indicates a trace link
+     */
+    abstract boolean isRelated(String answer);
+
+    /**
+     * Extracts the verdict from the response of a language model.
+     *
+     * @param llmResponse The response of the language model
+     * @return true if the response indicates a trace link
+     */
+    boolean extract(String llmResponse) {
+        return isRelated(stripThinking(llmResponse));
+    }
+
+    /**
+     * Removes the thinking of models like deepseek-r1 from the response.
+     *
+     * @param llmResponse The response of the language model
+     * @return The response without the leading thinking
+     */
+    static String stripThinking(String llmResponse) {
+        if (llmResponse.startsWith("<think>") && llmResponse.contains(THINK_END)) {
+            return llmResponse
+                    .substring(llmResponse.indexOf(THINK_END) + THINK_END.length())
+                    .strip();
+        }
+        return llmResponse;
+    }
+
+    /**
+     * Returns the extractor with the given configuration name (case-insensitive).
+     *
+     * @param name The name of the extractor, e.g., "trace"
+     * @return The extractor
+     * @throws IllegalArgumentException If there is no extractor with the given name
+     */
+    static AnswerExtractor fromName(String name) {
+        return valueOf(name.toUpperCase(Locale.ROOT));
+    }
+}
@@ -0,0 +1,231 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.classifier;
+
+import java.util.ArrayList;
+import java.util.Collection;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.Optional;
+import java.util.concurrent.atomic.AtomicLong;
+
+import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
+import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
+import edu.kit.kastel.sdq.lissa.ratlr.elementstore.SourceElementStore;
+import edu.kit.kastel.sdq.lissa.ratlr.elementstore.TargetElementStore;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
+
+/**
+ * A classifier that cascades from a cheap to a strong language model.
+ * <p>
+ * Each pair is first classified by the cheap model with n-sample self-consistency: the cheap model is asked
+ * {@code samples} times with distinct seeds, and the share of the majority answer is the confidence of the cheap
+ * tier. If the confidence reaches {@code confidence_threshold}, the majority answer of the cheap tier is used and
+ * reported with this confidence. Otherwise, i.e., if the samples disagree, the pair is escalated to the strong model,
+ * whose answer is reported with a confidence of 1.0.
+ * <p>
+ * Both tiers use the requests of the {@link SimpleClassifier} and share its caches, so answers already cached by
+ * simple classifiers of the same models are reused. The first sample of the cheap tier uses the configured seed.
+ * Self-consistency requires a temperature above 0, as the samples are identical otherwise.
+ * <p>
+ * Configuration options:
+ * <ul>
+ *     <li>model: The cheap model (default: the default model of the platform)</li>
+ *     <li>strong_model: The strong model that answers the escalated pairs</li>
+ *     <li>samples: The number of samples of the cheap model (default: 3)</li>
+ *     <li>confidence_threshold: The minimal share of agreeing samples to accept the answer of the cheap model
+ *     (default: 1.0, i.e., the samples have to be unanimous)</li>
+ *     <li>template: The template of the requests, see {@link SimpleClassifier}</li>
+ * </ul>
+ */
+public class CascadeClassifier extends Classifier {
+
+    public static final String CASCADE_CLASSIFIER_NAME = "cascade";
+
+    private static final int DEFAULT_SAMPLES = 3;
+    private static final double DEFAULT_CONFIDENCE_THRESHOLD = 1.0;
+
+    /**
+     * The cheap model, once per sample.
+     */
+    private final List<Classifier> cheapTier;
+
+    /**
+     * The strong model for escalated pairs.
+     */
+    private final Classifier strongTier;
+
+    private final double confidenceThreshold;
+
+    /**
+     * Number of pairs answered by the cheap tier, shared by all copies.
+     */
+    private final AtomicLong cheapAnswers;
+
+    /**
+     * Number of pairs answered by the strong tier, shared by all copies.
+     */
+    private final AtomicLong strongAnswers;
+
+    /**
+     * Creates a new cascade classifier with the specified configuration.
+     *
+     * @param configuration The module configuration containing classifier settings
+     * @param contextStore The shared context store for pipeline components
+     */
+    public CascadeClassifier(ModuleConfiguration configuration, ContextStore contextStore) {
+        super(ChatLanguageModelProvider.threads(configuration), contextStore);
+        ChatLanguageModelProvider provider = new ChatLanguageModelProvider(configuration);
+        String strongModel = configuration.argumentAsString("strong_model");
+        int samples = configuration.argumentAsInt("samples", DEFAULT_SAMPLES);
+        this.confidenceThreshold =
+                configuration.argumentAsDouble("confidence_threshold", DEFAULT_CONFIDENCE_THRESHOLD);
+        String template =
+                configuration.argumentAsString(SimpleClassifier.PROMPT_TEMPLATE_KEY, SimpleClassifier.DEFAULT_TEMPLATE);
+        if (samples < 1) {
+            throw new IllegalArgumentException("The number of samples must be greater than 0.");
+        }
+
+        this.cheapTier = new ArrayList<>(samples);
+        for (int i = 0; i < samples; i++) {
+            cheapTier.add(new SimpleClassifier(
+                    provider.withModel(provider.modelName(), provider.seed() + i), template, contextStore));
+        }
+        this.strongTier =
+                new SimpleClassifier(provider.withModel(strongModel, provider.seed()), template, contextStore);
+        this.cheapAnswers = new AtomicLong();
+        this.strongAnswers = new AtomicLong();
+    }
+
+    /**
+     * Creates a new cascade classifier with the specified tiers.
+     * This constructor is used internally for creating thread-local copies.
+     */
+    private CascadeClassifier(
+            int threads,
+            List<Classifier> cheapTier,
+            Classifier strongTier,
+            double confidenceThreshold,
+            AtomicLong cheapAnswers,
+            AtomicLong strongAnswers,
+            ContextStore contextStore) {
+        super(threads, contextStore);
+        this.cheapTier = cheapTier;
+        this.strongTier = strongTier;
+        this.confidenceThreshold = confidenceThreshold;
+        this.cheapAnswers = cheapAnswers;
+        this.strongAnswers = strongAnswers;
+    }
+
+    @Override
+    public final Classifier copyOf() {
+        List<Classifier> cheapTierCopy = new ArrayList<>(cheapTier.size());
+        for (Classifier sample : cheapTier) {
+            cheapTierCopy.add(sample.copyOf());
+        }
+        return new CascadeClassifier(
+                threads,
+                cheapTierCopy,
+                strongTier.copyOf(),
+                confidenceThreshold,
+                cheapAnswers,
+                strongAnswers,
+                contextStore);
+    }
+
+    @Override
+    public void setClassificationPrompt(String prompt) {
+        for (Classifier sample : cheapTier) {
+            sample.setClassificationPrompt(prompt);
+        }
+        strongTier.setClassificationPrompt(prompt);
+    }
+
+    @Override
+    public Map<String, String> getCacheParameters() {
+        Map<String, String> params = new HashMap<>();
+        params.put("classifier", CASCADE_CLASSIFIER_NAME);
+        for (int i = 0; i < cheapTier.size(); i++) {
+            params.put("cheap_" + i, cheapTier.get(i).getCacheParameters().toString());
+        }
+        params.put("strong", strongTier.getCacheParameters().toString());
+        params.put("confidence_threshold", String.valueOf(confidenceThreshold));
+        return params;
+    }
+
+    @Override
+    public List<ClassificationResult> classify(SourceElementStore sourceStore, TargetElementStore targetStore) {
+        List<ClassificationResult> results = super.classify(sourceStore, targetStore);
+        logger.info(
+                "Cascade answers: {} by the cheap model, {} escalated to the strong model",
+                cheapAnswers.get(),
+                strongAnswers.get());
+        return results;
+    }
+
+    @Override
+    protected final Optional<ClassificationResult> classify(Element source, Element target) {
+        int positive = 0;
+        for (Classifier sample : cheapTier) {
+            if (sample.classify(source, target).isPresent()) {
+                positive++;
+            }
+        }
+        if (isConfident(positive)) {
+            return cheapAnswer(source, target, positive);
+        }
+        strongAnswers.incrementAndGet();
+        logger.debug("Escalating {} and {} to the strong model", source.getIdentifier(), target.getIdentifier());
+        return strongTier.classify(source, target);
+    }
+
+    @Override
+    protected final boolean classifyFromCache(
+            Element source, Element target, Collection<ClassificationResult> results) {
+        int positive = 0;
+        List<ClassificationResult> sampleResult = new ArrayList<>(1);
+        for (Classifier sample : cheapTier) {
+            sampleResult.clear();
+            if (!sample.classifyFromCache(source, target, sampleResult)) {
+                return false;
+            }
+            positive += sampleResult.size();
+        }
+        if (isConfident(positive)) {
+            cheapAnswer(source, target, positive).ifPresent(results::add);
+            return true;
+        }
+        if (strongTier.classifyFromCache(source, target, results)) {
+            strongAnswers.incrementAndGet();
+            return true;
+        }
+        return false;
+    }
+
+    /**
+     * Returns the majority answer of the cheap tier with the agreement of the samples as confidence.
+     *
+     * @param source The source element
+     * @param target The target element
+     * @param positive The number of samples of the cheap tier that classified the pair as related
+     * @return A classification result if the majority of samples classified the pair as related, empty otherwise
+     */
+    private Optional<ClassificationResult> cheapAnswer(Element source, Element target, int positive) {
+        cheapAnswers.incrementAndGet();
+        if (2 * positive > cheapTier.size()) {
+            return Optional.of(ClassificationResult.of(source, target, agreement(positive)));
+        }
+        return Optional.empty();
+    }
+
+    private boolean isConfident(int positive) {
+        return agreement(positive) >= confidenceThreshold;
+    }
+
+    /**
+     * Returns the share of cheap samples that agree with the majority answer.
+     */
+    private double agreement(int positive) {
+        return Math.max(positive, cheapTier.size() - positive) / (double) cheapTier.size();
+    }
+}
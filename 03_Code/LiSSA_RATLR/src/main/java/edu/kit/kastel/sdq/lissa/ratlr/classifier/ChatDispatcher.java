@@ -0,0 +1,334 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.classifier;
+
+import java.time.Duration;
+import java.util.EnumMap;
+import java.util.Map;
+import java.util.concurrent.ThreadLocalRandom;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicLong;
+import java.util.concurrent.locks.Condition;
+import java.util.concurrent.locks.ReentrantLock;
+import java.util.function.Supplier;
+
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+
+import edu.kit.kastel.sdq.lissa.ratlr.utils.Environment;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.TokenBucket;
+
+import dev.langchain4j.exception.RateLimitException;
+import dev.langchain4j.exception.RetriableException;
+
+/**
+ * Dispatches requests to a language model platform while respecting its limits.
+ * There is one shared dispatcher per {@link ChatLanguageModelPlatform}, so all classifiers, preprocessors, and
+ * optimizers that use the same platform are throttled together. The dispatcher provides:
+ * <ul>
+ *     <li>Token buckets for requests per minute and tokens per minute</li>
+ *     <li>Adaptive concurrency (AIMD): the concurrency limit grows additively on success and shrinks
+ *     multiplicatively on throttling (HTTP 429) or when the latency degrades</li>
+ *     <li>Retries with exponential backoff and jitter on throttling and other retriable errors
+ *     (e.g., HTTP 5xx or timeouts)</li>
+ * </ul>
+ *
+ * The limits of a platform are configured via environment variables, where {@code <PLATFORM>} is the name of the
+ * platform (e.g., {@code OPENAI}):
+ * <ul>
+ *     <li>{@code <PLATFORM>_REQUESTS_PER_MINUTE}: Maximum requests per minute (default: unlimited)</li>
+ *     <li>{@code <PLATFORM>_TOKENS_PER_MINUTE}: Maximum (estimated) tokens per minute (default: unlimited)</li>
+ *     <li>{@code <PLATFORM>_MAX_CONCURRENCY}: Maximum concurrent requests (default: threads of the platform)</li>
+ *     <li>{@code <PLATFORM>_MAX_RETRIES}: Maximum retries per request (default: 5)</li>
+ * </ul>
+ */
+public final class ChatDispatcher {
+    private static final Logger logger = LoggerFactory.getLogger(ChatDispatcher.class);
+
+    private static final Map<ChatLanguageModelPlatform, ChatDispatcher> DISPATCHERS =
+            new EnumMap<>(ChatLanguageModelPlatform.class);
+
+    private static final int DEFAULT_MAX_RETRIES = 5;
+    private static final Duration DEFAULT_INITIAL_BACKOFF = Duration.ofSeconds(1);
+    private static final Duration DEFAULT_MAX_BACKOFF = Duration.ofMinutes(1);
+
+    /**
+     * Factor by which the concurrency limit is reduced on throttling.
+     */
+    private static final double THROTTLE_DECREASE = 0.5;
+
+    /**
+     * Factor by which the concurrency limit is reduced when the latency degrades.
+     */
+    private static final double LATENCY_DECREASE = 0.9;
+
+    /**
+     * A request whose latency exceeds the smoothed latency by this factor counts as degraded.
+     */
+    private static final double LATENCY_TOLERANCE = 3.0;
+
+    /**
+     * Smoothing factor of the exponentially weighted moving average of the latency.
+     */
+    private static final double LATENCY_SMOOTHING = 0.1;
+
+    private final String name;
+    private final TokenBucket requestBucket;
+    private final TokenBucket tokenBucket;
+    private final int maxConcurrency;
+    private final int maxRetries;
+    private final Duration initialBackoff;
+    private final Duration maxBackoff;
+
+    private final ReentrantLock lock = new ReentrantLock();
+    private final Condition slotReleased = lock.newCondition();
+    private double concurrencyLimit;
+    private int inFlight;
+    private double smoothedLatencyNanos;
+
+    private final AtomicLong requests = new AtomicLong();
+    private final AtomicLong throttled = new AtomicLong();
+    private final AtomicLong retries = new AtomicLong();
+
+    /**
+     * Creates a new dispatcher.
+     *
+     * @param name The name used in log messages
+     * @param requestsPerMinute Maximum requests per minute, or a non-positive value for no limit
+     * @param tokensPerMinute Maximum tokens per minute, or a non-positive value for no limit
+     * @param maxConcurrency Maximum number of concurrent requests
+     * @param maxRetries Maximum number of retries per request
+     * @param initialBackoff Backoff before the first retry
+     * @param maxBackoff Upper bound of the backoff
+     */
+    ChatDispatcher(
+            String name,
+            long requestsPerMinute,
+            long tokensPerMinute,
+            int maxConcurrency,
+            int maxRetries,
+            Duration initialBackoff,
+            Duration maxBackoff) {
+        if (maxConcurrency < 1) {
+            throw new IllegalArgumentException("The maximum concurrency must be greater than 0.");
+        }
+        this.name = name;
+        this.requestBucket = requestsPerMinute > 0 ? new TokenBucket(requestsPerMinute) : null;
+        this.tokenBucket = tokensPerMinute > 0 ? new TokenBucket(tokensPerMinute) : null;
+        this.maxConcurrency = maxConcurrency;
+        this.maxRetries = maxRetries;
+        this.initialBackoff = initialBackoff;
+        this.maxBackoff = maxBackoff;
+        this.concurrencyLimit = maxConcurrency;
+    }
+
+    /**
+     * Returns the shared dispatcher of the given platform.
+     * The dispatcher is created on first use from the environment configuration of the platform.
+     *
+     * @param platform The language model platform
+     * @return The shared dispatcher of the platform
+     */
+    public static synchronized ChatDispatcher forPlatform(ChatLanguageModelPlatform platform) {
+        return DISPATCHERS.computeIfAbsent(platform, ChatDispatcher::fromEnvironment);
+    }
+
+    /**
+     * Returns the dispatchers that were created so far.
+     *
+     * @return The dispatchers by platform
+     */
+    public static synchronized Map<ChatLanguageModelPlatform, ChatDispatcher> getDispatchers() {
+        return Map.copyOf(DISPATCHERS);
+    }
+
+    private static ChatDispatcher fromEnvironment(ChatLanguageModelPlatform platform) {
+        String prefix = platform.name() + "_";
+        return new ChatDispatcher(
+                platform.name(),
+                longFromEnvironment(prefix + "REQUESTS_PER_MINUTE", 0),
+                longFromEnvironment(prefix + "TOKENS_PER_MINUTE", 0),
+                (int) longFromEnvironment(prefix + "MAX_CONCURRENCY", platform.getThreads()),
+                (int) longFromEnvironment(prefix + "MAX_RETRIES", DEFAULT_MAX_RETRIES),
+                DEFAULT_INITIAL_BACKOFF,
+                DEFAULT_MAX_BACKOFF);
+    }
+
+    private static long longFromEnvironment(String key, long defaultValue) {
+        String value = Environment.getenv(key);
+        if (value == null || value.isBlank()) {
+            return defaultValue;
+        }
+        try {
+            return Long.parseLong(value.trim());
+        } catch (NumberFormatException e) {
+            throw new IllegalArgumentException("Environment variable " + key + " is not a number: " + value, e);
+        }
+    }
+
+    /**
+     * Executes a request to the language model within the limits of this dispatcher.
+     * The request is retried on throttling and other retriable errors until the maximum number of retries is
+     * reached, after which the last error is rethrown.
+     *
+     * @param <T> The type of the response
+     * @param request The request to execute
+     * @param estimatedTokens The estimated number of tokens of the request, used for the token limit
+     * @return The response of the request
+     * @throws IllegalStateException If the thread is interrupted while waiting
+     */
+    public <T> T execute(Supplier<T> request, long estimatedTokens) {
+        requests.incrementAndGet();
+        for (int attempt = 0; ; attempt++) {
+            try {
+                return executeOnce(request, estimatedTokens);
+            } catch (RateLimitException e) {
+                throttled.incrementAndGet();
+                decreaseLimit(THROTTLE_DECREASE);
+                if (attempt >= maxRetries) {
+                    throw e;
+                }
+                logger.warn("{}: request was throttled, retrying (attempt {})", name, attempt + 1);
+            } catch (RetriableException e) {
+                if (attempt >= maxRetries) {
+                    throw e;
+                }
+                logger.warn("{}: request failed ({}), retrying (attempt {})", name, e.getMessage(), attempt + 1);
+            }
+            retries.incrementAndGet();
+            sleep(backoff(attempt));
+        }
+    }
+
+    private <T> T executeOnce(Supplier<T> request, long estimatedTokens) {
+        acquireSlot();
+        try {
+            if (requestBucket != null) {
+                requestBucket.acquire(1);
+            }
+            if (tokenBucket != null) {
+                tokenBucket.acquire(estimatedTokens);
+            }
+            long start = System.nanoTime();
+            T response = request.get();
+            onSuccess(System.nanoTime() - start);
+            return response;
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw new IllegalStateException("Interrupted while waiting for the rate limit", e);
+        } finally {
+            releaseSlot();
+        }
+    }
+
+    private void acquireSlot() {
+        lock.lock();
+        try {
+            while (inFlight >= Math.max(1, (int) concurrencyLimit)) {
+                slotReleased.await();
+            }
+            inFlight++;
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw new IllegalStateException("Interrupted while waiting for a free request slot", e);
+        } finally {
+            lock.unlock();
+        }
+    }
+
+    private void releaseSlot() {
+        lock.lock();
+        try {
+            inFlight--;
+            slotReleased.signalAll();
+        } finally {
+            lock.unlock();
+        }
+    }
+
+    private void onSuccess(long latencyNanos) {
+        lock.lock();
+        try {
+            boolean degraded = smoothedLatencyNanos > 0 && latencyNanos > LATENCY_TOLERANCE * smoothedLatencyNanos;
+            smoothedLatencyNanos = smoothedLatencyNanos == 0
+                    ? latencyNanos
+                    : (1 - LATENCY_SMOOTHING) * smoothedLatencyNanos + LATENCY_SMOOTHING * latencyNanos;
+            if (degraded) {
+                concurrencyLimit = Math.max(1, concurrencyLimit * LATENCY_DECREASE);
+            } else {
+                concurrencyLimit = Math.min(maxConcurrency, concurrencyLimit + 1 / concurrencyLimit);
+            }
+            slotReleased.signalAll();
+        } finally {
+            lock.unlock();
+        }
+    }
+
+    private void decreaseLimit(double factor) {
+        lock.lock();
+        try {
+            concurrencyLimit = Math.max(1, concurrencyLimit * factor);
+            logger.debug("{}: reduced concurrency limit to {}", name, concurrencyLimit);
+        } finally {
+            lock.unlock();
+        }
+    }
+
+    /**
+     * Exponential backoff with jitter in the upper half of the current backoff window.
+     */
+    private long backoff(int attempt) {
+        long exponential = initialBackoff.toMillis() << Math.min(attempt, 20);
+        long bound = Math.max(1, Math.min(maxBackoff.toMillis(), exponential));
+        return ThreadLocalRandom.current().nextLong(bound / 2, bound + 1);
+    }
+
+    private static void sleep(long millis) {
+        try {
+            TimeUnit.MILLISECONDS.sleep(millis);
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw new IllegalStateException("Interrupted during backoff", e);
+        }
+    }
+
+    /**
+     * Returns the current concurrency limit.
+     *
+     * @return The number of requests that may currently be in flight
+     */
+    public int getConcurrencyLimit() {
+        lock.lock();
+        try {
+            return Math.max(1, (int) concurrencyLimit);
+        } finally {
+            lock.unlock();
+        }
+    }
+
+    /**
+     * Returns the number of requests dispatched so far (without retries).
+     *
+     * @return The number of requests
+     */
+    public long getRequests() {
+        return requests.get();
+    }
+
+    /**
+     * Returns the number of throttled (HTTP 429) attempts so far.
+     *
+     * @return The number of throttled attempts
+     */
+    public long getThrottled() {
+        return throttled.get();
+    }
+
+    /**
+     * Returns the number of retries so far.
+     *
+     * @return The number of retries
+     */
+    public long getRetries() {
+        return retries.get();
+    }
+}
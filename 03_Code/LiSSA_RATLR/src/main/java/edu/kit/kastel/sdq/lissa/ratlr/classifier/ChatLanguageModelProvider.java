@@ -5,9 +5,12 @@ import java.nio.charset.StandardCharsets;
 import java.time.Duration;
 import java.util.Base64;
 import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
 
+import edu.kit.kastel.sdq.lissa.ratlr.cache.OfflineReplay;
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.utils.Environment;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.HttpClients;
 
 import dev.langchain4j.model.chat.ChatModel;
 import dev.langchain4j.model.ollama.OllamaChatModel;
@@ -24,6 +27,7 @@ import dev.langchain4j.model.openai.OpenAiChatModel;
  *     <ul>
  *       <li>{@code OPENAI_ORGANIZATION_ID}: Your OpenAI organization ID</li>
  *       <li>{@code OPENAI_API_KEY}: Your OpenAI API key</li>
+ *       <li>{@code OPENAI_BASE_URL}: Alternative base URL, e.g., of a local mock server (optional)</li>
  *     </ul>
  *   </li>
  *   <li>Ollama:
@@ -39,6 +43,8 @@ import dev.langchain4j.model.openai.OpenAiChatModel;
  *     </ul>
  *   </li>
  * </ul>
+ * The rate limits of each platform are configured as described in {@link ChatDispatcher}, its HTTP clients as
+ * described in {@link HttpClients}.
  *
  * @see ChatLanguageModelPlatform
  */
@@ -58,6 +64,11 @@ public class ChatLanguageModelProvider {
      */
     public static final int OLLAMA_MINUTES_TO_TIMEOUT = 15;
 
+    /**
+     * The shared chat model instances by configuration.
+     */
+    private static final Map<ChatModelKey, ChatModel> CHAT_MODELS = new ConcurrentHashMap<>();
+
     /**
      * The platform to use for the language model.
      */
@@ -89,19 +100,65 @@ public class ChatLanguageModelProvider {
         this.initPlatformParameters(configuration);
     }
 
+    private ChatLanguageModelProvider(
+            ChatLanguageModelPlatform platform, String modelName, int seed, double temperature) {
+        this.platform = platform;
+        this.modelName = modelName;
+        this.seed = seed;
+        this.temperature = temperature;
+    }
+
+    /**
+     * Creates a provider for another model and seed on the same platform and with the same temperature.
+     *
+     * @param modelName The name of the model to use
+     * @param seed The seed value for model randomization
+     * @return A new provider for the given model and seed
+     */
+    ChatLanguageModelProvider withModel(String modelName, int seed) {
+        return new ChatLanguageModelProvider(platform, modelName, seed, temperature);
+    }
+
+    /**
+     * Gets the platform of the model.
+     *
+     * @return The platform
+     */
+    public ChatLanguageModelPlatform platform() {
+        return platform;
+    }
+
     /**
-     * Creates a chat model instance based on the configured platform.
+     * Returns a chat model instance for the configured platform, model, seed, and temperature.
+     * Chat models are thread-safe, so there is only one instance per configuration, which is shared by all
+     * classifiers, classifier copies, preprocessors, and optimizers. Thus, all of them share the keep-alive connection
+     * pool of its HTTP client (see {@link HttpClients}) instead of opening their own connections.
+     * All requests of the model are sent through the shared {@link ChatDispatcher} of the platform,
+     * which enforces its rate limits and retries throttled or failed requests.
+     * <p>
+     * In {@link OfflineReplay offline replay mode}, no client of the platform is created. Instead, the returned model
+     * reports every request as uncached.
      *
-     * @return A chat model instance for the configured platform
+     * @return The shared chat model instance for the configuration
      * @throws IllegalArgumentException If the platform is not supported
      */
     public ChatModel createChatModel() {
-        return switch (platform) {
-            case OPENAI -> createOpenAiChatModel(modelName, seed, temperature);
-            case OLLAMA -> createOllamaChatModel(modelName, seed, temperature);
-            case BLABLADOR -> createBlabladorChatModel(modelName, seed, temperature);
-            case DEEPSEEK -> createDeepSeekChatModel(modelName, seed, temperature);
-        };
+        if (OfflineReplay.isEnabled()) {
+            return new OfflineChatModel(modelName);
+        }
+        return CHAT_MODELS.computeIfAbsent(
+                new ChatModelKey(platform, modelName, seed, temperature), ChatLanguageModelProvider::buildChatModel);
+    }
+
+    private static ChatModel buildChatModel(ChatModelKey key) {
+        ChatModel chatModel =
+                switch (key.platform()) {
+                    case OPENAI -> createOpenAiChatModel(key.modelName(), key.seed(), key.temperature());
+                    case OLLAMA -> createOllamaChatModel(key.modelName(), key.seed(), key.temperature());
+                    case BLABLADOR -> createBlabladorChatModel(key.modelName(), key.seed(), key.temperature());
+                    case DEEPSEEK -> createDeepSeekChatModel(key.modelName(), key.seed(), key.temperature());
+                };
+        return new DispatchingChatModel(chatModel, ChatDispatcher.forPlatform(key.platform()));
     }
 
     /**
@@ -173,9 +230,11 @@ public class ChatLanguageModelProvider {
         var ollama = OllamaChatModel.builder()
                 .baseUrl(host)
                 .modelName(model)
+                .httpClientBuilder(HttpClients.builder(ChatLanguageModelPlatform.OLLAMA.name()))
                 .timeout(Duration.ofMinutes(OLLAMA_MINUTES_TO_TIMEOUT))
                 .temperature(temperature)
-                .seed(seed);
+                .seed(seed)
+                .maxRetries(0);
         if (user != null && password != null && !user.isEmpty() && !password.isEmpty()) {
             ollama.customHeaders(Map.of(
                     "Authorization",
@@ -203,11 +262,14 @@ public class ChatLanguageModelProvider {
             throw new IllegalStateException("OPENAI_ORGANIZATION_ID or OPENAI_API_KEY environment variable not set");
         }
         return new OpenAiChatModel.OpenAiChatModelBuilder()
+                .httpClientBuilder(HttpClients.builder(ChatLanguageModelPlatform.OPENAI.name()))
+                .baseUrl(Environment.getenv("OPENAI_BASE_URL"))
                 .modelName(model)
                 .organizationId(openAiOrganizationId)
                 .apiKey(openAiApiKey)
                 .temperature(temperature)
                 .seed(seed)
+                .maxRetries(0)
                 .build();
     }
 
@@ -227,11 +289,13 @@ public class ChatLanguageModelProvider {
             throw new IllegalStateException("BLABLADOR_API_KEY environment variable not set");
         }
         return new OpenAiChatModel.OpenAiChatModelBuilder()
+                .httpClientBuilder(HttpClients.builder(ChatLanguageModelPlatform.BLABLADOR.name()))
                 .baseUrl("https://api.helmholtz-blablador.fz-juelich.de/v1")
                 .modelName(model)
                 .apiKey(blabladorApiKey)
                 .temperature(temperature)
                 .seed(seed)
+                .maxRetries(0)
                 .build();
     }
 
@@ -251,11 +315,13 @@ public class ChatLanguageModelProvider {
             throw new IllegalStateException("DEEPSEEK_API_KEY environment variable not set");
         }
         return new OpenAiChatModel.OpenAiChatModelBuilder()
+                .httpClientBuilder(HttpClients.builder(ChatLanguageModelPlatform.DEEPSEEK.name()))
                 .baseUrl("https://api.deepseek.com/v1")
                 .modelName(model)
                 .apiKey(deepseekApiKey)
                 .temperature(temperature)
                 .seed(seed)
+                .maxRetries(0)
                 .build();
     }
 
@@ -280,4 +346,9 @@ public class ChatLanguageModelProvider {
                     String.valueOf(temperature()));
         }
     }
+
+    /**
+     * Identifies a chat model configuration.
+     */
+    private record ChatModelKey(ChatLanguageModelPlatform platform, String modelName, int seed, double temperature) {}
 }
@@ -1,6 +1,7 @@
 /* Licensed under MIT 2025. */
 package edu.kit.kastel.sdq.lissa.ratlr.classifier;
 
+import static edu.kit.kastel.sdq.lissa.ratlr.classifier.CascadeClassifier.CASCADE_CLASSIFIER_NAME;
 import static edu.kit.kastel.sdq.lissa.ratlr.classifier.ReasoningClassifier.REASONING_CLASSIFIER_NAME;
 import static edu.kit.kastel.sdq.lissa.ratlr.classifier.SimpleClassifier.SIMPLE_CLASSIFIER_NAME;
 
@@ -11,11 +12,13 @@ import java.util.Map;
 import java.util.Objects;
 import java.util.Optional;
 import java.util.concurrent.*;
+import java.util.concurrent.atomic.AtomicReference;
 
 import org.jetbrains.annotations.NotNull;
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
 
+import edu.kit.kastel.sdq.lissa.ratlr.cache.OfflineReplay;
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
 import edu.kit.kastel.sdq.lissa.ratlr.elementstore.SourceElementStore;
@@ -82,17 +85,28 @@ public abstract class Classifier {
 
     /**
      * Performs parallel classification of trace links using virtual threads.
+     * Tasks whose responses are already cached are resolved up front, so only the remaining tasks are
+     * distributed to the workers and no worker (or language model) is created if every response is cached.
      * Each thread processes tasks from a shared queue and adds results to a concurrent collection.
+     * If the classification of a task fails, e.g., as the retries of a request are exhausted or a response is missing
+     * in {@link OfflineReplay offline replay mode} and cannot be skipped, the workers stop and the first failure is
+     * rethrown once all workers finished. Thus, no task is silently dropped from the results.
      *
      * @param tasks The list of element pairs to classify
      * @return A list of classification results
      */
     protected final List<ClassificationResult> parallelClassify(List<Pair<Element, Element>> tasks) {
         ConcurrentLinkedQueue<ClassificationResult> results = new ConcurrentLinkedQueue<>();
-        ConcurrentLinkedQueue<Pair<Element, Element>> taskQueue = new ConcurrentLinkedQueue<>(tasks);
+        List<Pair<Element, Element>> misses = resolveFromCache(tasks, results);
+        if (misses.isEmpty()) {
+            return new ArrayList<>(results);
+        }
+        ConcurrentLinkedQueue<Pair<Element, Element>> taskQueue = new ConcurrentLinkedQueue<>(misses);
+        AtomicReference<RuntimeException> failure = new AtomicReference<>();
 
-        Thread[] workers = new Thread[threads];
-        for (int i = 0; i < threads; i++) {
+        int workerCount = Math.min(threads, misses.size());
+        Thread[] workers = new Thread[workerCount];
+        for (int i = 0; i < workerCount; i++) {
             workers[i] = Thread.ofVirtual().start(new Runnable() {
                 private final Classifier copy = copyOf();
 
@@ -103,7 +117,14 @@ public abstract class Classifier {
                         if (pair == null) {
                             return;
                         }
-                        var result = copy.classify(pair.first(), pair.second());
+                        Optional<ClassificationResult> result;
+                        try {
+                            result = copy.classifyOrSkip(pair.first(), pair.second());
+                        } catch (RuntimeException e) {
+                            failure.compareAndSet(null, e);
+                            taskQueue.clear();
+                            return;
+                        }
                         logger.debug(
                                 "Classified (P) {} with {}: {}",
                                 pair.first().getIdentifier(),
@@ -125,6 +146,9 @@ public abstract class Classifier {
                 Thread.currentThread().interrupt();
             }
         }
+        if (failure.get() != null) {
+            throw failure.get();
+        }
 
         List<ClassificationResult> resultList = new ArrayList<>(results);
         logger.debug("Finished parallel classification with {} results.", resultList.size());
@@ -140,8 +164,13 @@ public abstract class Classifier {
      */
     private List<ClassificationResult> sequentialClassify(List<Pair<Element, Element>> tasks) {
         List<ClassificationResult> results = new ArrayList<>();
+        int cachedTasks = 0;
         for (var task : tasks) {
-            var result = classify(task.first(), task.second());
+            if (classifyFromCache(task.first(), task.second(), results)) {
+                cachedTasks++;
+                continue;
+            }
+            var result = classifyOrSkip(task.first(), task.second());
             logger.debug(
                     "Classified {} with {}: {}",
                     task.first().getIdentifier(),
@@ -149,10 +178,52 @@ public abstract class Classifier {
                     result);
             result.ifPresent(results::add);
         }
+        logCacheResolution(tasks.size(), cachedTasks);
         logger.debug("Finished sequential classification with {} results.", results.size());
         return results;
     }
 
+    /**
+     * Resolves all tasks whose responses are already cached and adds their results.
+     *
+     * @param tasks The list of element pairs to classify
+     * @param results The collection to add the results of cached tasks to
+     * @return The tasks that could not be resolved from the cache, in their original order
+     */
+    private List<Pair<Element, Element>> resolveFromCache(
+            List<Pair<Element, Element>> tasks, Collection<ClassificationResult> results) {
+        List<Pair<Element, Element>> misses = new ArrayList<>();
+        for (var task : tasks) {
+            if (!classifyFromCache(task.first(), task.second(), results)) {
+                misses.add(task);
+            }
+        }
+        logCacheResolution(tasks.size(), tasks.size() - misses.size());
+        return misses;
+    }
+
+    private void logCacheResolution(int tasks, int cachedTasks) {
+        logger.info(
+                "Classification tasks: {} total, {} resolved from cache, {} sent to the language model",
+                tasks,
+                cachedTasks,
+                tasks - cachedTasks);
+    }
+
+    /**
+     * Classifies a pair of elements using cached responses only, without querying a language model.
+     * Classifiers that cache their responses override this method so that cached tasks can be resolved
+     * before any language model or worker is created. The default implementation resolves nothing.
+     *
+     * @param source The source element
+     * @param target The target element
+     * @param results The collection to add the result to if the pair is cached and related
+     * @return true if the pair was resolved from the cache, false if the language model has to be queried
+     */
+    protected boolean classifyFromCache(Element source, Element target, Collection<ClassificationResult> results) {
+        return false;
+    }
+
     /**
      * Classifies a single classification task.
      * This method delegates to the abstract {@link #classify(Element, Element)} method
@@ -162,7 +233,26 @@ public abstract class Classifier {
      * @return     A classification result if a trace link is found, empty otherwise
      */
     public Optional<ClassificationResult> classify(ClassificationTask task) {
-        return classify(task.source(), task.target());
+        return classifyOrSkip(task.source(), task.target());
+    }
+
+    /**
+     * Classifies a pair of elements, treating the pair as unrelated if its response is missing and
+     * {@link OfflineReplay offline replay mode} skips uncached requests.
+     *
+     * @param source The source element
+     * @param target The target element
+     * @return A classification result if a trace link is found, empty otherwise
+     */
+    protected final Optional<ClassificationResult> classifyOrSkip(Element source, Element target) {
+        try {
+            return classify(source, target);
+        } catch (RuntimeException e) {
+            if (OfflineReplay.isSkipped(e)) {
+                return Optional.empty();
+            }
+            throw e;
+        }
     }
 
     /**
@@ -214,15 +304,7 @@ public abstract class Classifier {
      */
     protected static List<Pair<Element, Element>> createClassificationTasks(
             SourceElementStore sourceStore, TargetElementStore targetStore) {
-        List<Pair<Element, Element>> tasks = new ArrayList<>();
-
-        for (var source : sourceStore.getAllElements(true)) {
-            var targetCandidates = targetStore.findSimilar(source);
-            for (Element target : targetCandidates) {
-                tasks.add(new Pair<>(source.first(), target));
-            }
-        }
-        return tasks;
+        return targetStore.getCandidateMatrix(sourceStore).getPairs();
     }
 
     private static List<Pair<Element, Element>> createClassificationTasks(
@@ -248,6 +330,7 @@ public abstract class Classifier {
             case "mock" -> new MockClassifier(contextStore);
             case SIMPLE_CLASSIFIER_NAME -> new SimpleClassifier(configuration, contextStore);
             case REASONING_CLASSIFIER_NAME -> new ReasoningClassifier(configuration, contextStore);
+            case CASCADE_CLASSIFIER_NAME -> new CascadeClassifier(configuration, contextStore);
             default -> throw new IllegalStateException("Unexpected value: " + configuration.name());
         };
     }
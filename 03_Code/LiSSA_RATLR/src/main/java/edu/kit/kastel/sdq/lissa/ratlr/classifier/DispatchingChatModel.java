@@ -0,0 +1,56 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.classifier;
+
+import java.util.Objects;
+
+import dev.langchain4j.data.message.AiMessage;
+import dev.langchain4j.data.message.ChatMessage;
+import dev.langchain4j.data.message.SystemMessage;
+import dev.langchain4j.data.message.UserMessage;
+import dev.langchain4j.model.chat.ChatModel;
+import dev.langchain4j.model.chat.request.ChatRequest;
+import dev.langchain4j.model.chat.response.ChatResponse;
+
+/**
+ * A chat model that sends all requests of a wrapped model through a {@link ChatDispatcher}.
+ * As all convenience methods of {@link ChatModel} delegate to {@link #chat(ChatRequest)}, every request
+ * of the wrapped model is rate limited and retried by the dispatcher.
+ */
+class DispatchingChatModel implements ChatModel {
+    /**
+     * Rough number of characters per token, used to estimate the tokens of a request.
+     */
+    private static final int CHARACTERS_PER_TOKEN = 4;
+
+    private final ChatModel delegate;
+    private final ChatDispatcher dispatcher;
+
+    DispatchingChatModel(ChatModel delegate, ChatDispatcher dispatcher) {
+        this.delegate = Objects.requireNonNull(delegate);
+        this.dispatcher = Objects.requireNonNull(dispatcher);
+    }
+
+    @Override
+    public ChatResponse chat(ChatRequest chatRequest) {
+        return dispatcher.execute(() -> delegate.chat(chatRequest), estimateTokens(chatRequest));
+    }
+
+    /**
+     * Estimates the tokens of a request from the length of its messages and the maximum output tokens.
+     */
+    private static long estimateTokens(ChatRequest chatRequest) {
+        long characters = 0;
+        for (ChatMessage message : chatRequest.messages()) {
+            characters += switch (message) {
+                case UserMessage userMessage when userMessage.hasSingleText() ->
+                    userMessage.singleText().length();
+                case SystemMessage systemMessage -> systemMessage.text().length();
+                case AiMessage aiMessage when aiMessage.text() != null ->
+                    aiMessage.text().length();
+                default -> message.toString().length();
+            };
+        }
+        Integer maxOutputTokens = chatRequest.parameters().maxOutputTokens();
+        return characters / CHARACTERS_PER_TOKEN + 1 + (maxOutputTokens == null ? 0 : maxOutputTokens);
+    }
+}
@@ -0,0 +1,44 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.classifier;
+
+import java.util.Objects;
+import java.util.stream.Collectors;
+
+import edu.kit.kastel.sdq.lissa.ratlr.cache.OfflineReplay;
+
+import dev.langchain4j.data.message.AiMessage;
+import dev.langchain4j.data.message.ChatMessage;
+import dev.langchain4j.data.message.SystemMessage;
+import dev.langchain4j.data.message.UserMessage;
+import dev.langchain4j.model.chat.ChatModel;
+import dev.langchain4j.model.chat.request.ChatRequest;
+import dev.langchain4j.model.chat.response.ChatResponse;
+
+/**
+ * Stands in for the chat model of a platform in {@link OfflineReplay offline replay mode}.
+ * Callers only query the model if the response is not cached, so every request is reported as a miss.
+ */
+final class OfflineChatModel implements ChatModel {
+    private final String modelName;
+
+    OfflineChatModel(String modelName) {
+        this.modelName = Objects.requireNonNull(modelName);
+    }
+
+    @Override
+    public ChatResponse chat(ChatRequest chatRequest) {
+        String request = chatRequest.messages().stream()
+                .map(OfflineChatModel::textOf)
+                .collect(Collectors.joining("\n"));
+        throw OfflineReplay.miss("chat", modelName, request);
+    }
+
+    private static String textOf(ChatMessage message) {
+        return switch (message) {
+            case UserMessage userMessage when userMessage.hasSingleText() -> userMessage.singleText();
+            case SystemMessage systemMessage -> systemMessage.text();
+            case AiMessage aiMessage when aiMessage.text() != null -> aiMessage.text();
+            default -> message.toString();
+        };
+    }
+}
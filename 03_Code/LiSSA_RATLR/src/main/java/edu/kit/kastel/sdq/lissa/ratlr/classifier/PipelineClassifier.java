@@ -2,7 +2,8 @@
 package edu.kit.kastel.sdq.lissa.ratlr.classifier;
 
 import java.util.*;
-import java.util.concurrent.atomic.AtomicInteger;
+import java.util.concurrent.ConcurrentLinkedQueue;
+import java.util.concurrent.atomic.AtomicReference;
 
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
@@ -22,21 +23,40 @@ import edu.kit.kastel.sdq.lissa.ratlr.utils.Pair;
  * </p>
  */
 public class PipelineClassifier extends Classifier {
+    /**
+     * Configuration key for the relative cost of a classifier within its stage.
+     */
+    public static final String COST_CONFIGURATION_KEY = "cost";
+
+    private static final double DEFAULT_COST = 1.0;
+
     /**
      * The list of classifier stages, where each stage is a list of classifiers.
      */
     private final List<List<Classifier>> classifiers;
 
+    /**
+     * The configured costs of the classifiers, in the same structure as {@link #classifiers}.
+     */
+    private final List<List<Double>> costs;
+
     /**
      * Creates a new pipeline classifier from a list of configuration lists.
      * Each inner list represents a stage in the pipeline, and each configuration
      * in a stage is used to create a classifier. All classifiers receive the shared {@link ContextStore}.
+     * The optional argument {@value #COST_CONFIGURATION_KEY} of a configuration sets the relative cost of its
+     * classifier (default: 1), which determines the order in which the classifiers of a stage vote.
      *
      * @param configs A list of configuration lists, where each inner list represents a stage
      * @param contextStore The shared context store for pipeline components
      */
     public PipelineClassifier(List<List<ModuleConfiguration>> configs, ContextStore contextStore) {
         super(1, contextStore);
+        this.costs = configs.stream()
+                .map(it -> it.stream()
+                        .map(config -> config.argumentAsDouble(COST_CONFIGURATION_KEY, DEFAULT_COST))
+                        .toList())
+                .toList();
         this.classifiers = configs.stream()
                 .map(it -> it.stream()
                         .map(config -> Classifier.createClassifier(config, contextStore))
@@ -49,11 +69,15 @@ public class PipelineClassifier extends Classifier {
      * This constructor is used internally for creating thread-local copies.
      *
      * @param classifiers The list of classifier stages
+     * @param costs The costs of the classifiers, in the same structure as the classifiers
      * @param threads The number of threads to use for parallel processing
+     * @param contextStore The shared context store for pipeline components
      */
-    private PipelineClassifier(List<List<Classifier>> classifiers, int threads, ContextStore contextStore) {
+    PipelineClassifier(
+            List<List<Classifier>> classifiers, List<List<Double>> costs, int threads, ContextStore contextStore) {
         super(threads, contextStore);
         this.classifiers = classifiers.stream().map(List::copyOf).toList();
+        this.costs = costs.stream().map(List::copyOf).toList();
     }
 
     /**
@@ -72,11 +96,12 @@ public class PipelineClassifier extends Classifier {
         List<Pair<Element, Element>> tasks = createClassificationTasks(sourceStore, targetStore);
 
         int layerNum = 0;
-        for (List<Classifier> layer : classifiers) {
+        for (int i = 0; i < classifiers.size(); i++) {
+            List<Classifier> layer = classifiers.get(i);
             logger.info("Invoking layer {} with {} classifiers and {} tasks", layerNum, layer.size(), tasks.size());
             layerNum++;
 
-            List<Pair<Element, Element>> layerResults = calculateRemainingCandidates(tasks, layer);
+            List<Pair<Element, Element>> layerResults = calculateRemainingCandidates(tasks, layer, costs.get(i));
             logger.info("Reduced targets @ layer {} from {} to {}", layerNum, tasks.size(), layerResults.size());
 
             tasks = layerResults;
@@ -98,51 +123,152 @@ public class PipelineClassifier extends Classifier {
      * Calculates the remaining candidates after processing through a stage of classifiers.
      * Each classifier in the stage votes on whether elements are related, and elements
      * must receive a majority vote to proceed to the next stage.
+     * <p>
+     * Cached votes are collected first, as they are free. Afterward, the classifiers vote in the order of their
+     * configured cost (and, for equal costs, their number of uncached tasks): the cheapest classifiers that are
+     * needed to decide a task at all vote concurrently, and every further classifier only votes on the tasks that are
+     * still undecided after the classifiers before it, i.e., that have no majority of positive votes yet but can
+     * still reach one.
      *
      * @param tasks The list of element pairs to classify
      * @param classifiers The list of classifiers in the current stage
+     * @param costs The costs of the classifiers
      * @return A list of element pairs that received a majority vote
      */
     private List<Pair<Element, Element>> calculateRemainingCandidates(
-            List<Pair<Element, Element>> tasks, List<Classifier> classifiers) {
-        Map<Pair<Element, Element>, AtomicInteger> counter = new LinkedHashMap<>();
+            List<Pair<Element, Element>> tasks, List<Classifier> classifiers, List<Double> costs) {
+        int majorityThreshold = (int) Math.ceil(classifiers.size() / 2.0);
+        List<TaskVotes> votes = new ArrayList<>(tasks.size());
         for (var task : tasks) {
-            counter.put(task, new AtomicInteger(0));
-        }
-
-        for (Classifier classifier : classifiers) {
-            if (tasks.isEmpty()) break;
-            List<ClassificationResult> classificationResults;
-            if (classifier.threads <= 1) {
-                classificationResults = tasks.stream()
-                        .map(e -> classifier.classify(e.first(), e.second()))
-                        .filter(Optional::isPresent)
-                        .map(Optional::get)
-                        .toList();
-            } else {
-                classificationResults = classifier.parallelClassify(tasks).stream()
-                        .filter(Objects::nonNull)
-                        .toList();
-            }
-            for (var result : classificationResults) {
-                counter.get(new Pair<>(result.source(), result.target())).incrementAndGet();
-            }
+            votes.add(new TaskVotes(task, classifiers.size(), majorityThreshold));
+        }
+
+        List<Voter> voters = new ArrayList<>();
+        for (int i = 0; i < classifiers.size(); i++) {
+            voters.add(new Voter(classifiers.get(i), costs.get(i), collectCachedVotes(classifiers.get(i), votes)));
+        }
+        voters.sort(Comparator.comparingDouble(Voter::cost)
+                .thenComparingInt(voter -> voter.pending().size()));
+
+        // A task cannot be decided with fewer votes, so these voters always vote together
+        int minimumVotes = Math.min(majorityThreshold, classifiers.size() - majorityThreshold + 1);
+        AtomicReference<RuntimeException> failure = new AtomicReference<>();
+        runVoters(voters.subList(0, Math.min(minimumVotes, voters.size())), failure);
+        for (Voter voter : voters.subList(Math.min(minimumVotes, voters.size()), voters.size())) {
+            runVoters(List.of(voter), failure);
         }
 
         List<Pair<Element, Element>> remainingTargetsAfterMajorityVote = new ArrayList<>();
-        int majorityThreshold = (int) Math.ceil(classifiers.size() / 2.0);
-        for (var entry : counter.entrySet()) {
-            if (entry.getValue().get() >= majorityThreshold) {
-                remainingTargetsAfterMajorityVote.add(entry.getKey());
+        int skippedVotes = 0;
+        for (TaskVotes taskVotes : votes) {
+            if (taskVotes.isAccepted()) {
+                remainingTargetsAfterMajorityVote.add(taskVotes.task);
             }
+            skippedVotes += taskVotes.missingVotes();
         }
+        logger.info(
+                "Skipped {} of {} votes as their tasks were already decided",
+                skippedVotes,
+                tasks.size() * classifiers.size());
 
         return remainingTargetsAfterMajorityVote;
     }
 
+    /**
+     * Lets the given voters vote concurrently on their undecided tasks and waits until they are done.
+     *
+     * @param voters The voters
+     * @param failure The first failure of a worker, shared by all workers of the stage
+     * @throws RuntimeException The first failure of a worker, if any
+     */
+    private void runVoters(List<Voter> voters, AtomicReference<RuntimeException> failure) {
+        List<Thread> workers = new ArrayList<>();
+        for (Voter voter : voters) {
+            Classifier classifier = voter.classifier();
+            Queue<TaskVotes> queue = new ConcurrentLinkedQueue<>(voter.pending());
+            int workerCount = Math.min(Math.max(1, classifier.threads), queue.size());
+            for (int i = 0; i < workerCount; i++) {
+                Classifier worker = classifier.threads <= 1 ? classifier : classifier.copyOf();
+                workers.add(Thread.ofVirtual().start(() -> vote(worker, queue, failure)));
+            }
+        }
+        for (Thread worker : workers) {
+            try {
+                worker.join();
+            } catch (InterruptedException e) {
+                logger.error("Worker thread interrupted.", e);
+                Thread.currentThread().interrupt();
+            }
+        }
+        if (failure.get() != null) {
+            throw failure.get();
+        }
+    }
+
+    /**
+     * Records the cached votes of a classifier for all undecided tasks.
+     *
+     * @param classifier The voting classifier
+     * @param votes The votes of all tasks
+     * @return The undecided tasks for which the classifier has no cached vote
+     */
+    private static List<TaskVotes> collectCachedVotes(Classifier classifier, List<TaskVotes> votes) {
+        List<TaskVotes> pending = new ArrayList<>();
+        List<ClassificationResult> cachedResult = new ArrayList<>(1);
+        for (TaskVotes taskVotes : votes) {
+            if (taskVotes.isDecided()) {
+                continue;
+            }
+            cachedResult.clear();
+            var task = taskVotes.task;
+            if (classifier.classifyFromCache(task.first(), task.second(), cachedResult)) {
+                taskVotes.record(!cachedResult.isEmpty());
+            } else {
+                pending.add(taskVotes);
+            }
+        }
+        return pending;
+    }
+
+    /**
+     * Lets a classifier vote on all tasks of the queue that are still undecided.
+     *
+     * If the classifier fails, e.g., as a response is missing in offline replay mode and cannot be skipped, the
+     * failure is recorded and all workers stop voting, so no majority is computed from incomplete votes.
+     *
+     * @param classifier The voting classifier, exclusively used by the calling thread
+     * @param queue The tasks of the classifier, shared by all workers of the classifier
+     * @param failure The first failure of a worker, shared by all workers of the stage
+     */
+    private void vote(Classifier classifier, Queue<TaskVotes> queue, AtomicReference<RuntimeException> failure) {
+        TaskVotes taskVotes;
+        while (failure.get() == null && (taskVotes = queue.poll()) != null) {
+            if (taskVotes.isDecided()) {
+                continue;
+            }
+            var task = taskVotes.task;
+            Optional<ClassificationResult> result;
+            try {
+                result = classifier.classifyOrSkip(task.first(), task.second());
+            } catch (RuntimeException e) {
+                failure.compareAndSet(null, e);
+                return;
+            }
+            logger.debug(
+                    "Voted on {} with {}: {}",
+                    task.first().getIdentifier(),
+                    task.second().getIdentifier(),
+                    result);
+            taskVotes.record(result.isPresent());
+        }
+    }
+
     @Override
     public Classifier copyOf() {
-        return new PipelineClassifier(classifiers, this.threads, this.contextStore);
+        List<List<Classifier>> classifierCopies = classifiers.stream()
+                .map(layer -> layer.stream().map(Classifier::copyOf).toList())
+                .toList();
+        return new PipelineClassifier(classifierCopies, costs, this.threads, this.contextStore);
     }
 
     @Override
@@ -167,6 +293,55 @@ public class PipelineClassifier extends Classifier {
         return result;
     }
 
+    /**
+     * A classifier of a stage with its cost and the tasks it has no cached vote for.
+     *
+     * @param classifier The voting classifier
+     * @param cost The configured cost of the classifier
+     * @param pending The tasks for which the classifier has no cached vote
+     */
+    private record Voter(Classifier classifier, double cost, List<TaskVotes> pending) {}
+
+    /**
+     * The votes of the classifiers of a stage on a single task.
+     */
+    private static final class TaskVotes {
+        private final Pair<Element, Element> task;
+        private final int voters;
+        private final int majorityThreshold;
+        private int positive;
+        private int negative;
+
+        private TaskVotes(Pair<Element, Element> task, int voters, int majorityThreshold) {
+            this.task = task;
+            this.voters = voters;
+            this.majorityThreshold = majorityThreshold;
+        }
+
+        private synchronized void record(boolean related) {
+            if (related) {
+                positive++;
+            } else {
+                negative++;
+            }
+        }
+
+        /**
+         * A task is decided once it has a majority or the remaining voters cannot produce a majority anymore.
+         */
+        private synchronized boolean isDecided() {
+            return positive >= majorityThreshold || voters - negative < majorityThreshold;
+        }
+
+        private synchronized boolean isAccepted() {
+            return positive >= majorityThreshold;
+        }
+
+        private synchronized int missingVotes() {
+            return voters - positive - negative;
+        }
+    }
+
     /**
      * This method is not supported by the pipeline classifier.
      * The pipeline classifier processes elements through multiple stages and cannot
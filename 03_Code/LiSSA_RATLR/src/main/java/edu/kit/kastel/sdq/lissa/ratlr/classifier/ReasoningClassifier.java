@@ -2,6 +2,7 @@
 package edu.kit.kastel.sdq.lissa.ratlr.classifier;
 
 import java.util.ArrayList;
+import java.util.Collection;
 import java.util.HashMap;
 import java.util.List;
 import java.util.Map;
@@ -12,6 +13,7 @@ import java.util.regex.Pattern;
 import edu.kit.kastel.sdq.lissa.ratlr.cache.Cache;
 import edu.kit.kastel.sdq.lissa.ratlr.cache.CacheManager;
 import edu.kit.kastel.sdq.lissa.ratlr.cache.ClassifierCacheKey;
+import edu.kit.kastel.sdq.lissa.ratlr.cache.SingleFlight;
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
@@ -40,8 +42,9 @@ public class ReasoningClassifier extends Classifier {
 
     /**
      * The language model instance used for classification.
+     * Created lazily, as no model is needed if all responses are cached.
      */
-    private final ChatModel llm;
+    private ChatModel llm;
 
     /**
      * The prompt template used for classification requests.
@@ -71,7 +74,6 @@ public class ReasoningClassifier extends Classifier {
         this.prompt = configuration.argumentAsStringByEnumIndex("prompt", 0, Prompt.values(), it -> it.promptTemplate);
         this.useOriginalArtifacts = configuration.argumentAsBoolean("use_original_artifacts", false);
         this.useSystemMessage = configuration.argumentAsBoolean("use_system_message", true);
-        this.llm = this.provider.createChatModel();
     }
 
     /**
@@ -99,7 +101,6 @@ public class ReasoningClassifier extends Classifier {
         this.prompt = prompt;
         this.useOriginalArtifacts = useOriginalArtifacts;
         this.useSystemMessage = useSystemMessage;
-        this.llm = this.provider.createChatModel();
     }
 
     @Override
@@ -131,12 +132,7 @@ public class ReasoningClassifier extends Classifier {
      */
     @Override
     protected final Optional<ClassificationResult> classify(Element source, Element target) {
-        var targetToConsider = target;
-        if (useOriginalArtifacts) {
-            while (targetToConsider.getParent() != null) {
-                targetToConsider = targetToConsider.getParent();
-            }
-        }
+        var targetToConsider = targetToConsider(target);
 
         var sourceToConsider = source;
         /* TODO Maybe reactivate the sourceToConsider in the future ..
@@ -155,6 +151,30 @@ public class ReasoningClassifier extends Classifier {
         return Optional.empty();
     }
 
+    @Override
+    protected final boolean classifyFromCache(
+            Element source, Element target, Collection<ClassificationResult> results) {
+        var targetToConsider = targetToConsider(target);
+        String cachedResponse = cache.get(createCacheKey(createMessages(source, targetToConsider)), String.class);
+        if (cachedResponse == null) {
+            return false;
+        }
+        if (isRelated(cachedResponse)) {
+            results.add(ClassificationResult.of(source, targetToConsider));
+        }
+        return true;
+    }
+
+    private Element targetToConsider(Element target) {
+        var targetToConsider = target;
+        if (useOriginalArtifacts) {
+            while (targetToConsider.getParent() != null) {
+                targetToConsider = targetToConsider.getParent();
+            }
+        }
+        return targetToConsider;
+    }
+
     /**
      * Determines if the language model's response indicates a trace link.
      * The response is expected to contain a trace tag with "yes" or "no".
@@ -183,6 +203,19 @@ public class ReasoningClassifier extends Classifier {
      * @return The language model's response
      */
     private String classifyIntern(Element source, Element target) {
+        List<ChatMessage> messages = createMessages(source, target);
+        return SingleFlight.getOrCompute(cache, createCacheKey(messages), String.class, () -> {
+            logger.info(
+                    "Classifying ({}): {} and {}",
+                    provider.modelName(),
+                    source.getIdentifier(),
+                    target.getIdentifier());
+            ChatResponse response = llm().chat(messages);
+            return response.aiMessage().text();
+        });
+    }
+
+    private List<ChatMessage> createMessages(Element source, Element target) {
         List<ChatMessage> messages = new ArrayList<>();
         if (useSystemMessage)
             messages.add(new SystemMessage(
@@ -193,29 +226,29 @@ public class ReasoningClassifier extends Classifier {
                 .replace("{target_type}", target.getType())
                 .replace("{target_content}", target.getContent());
         messages.add(new UserMessage(request));
+        return messages;
+    }
 
+    private ClassifierCacheKey createCacheKey(List<ChatMessage> messages) {
         // TODO Don't rely on messages.toString() as it is not stable
-        ClassifierCacheKey cacheKey = ClassifierCacheKey.of(
+        return ClassifierCacheKey.of(
                 provider.modelName(),
                 provider.seed(),
                 provider.temperature(),
                 ClassifierCacheKey.Mode.CHAT,
                 messages.toString());
+    }
 
-        String cachedResponse = cache.get(cacheKey, String.class);
-        if (cachedResponse != null) {
-            return cachedResponse;
-        } else {
-            logger.info(
-                    "Classifying ({}): {} and {}",
-                    provider.modelName(),
-                    source.getIdentifier(),
-                    target.getIdentifier());
-            ChatResponse response = llm.chat(messages);
-            String responseText = response.aiMessage().text();
-            cache.put(cacheKey, responseText);
-            return responseText;
+    /**
+     * Returns the language model, creating it on first use.
+     *
+     * @return The language model instance
+     */
+    private synchronized ChatModel llm() {
+        if (llm == null) {
+            llm = provider.createChatModel();
         }
+        return llm;
     }
 
     /**
@@ -1,24 +1,41 @@
 /* Licensed under MIT 2025. */
 package edu.kit.kastel.sdq.lissa.ratlr.classifier;
 
+import java.util.Collection;
 import java.util.HashMap;
 import java.util.Map;
 import java.util.Optional;
 
+import com.fasterxml.jackson.annotation.JsonInclude;
+
 import edu.kit.kastel.sdq.lissa.ratlr.cache.Cache;
 import edu.kit.kastel.sdq.lissa.ratlr.cache.CacheManager;
 import edu.kit.kastel.sdq.lissa.ratlr.cache.ClassifierCacheKey;
+import edu.kit.kastel.sdq.lissa.ratlr.cache.SingleFlight;
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
 
+import dev.langchain4j.data.message.UserMessage;
 import dev.langchain4j.model.chat.ChatModel;
+import dev.langchain4j.model.chat.request.ChatRequest;
 
 /**
  * A simple classifier that uses a language model to determine trace links between elements.
  * This classifier uses a straightforward yes/no approach, asking the language model
  * directly whether elements are related. It includes caching to improve performance
  * and supports custom templates for the classification request.
+ * <p>
+ * The classifier offers an opt-in short-answer mode that is enabled if {@code max_output_tokens} is positive or an
+ * {@code answer_extractor} other than {@code contains} is configured:
+ * <ul>
+ *     <li>max_output_tokens: Maximum number of tokens of the response (default: 0, i.e., unlimited)</li>
+ *     <li>answer_extractor: How the verdict is extracted from the response: {@code contains} ("yes" anywhere),
+ *     {@code trace} ({@code <trace>yes</trace>}), or {@code final_token} (final word is "yes") (default: contains)</li>
+ *     <li>rationale_length: Number of characters of the response stored as rationale (default: 0)</li>
+ * </ul>
+ * In short-answer mode, the token limit and the extractor are part of the cache key, and only the verdict plus the
+ * truncated rationale are cached instead of the full response.
  */
 public class SimpleClassifier extends Classifier {
 
@@ -31,7 +48,7 @@ public class SimpleClassifier extends Classifier {
      * The default template for classification requests.
      * This template presents two artifacts and asks if they are related.
      */
-    private static final String DEFAULT_TEMPLATE =
+    static final String DEFAULT_TEMPLATE =
             """
             Question: Here are two parts of software development artifacts.
 
@@ -45,6 +62,10 @@ public class SimpleClassifier extends Classifier {
 
     public static final String SIMPLE_CLASSIFIER_NAME = "simple";
 
+    private static final String MAX_OUTPUT_TOKENS_KEY = "max_output_tokens";
+    private static final String ANSWER_EXTRACTOR_KEY = "answer_extractor";
+    private static final String RATIONALE_LENGTH_KEY = "rationale_length";
+
     private final Cache cache;
 
     /**
@@ -54,14 +75,30 @@ public class SimpleClassifier extends Classifier {
 
     /**
      * The language model instance used for classification.
+     * Created lazily, as no model is needed if all responses are cached.
      */
-    private final ChatModel llm;
+    private ChatModel llm;
 
     /**
      * The template used for classification requests.
      */
     private String template;
 
+    /**
+     * Maximum number of tokens of a response, or 0 for no limit.
+     */
+    private final int maxOutputTokens;
+
+    /**
+     * Extracts the verdict from a response.
+     */
+    private final AnswerExtractor answerExtractor;
+
+    /**
+     * Number of characters of a response cached as rationale in short-answer mode.
+     */
+    private final int rationaleLength;
+
     /**
      * Creates a new simple classifier with the specified configuration.
      *
@@ -72,8 +109,30 @@ public class SimpleClassifier extends Classifier {
         super(ChatLanguageModelProvider.threads(configuration), contextStore);
         this.provider = new ChatLanguageModelProvider(configuration);
         this.template = configuration.argumentAsString(PROMPT_TEMPLATE_KEY, DEFAULT_TEMPLATE);
+        this.maxOutputTokens = configuration.argumentAsInt(MAX_OUTPUT_TOKENS_KEY, 0);
+        this.answerExtractor = AnswerExtractor.fromName(
+                configuration.argumentAsString(ANSWER_EXTRACTOR_KEY, AnswerExtractor.CONTAINS.name()));
+        this.rationaleLength = configuration.argumentAsInt(RATIONALE_LENGTH_KEY, 0);
+        this.cache = CacheManager.getDefaultInstance().getCache(this, provider.getCacheParameters());
+    }
+
+    /**
+     * Creates a new simple classifier for the given language model.
+     * This constructor is used for the tiers of a {@link CascadeClassifier}, which share their caches with simple
+     * classifiers of the same model.
+     *
+     * @param provider The language model provider
+     * @param template The template to use for classification requests
+     * @param contextStore The shared context store for pipeline components
+     */
+    SimpleClassifier(ChatLanguageModelProvider provider, String template, ContextStore contextStore) {
+        super(provider.platform().getThreads(), contextStore);
+        this.provider = provider;
+        this.template = template;
+        this.maxOutputTokens = 0;
+        this.answerExtractor = AnswerExtractor.CONTAINS;
+        this.rationaleLength = 0;
         this.cache = CacheManager.getDefaultInstance().getCache(this, provider.getCacheParameters());
-        this.llm = provider.createChatModel();
     }
 
     /**
@@ -84,14 +143,26 @@ public class SimpleClassifier extends Classifier {
      * @param cache The cache to use for storing classification results
      * @param provider The language model provider
      * @param template The template to use for classification requests
+     * @param maxOutputTokens The maximum number of tokens of a response, or 0 for no limit
+     * @param answerExtractor The extractor of the verdict
+     * @param rationaleLength The number of characters cached as rationale in short-answer mode
      */
     private SimpleClassifier(
-            int threads, Cache cache, ChatLanguageModelProvider provider, String template, ContextStore contextStore) {
+            int threads,
+            Cache cache,
+            ChatLanguageModelProvider provider,
+            String template,
+            int maxOutputTokens,
+            AnswerExtractor answerExtractor,
+            int rationaleLength,
+            ContextStore contextStore) {
         super(threads, contextStore);
         this.cache = cache;
         this.provider = provider;
         this.template = template;
-        this.llm = provider.createChatModel();
+        this.maxOutputTokens = maxOutputTokens;
+        this.answerExtractor = answerExtractor;
+        this.rationaleLength = rationaleLength;
     }
 
     /**
@@ -102,7 +173,8 @@ public class SimpleClassifier extends Classifier {
      */
     @Override
     public final Classifier copyOf() {
-        return new SimpleClassifier(threads, cache, provider, template, contextStore);
+        return new SimpleClassifier(
+                threads, cache, provider, template, maxOutputTokens, answerExtractor, rationaleLength, contextStore);
     }
 
     @Override
@@ -115,6 +187,10 @@ public class SimpleClassifier extends Classifier {
         Map<String, String> providerParams = provider.getCacheParameters();
         Map<String, String> params = new HashMap<>(providerParams);
         params.put("classifier", SIMPLE_CLASSIFIER_NAME);
+        if (isShortAnswerMode()) {
+            params.put(MAX_OUTPUT_TOKENS_KEY, String.valueOf(maxOutputTokens));
+            params.put(ANSWER_EXTRACTOR_KEY, answerExtractor.name());
+        }
         return params;
     }
 
@@ -128,24 +204,111 @@ public class SimpleClassifier extends Classifier {
      */
     @Override
     protected final Optional<ClassificationResult> classify(Element source, Element target) {
-        String llmResponse = classifyIntern(source, target);
-
-        String thinkEnd = "</think>";
-        if (llmResponse.startsWith("<think>") && llmResponse.contains(thinkEnd)) {
-            // Omit the thinking of models like deepseek-r1
-            llmResponse = llmResponse
-                    .substring(llmResponse.indexOf(thinkEnd) + thinkEnd.length())
-                    .strip();
+        if (isShortAnswerMode()) {
+            return toClassificationResult(source, target, classifyShort(source, target).related());
         }
+        return toClassificationResult(source, target, answerExtractor.extract(classifyIntern(source, target)));
+    }
 
-        boolean isRelated = llmResponse.toLowerCase().contains("yes");
-        if (isRelated) {
-            return Optional.of(ClassificationResult.of(source, target));
+    @Override
+    protected final boolean classifyFromCache(
+            Element source, Element target, Collection<ClassificationResult> results) {
+        String request = createRequest(source, target);
+        boolean related;
+        if (isShortAnswerMode()) {
+            ShortAnswer cachedAnswer = cache.get(createShortAnswerCacheKey(request), ShortAnswer.class);
+            if (cachedAnswer == null) {
+                return false;
+            }
+            related = cachedAnswer.related();
+        } else {
+            String cachedResponse = cache.get(createCacheKey(request), String.class);
+            if (cachedResponse == null) {
+                return false;
+            }
+            related = answerExtractor.extract(cachedResponse);
         }
+        toClassificationResult(source, target, related).ifPresent(results::add);
+        return true;
+    }
 
+    private static Optional<ClassificationResult> toClassificationResult(
+            Element source, Element target, boolean related) {
+        if (related) {
+            return Optional.of(ClassificationResult.of(source, target));
+        }
         return Optional.empty();
     }
 
+    private boolean isShortAnswerMode() {
+        return maxOutputTokens > 0 || answerExtractor != AnswerExtractor.CONTAINS;
+    }
+
+    private String createRequest(Element source, Element target) {
+        return template.replace("{source_type}", source.getType())
+                .replace("{source_content}", source.getContent())
+                .replace("{target_type}", target.getType())
+                .replace("{target_content}", target.getContent());
+    }
+
+    private ClassifierCacheKey createCacheKey(String request) {
+        return ClassifierCacheKey.of(
+                provider.modelName(), provider.seed(), provider.temperature(), ClassifierCacheKey.Mode.CHAT, request);
+    }
+
+    /**
+     * Creates the cache key of a request in short-answer mode, which includes the token limit and the extractor.
+     */
+    private ClassifierCacheKey createShortAnswerCacheKey(String request) {
+        return createCacheKey("%s: %d, %s: %s%n%s"
+                .formatted(
+                        MAX_OUTPUT_TOKENS_KEY,
+                        maxOutputTokens,
+                        ANSWER_EXTRACTOR_KEY,
+                        answerExtractor.name(),
+                        request));
+    }
+
+    /**
+     * Returns the language model, creating it on first use.
+     *
+     * @return The language model instance
+     */
+    private synchronized ChatModel llm() {
+        if (llm == null) {
+            llm = provider.createChatModel();
+        }
+        return llm;
+    }
+
+    /**
+     * Performs the classification in short-answer mode.
+     * Only the verdict and the truncated rationale are cached.
+     *
+     * @param source The source element
+     * @param target The target element
+     * @return The verdict of the language model
+     */
+    private ShortAnswer classifyShort(Element source, Element target) {
+        String request = createRequest(source, target);
+        return SingleFlight.getOrCompute(cache, createShortAnswerCacheKey(request), ShortAnswer.class, () -> {
+            logger.info(
+                    "Classifying ({}, short answer): {} and {}",
+                    provider.modelName(),
+                    source.getIdentifier(),
+                    target.getIdentifier());
+            var chatRequest = ChatRequest.builder().messages(UserMessage.from(request));
+            if (maxOutputTokens > 0) {
+                chatRequest.maxOutputTokens(maxOutputTokens);
+            }
+            String response = llm().chat(chatRequest.build()).aiMessage().text();
+            String rationale = rationaleLength > 0
+                    ? response.substring(0, Math.min(response.length(), rationaleLength))
+                    : null;
+            return new ShortAnswer(answerExtractor.extract(response), rationale);
+        });
+    }
+
     /**
      * Performs the actual classification using the language model.
      * The result is cached to avoid redundant LLM calls.
@@ -155,25 +318,23 @@ public class SimpleClassifier extends Classifier {
      * @return The language model's response
      */
     private String classifyIntern(Element source, Element target) {
-        String request = template.replace("{source_type}", source.getType())
-                .replace("{source_content}", source.getContent())
-                .replace("{target_type}", target.getType())
-                .replace("{target_content}", target.getContent());
-
-        ClassifierCacheKey cacheKey = ClassifierCacheKey.of(
-                provider.modelName(), provider.seed(), provider.temperature(), ClassifierCacheKey.Mode.CHAT, request);
-        String cachedResponse = cache.get(cacheKey, String.class);
-        if (cachedResponse != null) {
-            return cachedResponse;
-        } else {
+        String request = createRequest(source, target);
+        return SingleFlight.getOrCompute(cache, createCacheKey(request), String.class, () -> {
             logger.info(
                     "Classifying ({}): {} and {}",
                     provider.modelName(),
                     source.getIdentifier(),
                     target.getIdentifier());
-            String response = llm.chat(request);
-            cache.put(cacheKey, response);
-            return response;
-        }
+            return llm().chat(request);
+        });
     }
+
+    /**
+     * The compact cache entry of the short-answer mode.
+     *
+     * @param related Whether the language model classified the pair as related
+     * @param rationale The beginning of the response, or null if no rationale is stored
+     */
+    @JsonInclude(JsonInclude.Include.NON_NULL)
+    record ShortAnswer(boolean related, String rationale) {}
 }
@@ -0,0 +1,250 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.elementstore;
+
+import java.nio.file.Path;
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+
+import edu.kit.kastel.sdq.lissa.ratlr.cache.Cache;
+import edu.kit.kastel.sdq.lissa.ratlr.cache.CacheManager;
+import edu.kit.kastel.sdq.lissa.ratlr.cache.RetrievalCacheKey;
+import edu.kit.kastel.sdq.lissa.ratlr.elementstore.strategy.RetrievalStrategy;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.Pair;
+
+/**
+ * The retrieval candidates of all source elements of a source store within a target store.
+ * <p>
+ * The candidates only depend on the embeddings of both stores and the retrieval strategy, never on a prompt.
+ * Therefore, they are computed once in a single batched pass and memoized per pair of stores. The memoization is
+ * keyed by the content hashes of both stores and the identifier of the retrieval strategy, so equal stores that were
+ * loaded independently (e.g., by several evaluation configurations) share the same matrix. Only the matrices of the
+ * most recently used pairs of stores are kept in memory. If a cache directory is configured, the matrix is
+ * additionally persisted there and reused by later runs.
+ */
+public final class CandidateMatrix {
+    private static final Logger logger = LoggerFactory.getLogger(CandidateMatrix.class);
+
+    private static final Path CACHE_FILE = Path.of("CandidateMatrix_retrieval.json");
+
+    /**
+     * The maximum number of matrices memoized in memory. A long-running session (see the {@code serve} command)
+     * sees arbitrarily many pairs of stores, so only the most recently used matrices are kept; older ones are loaded
+     * from the cache directory again.
+     */
+    private static final int MAX_MEMOIZED_MATRICES = 32;
+
+    /**
+     * In-memory memoization of the most recently used matrices of this process, keyed by the local key of their cache
+     * key. Matrices are memoized by element identifiers, as equal stores may be loaded several times with distinct
+     * element instances.
+     */
+    private static final Map<String, StoredCandidates> MATRICES =
+            Collections.synchronizedMap(new LinkedHashMap<>(16, 0.75f, true) {
+                @Override
+                protected boolean removeEldestEntry(Map.Entry<String, StoredCandidates> eldest) {
+                    return size() > MAX_MEMOIZED_MATRICES;
+                }
+            });
+
+    /**
+     * The source elements (marked for comparison) with their candidates, in the order of the source store.
+     */
+    private final List<Pair<Pair<Element, float[]>, List<Pair<Element, Float>>>> candidates;
+
+    /**
+     * Maps source element identifiers to their candidates.
+     */
+    private final Map<String, List<Pair<Element, Float>>> sourceIdToCandidates;
+
+    private CandidateMatrix(List<Pair<Pair<Element, float[]>, List<Pair<Element, Float>>>> candidates) {
+        this.candidates = Collections.unmodifiableList(candidates);
+        this.sourceIdToCandidates = new LinkedHashMap<>();
+        for (var entry : candidates) {
+            sourceIdToCandidates.put(entry.first().first().getIdentifier(), entry.second());
+        }
+    }
+
+    /**
+     * Returns the candidate matrix for the given stores.
+     * The matrix is taken from memory or the cache if available and computed otherwise.
+     *
+     * @param sourceStore The store containing the source elements
+     * @param targetStore The store containing the target elements
+     * @return The candidate matrix for all source elements marked for comparison
+     */
+    public static CandidateMatrix of(SourceElementStore sourceStore, TargetElementStore targetStore) {
+        return of(sourceStore, targetStore, targetStore.getRetrievalStrategy());
+    }
+
+    /**
+     * Returns the candidate matrix for the given stores using the given retrieval strategy instead of the strategy
+     * of the target store.
+     *
+     * @param sourceStore The store containing the source elements
+     * @param targetStore The store containing the target elements
+     * @param retrievalStrategy The strategy used to retrieve the candidates
+     * @return The candidate matrix for all source elements marked for comparison
+     */
+    public static CandidateMatrix of(
+            SourceElementStore sourceStore, TargetElementStore targetStore, RetrievalStrategy retrievalStrategy) {
+        RetrievalCacheKey key = RetrievalCacheKey.of(
+                sourceStore.getContentHash(), targetStore.getContentHash(), retrievalStrategy.getIdentifier());
+        List<Pair<Element, float[]>> sources = sourceStore.getAllElements(true);
+
+        StoredCandidates memoized = MATRICES.get(key.localKey());
+        CandidateMatrix matrix = memoized == null ? null : fromStored(memoized, sources, targetStore);
+        if (matrix == null) {
+            matrix = loadOrCompute(key, sources, targetStore, retrievalStrategy);
+            MATRICES.put(key.localKey(), matrix.toStored());
+        }
+        return matrix;
+    }
+
+    /**
+     * Forgets the matrices memoized in this process, so they are loaded from the cache directory or computed again.
+     */
+    static void forgetMemoized() {
+        MATRICES.clear();
+    }
+
+    private static CandidateMatrix loadOrCompute(
+            RetrievalCacheKey key,
+            List<Pair<Element, float[]>> sources,
+            TargetElementStore targetStore,
+            RetrievalStrategy retrievalStrategy) {
+        Cache cache =
+                CacheManager.hasDefaultInstance() ? CacheManager.getDefaultInstance().getCache(CACHE_FILE, true) : null;
+
+        if (cache != null) {
+            StoredCandidates stored = cache.get(key, StoredCandidates.class);
+            if (stored != null) {
+                CandidateMatrix matrix = fromStored(stored, sources, targetStore);
+                if (matrix != null) {
+                    logger.info("Reusing cached retrieval candidates for {} source elements", sources.size());
+                    return matrix;
+                }
+                logger.warn("Cached retrieval candidates do not match the stores, recomputing them");
+            }
+        }
+
+        logger.info("Computing retrieval candidates for {} source elements", sources.size());
+        List<List<Pair<Element, Float>>> similar =
+                retrievalStrategy.findSimilarElements(sources, targetStore.getAllElementsIntern(true));
+        List<Pair<Pair<Element, float[]>, List<Pair<Element, Float>>>> candidates = new ArrayList<>(sources.size());
+        for (int i = 0; i < sources.size(); i++) {
+            candidates.add(new Pair<>(sources.get(i), List.copyOf(similar.get(i))));
+        }
+        CandidateMatrix matrix = new CandidateMatrix(candidates);
+        if (cache != null) {
+            cache.put(key, matrix.toStored());
+            cache.flush();
+        }
+        return matrix;
+    }
+
+    private static CandidateMatrix fromStored(
+            StoredCandidates stored, List<Pair<Element, float[]>> sources, TargetElementStore targetStore) {
+        if (stored.sourceIds().size() != sources.size()) {
+            return null;
+        }
+        List<Pair<Pair<Element, float[]>, List<Pair<Element, Float>>>> candidates = new ArrayList<>(sources.size());
+        for (int i = 0; i < sources.size(); i++) {
+            var source = sources.get(i);
+            if (!source.first().getIdentifier().equals(stored.sourceIds().get(i))) {
+                return null;
+            }
+            List<String> targetIds = stored.targetIds().get(i);
+            List<Float> similarities = stored.similarities().get(i);
+            List<Pair<Element, Float>> candidatesOfSource = new ArrayList<>(targetIds.size());
+            for (int j = 0; j < targetIds.size(); j++) {
+                var target = targetStore.getById(targetIds.get(j));
+                if (target == null) {
+                    return null;
+                }
+                candidatesOfSource.add(new Pair<>(target.first(), similarities.get(j)));
+            }
+            candidates.add(new Pair<>(source, List.copyOf(candidatesOfSource)));
+        }
+        return new CandidateMatrix(candidates);
+    }
+
+    private StoredCandidates toStored() {
+        List<String> sourceIds = new ArrayList<>(candidates.size());
+        List<List<String>> targetIds = new ArrayList<>(candidates.size());
+        List<List<Float>> similarities = new ArrayList<>(candidates.size());
+        for (var entry : candidates) {
+            sourceIds.add(entry.first().first().getIdentifier());
+            targetIds.add(entry.second().stream()
+                    .map(it -> it.first().getIdentifier())
+                    .toList());
+            similarities.add(entry.second().stream().map(Pair::second).toList());
+        }
+        return new StoredCandidates(sourceIds, targetIds, similarities);
+    }
+
+    /**
+     * Returns the source elements (marked for comparison) with their candidates, in the order of the source store.
+     *
+     * @return Read-only list of source elements and their candidates with similarity scores
+     */
+    public List<Pair<Pair<Element, float[]>, List<Pair<Element, Float>>>> getCandidates() {
+        return candidates;
+    }
+
+    /**
+     * Returns the candidates of a source element, sorted by descending similarity.
+     *
+     * @param sourceId The identifier of the source element
+     * @return Read-only list of candidate target elements, empty if the source element is unknown
+     */
+    public List<Element> getCandidates(String sourceId) {
+        return sourceIdToCandidates.getOrDefault(sourceId, List.of()).stream()
+                .map(Pair::first)
+                .toList();
+    }
+
+    /**
+     * Returns the number of candidates of all source elements.
+     *
+     * @return The number of source-target pairs in this matrix
+     */
+    public int size() {
+        int size = 0;
+        for (var entry : candidates) {
+            size += entry.second().size();
+        }
+        return size;
+    }
+
+    /**
+     * Returns all pairs of source elements and their candidate target elements.
+     *
+     * @return List of source-target pairs in the order of the source store and descending similarity
+     */
+    public List<Pair<Element, Element>> getPairs() {
+        List<Pair<Element, Element>> pairs = new ArrayList<>();
+        for (var entry : candidates) {
+            for (var target : entry.second()) {
+                pairs.add(new Pair<>(entry.first().first(), target.first()));
+            }
+        }
+        return pairs;
+    }
+
+    /**
+     * Serializable form of a candidate matrix that references elements by their identifiers.
+     *
+     * @param sourceIds The identifiers of the source elements in the order of the source store
+     * @param targetIds For each source element, the identifiers of its candidates
+     * @param similarities For each source element, the similarity scores of its candidates
+     */
+    record StoredCandidates(
+            List<String> sourceIds, List<List<String>> targetIds, List<List<Float>> similarities) {}
+}
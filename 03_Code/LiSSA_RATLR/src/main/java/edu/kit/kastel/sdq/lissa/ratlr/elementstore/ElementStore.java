@@ -3,6 +3,7 @@ package edu.kit.kastel.sdq.lissa.ratlr.elementstore;
 
 import java.util.ArrayList;
 import java.util.Arrays;
+import java.util.Collections;
 import java.util.HashMap;
 import java.util.List;
 import java.util.Map;
@@ -10,6 +11,7 @@ import java.util.Map;
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.elementstore.strategy.RetrievalStrategy;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.KeyGenerator;
 import edu.kit.kastel.sdq.lissa.ratlr.utils.Pair;
 
 /**
@@ -22,6 +24,10 @@ import edu.kit.kastel.sdq.lissa.ratlr.utils.Pair;
  *     <li>{@link SourceElementStore}</li>
  *     <li>{@link TargetElementStore}</li>
  * </ul>
+ *
+ * The store is frozen once {@link #setup(List, List)} has been called. All lookups return read-only views
+ * that share the embeddings owned by the store instead of copying them, so retrieval does not allocate memory
+ * proportional to the size of the store. The embedding arrays handed out by the store must not be modified.
  */
 public class ElementStore {
 
@@ -37,6 +43,29 @@ public class ElementStore {
      */
     private final List<Pair<Element, float[]>> elementsWithEmbedding;
 
+    /**
+     * Maps parent element identifiers to their direct children and embeddings.
+     * Built once during setup so that hierarchical lookups do not scan the whole store.
+     */
+    private final Map<String, List<Pair<Element, float[]>>> parentIdToChildrenWithEmbedding;
+
+    /**
+     * Read-only view of all elements that are marked for comparison.
+     * Built once during setup as it is queried for every similarity search.
+     */
+    private List<Pair<Element, float[]>> compareElementsWithEmbedding;
+
+    /**
+     * Whether the store has been set up and can no longer be modified.
+     */
+    private boolean frozen;
+
+    /**
+     * Deterministic hash of the identifiers, comparison flags, and embeddings of the stored elements.
+     * Computed once during setup.
+     */
+    private String contentHash;
+
     /**
      * Creates a new element store for the LiSSA framework.
      *
@@ -54,11 +83,14 @@ public class ElementStore {
 
         elementsWithEmbedding = new ArrayList<>();
         idToElementWithEmbedding = new HashMap<>();
+        parentIdToChildrenWithEmbedding = new HashMap<>();
+        compareElementsWithEmbedding = List.of();
     }
 
     /**
      * Creates a new element store with the provided content.
      * This constructor is used for initializing the store with existing elements and their embeddings.
+     * The embeddings are shared with the provided content, as stores never modify them.
      *
      * @param content List of pairs containing elements and their embeddings
      * @param retrievalStrategy The retrieval strategy to use for finding similar elements
@@ -68,19 +100,20 @@ public class ElementStore {
 
         elementsWithEmbedding = new ArrayList<>();
         idToElementWithEmbedding = new HashMap<>();
-        List<Element> elements = new ArrayList<>();
-        List<float[]> embeddings = new ArrayList<>();
+        parentIdToChildrenWithEmbedding = new HashMap<>();
+        compareElementsWithEmbedding = List.of();
+        List<Element> elements = new ArrayList<>(content.size());
+        List<float[]> embeddings = new ArrayList<>(content.size());
         for (var pair : content) {
-            var element = pair.first();
-            var embedding = pair.second();
-            elements.add(element);
-            embeddings.add(Arrays.copyOf(embedding, embedding.length));
+            elements.add(pair.first());
+            embeddings.add(pair.second());
         }
         setup(elements, embeddings);
     }
 
     /**
      * Initializes the element store with elements and their embeddings for LiSSA's processing.
+     * Afterward, the store is frozen and only provides read-only views of its content.
      *
      * @param elements List of elements to store
      * @param embeddings List of embeddings corresponding to the elements
@@ -88,7 +121,7 @@ public class ElementStore {
      * @throws IllegalArgumentException If the number of elements and embeddings don't match
      */
     public void setup(List<Element> elements, List<float[]> embeddings) {
-        if (!elementsWithEmbedding.isEmpty() || !idToElementWithEmbedding.isEmpty()) {
+        if (frozen || !elementsWithEmbedding.isEmpty() || !idToElementWithEmbedding.isEmpty()) {
             throw new IllegalStateException("The element store is already set up.");
         }
 
@@ -102,7 +135,48 @@ public class ElementStore {
             var pair = new Pair<>(element, embedding);
             elementsWithEmbedding.add(pair);
             idToElementWithEmbedding.put(element.getIdentifier(), pair);
+            if (element.getParent() != null) {
+                parentIdToChildrenWithEmbedding
+                        .computeIfAbsent(element.getParent().getIdentifier(), k -> new ArrayList<>())
+                        .add(pair);
+            }
         }
+        parentIdToChildrenWithEmbedding.replaceAll((k, v) -> Collections.unmodifiableList(v));
+        compareElementsWithEmbedding = elementsWithEmbedding.stream()
+                .filter(it -> it.first().isCompare())
+                .toList();
+        contentHash = calculateContentHash(elementsWithEmbedding);
+        frozen = true;
+    }
+
+    private static String calculateContentHash(List<Pair<Element, float[]>> elementsWithEmbedding) {
+        StringBuilder content = new StringBuilder();
+        for (var pair : elementsWithEmbedding) {
+            content.append(pair.first().getIdentifier())
+                    .append('\0')
+                    .append(pair.first().isCompare())
+                    .append('\0')
+                    .append(pair.second().length)
+                    .append('\0')
+                    .append(Arrays.hashCode(pair.second()))
+                    .append('\n');
+        }
+        return KeyGenerator.generateKey(content.toString());
+    }
+
+    /**
+     * Returns a deterministic hash of the content of this store.
+     * Two stores with the same elements (identifiers and comparison flags) and embeddings in the same order
+     * have the same hash, which allows sharing derived results such as retrieval candidates between them.
+     *
+     * @return The content hash of this store
+     * @throws IllegalStateException If the store has not been set up yet
+     */
+    public String getContentHash() {
+        if (!frozen) {
+            throw new IllegalStateException("The element store is not set up yet.");
+        }
+        return contentHash;
     }
 
     /**
@@ -110,14 +184,10 @@ public class ElementStore {
      * Available in both source and target store modes for LiSSA's element lookup.
      *
      * @param id The identifier of the element to retrieve
-     * @return A pair containing the element and its embedding, or null if not found
+     * @return A pair containing the element and its (shared, read-only) embedding, or null if not found
      */
     public Pair<Element, float[]> getById(String id) {
-        var element = idToElementWithEmbedding.get(id);
-        if (element == null) {
-            return null;
-        }
-        return new Pair<>(element.first(), Arrays.copyOf(element.second(), element.second().length));
+        return idToElementWithEmbedding.get(id);
     }
 
     /**
@@ -125,17 +195,10 @@ public class ElementStore {
      * Available in both source and target store modes for LiSSA's hierarchical analysis.
      *
      * @param parentId The identifier of the parent element
-     * @return List of pairs containing elements and their embeddings
+     * @return Read-only list of pairs containing elements and their embeddings
      */
     public List<Pair<Element, float[]>> getElementsByParentId(String parentId) {
-        List<Pair<Element, float[]>> elements = new ArrayList<>();
-        for (Pair<Element, float[]> element : elementsWithEmbedding) {
-            if (element.first().getParent() != null
-                    && element.first().getParent().getIdentifier().equals(parentId)) {
-                elements.add(new Pair<>(element.first(), Arrays.copyOf(element.second(), element.second().length)));
-            }
-        }
-        return elements;
+        return parentIdToChildrenWithEmbedding.getOrDefault(parentId, List.of());
     }
 
     /**
@@ -143,16 +206,10 @@ public class ElementStore {
      * Available in both source and target store modes for LiSSA's internal processing.
      *
      * @param onlyCompare If true, only returns elements marked for comparison
-     * @return List of pairs containing elements and their embeddings
+     * @return Read-only list of pairs containing elements and their embeddings
      */
     protected List<Pair<Element, float[]>> getAllElementsIntern(boolean onlyCompare) {
-        List<Pair<Element, float[]>> elements = new ArrayList<>();
-        for (Pair<Element, float[]> element : elementsWithEmbedding) {
-            if (!onlyCompare || element.first().isCompare()) {
-                elements.add(new Pair<>(element.first(), Arrays.copyOf(element.second(), element.second().length)));
-            }
-        }
-        return elements;
+        return onlyCompare ? compareElementsWithEmbedding : Collections.unmodifiableList(elementsWithEmbedding);
     }
 
     protected int size() {
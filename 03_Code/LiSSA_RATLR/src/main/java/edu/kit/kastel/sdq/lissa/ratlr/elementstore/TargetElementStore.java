@@ -65,9 +65,9 @@ public class TargetElementStore extends ElementStore {
      */
     public TargetElementStore reduceTargetElementStore(SourceElementStore sourceStore) {
         List<Pair<Element, float[]>> reducedTargetElements = new ArrayList<>();
-        for (var element : sourceStore.getAllElements(true)) {
-            for (Element candidate : this.findSimilar(element)) {
-                reducedTargetElements.add(this.getById(candidate.getIdentifier()));
+        for (var entry : getCandidateMatrix(sourceStore).getCandidates()) {
+            for (var candidate : entry.second()) {
+                reducedTargetElements.add(this.getById(candidate.first().getIdentifier()));
             }
         }
         return new TargetElementStore(reducedTargetElements, this.retrievalStrategy);
@@ -93,4 +93,26 @@ public class TargetElementStore extends ElementStore {
     public List<Pair<Element, Float>> findSimilarWithDistances(Pair<Element, float[]> query) {
         return retrievalStrategy.findSimilarElements(query, getAllElementsIntern(true));
     }
+
+    /**
+     * Finds elements similar to each of the given query vectors in one batched pass.
+     *
+     * @param queries The elements and vectors to find similar elements for
+     * @return For each query (in the same order), the similar elements and their similarity scores
+     */
+    public List<List<Pair<Element, Float>>> findSimilarWithDistances(List<Pair<Element, float[]>> queries) {
+        return retrievalStrategy.findSimilarElements(queries, getAllElementsIntern(true));
+    }
+
+    /**
+     * Retrieves the candidates of all source elements of the given source store in this target store.
+     * The result is computed once per pair of store contents and retrieval strategy, and reused afterward.
+     *
+     * @param sourceStore The store containing the source elements
+     * @return The candidate matrix of the source store in this target store
+     * @see CandidateMatrix
+     */
+    public CandidateMatrix getCandidateMatrix(SourceElementStore sourceStore) {
+        return CandidateMatrix.of(sourceStore, this);
+    }
 }
@@ -0,0 +1,116 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.elementstore.strategy;
+
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Optional;
+
+import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.Pair;
+
+/**
+ * A retrieval strategy that ranks elements by cosine similarity like {@link CosineSimilarity}, but prunes
+ * low-value candidates of each query. As every candidate becomes a classification task, pruning directly reduces
+ * the number of requests to the language model.
+ * <p>
+ * For each query, the ranked candidates (at most {@code max_results}) are cut at the first candidate that
+ * <ul>
+ *     <li>has a similarity below {@code similarity_floor}, or</li>
+ *     <li>is separated from its predecessor by a relative similarity gap larger than {@code relative_gap}
+ *     (the elbow of the sorted similarities).</li>
+ * </ul>
+ * The first {@code min_results} candidates are always kept, so every query retains an adaptive number of
+ * candidates between {@code min_results} and {@code max_results}.
+ * <p>
+ * Configuration options:
+ * <ul>
+ *     <li>max_results: The maximum number of candidates per query, or "infinity" (default: 10)</li>
+ *     <li>min_results: The minimum number of candidates per query (default: 1)</li>
+ *     <li>similarity_floor: The minimum similarity of a candidate (default: 0.0)</li>
+ *     <li>relative_gap: The maximum relative similarity drop between consecutive candidates (default: 0.25)</li>
+ * </ul>
+ */
+public class AdaptiveCosineSimilarity implements RetrievalStrategy {
+    private static final String MIN_RESULTS_KEY = "min_results";
+    private static final String SIMILARITY_FLOOR_KEY = "similarity_floor";
+    private static final String RELATIVE_GAP_KEY = "relative_gap";
+
+    private static final int DEFAULT_MIN_RESULTS = 1;
+    private static final double DEFAULT_SIMILARITY_FLOOR = 0.0;
+    private static final double DEFAULT_RELATIVE_GAP = 0.25;
+
+    /**
+     * The strategy that ranks the candidates before pruning.
+     */
+    private final CosineSimilarity ranking;
+
+    private final int minResults;
+    private final double similarityFloor;
+    private final double relativeGap;
+
+    public AdaptiveCosineSimilarity(ModuleConfiguration configuration) {
+        this.ranking = new CosineSimilarity(configuration);
+        this.minResults = configuration.argumentAsInt(MIN_RESULTS_KEY, DEFAULT_MIN_RESULTS);
+        this.similarityFloor = configuration.argumentAsDouble(SIMILARITY_FLOOR_KEY, DEFAULT_SIMILARITY_FLOOR);
+        this.relativeGap = configuration.argumentAsDouble(RELATIVE_GAP_KEY, DEFAULT_RELATIVE_GAP);
+        if (minResults < 1) {
+            throw new IllegalArgumentException("The minimum number of results must be greater than 0.");
+        }
+        if (minResults > ranking.getMaxResults()) {
+            throw new IllegalArgumentException(
+                    "The minimum number of results must not be greater than the maximum number of results.");
+        }
+        if (relativeGap <= 0) {
+            throw new IllegalArgumentException("The relative gap must be greater than 0.");
+        }
+    }
+
+    @Override
+    public List<Pair<Element, Float>> findSimilarElements(
+            Pair<Element, float[]> query, List<Pair<Element, float[]>> allElementsInStore) {
+        return prune(ranking.findSimilarElements(query, allElementsInStore));
+    }
+
+    @Override
+    public List<List<Pair<Element, Float>>> findSimilarElements(
+            List<Pair<Element, float[]>> queries, List<Pair<Element, float[]>> allElementsInStore) {
+        List<List<Pair<Element, Float>>> ranked = ranking.findSimilarElements(queries, allElementsInStore);
+        List<List<Pair<Element, Float>>> pruned = new ArrayList<>(ranked.size());
+        for (var candidates : ranked) {
+            pruned.add(prune(candidates));
+        }
+        return pruned;
+    }
+
+    /**
+     * Cuts the ranked candidates at the similarity floor or at the first large relative gap.
+     *
+     * @param candidates The candidates sorted by descending similarity
+     * @return The retained prefix of the candidates
+     */
+    private List<Pair<Element, Float>> prune(List<Pair<Element, Float>> candidates) {
+        int retained = Math.min(minResults, candidates.size());
+        while (retained < candidates.size()) {
+            float previous = candidates.get(retained - 1).second();
+            float current = candidates.get(retained).second();
+            boolean belowFloor = current < similarityFloor;
+            boolean elbow = previous != 0 && (previous - current) / Math.abs(previous) > relativeGap;
+            if (belowFloor || elbow) {
+                break;
+            }
+            retained++;
+        }
+        return candidates.subList(0, retained);
+    }
+
+    @Override
+    public String getIdentifier() {
+        return "adaptive_" + ranking.getIdentifier() + "_" + minResults + "_" + similarityFloor + "_" + relativeGap;
+    }
+
+    @Override
+    public Optional<RetrievalStrategy> getUnprunedStrategy() {
+        return Optional.of(ranking);
+    }
+}
@@ -2,7 +2,9 @@
 package edu.kit.kastel.sdq.lissa.ratlr.elementstore.strategy;
 
 import java.util.ArrayList;
+import java.util.Comparator;
 import java.util.List;
+import java.util.PriorityQueue;
 
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
@@ -21,6 +23,26 @@ public class CosineSimilarity implements RetrievalStrategy {
      */
     public static final String MAX_RESULTS_INFINITY_ARGUMENT = "infinity";
 
+    /**
+     * Number of target vectors that are compared against a block of queries at once.
+     * Chosen such that a block of typical embeddings fits into the CPU cache.
+     */
+    private static final int TARGET_BLOCK_SIZE = 32;
+
+    /**
+     * Number of query vectors that are compared against a block of targets at once.
+     */
+    private static final int QUERY_BLOCK_SIZE = 16;
+
+    /**
+     * Orders candidates by descending similarity.
+     * Ties are resolved by the order of the elements in the store, as in the stable sort of the single query case.
+     */
+    private static final Comparator<Candidate> BEST_FIRST = (a, b) -> {
+        int comparison = Float.compare(b.similarity(), a.similarity());
+        return comparison != 0 ? comparison : Integer.compare(a.index(), b.index());
+    };
+
     private final int maxResults;
 
     public CosineSimilarity(ModuleConfiguration configuration) {
@@ -38,6 +60,15 @@ public class CosineSimilarity implements RetrievalStrategy {
         }
     }
 
+    /**
+     * Returns the maximum number of results per query.
+     *
+     * @return The maximum number of results, or {@link Integer#MAX_VALUE} if the number is not limited
+     */
+    int getMaxResults() {
+        return maxResults;
+    }
+
     @Override
     public List<Pair<Element, Float>> findSimilarElements(
             Pair<Element, float[]> query, List<Pair<Element, float[]>> allElementsInStore) {
@@ -51,6 +82,96 @@ public class CosineSimilarity implements RetrievalStrategy {
         return similarElements.subList(0, Math.min(maxResults, similarElements.size()));
     }
 
+    /**
+     * Computes the similarities of all queries to all elements in one blocked pass.
+     * The norms of all vectors are computed once, and queries and targets are processed in blocks to keep the
+     * vectors in the CPU cache. Each query of a block keeps only its {@link #maxResults} best elements, so the memory
+     * does not grow with the product of queries and elements. The results are equal to calling
+     * {@link #findSimilarElements(Pair, List)} per query.
+     */
+    @Override
+    public List<List<Pair<Element, Float>>> findSimilarElements(
+            List<Pair<Element, float[]>> queries, List<Pair<Element, float[]>> allElementsInStore) {
+        double[] queryNorms = norms(queries);
+        double[] targetNorms = norms(allElementsInStore);
+        int limit = Math.min(maxResults, allElementsInStore.size());
+
+        List<List<Pair<Element, Float>>> results = new ArrayList<>(queries.size());
+        for (int queryBlock = 0; queryBlock < queries.size(); queryBlock += QUERY_BLOCK_SIZE) {
+            int queryBlockEnd = Math.min(queryBlock + QUERY_BLOCK_SIZE, queries.size());
+            List<PriorityQueue<Candidate>> best = new ArrayList<>(queryBlockEnd - queryBlock);
+            for (int q = queryBlock; q < queryBlockEnd; q++) {
+                // Head of the queue is the worst of the current best results
+                best.add(new PriorityQueue<>(Math.max(1, Math.min(limit, 1024)), BEST_FIRST.reversed()));
+            }
+            for (int targetBlock = 0; targetBlock < allElementsInStore.size(); targetBlock += TARGET_BLOCK_SIZE) {
+                int targetBlockEnd = Math.min(targetBlock + TARGET_BLOCK_SIZE, allElementsInStore.size());
+                for (int q = queryBlock; q < queryBlockEnd; q++) {
+                    float[] queryVector = queries.get(q).second();
+                    PriorityQueue<Candidate> bestOfQuery = best.get(q - queryBlock);
+                    for (int t = targetBlock; t < targetBlockEnd; t++) {
+                        float[] elementVector = allElementsInStore.get(t).second();
+                        float similarity =
+                                (float) (dotProduct(queryVector, elementVector) / (queryNorms[q] * targetNorms[t]));
+                        offer(bestOfQuery, new Candidate(t, similarity), limit);
+                    }
+                }
+            }
+            for (PriorityQueue<Candidate> bestOfQuery : best) {
+                results.add(sortedResults(bestOfQuery, allElementsInStore));
+            }
+        }
+        return results;
+    }
+
+    private static void offer(PriorityQueue<Candidate> best, Candidate candidate, int limit) {
+        if (best.size() < limit) {
+            best.add(candidate);
+        } else if (limit > 0 && BEST_FIRST.compare(candidate, best.peek()) < 0) {
+            best.poll();
+            best.add(candidate);
+        }
+    }
+
+    private static List<Pair<Element, Float>> sortedResults(
+            PriorityQueue<Candidate> best, List<Pair<Element, float[]>> elements) {
+        List<Candidate> candidates = new ArrayList<>(best);
+        candidates.sort(BEST_FIRST);
+        List<Pair<Element, Float>> result = new ArrayList<>(candidates.size());
+        for (Candidate candidate : candidates) {
+            result.add(new Pair<>(elements.get(candidate.index()).first(), candidate.similarity()));
+        }
+        return result;
+    }
+
+    @Override
+    public String getIdentifier() {
+        return "cosine_similarity_" + (maxResults == Integer.MAX_VALUE ? MAX_RESULTS_INFINITY_ARGUMENT : maxResults);
+    }
+
+    private static double[] norms(List<Pair<Element, float[]>> vectors) {
+        double[] norms = new double[vectors.size()];
+        for (int i = 0; i < vectors.size(); i++) {
+            double norm = 0.0;
+            for (float value : vectors.get(i).second()) {
+                norm += Math.pow(value, 2);
+            }
+            norms[i] = Math.sqrt(norm);
+        }
+        return norms;
+    }
+
+    private static double dotProduct(float[] queryVector, float[] elementVector) {
+        if (queryVector.length != elementVector.length) {
+            throw new IllegalArgumentException("The length of the query vector and the element vector must be equal.");
+        }
+        double dotProduct = 0.0;
+        for (int i = 0; i < queryVector.length; i++) {
+            dotProduct += queryVector[i] * elementVector[i];
+        }
+        return dotProduct;
+    }
+
     private float cosineSimilarity(float[] queryVector, float[] elementVector) {
         if (queryVector.length != elementVector.length) {
             throw new IllegalArgumentException("The length of the query vector and the element vector must be equal.");
@@ -66,4 +187,9 @@ public class CosineSimilarity implements RetrievalStrategy {
         }
         return (float) (dotProduct / (Math.sqrt(normA) * Math.sqrt(normB)));
     }
+
+    /**
+     * An element of the store, referenced by its index, with its similarity to a query.
+     */
+    private record Candidate(int index, float similarity) {}
 }
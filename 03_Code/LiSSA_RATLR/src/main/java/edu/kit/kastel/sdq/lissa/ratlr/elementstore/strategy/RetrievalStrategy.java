@@ -1,7 +1,9 @@
 /* Licensed under MIT 2025. */
 package edu.kit.kastel.sdq.lissa.ratlr.elementstore.strategy;
 
+import java.util.ArrayList;
 import java.util.List;
+import java.util.Optional;
 
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
@@ -16,9 +18,50 @@ public interface RetrievalStrategy {
     List<Pair<Element, Float>> findSimilarElements(
             Pair<Element, float[]> query, List<Pair<Element, float[]>> allElementsInStore);
 
+    /**
+     * Finds the similar elements for a batch of queries at once.
+     * The result only depends on the embeddings and the configuration of the strategy, so it can be computed once
+     * for all source elements and reused. Strategies may override this method to use a more efficient batched
+     * computation; the default delegates to {@link #findSimilarElements(Pair, List)} for every query.
+     *
+     * @param queries The elements and vectors to find similar elements for
+     * @param allElementsInStore The elements and vectors to search in
+     * @return For each query (in the same order), the similar elements with their similarity scores
+     */
+    default List<List<Pair<Element, Float>>> findSimilarElements(
+            List<Pair<Element, float[]>> queries, List<Pair<Element, float[]>> allElementsInStore) {
+        List<List<Pair<Element, Float>>> results = new ArrayList<>(queries.size());
+        for (var query : queries) {
+            results.add(findSimilarElements(query, allElementsInStore));
+        }
+        return results;
+    }
+
+    /**
+     * Returns an identifier of this strategy including all parameters that influence its results.
+     * The identifier is used to cache retrieval results, so two strategies with equal identifiers must produce
+     * equal results for the same input.
+     *
+     * @return The identifier of this strategy
+     */
+    default String getIdentifier() {
+        return getClass().getSimpleName();
+    }
+
+    /**
+     * Returns the strategy that retrieves the candidates before this strategy prunes them, if it prunes any.
+     * It is used to report how many candidates were pruned and what the pruning costs in terms of recall.
+     *
+     * @return The strategy without pruning, or empty if this strategy does not prune candidates
+     */
+    default Optional<RetrievalStrategy> getUnprunedStrategy() {
+        return Optional.empty();
+    }
+
     static RetrievalStrategy createStrategy(ModuleConfiguration configuration) {
         return switch (configuration.name()) {
             case "cosine_similarity" -> new CosineSimilarity(configuration);
+            case "adaptive_cosine_similarity" -> new AdaptiveCosineSimilarity(configuration);
             case "custom" -> {
                 logger.warn("For backwards compatibility: Using cosine similarity as default retrieval strategy.");
                 yield new CosineSimilarity(configuration);
@@ -14,6 +14,7 @@ import com.knuddels.jtokkit.api.EncodingRegistry;
 import edu.kit.kastel.sdq.lissa.ratlr.cache.Cache;
 import edu.kit.kastel.sdq.lissa.ratlr.cache.CacheManager;
 import edu.kit.kastel.sdq.lissa.ratlr.cache.ClassifierCacheKey;
+import edu.kit.kastel.sdq.lissa.ratlr.cache.OfflineReplay;
 import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
 import edu.kit.kastel.sdq.lissa.ratlr.utils.Futures;
@@ -33,6 +34,9 @@ import dev.langchain4j.model.embedding.EmbeddingModel;
  * The class uses a cache to store previously generated embeddings and implements
  * a sophisticated mechanism to handle texts that exceed the maximum token length
  * of the underlying embedding model.
+ * <p>
+ * In {@link OfflineReplay offline replay mode}, no embedding model is created and all embeddings are served from the
+ * cache. A missing embedding fails with both policies, as every element of a store needs its embedding.
  */
 abstract class CachedEmbeddingCreator extends EmbeddingCreator {
     // TODO Handle Token Length better .. 8192 is the length for ada
@@ -41,6 +45,7 @@ abstract class CachedEmbeddingCreator extends EmbeddingCreator {
     private static final Logger STATIC_LOGGER = LoggerFactory.getLogger(CachedEmbeddingCreator.class);
     protected final Logger logger = LoggerFactory.getLogger(this.getClass());
     private final Cache cache;
+    /** The embedding model, or null if embeddings are only served from the cache */
     private final EmbeddingModel embeddingModel;
     private final String rawNameOfModel;
     private final int threads;
@@ -56,7 +61,8 @@ abstract class CachedEmbeddingCreator extends EmbeddingCreator {
     protected CachedEmbeddingCreator(ContextStore contextStore, String model, int threads, String... params) {
         super(contextStore);
         this.cache = CacheManager.getDefaultInstance().getCache(this, new String[] {model});
-        this.embeddingModel = Objects.requireNonNull(createEmbeddingModel(model, params));
+        this.embeddingModel =
+                OfflineReplay.isEnabled() ? null : Objects.requireNonNull(createEmbeddingModel(model, params));
         this.rawNameOfModel = model;
         this.threads = Math.max(1, threads);
     }
@@ -92,10 +98,8 @@ abstract class CachedEmbeddingCreator extends EmbeddingCreator {
             int start = i * numberOfElementsPerThread;
             int end = i == threadCount - 1 ? elements.size() : (i + 1) * numberOfElementsPerThread;
             List<Element> subList = elements.subList(start, end);
-            futureResults.add(executor.submit(() -> {
-                var embeddingModelInstance = createEmbeddingModel(this.rawNameOfModel);
-                return calculateEmbeddingsSequential(embeddingModelInstance, subList);
-            }));
+            // Embedding models are thread-safe, so all threads share the model and the connection pool of its client
+            futureResults.add(executor.submit(() -> calculateEmbeddingsSequential(subList)));
         }
         logger.info("Waiting for classification to finish. Elements in queue: {}", futureResults.size());
 
@@ -167,11 +171,16 @@ abstract class CachedEmbeddingCreator extends EmbeddingCreator {
      *     <li>A generated key based on the content</li>
      * </ul>
      *
-     * @param embeddingModel The model to use for embedding generation
+     * Without an embedding model, the embedding of the truncated content is looked up as well before the miss is
+     * reported to {@link OfflineReplay}.
+     *
+     * @param embeddingModel The model to use for embedding generation, or null to only use the cache
      * @param cache The cache to use for storing and retrieving embeddings
      * @param rawNameOfModel The name of the model being used
      * @param element The element to create an embedding for
      * @return The vector embedding of the element, either from cache or newly generated
+     * @throws edu.kit.kastel.sdq.lissa.ratlr.cache.UncachedRequestException If there is no embedding model and the
+     *         embedding is not cached
      */
     private static float[] calculateFinalEmbedding(
             EmbeddingModel embeddingModel, Cache cache, String rawNameOfModel, Element element) {
@@ -182,6 +191,13 @@ abstract class CachedEmbeddingCreator extends EmbeddingCreator {
         float[] cachedEmbedding = cache.get(cacheKey, float[].class);
         if (cachedEmbedding != null) {
             return cachedEmbedding;
+        } else if (embeddingModel == null) {
+            float[] fixedEmbedding =
+                    cache.get(createFixedCacheKey(rawNameOfModel, cacheKey, element.getContent()), float[].class);
+            if (fixedEmbedding != null) {
+                return fixedEmbedding;
+            }
+            throw OfflineReplay.miss("embedding", rawNameOfModel, element.getContent());
         } else {
             STATIC_LOGGER.info("Calculating embedding for: {}", element.getIdentifier());
             try {
@@ -213,17 +229,7 @@ abstract class CachedEmbeddingCreator extends EmbeddingCreator {
      */
     private static float[] tryToFixWithLength(
             EmbeddingModel embeddingModel, Cache cache, String rawNameOfModel, ClassifierCacheKey key, String content) {
-        String newKey = key.localKey() + "_fixed_" + MAX_TOKEN_LENGTH;
-
-        // We need the old keys for backwards compatibility
-        @SuppressWarnings("deprecation")
-        ClassifierCacheKey newCacheKey = ClassifierCacheKey.ofRaw(
-                rawNameOfModel,
-                -1,
-                -1,
-                ClassifierCacheKey.Mode.EMBEDDING,
-                "(FIXED::%d): %s".formatted(MAX_TOKEN_LENGTH, content),
-                newKey);
+        ClassifierCacheKey newCacheKey = createFixedCacheKey(rawNameOfModel, key, content);
 
         float[] cachedEmbedding = cache.get(newCacheKey, float[].class);
         if (cachedEmbedding != null) {
@@ -258,4 +264,28 @@ abstract class CachedEmbeddingCreator extends EmbeddingCreator {
         cache.put(newCacheKey, embedding);
         return embedding;
     }
+
+    /**
+     * Creates the cache key of the embedding of content that was truncated to the maximum token length.
+     *
+     * @param rawNameOfModel The name of the model being used
+     * @param key The cache key of the original content
+     * @param content The original content
+     * @return The cache key of the truncated content
+     */
+    private static ClassifierCacheKey createFixedCacheKey(
+            String rawNameOfModel, ClassifierCacheKey key, String content) {
+        String newKey = key.localKey() + "_fixed_" + MAX_TOKEN_LENGTH;
+
+        // We need the old keys for backwards compatibility
+        @SuppressWarnings("deprecation")
+        ClassifierCacheKey newCacheKey = ClassifierCacheKey.ofRaw(
+                rawNameOfModel,
+                -1,
+                -1,
+                ClassifierCacheKey.Mode.EMBEDDING,
+                "(FIXED::%d): %s".formatted(MAX_TOKEN_LENGTH, content),
+                newKey);
+        return newCacheKey;
+    }
 }
@@ -4,6 +4,7 @@ package edu.kit.kastel.sdq.lissa.ratlr.embeddingcreator;
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
 import edu.kit.kastel.sdq.lissa.ratlr.utils.Environment;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.HttpClients;
 
 import dev.langchain4j.model.embedding.EmbeddingModel;
 import dev.langchain4j.model.openai.OpenAiEmbeddingModel;
@@ -17,6 +18,7 @@ import dev.langchain4j.model.openai.OpenAiEmbeddingModel;
  * <ul>
  *     <li>{@code OPENAI_ORGANIZATION_ID}: Your OpenAI organization ID</li>
  *     <li>{@code OPENAI_API_KEY}: Your OpenAI API key</li>
+ *     <li>{@code OPENAI_BASE_URL}: Alternative base URL, e.g., of a local mock server (optional)</li>
  * </ul>
  *
  * The default model used is "text-embedding-ada-002", but this can be overridden
@@ -57,6 +59,8 @@ public class OpenAiEmbeddingCreator extends CachedEmbeddingCreator {
             throw new IllegalStateException("OPENAI_ORGANIZATION_ID or OPENAI_API_KEY environment variable not set");
         }
         return new OpenAiEmbeddingModel.OpenAiEmbeddingModelBuilder()
+                .httpClientBuilder(HttpClients.builder("OPENAI"))
+                .baseUrl(Environment.getenv("OPENAI_BASE_URL"))
                 .modelName(model)
                 .organizationId(openAiOrganizationId)
                 .apiKey(openAiApiKey)
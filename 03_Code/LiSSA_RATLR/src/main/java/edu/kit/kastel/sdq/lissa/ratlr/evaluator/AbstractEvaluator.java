@@ -2,8 +2,6 @@
 package edu.kit.kastel.sdq.lissa.ratlr.evaluator;
 
 import java.util.List;
-import java.util.Random;
-import java.util.random.RandomGenerator;
 
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
@@ -11,6 +9,7 @@ import org.slf4j.LoggerFactory;
 import edu.kit.kastel.sdq.lissa.ratlr.classifier.ClassificationTask;
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.promptmetric.Metric;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.ResumableRandom;
 
 /**
  * Abstract base class for evaluators in the LiSSA framework.
@@ -33,20 +32,48 @@ public abstract class AbstractEvaluator {
     private static final String EVAL_PROMPTS_PER_ROUND_KEY = "eval_prompts_per_round";
     private static final int EVAL_PROMPTS_PER_ROUND = 8;
 
+    /**
+     * Configuration key for the maximum number of prompt-task classifications of one evaluation.
+     */
+    protected static final String MAX_EVALUATIONS_KEY = "max_evaluations";
+
+    /**
+     * Configuration key for the maximum number of prompts that are scored concurrently.
+     */
+    protected static final String MAX_THREADS_KEY = "max_threads";
+
     protected final Logger logger = LoggerFactory.getLogger(this.getClass());
 
     protected int samplesPerEval;
     protected int evalRounds;
     protected int evalPromptsPerRound;
     protected final int evaluationBudget;
-    protected final RandomGenerator random;
+    protected final ResumableRandom random;
 
     protected AbstractEvaluator(ModuleConfiguration configuration) {
         this.samplesPerEval = configuration.argumentAsInt(SAMPLES_PER_EVAL_KEY, SAMPLES_PER_EVAL);
         this.evalRounds = configuration.argumentAsInt(EVAL_ROUNDS_KEY, EVAL_ROUNDS);
         this.evalPromptsPerRound = configuration.argumentAsInt(EVAL_PROMPTS_PER_ROUND_KEY, EVAL_PROMPTS_PER_ROUND);
         this.evaluationBudget = samplesPerEval * evalRounds * evalPromptsPerRound;
-        this.random = new Random(configuration.argumentAsInt(SEED_KEY, DEFAULT_SEED));
+        this.random = new ResumableRandom(configuration.argumentAsInt(SEED_KEY, DEFAULT_SEED));
+    }
+
+    /**
+     * Returns the state of the random generator of this evaluator, e.g., for a checkpoint.
+     *
+     * @return The state of the random generator
+     */
+    public long getRandomState() {
+        return random.state();
+    }
+
+    /**
+     * Restores the state of the random generator of this evaluator, e.g., from a checkpoint.
+     *
+     * @param state A state returned by {@link #getRandomState()}
+     */
+    public void restoreRandomState(long state) {
+        random.restore(state);
     }
 
     /**
@@ -66,6 +93,7 @@ public abstract class AbstractEvaluator {
             case "mock" -> new MockEvaluator();
             case "bruteforce" -> new BruteForceEvaluator(configuration);
             case "ucb" -> new UpperConfidenceBoundBanditEvaluator(configuration);
+            case "racing" -> new RacingEvaluator(configuration);
             default -> throw new IllegalStateException("Unexpected value: " + configuration.name());
         };
     }
@@ -0,0 +1,66 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.evaluator;
+
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.List;
+import java.util.random.RandomGenerator;
+
+/**
+ * Samples minibatches without replacement from a list of examples.
+ * The examples are shuffled with a seeded random generator and consumed in this order; once all examples were drawn,
+ * they are reshuffled. Thus, consecutive minibatches only repeat examples after the whole list was used.
+ *
+ * @param <T> The type of the examples
+ */
+final class MinibatchSampler<T> {
+    private final List<T> order;
+    private final RandomGenerator random;
+    private int position;
+
+    /**
+     * Creates a new sampler for the given examples.
+     *
+     * @param examples The examples to sample from
+     * @param random The random generator used for shuffling
+     */
+    MinibatchSampler(List<T> examples, RandomGenerator random) {
+        this.order = new ArrayList<>(examples);
+        this.random = random;
+        Collections.shuffle(order, random);
+    }
+
+    /**
+     * Draws the next minibatch.
+     * The minibatch contains no duplicates and is smaller than the given size only if there are fewer examples.
+     *
+     * @param size The size of the minibatch
+     * @return The next minibatch
+     */
+    List<T> next(int size) {
+        int batchSize = Math.min(size, order.size());
+        if (position + batchSize > order.size()) {
+            // Keep the remaining examples of this pass in front, so the minibatch does not contain duplicates
+            List<T> remaining = new ArrayList<>(order.subList(position, order.size()));
+            List<T> drawn = new ArrayList<>(order.subList(0, position));
+            Collections.shuffle(drawn, random);
+            order.clear();
+            order.addAll(remaining);
+            order.addAll(drawn);
+            position = 0;
+        }
+        List<T> batch = new ArrayList<>(order.subList(position, position + batchSize));
+        position += batchSize;
+        return batch;
+    }
+
+    /**
+     * Returns the first examples of the shuffled order, i.e., a nested prefix for increasing sizes.
+     *
+     * @param size The number of examples
+     * @return The first examples of the shuffled order
+     */
+    List<T> prefix(int size) {
+        return new ArrayList<>(order.subList(0, Math.min(size, order.size())));
+    }
+}
@@ -0,0 +1,158 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.evaluator;
+
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.Comparator;
+import java.util.List;
+
+import edu.kit.kastel.sdq.lissa.ratlr.classifier.ClassificationTask;
+import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
+import edu.kit.kastel.sdq.lissa.ratlr.promptmetric.Metric;
+import edu.kit.kastel.sdq.lissa.ratlr.promptmetric.MetricUtils;
+
+/**
+ * An evaluator that races the prompts against each other with successive halving and confidence-bound elimination.
+ * <p>
+ * The examples are shuffled once with the seeded random generator. In each round, all remaining prompts are scored
+ * on the same prefix of the shuffled examples, and the prefix doubles from round to round. After each round, prompts
+ * whose upper confidence bound is below the lower confidence bound of the {@code survivors}-th best prompt are
+ * eliminated, and at most the better half of the remaining prompts advances to the next round. The race ends if only
+ * {@code survivors} prompts remain, all examples are used, or the next round would exceed {@code max_evaluations}
+ * prompt-task classifications. Since the prefixes are nested, the outcomes of the previous rounds are reused by
+ * metrics that keep them (see {@link edu.kit.kastel.sdq.lissa.ratlr.promptmetric.GlobalMetric}).
+ * <p>
+ * The score of a remaining prompt is its score on the last prefix. The score of an eliminated prompt is its score on
+ * the prefix of its last round, but at most slightly below the scores of the prompts that outlasted it, so ranking the
+ * scores preserves the outcome of the race.
+ * <br>
+ * Configuration options:
+ * <ul>
+ *   <li>samples_per_eval: The number of examples of the first round (default: 32)</li>
+ *   <li>survivors: The number of prompts that are never eliminated, e.g., the beam size (default: 4)</li>
+ *   <li>delta: The error probability of the confidence bounds (default: 0.05)</li>
+ *   <li>max_threads: The maximum number of prompts that are scored concurrently (default: 1)</li>
+ *   <li>max_evaluations: The maximum number of prompt-task classifications (default:
+ *   samples_per_eval * eval_rounds * eval_prompts_per_round)</li>
+ * </ul>
+ */
+public class RacingEvaluator extends AbstractEvaluator {
+
+    private static final String SURVIVORS_KEY = "survivors";
+    private static final int DEFAULT_SURVIVORS = 4;
+    private static final String DELTA_KEY = "delta";
+    private static final double DEFAULT_DELTA = 0.05;
+    private static final int DEFAULT_MAX_THREADS = 1;
+
+    private final int survivors;
+    private final double delta;
+    private final int maxThreads;
+    private final int maxEvaluations;
+
+    /**
+     * Creates a new racing evaluator instance with the given configuration.
+     *
+     * @param configuration The configuration for the evaluator.
+     */
+    public RacingEvaluator(ModuleConfiguration configuration) {
+        super(configuration);
+        this.survivors = Math.max(1, configuration.argumentAsInt(SURVIVORS_KEY, DEFAULT_SURVIVORS));
+        this.delta = configuration.argumentAsDouble(DELTA_KEY, DEFAULT_DELTA);
+        this.maxThreads = configuration.argumentAsInt(MAX_THREADS_KEY, DEFAULT_MAX_THREADS);
+        this.maxEvaluations = configuration.argumentAsInt(MAX_EVALUATIONS_KEY, this.evaluationBudget);
+    }
+
+    @Override
+    public List<Double> sampleAndEvaluate(List<String> prompts, List<ClassificationTask> examples, Metric metric) {
+        if (prompts.isEmpty()) {
+            return List.of();
+        }
+        MinibatchSampler<ClassificationTask> sampler = new MinibatchSampler<>(examples, this.random);
+        double[] scores = new double[prompts.size()];
+        List<Integer> remaining = new ArrayList<>();
+        for (int i = 0; i < prompts.size(); i++) {
+            remaining.add(i);
+        }
+        List<List<Integer>> eliminatedPerRound = new ArrayList<>();
+
+        int size = Math.min(examples.size(), Math.max(1, Math.min(samplesPerEval, maxEvaluations / prompts.size())));
+        int previousSize = 0;
+        long evaluations = 0;
+        int round = 0;
+        while (true) {
+            long roundEvaluations = (long) remaining.size() * (size - previousSize);
+            if (round > 0 && evaluations + roundEvaluations > maxEvaluations) {
+                logger.info("Stopping the race after {} rounds, as the evaluation budget is exhausted", round);
+                break;
+            }
+            List<String> racingPrompts = remaining.stream().map(prompts::get).toList();
+            List<Double> roundScores =
+                    MetricUtils.getMetricConcurrently(metric, racingPrompts, sampler.prefix(size), maxThreads);
+            for (int i = 0; i < remaining.size(); i++) {
+                scores[remaining.get(i)] = roundScores.get(i);
+            }
+            evaluations += roundEvaluations;
+            round++;
+            if (remaining.size() <= survivors || size == examples.size()) {
+                break;
+            }
+
+            List<Integer> eliminated = eliminate(remaining, scores, size);
+            logger.info(
+                    "Race round {} on {} examples: eliminated {} of {} prompts",
+                    round,
+                    size,
+                    eliminated.size(),
+                    remaining.size() + eliminated.size());
+            eliminatedPerRound.add(eliminated);
+            previousSize = size;
+            size = Math.min(examples.size(), 2 * size);
+        }
+        logger.info("Race used {} of {} prompt-task evaluations", evaluations, maxEvaluations);
+        rankEliminated(remaining, eliminatedPerRound, scores);
+        return Arrays.stream(scores).boxed().toList();
+    }
+
+    /**
+     * Removes the prompts that are confidently worse than the {@link #survivors}-th best prompt and the worse half of
+     * the remaining prompts, but never more than needed to keep {@link #survivors} prompts.
+     *
+     * @param remaining The indices of the remaining prompts, modified in place
+     * @param scores The scores of the prompts
+     * @param size The number of examples the scores are based on
+     * @return The indices of the eliminated prompts
+     */
+    private List<Integer> eliminate(List<Integer> remaining, double[] scores, int size) {
+        // ties keep the order of the prompts
+        remaining.sort(Comparator.comparingDouble((Integer i) -> scores[i]).reversed());
+        double radius = Math.sqrt(Math.log(2.0 * remaining.size() / delta) / (2.0 * size));
+        double survivorLowerBound = scores[remaining.get(survivors - 1)] - radius;
+
+        int keep = Math.max(survivors, (remaining.size() + 1) / 2);
+        while (keep > survivors && scores[remaining.get(keep - 1)] + radius < survivorLowerBound) {
+            keep--;
+        }
+        List<Integer> eliminated = new ArrayList<>(remaining.subList(keep, remaining.size()));
+        remaining.subList(keep, remaining.size()).clear();
+        remaining.sort(Comparator.naturalOrder());
+        return eliminated;
+    }
+
+    /**
+     * Caps the scores of eliminated prompts below the scores of all prompts that outlasted them.
+     */
+    private static void rankEliminated(
+            List<Integer> remaining, List<List<Integer>> eliminatedPerRound, double[] scores) {
+        double floor = remaining.stream()
+                .mapToDouble(i -> scores[i])
+                .min()
+                .orElse(MetricUtils.MAXIMUM_SCORE);
+        for (List<Integer> eliminated : eliminatedPerRound.reversed()) {
+            double cap = Math.max(MetricUtils.MINIMUM_SCORE, Math.nextDown(floor));
+            for (int index : eliminated) {
+                scores[index] = Math.min(scores[index], cap);
+                floor = Math.min(floor, scores[index]);
+            }
+        }
+    }
+}
@@ -3,12 +3,16 @@ package edu.kit.kastel.sdq.lissa.ratlr.evaluator;
 
 import java.util.ArrayList;
 import java.util.Arrays;
+import java.util.Collections;
+import java.util.Comparator;
 import java.util.List;
 import java.util.Random;
+import java.util.stream.IntStream;
 
 import edu.kit.kastel.sdq.lissa.ratlr.classifier.ClassificationTask;
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.promptmetric.Metric;
+import edu.kit.kastel.sdq.lissa.ratlr.promptmetric.MetricUtils;
 
 /**
  * An evaluator that uses the Upper Confidence Bound (UCB) algorithm to select prompts
@@ -18,12 +22,17 @@ import edu.kit.kastel.sdq.lissa.ratlr.promptmetric.Metric;
  * The UCB algorithm is particularly useful in scenarios where the goal is to maximize the cumulative reward
  * over a series of selections, making it well-suited for prompt optimization tasks.
  * <br>
+ * Each round draws a new seeded minibatch without replacement (see {@link MinibatchSampler}) and scores the chosen
+ * prompts concurrently with up to {@code max_threads} threads. If {@code max_evaluations} is set, no round is started
+ * that would exceed this number of prompt-task classifications.
+ * <br>
  * Default parameters:
  * <ul>
  *   <li>rounds: 40</li>
  *   <li>numPromptsPerRound: 10</li>
  *   <li>samplesPerEval: 5</li>
  *   <li>maxThreads: 1</li>
+ *   <li>maxEvaluations: unlimited</li>
  *   <li>c: 1.0</li>
  *   <li>mode: "ucb"</li>
  * </ul>
@@ -34,7 +43,6 @@ public class UpperConfidenceBoundBanditEvaluator extends AbstractEvaluator {
     private static final int DEFAULT_ROUNDS = 40;
     private static final String NUM_PROMPTS_PER_ROUND_KEY = "num_prompts_per_round";
     private static final int DEFAULT_NUM_PROMPTS_PER_ROUND = 10;
-    private static final String MAX_THREADS_KEY = "max_threads";
     private static final int DEFAULT_MAX_THREADS = 1;
     private static final String C_KEY = "c";
     private static final double DEFAULT_C = 1.0;
@@ -44,6 +52,7 @@ public class UpperConfidenceBoundBanditEvaluator extends AbstractEvaluator {
     private final int rounds;
     private final int numberOfPromptsPerRound;
     private final int maxThreads;
+    private final int maxEvaluations;
     private final double c;
     private final String mode;
 
@@ -58,6 +67,7 @@ public class UpperConfidenceBoundBanditEvaluator extends AbstractEvaluator {
         this.numberOfPromptsPerRound =
                 configuration.argumentAsInt(NUM_PROMPTS_PER_ROUND_KEY, DEFAULT_NUM_PROMPTS_PER_ROUND);
         this.maxThreads = configuration.argumentAsInt(MAX_THREADS_KEY, DEFAULT_MAX_THREADS);
+        this.maxEvaluations = configuration.argumentAsInt(MAX_EVALUATIONS_KEY, Integer.MAX_VALUE);
         this.c = configuration.argumentAsDouble(C_KEY, DEFAULT_C);
         this.mode = configuration.argumentAsString(MODE_KEY, DEFAULT_MODE);
     }
@@ -67,19 +77,25 @@ public class UpperConfidenceBoundBanditEvaluator extends AbstractEvaluator {
         UpperConfidenceBoundBandits banditAlgo =
                 new UpperConfidenceBoundBandits(prompts.size(), this.samplesPerEval, this.c, this.mode);
         int numPromptsPerRound = Math.min(this.numberOfPromptsPerRound, prompts.size());
+        MinibatchSampler<ClassificationTask> dataSampler = new MinibatchSampler<>(examples, this.random);
+        long evaluations = 0;
         for (int ri = 1; ri <= this.rounds; ri++) {
+            long roundEvaluations = (long) numPromptsPerRound * Math.min(this.samplesPerEval, examples.size());
+            if (ri > 1 && evaluations + roundEvaluations > this.maxEvaluations) {
+                logger.info("Stopping after {} rounds, as the evaluation budget is exhausted", ri - 1);
+                break;
+            }
             // Sample the prompts
             List<Integer> sampledPromptsIdx = banditAlgo.choose(numPromptsPerRound, ri);
             List<String> sampledPrompts = new ArrayList<>();
             for (int idx : sampledPromptsIdx) {
                 sampledPrompts.add(prompts.get(idx));
             }
-            List<ClassificationTask> sampledData = dataSampler(examples, this.samplesPerEval);
+            List<ClassificationTask> sampledData = dataSampler.next(this.samplesPerEval);
             List<Double> scores;
             while (true) {
                 try {
-                    // TODO: Pryzant et al. used multiple threads here
-                    scores = metric.getMetric(sampledPrompts, sampledData);
+                    scores = MetricUtils.getMetricConcurrently(metric, sampledPrompts, sampledData, this.maxThreads);
                     break;
                 } catch (Exception e) {
                     logger.warn("Exception during scoring: {}. Retrying...", e.getMessage());
@@ -88,14 +104,11 @@ public class UpperConfidenceBoundBanditEvaluator extends AbstractEvaluator {
             int[] chosenArray = sampledPromptsIdx.stream().mapToInt(i -> i).toArray();
             double[] scoresArray = scores.stream().mapToDouble(i -> i).toArray();
             banditAlgo.update(chosenArray, scoresArray);
+            evaluations += roundEvaluations;
         }
         return Arrays.stream(banditAlgo.getScores()).boxed().toList();
     }
 
-    private <T> List<T> dataSampler(List<T> list, int samplesPerEval) {
-        return new ArrayList<>(list.subList(0, Math.min(samplesPerEval, list.size())));
-    }
-
     /**
      * Upper Confidence Bound (UCB) Bandits
      * Implements the UCB and UCB-E algorithms for multi-armed bandit problems.
@@ -160,9 +173,11 @@ public class UpperConfidenceBoundBanditEvaluator extends AbstractEvaluator {
          * @return A list of indices of the chosen prompts.
          */
         public List<Integer> choose(int n, int t) {
-            // If all counts are 0, choose randomly.
+            // If all counts are 0, choose randomly without duplicates.
             if (Arrays.equals(counts, new double[counts.length])) {
-                return random.ints(0, numPrompts).limit(n).boxed().toList();
+                List<Integer> indices = new ArrayList<>(IntStream.range(0, numPrompts).boxed().toList());
+                Collections.shuffle(indices, random);
+                return indices.subList(0, Math.min(n, numPrompts));
             }
 
             double[] ucbScores = new double[numPrompts];
@@ -176,20 +191,11 @@ public class UpperConfidenceBoundBanditEvaluator extends AbstractEvaluator {
                     ucbScores[i] = currentScores[i] + c * Math.sqrt(c / count);
                 }
             }
-            return Arrays.stream(ucbScores)
+            // sort the indices by score in descending order, ties keep the order of the prompts
+            return IntStream.range(0, numPrompts)
                     .boxed()
-                    // sort in descending order
-                    .sorted((a, b) -> Double.compare(b, a))
+                    .sorted(Comparator.comparingDouble((Integer i) -> ucbScores[i]).reversed())
                     .limit(n)
-                    .map(score -> {
-                        for (int i = 0; i < ucbScores.length; i++) {
-                            if (ucbScores[i] == score) {
-                                return i;
-                            }
-                        }
-                        // should never happen
-                        return -1;
-                    })
                     .toList();
         }
     }
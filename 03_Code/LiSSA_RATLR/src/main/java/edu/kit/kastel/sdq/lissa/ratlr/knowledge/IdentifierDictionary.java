@@ -0,0 +1,66 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.knowledge;
+
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * Maps the identifiers of artifacts and elements to dense integer indices.
+ * Each distinct identifier is stored once, so collections that refer to identifiers by index (see
+ * {@link TraceLinkSet}) neither keep duplicate strings nor hash or compare full identifiers.
+ * <p>
+ * This class is not thread-safe.
+ */
+public final class IdentifierDictionary {
+    private final Map<String, Integer> indices = new HashMap<>();
+    private final List<String> identifiers = new ArrayList<>();
+
+    /**
+     * Returns the index of an identifier, adding the identifier if it is not known yet.
+     *
+     * @param identifier The identifier
+     * @return The index of the identifier
+     */
+    public int intern(String identifier) {
+        Integer index = indices.get(identifier);
+        if (index == null) {
+            index = identifiers.size();
+            identifiers.add(identifier);
+            indices.put(identifier, index);
+        }
+        return index;
+    }
+
+    /**
+     * Returns the index of an identifier without adding it.
+     *
+     * @param identifier The identifier
+     * @return The index of the identifier, or -1 if it is not known
+     */
+    public int indexOf(String identifier) {
+        Integer index = indices.get(identifier);
+        return index == null ? -1 : index;
+    }
+
+    /**
+     * Returns the identifier with the given index.
+     *
+     * @param index The index returned by {@link #intern(String)}
+     * @return The identifier
+     * @throws IndexOutOfBoundsException If no identifier has the index
+     */
+    public String identifier(int index) {
+        return identifiers.get(index);
+    }
+
+    /**
+     * Returns the number of known identifiers.
+     *
+     * @return The number of identifiers
+     */
+    public int size() {
+        return identifiers.size();
+    }
+}
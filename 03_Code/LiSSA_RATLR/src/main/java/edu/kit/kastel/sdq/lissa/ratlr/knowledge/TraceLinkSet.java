@@ -0,0 +1,334 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.knowledge;
+
+import java.util.AbstractSet;
+import java.util.Arrays;
+import java.util.Collection;
+import java.util.ConcurrentModificationException;
+import java.util.Iterator;
+import java.util.NoSuchElementException;
+
+/**
+ * A set of {@link TraceLink TraceLinks} that stores each link as a single {@code long}.
+ * The source and target identifiers are interned in an {@link IdentifierDictionary}, and a link is stored as the
+ * packed pair of their indices in a primitive open-addressing hash table. Compared to a {@link java.util.HashSet} of
+ * trace links, this avoids one link object and one table entry per link, and hashing or comparing a link only
+ * involves its two indices.
+ * <p>
+ * The set keeps the insertion order, like a {@link java.util.LinkedHashSet}. Its iterator creates the trace link
+ * objects on demand. Sets that share a dictionary (see {@link #TraceLinkSet(IdentifierDictionary)}) also share their
+ * identifier strings. This class is not thread-safe.
+ */
+public final class TraceLinkSet extends AbstractSet<TraceLink> {
+    private static final int INITIAL_CAPACITY = 16;
+    /** Marks an empty slot of the hash table; valid keys are never negative */
+    private static final long EMPTY = -1L;
+    /** Marks a removed link in the insertion order */
+    private static final long REMOVED = -2L;
+
+    private final IdentifierDictionary dictionary;
+
+    /** The keys in insertion order, including removed keys */
+    private long[] order;
+    /** The number of used positions in {@link #order} */
+    private int orderSize;
+
+    /** The hash table of keys */
+    private long[] table;
+    /** The position in {@link #order} of the key in the same slot of {@link #table} */
+    private int[] positions;
+    private int size;
+    private int modifications;
+
+    /**
+     * Creates an empty set with its own identifier dictionary.
+     */
+    public TraceLinkSet() {
+        this(new IdentifierDictionary());
+    }
+
+    /**
+     * Creates an empty set that interns identifiers in the given dictionary.
+     *
+     * @param dictionary The dictionary of the identifiers
+     */
+    public TraceLinkSet(IdentifierDictionary dictionary) {
+        this.dictionary = dictionary;
+        this.order = new long[INITIAL_CAPACITY];
+        this.table = emptyTable(INITIAL_CAPACITY);
+        this.positions = new int[INITIAL_CAPACITY];
+    }
+
+    /**
+     * Creates a set containing the given trace links.
+     * If the given collection is a {@link TraceLinkSet}, the new set shares its dictionary.
+     *
+     * @param traceLinks The trace links to add
+     */
+    public TraceLinkSet(Collection<? extends TraceLink> traceLinks) {
+        this(traceLinks instanceof TraceLinkSet other ? other.dictionary : new IdentifierDictionary());
+        addAll(traceLinks);
+    }
+
+    /**
+     * Creates an empty set for links derived from the given trace links.
+     * If the given collection is a {@link TraceLinkSet}, the new set shares its dictionary, so identifiers that are
+     * kept unchanged are not interned twice.
+     *
+     * @param traceLinks The trace links the new links are derived from
+     * @return An empty trace link set
+     */
+    public static TraceLinkSet derivedFrom(Collection<? extends TraceLink> traceLinks) {
+        return traceLinks instanceof TraceLinkSet other
+                ? new TraceLinkSet(other.dictionary)
+                : new TraceLinkSet(new IdentifierDictionary());
+    }
+
+    /**
+     * Returns the dictionary the identifiers of this set are interned in.
+     *
+     * @return The identifier dictionary
+     */
+    public IdentifierDictionary getDictionary() {
+        return dictionary;
+    }
+
+    /**
+     * Adds the trace link between the given identifiers.
+     *
+     * @param sourceId The identifier of the source
+     * @param targetId The identifier of the target
+     * @return true if the set did not contain the link
+     */
+    public boolean add(String sourceId, String targetId) {
+        return addKey(key(dictionary.intern(sourceId), dictionary.intern(targetId)));
+    }
+
+    @Override
+    public boolean add(TraceLink traceLink) {
+        return add(traceLink.sourceId(), traceLink.targetId());
+    }
+
+    @Override
+    public boolean addAll(Collection<? extends TraceLink> traceLinks) {
+        if (!(traceLinks instanceof TraceLinkSet other) || other.dictionary != dictionary) {
+            return super.addAll(traceLinks);
+        }
+        // Same dictionary, so the keys can be copied directly
+        boolean changed = false;
+        for (int i = 0; i < other.orderSize; i++) {
+            long otherKey = other.order[i];
+            if (otherKey != REMOVED) {
+                changed |= addKey(otherKey);
+            }
+        }
+        return changed;
+    }
+
+    @Override
+    public boolean contains(Object object) {
+        return object instanceof TraceLink traceLink && slotOf(keyOf(traceLink)) >= 0;
+    }
+
+    @Override
+    public boolean remove(Object object) {
+        if (!(object instanceof TraceLink traceLink)) {
+            return false;
+        }
+        int slot = slotOf(keyOf(traceLink));
+        if (slot < 0) {
+            return false;
+        }
+        removeSlot(slot);
+        return true;
+    }
+
+    @Override
+    public int size() {
+        return size;
+    }
+
+    @Override
+    public void clear() {
+        order = new long[INITIAL_CAPACITY];
+        orderSize = 0;
+        table = emptyTable(INITIAL_CAPACITY);
+        positions = new int[INITIAL_CAPACITY];
+        size = 0;
+        modifications++;
+    }
+
+    @Override
+    public Iterator<TraceLink> iterator() {
+        return new Iterator<>() {
+            private int next = skipRemoved(0);
+            private int last = -1;
+            private int expectedModifications = modifications;
+
+            @Override
+            public boolean hasNext() {
+                return next < orderSize;
+            }
+
+            @Override
+            public TraceLink next() {
+                if (expectedModifications != modifications) {
+                    throw new ConcurrentModificationException();
+                }
+                if (next >= orderSize) {
+                    throw new NoSuchElementException();
+                }
+                last = next;
+                next = skipRemoved(next + 1);
+                long key = order[last];
+                return new TraceLink(dictionary.identifier(sourceIndex(key)), dictionary.identifier(targetIndex(key)));
+            }
+
+            @Override
+            public void remove() {
+                if (last < 0) {
+                    throw new IllegalStateException();
+                }
+                if (expectedModifications != modifications) {
+                    throw new ConcurrentModificationException();
+                }
+                // Removing never compacts the order, so the positions of the iterator stay valid
+                removeSlot(slotOf(order[last]));
+                last = -1;
+                expectedModifications = modifications;
+            }
+        };
+    }
+
+    private int skipRemoved(int position) {
+        while (position < orderSize && order[position] == REMOVED) {
+            position++;
+        }
+        return position;
+    }
+
+    private static long key(int sourceIndex, int targetIndex) {
+        return ((long) sourceIndex << 32) | targetIndex;
+    }
+
+    private static int sourceIndex(long key) {
+        return (int) (key >>> 32);
+    }
+
+    private static int targetIndex(long key) {
+        return (int) key;
+    }
+
+    /**
+     * Returns the key of a trace link without interning its identifiers.
+     *
+     * @return The key, or {@link #EMPTY} if an identifier is unknown and the set thus cannot contain the link
+     */
+    private long keyOf(TraceLink traceLink) {
+        int sourceIndex = dictionary.indexOf(traceLink.sourceId());
+        int targetIndex = dictionary.indexOf(traceLink.targetId());
+        return sourceIndex < 0 || targetIndex < 0 ? EMPTY : key(sourceIndex, targetIndex);
+    }
+
+    private int homeSlot(long key) {
+        long hash = key * 0x9E3779B97F4A7C15L;
+        return (int) (hash ^ (hash >>> 32)) & (table.length - 1);
+    }
+
+    /**
+     * Returns the slot of a key in the hash table.
+     *
+     * @return The slot, or -1 if the set does not contain the key
+     */
+    private int slotOf(long key) {
+        if (key == EMPTY) {
+            return -1;
+        }
+        int mask = table.length - 1;
+        for (int slot = homeSlot(key); table[slot] != EMPTY; slot = (slot + 1) & mask) {
+            if (table[slot] == key) {
+                return slot;
+            }
+        }
+        return -1;
+    }
+
+    private boolean addKey(long key) {
+        if (slotOf(key) >= 0) {
+            return false;
+        }
+        if (2 * (size + 1) > table.length) {
+            rehash(table.length * 2);
+        }
+        if (orderSize == order.length) {
+            // Compact the removed keys or grow the order
+            rehash(table.length);
+            if (orderSize == order.length) {
+                order = Arrays.copyOf(order, order.length * 2);
+            }
+        }
+        order[orderSize] = key;
+        insert(key, orderSize);
+        orderSize++;
+        size++;
+        modifications++;
+        return true;
+    }
+
+    private void insert(long key, int position) {
+        int mask = table.length - 1;
+        int slot = homeSlot(key);
+        while (table[slot] != EMPTY) {
+            slot = (slot + 1) & mask;
+        }
+        table[slot] = key;
+        positions[slot] = position;
+    }
+
+    /**
+     * Removes the key in the given slot with backward shift deletion, so lookups never need tombstones.
+     */
+    private void removeSlot(int slot) {
+        order[positions[slot]] = REMOVED;
+        int mask = table.length - 1;
+        int hole = slot;
+        for (int next = (hole + 1) & mask; table[next] != EMPTY; next = (next + 1) & mask) {
+            int home = homeSlot(table[next]);
+            // The key in next may fill the hole if the hole lies between its home slot and next
+            if (((next - home) & mask) >= ((next - hole) & mask)) {
+                table[hole] = table[next];
+                positions[hole] = positions[next];
+                hole = next;
+            }
+        }
+        table[hole] = EMPTY;
+        size--;
+        modifications++;
+    }
+
+    /**
+     * Rebuilds the hash table with the given capacity and removes the removed keys from the insertion order.
+     */
+    private void rehash(int capacity) {
+        long[] compacted = new long[Math.max(order.length, INITIAL_CAPACITY)];
+        int compactedSize = 0;
+        for (int i = 0; i < orderSize; i++) {
+            if (order[i] != REMOVED) {
+                compacted[compactedSize++] = order[i];
+            }
+        }
+        order = compacted;
+        orderSize = compactedSize;
+        table = emptyTable(capacity);
+        positions = new int[capacity];
+        for (int i = 0; i < orderSize; i++) {
+            insert(order[i], i);
+        }
+    }
+
+    private static long[] emptyTable(int capacity) {
+        long[] emptyTable = new long[capacity];
+        Arrays.fill(emptyTable, EMPTY);
+        return emptyTable;
+    }
+}
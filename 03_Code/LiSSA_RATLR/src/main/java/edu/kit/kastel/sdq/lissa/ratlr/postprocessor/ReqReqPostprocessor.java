@@ -1,11 +1,11 @@
 /* Licensed under MIT 2025. */
 package edu.kit.kastel.sdq.lissa.ratlr.postprocessor;
 
-import java.util.LinkedHashSet;
 import java.util.Set;
 
 import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.TraceLink;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.TraceLinkSet;
 
 /**
  * A postprocessor that transforms trace links between requirements.
@@ -39,13 +39,13 @@ public class ReqReqPostprocessor extends TraceLinkIdPostprocessor {
     public Set<TraceLink> postprocess(Set<TraceLink> traceLinks) {
         // TraceLink[sourceId=UC10E1.txt, targetId=UC10E2.txt]
         // => TraceLink[sourceId=UC10E1, targetId=UC10E2]
-        Set<TraceLink> result = new LinkedHashSet<>();
+        TraceLinkSet result = TraceLinkSet.derivedFrom(traceLinks);
         for (TraceLink traceLink : traceLinks) {
             String sourceId = traceLink.sourceId();
             String targetId = traceLink.targetId();
             sourceId = sourceId.substring(0, sourceId.lastIndexOf("."));
             targetId = targetId.substring(0, targetId.lastIndexOf("."));
-            result.add(new TraceLink(sourceId, targetId));
+            result.add(sourceId, targetId);
         }
         return result;
     }
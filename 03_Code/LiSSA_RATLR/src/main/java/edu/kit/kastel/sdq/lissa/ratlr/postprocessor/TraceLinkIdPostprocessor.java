@@ -1,13 +1,13 @@
 /* Licensed under MIT 2025. */
 package edu.kit.kastel.sdq.lissa.ratlr.postprocessor;
 
-import java.util.LinkedHashSet;
 import java.util.Objects;
 import java.util.Set;
 
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.TraceLink;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.TraceLinkSet;
 
 /**
  * Base class for postprocessors that modify trace link identifiers.
@@ -99,7 +99,7 @@ public class TraceLinkIdPostprocessor {
         if (idProcessor == null) {
             throw new IllegalStateException("idProcessor not set or method not overridden");
         }
-        Set<TraceLink> result = new LinkedHashSet<>();
+        Set<TraceLink> result = TraceLinkSet.derivedFrom(traceLinks);
         for (TraceLink traceLink : traceLinks) {
             result.add(idProcessor.process(traceLink));
         }
@@ -0,0 +1,187 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.preprocessor;
+
+import java.io.IOException;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.StandardCopyOption;
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.stream.Collectors;
+
+import com.fasterxml.jackson.core.JsonProcessingException;
+import com.fasterxml.jackson.core.type.TypeReference;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.fasterxml.jackson.databind.SerializationFeature;
+
+import edu.kit.kastel.sdq.lissa.ratlr.cache.CacheManager;
+import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
+import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Artifact;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.KeyGenerator;
+
+/**
+ * Persists the elements of a deterministic preprocessor in the cache directory, so later runs with the same
+ * artifacts and preprocessor configuration read the elements instead of extracting them again.
+ * <p>
+ * The elements are stored in {@code preprocessing/<preprocessor key>/<artifact key>.json}. The preprocessor key
+ * covers the configuration and {@link #CACHE_VERSION}; the artifact key covers the identifier, type, and content of
+ * the artifact. For preprocessors that handle each artifact on its own, every artifact is stored separately, so a
+ * change of some files only preprocesses these files again. Other preprocessors are cached per set of artifacts.
+ * Without a cache directory, the delegate is called directly.
+ */
+final class CachedPreprocessor extends Preprocessor {
+    /**
+     * Version of the cached elements. Increment it whenever a cached preprocessor extracts different elements, so
+     * existing entries are not reused.
+     */
+    static final int CACHE_VERSION = 1;
+
+    private static final String CACHE_DIRECTORY = "preprocessing";
+    private static final ObjectMapper MAPPER =
+            new ObjectMapper().configure(SerializationFeature.ORDER_MAP_ENTRIES_BY_KEYS, true);
+
+    private final Preprocessor delegate;
+    private final ModuleConfiguration configuration;
+    private final boolean perArtifact;
+
+    /**
+     * Creates a caching preprocessor.
+     *
+     * @param delegate The preprocessor that extracts the elements on a cache miss
+     * @param configuration The configuration of the delegate
+     * @param perArtifact Whether the delegate extracts the elements of each artifact independently of the others
+     * @param contextStore The shared context store for pipeline components
+     */
+    CachedPreprocessor(
+            Preprocessor delegate, ModuleConfiguration configuration, boolean perArtifact, ContextStore contextStore) {
+        super(contextStore);
+        this.delegate = delegate;
+        this.configuration = configuration;
+        this.perArtifact = perArtifact;
+    }
+
+    @Override
+    public List<Element> preprocess(List<Artifact> artifacts) {
+        if (!CacheManager.hasDefaultInstance()) {
+            return delegate.preprocess(artifacts);
+        }
+        Path directory = CacheManager.getDefaultInstance()
+                .getCacheDirectory()
+                .resolve(CACHE_DIRECTORY)
+                .resolve(preprocessorKey());
+
+        if (!perArtifact) {
+            String key = KeyGenerator.generateKey(
+                    artifacts.stream().map(CachedPreprocessor::artifactKey).collect(Collectors.joining("\n")));
+            Path file = directory.resolve(key + ".json");
+            List<Element> elements = load(file);
+            if (elements != null) {
+                logger.info("Reusing the preprocessed elements of {} artifacts", artifacts.size());
+                return elements;
+            }
+            elements = delegate.preprocess(artifacts);
+            store(file, elements);
+            return elements;
+        }
+
+        List<Element> elements = new ArrayList<>();
+        int reused = 0;
+        for (Artifact artifact : artifacts) {
+            Path file = directory.resolve(artifactKey(artifact) + ".json");
+            List<Element> elementsOfArtifact = load(file);
+            if (elementsOfArtifact == null) {
+                elementsOfArtifact = delegate.preprocess(List.of(artifact));
+                store(file, elementsOfArtifact);
+            } else {
+                reused++;
+            }
+            elements.addAll(elementsOfArtifact);
+        }
+        logger.info("Reusing the preprocessed elements of {} of {} artifacts", reused, artifacts.size());
+        return elements;
+    }
+
+    private String preprocessorKey() {
+        try {
+            return KeyGenerator.generateKey(CACHE_VERSION + "_" + MAPPER.writeValueAsString(configuration));
+        } catch (JsonProcessingException e) {
+            throw new IllegalArgumentException("Could not serialize preprocessor configuration", e);
+        }
+    }
+
+    private static String artifactKey(Artifact artifact) {
+        return KeyGenerator.generateKey(
+                artifact.getIdentifier() + "\0" + artifact.getType() + "\0" + artifact.getContent());
+    }
+
+    /**
+     * Loads cached elements and links them to their parents.
+     *
+     * @return The elements, or null if the file does not exist or cannot be used
+     */
+    private List<Element> load(Path file) {
+        if (!Files.isRegularFile(file)) {
+            return null;
+        }
+        List<StoredElement> stored;
+        try {
+            stored = MAPPER.readValue(file.toFile(), new TypeReference<List<StoredElement>>() {});
+        } catch (IOException e) {
+            logger.warn("Could not read preprocessed elements {}, preprocessing again", file, e);
+            return null;
+        }
+        Map<String, Element> elementsById = new HashMap<>();
+        List<Element> elements = new ArrayList<>(stored.size());
+        for (StoredElement storedElement : stored) {
+            Element parent = null;
+            if (storedElement.parentId() != null) {
+                parent = elementsById.get(storedElement.parentId());
+                if (parent == null) {
+                    logger.warn("Preprocessed elements {} are inconsistent, preprocessing again", file);
+                    return null;
+                }
+            }
+            Element element = new Element(
+                    storedElement.identifier(),
+                    storedElement.type(),
+                    storedElement.content(),
+                    storedElement.granularity(),
+                    parent,
+                    storedElement.compare());
+            elementsById.put(element.getIdentifier(), element);
+            elements.add(element);
+        }
+        return elements;
+    }
+
+    private void store(Path file, List<Element> elements) {
+        List<StoredElement> stored = new ArrayList<>(elements.size());
+        for (Element element : elements) {
+            stored.add(new StoredElement(
+                    element.getIdentifier(),
+                    element.getType(),
+                    element.getContent(),
+                    element.getGranularity(),
+                    element.getParent() == null ? null : element.getParent().getIdentifier(),
+                    element.isCompare()));
+        }
+        try {
+            Files.createDirectories(file.getParent());
+            Path tempFile = Files.createTempFile(file.getParent(), file.getFileName().toString(), ".tmp");
+            MAPPER.writeValue(tempFile.toFile(), stored);
+            Files.move(tempFile, file, StandardCopyOption.REPLACE_EXISTING);
+        } catch (IOException e) {
+            logger.warn("Could not write preprocessed elements {}", file, e);
+        }
+    }
+
+    /**
+     * The persisted form of an element. Parents precede their children, so they can be linked while loading.
+     */
+    record StoredElement(
+            String identifier, String type, String content, int granularity, String parentId, boolean compare) {}
+}
@@ -43,7 +43,8 @@ import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
  * </ul>
  *
  * Each preprocessor type is created based on the module configuration and
- * implements its own strategy for extracting elements from artifacts.
+ * implements its own strategy for extracting elements from artifacts. The elements of all deterministic
+ * preprocessors are persisted in the cache directory (see {@link CachedPreprocessor}).
  */
 public abstract class Preprocessor {
     /** Separator used in element identifiers */
@@ -89,24 +90,43 @@ public abstract class Preprocessor {
      */
     public static Preprocessor createPreprocessor(ModuleConfiguration configuration, ContextStore contextStore) {
         return switch (configuration.name().split(CONFIG_NAME_SEPARATOR)[0]) {
-            case "sentence" -> new SentencePreprocessor(configuration, contextStore);
+            case "sentence" -> cached(new SentencePreprocessor(configuration, contextStore), configuration, true);
             case "code" ->
                 switch (configuration.name()) {
-                    case "code_chunking" -> new CodeChunkingPreprocessor(configuration, contextStore);
-                    case "code_method" -> new CodeMethodPreprocessor(configuration, contextStore);
-                    case "code_tree" -> new CodeTreePreprocessor(configuration, contextStore);
+                    case "code_chunking" ->
+                        cached(new CodeChunkingPreprocessor(configuration, contextStore), configuration, true);
+                    case "code_method" ->
+                        cached(new CodeMethodPreprocessor(configuration, contextStore), configuration, true);
+                    case "code_tree" ->
+                        cached(new CodeTreePreprocessor(configuration, contextStore), configuration, false);
                     default ->
                         throw new IllegalArgumentException("Unsupported preprocessor name: " + configuration.name());
                 };
             case "model" ->
                 switch (configuration.name()) {
-                    case "model_uml" -> new ModelUMLPreprocessor(configuration, contextStore);
+                    case "model_uml" ->
+                        cached(new ModelUMLPreprocessor(configuration, contextStore), configuration, true);
                     default ->
                         throw new IllegalArgumentException("Unsupported preprocessor name: " + configuration.name());
                 };
+            // The summaries are cached per language model request
             case "summarize" -> new SummarizePreprocessor(configuration, contextStore);
-            case "artifact" -> new SingleArtifactPreprocessor(contextStore);
+            case "artifact" -> cached(new SingleArtifactPreprocessor(contextStore), configuration, true);
             default -> throw new IllegalStateException("Unexpected value: " + configuration.name());
         };
     }
+
+    /**
+     * Wraps a deterministic preprocessor, so its elements are persisted in the cache directory.
+     *
+     * @param preprocessor The preprocessor to wrap
+     * @param configuration The configuration of the preprocessor
+     * @param perArtifact Whether the preprocessor extracts the elements of each artifact independently
+     * @return The caching preprocessor
+     * @see CachedPreprocessor
+     */
+    private static Preprocessor cached(
+            Preprocessor preprocessor, ModuleConfiguration configuration, boolean perArtifact) {
+        return new CachedPreprocessor(preprocessor, configuration, perArtifact, preprocessor.contextStore);
+    }
 }
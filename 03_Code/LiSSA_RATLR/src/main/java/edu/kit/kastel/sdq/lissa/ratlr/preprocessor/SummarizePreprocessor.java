@@ -8,6 +8,7 @@ import java.util.concurrent.*;
 import edu.kit.kastel.sdq.lissa.ratlr.cache.Cache;
 import edu.kit.kastel.sdq.lissa.ratlr.cache.CacheManager;
 import edu.kit.kastel.sdq.lissa.ratlr.cache.ClassifierCacheKey;
+import edu.kit.kastel.sdq.lissa.ratlr.cache.SingleFlight;
 import edu.kit.kastel.sdq.lissa.ratlr.classifier.ChatLanguageModelProvider;
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
@@ -15,8 +16,6 @@ import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Artifact;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
 import edu.kit.kastel.sdq.lissa.ratlr.utils.Futures;
 
-import dev.langchain4j.model.chat.ChatModel;
-
 /**
  * A preprocessor that generates summaries of artifacts using a language model.
  * This preprocessor is part of the "summarize" type in the preprocessor hierarchy.
@@ -81,8 +80,8 @@ public class SummarizePreprocessor extends Preprocessor {
      * The method handles parallel processing efficiently:
      * <ul>
      *     <li>Uses a thread pool with the configured number of threads</li>
-     *     <li>Creates a new model instance per thread when using multiple threads</li>
-     *     <li>Shares a single model instance when using one thread</li>
+     *     <li>Shares the single model instance of the provider across all threads</li>
+     *     <li>Coalesces concurrent requests with the same cache key into one model request</li>
      * </ul>
      *
      * @param artifacts The list of artifacts to summarize
@@ -114,15 +113,7 @@ public class SummarizePreprocessor extends Preprocessor {
                         ClassifierCacheKey.Mode.CHAT,
                         request);
 
-                String cachedResponse = cache.get(cacheKey, String.class);
-                if (cachedResponse != null) {
-                    return cachedResponse;
-                }
-
-                ChatModel chatModel = threads > 1 ? provider.createChatModel() : llmInstance;
-                String response = chatModel.chat(request);
-                cache.put(cacheKey, response);
-                return response;
+                return SingleFlight.getOrCompute(cache, cacheKey, String.class, () -> llmInstance.chat(request));
             });
         }
 
@@ -36,7 +36,12 @@ public class FBetaMetric extends GlobalMetric {
             Classifier classifier,
             ResultAggregator aggregator,
             TraceLinkIdPostprocessor postprocessor) {
-        super(classifier, aggregator, postprocessor);
+        super(
+                classifier,
+                aggregator,
+                postprocessor,
+                configuration.argumentAsInt(
+                        MetricUtils.MAX_PARALLEL_PROMPTS_KEY, MetricUtils.DEFAULT_MAX_PARALLEL_PROMPTS));
         this.beta = configuration.argumentAsInt(BETA_CONFIGURATION_KEY, DEFAULT_BETA);
     }
 
@@ -64,7 +69,14 @@ public class FBetaMetric extends GlobalMetric {
                 trueNegative++;
             }
         }
+        return reduce(truePositive, falsePositive, falseNegative, trueNegative);
+    }
 
+    /**
+     * Computes the F-beta score from the confusion counts.
+     */
+    @Override
+    public double reduce(int truePositive, int falsePositive, int falseNegative, int trueNegative) {
         if (truePositive + trueNegative == 0) {
             return 0.0;
         }
@@ -2,11 +2,12 @@
 package edu.kit.kastel.sdq.lissa.ratlr.promptmetric;
 
 import java.util.ArrayList;
+import java.util.BitSet;
 import java.util.Collection;
 import java.util.HashMap;
+import java.util.HashSet;
 import java.util.List;
 import java.util.Map;
-import java.util.Optional;
 import java.util.Set;
 import java.util.stream.Collectors;
 
@@ -18,6 +19,7 @@ import edu.kit.kastel.sdq.lissa.ratlr.classifier.ClassificationTask;
 import edu.kit.kastel.sdq.lissa.ratlr.classifier.Classifier;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.TraceLink;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.TraceLinkSet;
 import edu.kit.kastel.sdq.lissa.ratlr.postprocessor.TraceLinkIdPostprocessor;
 import edu.kit.kastel.sdq.lissa.ratlr.resultaggregator.ResultAggregator;
 import edu.kit.kastel.sdq.lissa.ratlr.utils.Pair;
@@ -36,26 +38,36 @@ public abstract class GlobalMetric implements Metric {
     private final boolean usesCustomAggregator;
     private final TraceLinkIdPostprocessor postprocessor;
     private final Cache cache;
+    private final int maxParallelPrompts;
 
-    protected GlobalMetric(Classifier classifier, ResultAggregator aggregator, TraceLinkIdPostprocessor postprocessor) {
+    /**
+     * The outcomes of the prompts per task, used if the classification results are not aggregated by a custom
+     * aggregator, as the score of any subset of tasks can then be derived from the outcomes of its tasks.
+     */
+    private final OutcomeMatrix outcomes;
+
+    protected GlobalMetric(
+            Classifier classifier,
+            ResultAggregator aggregator,
+            TraceLinkIdPostprocessor postprocessor,
+            int maxParallelPrompts) {
         this.classifier = classifier;
         this.aggregator = aggregator;
         this.usesCustomAggregator = aggregator != null;
         this.postprocessor = postprocessor;
+        this.maxParallelPrompts = maxParallelPrompts;
+        this.outcomes = new OutcomeMatrix();
         this.cache = CacheManager.getDefaultInstance().getCache(this, getCacheParameters());
     }
 
     /**
      * This method computes scores for a list of prompts and classification task examples.
      * Each prompt is delegated to the {@link #getMetric(String, List)} method for scoring with the entire example set.
+     * Up to {@link MetricUtils#MAX_PARALLEL_PROMPTS_KEY} prompts are scored concurrently.
      */
     @Override
     public List<Double> getMetric(List<String> prompts, List<ClassificationTask> examples) {
-        List<Double> scores = new ArrayList<>();
-        for (String prompt : prompts) {
-            scores.add(getMetric(prompt, examples));
-        }
-        return scores;
+        return MetricUtils.getMetricConcurrently(this, prompts, examples, maxParallelPrompts);
     }
 
     /**
@@ -63,9 +75,15 @@ public abstract class GlobalMetric implements Metric {
      * It classifies the examples using the specified classifier and aggregates the results into accepted and rejected sets.
      * The final metric value is computed by reducing the classified results against the ground truth using the
      * abstract {@link #reduce(Collection, Collection, Collection)} method.
+     * <p>
+     * Without a custom aggregator, the score is derived from the {@link OutcomeMatrix} of this metric, and only the
+     * examples that were never classified with the prompt are classified.
      */
     @Override
     public Double getMetric(String prompt, List<ClassificationTask> examples) {
+        if (!usesCustomAggregator) {
+            return getMetricFromOutcomes(prompt, examples);
+        }
         ScorerCacheKey key = ScorerCacheKey.of(prompt, examples.toString());
         if (cache.containsKey(key)) {
             return cache.get(key, Double.class);
@@ -75,12 +93,28 @@ public abstract class GlobalMetric implements Metric {
                 .filter(ClassificationTask::label)
                 .map(task -> TraceLink.of(
                         task.source().getIdentifier(), task.target().getIdentifier()))
-                .collect(Collectors.toSet());
+                .collect(Collectors.toCollection(TraceLinkSet::new));
         Double score = reduce(classifiedLinks.first(), classifiedLinks.second(), groundTruth);
         cache.put(key, score);
         return score;
     }
 
+    private double getMetricFromOutcomes(String prompt, List<ClassificationTask> examples) {
+        BitSet subset = outcomes.indicesOf(examples);
+        List<ClassificationTask> unknownTasks = outcomes.unknownTasks(prompt, examples);
+        if (!unknownTasks.isEmpty()) {
+            Classifier promptClassifier = classifier.copyOf();
+            promptClassifier.setClassificationPrompt(prompt);
+            List<Pair<String, String>> accepted = new ArrayList<>();
+            for (ClassificationResult result : promptClassifier.classify(unknownTasks)) {
+                accepted.add(new Pair<>(result.source().getIdentifier(), result.target().getIdentifier()));
+            }
+            outcomes.record(prompt, unknownTasks, accepted);
+        }
+        int[] counts = outcomes.count(prompt, subset);
+        return reduce(counts[0], counts[1], counts[2], counts[3]);
+    }
+
     /**
      * Reduces the given collections of items, rejected items, and ground truth into a single score.
      * The specific reduction strategy is defined in implementations.
@@ -93,24 +127,40 @@ public abstract class GlobalMetric implements Metric {
      */
     protected abstract <T> double reduce(Collection<T> items, Collection<T> rejectedItems, Collection<T> groundTruth);
 
+    /**
+     * Reduces the confusion counts of the classified items into a single score.
+     * The result must be equal to {@link #reduce(Collection, Collection, Collection)} for items with these counts.
+     *
+     * @param truePositive The number of accepted items contained in the ground truth.
+     * @param falsePositive The number of accepted items not contained in the ground truth.
+     * @param falseNegative The number of rejected items contained in the ground truth.
+     * @param trueNegative The number of rejected items not contained in the ground truth.
+     * @return A double representing the reduced score.
+     */
+    protected abstract double reduce(int truePositive, int falsePositive, int falseNegative, int trueNegative);
+
     /**
      * Classifies the given tasks using the specified prompt and aggregates the results into sets of accepted and rejected trace links.
+     * The tasks are classified by a copy of the classifier that is scoped to the prompt, so several prompts can be
+     * classified concurrently. The copy classifies the tasks in parallel according to its configured threads.
      *
      * @param prompt The prompt to use for classification.
      * @param tasks The collection of classification tasks to be classified.
      * @return A pair containing two sets of trace links: the first set contains accepted links, and the second set contains rejected links.
      */
     private Pair<Set<TraceLink>, Set<TraceLink>> classify(String prompt, Collection<ClassificationTask> tasks) {
-        classifier.setClassificationPrompt(prompt);
-        List<ClassificationResult> acceptedTraceLinks = new ArrayList<>();
-        List<ClassificationResult> rejectedTraceLinks = new ArrayList<>();
-        new Pair<>(new ArrayList<>(), new ArrayList<>());
+        Classifier promptClassifier = classifier.copyOf();
+        promptClassifier.setClassificationPrompt(prompt);
+        List<ClassificationResult> acceptedTraceLinks = promptClassifier.classify(tasks);
 
+        Set<Pair<String, String>> acceptedPairs = new HashSet<>();
+        for (ClassificationResult result : acceptedTraceLinks) {
+            acceptedPairs.add(
+                    new Pair<>(result.source().getIdentifier(), result.target().getIdentifier()));
+        }
+        List<ClassificationResult> rejectedTraceLinks = new ArrayList<>();
         for (ClassificationTask task : tasks) {
-            Optional<ClassificationResult> result = classifier.classify(task);
-            if (result.isPresent()) {
-                acceptedTraceLinks.add(result.get());
-            } else {
+            if (!isAccepted(task, acceptedPairs)) {
                 // TODO: Is there a constant for use instead of 0.0?
                 rejectedTraceLinks.add(new ClassificationResult(task.source(), task.target(), 0.0));
             }
@@ -118,6 +168,21 @@ public abstract class GlobalMetric implements Metric {
         return new Pair<>(aggregate(acceptedTraceLinks), aggregate(rejectedTraceLinks));
     }
 
+    /**
+     * Checks whether a task was classified as trace link, either to its target or, as by classifiers that use the
+     * original artifacts, to an ancestor of its target. This matches the outcomes recorded in the
+     * {@link OutcomeMatrix}.
+     */
+    private static boolean isAccepted(ClassificationTask task, Set<Pair<String, String>> acceptedPairs) {
+        String sourceId = task.source().getIdentifier();
+        for (Element target = task.target(); target != null; target = target.getParent()) {
+            if (acceptedPairs.contains(new Pair<>(sourceId, target.getIdentifier()))) {
+                return true;
+            }
+        }
+        return false;
+    }
+
     /**
      * Aggregates the classification results into a set of trace links using either a custom aggregator or a default method.
      *
@@ -151,7 +216,7 @@ public abstract class GlobalMetric implements Metric {
         return classificationResults.stream()
                 .map(result -> TraceLink.of(
                         result.source().getIdentifier(), result.target().getIdentifier()))
-                .collect(Collectors.toSet());
+                .collect(Collectors.toCollection(TraceLinkSet::new));
     }
 
     private Map<String, String> getCacheParameters() {
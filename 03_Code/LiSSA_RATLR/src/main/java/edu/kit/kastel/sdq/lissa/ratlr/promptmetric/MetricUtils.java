@@ -1,11 +1,77 @@
 /* Licensed under MIT 2025. */
 package edu.kit.kastel.sdq.lissa.ratlr.promptmetric;
 
+import java.util.ArrayList;
+import java.util.List;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.concurrent.Semaphore;
+
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+
+import edu.kit.kastel.sdq.lissa.ratlr.classifier.ClassificationTask;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.Futures;
+
 public final class MetricUtils {
     public static final double MAXIMUM_SCORE = 1.0;
     public static final double MINIMUM_SCORE = 0.0;
 
+    /**
+     * The configuration key for the maximum number of prompts that are scored concurrently.
+     */
+    public static final String MAX_PARALLEL_PROMPTS_KEY = "max_parallel_prompts";
+
+    /**
+     * The default maximum number of prompts that are scored concurrently.
+     * The concurrency of the requests to a language model is additionally limited by the dispatcher of its platform.
+     */
+    public static final int DEFAULT_MAX_PARALLEL_PROMPTS = 4;
+
+    private static final Logger logger = LoggerFactory.getLogger(MetricUtils.class);
+
     private MetricUtils() {
         throw new IllegalAccessError("Utility class should not be instantiated.");
     }
+
+    /**
+     * Scores several prompts concurrently with {@link Metric#getMetric(String, List)}.
+     * At most {@code maxParallelPrompts} prompts are scored at the same time.
+     *
+     * @param metric The metric to score the prompts with
+     * @param prompts The prompts to score
+     * @param examples The classification tasks to score the prompts against
+     * @param maxParallelPrompts The maximum number of prompts scored at the same time
+     * @return The scores in the order of the prompts
+     */
+    public static List<Double> getMetricConcurrently(
+            Metric metric, List<String> prompts, List<ClassificationTask> examples, int maxParallelPrompts) {
+        List<Double> scores = new ArrayList<>(prompts.size());
+        if (prompts.size() <= 1 || maxParallelPrompts <= 1) {
+            for (String prompt : prompts) {
+                scores.add(metric.getMetric(prompt, examples));
+            }
+            return scores;
+        }
+
+        Semaphore slots = new Semaphore(maxParallelPrompts);
+        try (ExecutorService executor = Executors.newVirtualThreadPerTaskExecutor()) {
+            List<Future<Double>> futures = new ArrayList<>(prompts.size());
+            for (String prompt : prompts) {
+                futures.add(executor.submit(() -> {
+                    slots.acquire();
+                    try {
+                        return metric.getMetric(prompt, examples);
+                    } finally {
+                        slots.release();
+                    }
+                }));
+            }
+            for (Future<Double> future : futures) {
+                scores.add(Futures.getLogged(future, logger));
+            }
+        }
+        return scores;
+    }
 }
@@ -0,0 +1,151 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.promptmetric;
+
+import java.util.ArrayList;
+import java.util.BitSet;
+import java.util.Collection;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+import edu.kit.kastel.sdq.lissa.ratlr.classifier.ClassificationTask;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.Pair;
+
+/**
+ * Stores the classification outcomes of prompts per task for the lifetime of a metric, i.e., of an optimization.
+ * <p>
+ * Each distinct task, identified by the identifiers of its source and target element, gets an index. Per prompt, the
+ * matrix holds two bitsets over these indices: the tasks whose outcome is known and the tasks that were classified as
+ * trace links. The confusion counts of any subset of tasks are derived with bit operations, so repeated scoring of
+ * overlapping subsets (e.g., minibatches or single tasks) only classifies the (prompt, task) cells that were never
+ * seen before.
+ * <p>
+ * All methods are thread-safe.
+ */
+final class OutcomeMatrix {
+    private final Map<Pair<String, String>, Integer> taskIndices = new HashMap<>();
+    private final BitSet labels = new BitSet();
+    private final Map<String, PromptOutcomes> promptOutcomes = new HashMap<>();
+
+    /**
+     * Returns the indices of the given tasks, assigning new indices to unseen tasks.
+     * Tasks with the same source and target identifiers share an index; the index is labeled as trace link if any of
+     * these tasks is labeled as trace link.
+     *
+     * @param tasks The tasks to index
+     * @return The set of indices of the tasks
+     */
+    synchronized BitSet indicesOf(Collection<ClassificationTask> tasks) {
+        BitSet indices = new BitSet();
+        for (ClassificationTask task : tasks) {
+            int index = taskIndices.computeIfAbsent(keyOf(task), key -> taskIndices.size());
+            if (task.label()) {
+                labels.set(index);
+            }
+            indices.set(index);
+        }
+        return indices;
+    }
+
+    /**
+     * Returns one task per index whose outcome for the prompt is not known yet.
+     *
+     * @param prompt The prompt
+     * @param tasks The tasks to check
+     * @return The tasks that have to be classified with the prompt
+     */
+    synchronized List<ClassificationTask> unknownTasks(String prompt, Collection<ClassificationTask> tasks) {
+        PromptOutcomes outcomes = promptOutcomes.get(prompt);
+        BitSet selected = new BitSet();
+        List<ClassificationTask> unknown = new ArrayList<>();
+        for (ClassificationTask task : tasks) {
+            int index = taskIndices.get(keyOf(task));
+            if ((outcomes == null || !outcomes.known.get(index)) && !selected.get(index)) {
+                selected.set(index);
+                unknown.add(task);
+            }
+        }
+        return unknown;
+    }
+
+    /**
+     * Records the outcomes of classifying the given tasks with the prompt.
+     * <p>
+     * Classifiers may report a trace link to an ancestor of the target of a task instead of the target itself, e.g., a
+     * reasoning classifier that uses the original artifacts. Such a result is the outcome of all classified tasks with
+     * the same source whose target descends from the reported target, as they were classified with the same request.
+     *
+     * @param prompt The prompt
+     * @param tasks The classified tasks
+     * @param accepted The identifiers of the source and target elements of the results classified as trace links
+     */
+    synchronized void record(
+            String prompt, Collection<ClassificationTask> tasks, Collection<Pair<String, String>> accepted) {
+        PromptOutcomes outcomes = promptOutcomes.computeIfAbsent(prompt, key -> new PromptOutcomes());
+        BitSet classified = new BitSet();
+        Map<Pair<String, String>, BitSet> indicesByAncestor = new HashMap<>();
+        for (ClassificationTask task : tasks) {
+            int index = taskIndices.get(keyOf(task));
+            classified.set(index);
+            for (Element ancestor = task.target().getParent(); ancestor != null; ancestor = ancestor.getParent()) {
+                indicesByAncestor
+                        .computeIfAbsent(
+                                new Pair<>(task.source().getIdentifier(), ancestor.getIdentifier()),
+                                key -> new BitSet())
+                        .set(index);
+            }
+        }
+        outcomes.known.or(classified);
+        for (Pair<String, String> key : accepted) {
+            Integer index = taskIndices.get(key);
+            if (index != null && classified.get(index)) {
+                outcomes.accepted.set(index);
+            }
+            BitSet descendants = indicesByAncestor.get(key);
+            if (descendants != null) {
+                outcomes.accepted.or(descendants);
+            }
+        }
+    }
+
+    /**
+     * Counts the outcomes of the prompt on the given subset of tasks.
+     * The outcomes of all tasks of the subset must be known.
+     *
+     * @param prompt The prompt
+     * @param subset The indices of the tasks, see {@link #indicesOf(Collection)}
+     * @return The confusion counts as array of true positives, false positives, false negatives, and true negatives
+     * @throws IllegalStateException If the outcome of a task of the subset is unknown
+     */
+    synchronized int[] count(String prompt, BitSet subset) {
+        PromptOutcomes outcomes = promptOutcomes.getOrDefault(prompt, new PromptOutcomes());
+        BitSet unknown = (BitSet) subset.clone();
+        unknown.andNot(outcomes.known);
+        if (!unknown.isEmpty()) {
+            throw new IllegalStateException("Outcomes of %d tasks are unknown".formatted(unknown.cardinality()));
+        }
+
+        BitSet accepted = (BitSet) subset.clone();
+        accepted.and(outcomes.accepted);
+        BitSet relevant = (BitSet) subset.clone();
+        relevant.and(labels);
+        BitSet truePositives = (BitSet) accepted.clone();
+        truePositives.and(labels);
+
+        int truePositive = truePositives.cardinality();
+        int falsePositive = accepted.cardinality() - truePositive;
+        int falseNegative = relevant.cardinality() - truePositive;
+        int trueNegative = subset.cardinality() - truePositive - falsePositive - falseNegative;
+        return new int[] {truePositive, falsePositive, falseNegative, trueNegative};
+    }
+
+    static Pair<String, String> keyOf(ClassificationTask task) {
+        return new Pair<>(task.source().getIdentifier(), task.target().getIdentifier());
+    }
+
+    private static final class PromptOutcomes {
+        private final BitSet known = new BitSet();
+        private final BitSet accepted = new BitSet();
+    }
+}
@@ -37,6 +37,7 @@ public class PointwiseMetric implements Metric {
     private final Reductor reductor;
     private final Classifier classifier;
     private final Cache cache;
+    private final int maxParallelPrompts;
 
     public PointwiseMetric(ModuleConfiguration configuration, Classifier classifier) {
         this.scorer =
@@ -44,20 +45,19 @@ public class PointwiseMetric implements Metric {
         this.reductor = ReductorFactory.createReductor(
                 configuration.argumentAsString(REDUCTOR_CONFIGURATION_KEY, DEFAULT_REDUCTOR));
         this.classifier = classifier;
+        this.maxParallelPrompts = configuration.argumentAsInt(
+                MetricUtils.MAX_PARALLEL_PROMPTS_KEY, MetricUtils.DEFAULT_MAX_PARALLEL_PROMPTS);
         this.cache = CacheManager.getDefaultInstance().getCache(this, getCacheParameters());
     }
 
     /**
      * This method computes scores for a list of prompts and classification task examples.
      * Each prompt is delegated to the {@link #getMetric(String, List)} method for scoring with the entire example set.
+     * Up to {@link MetricUtils#MAX_PARALLEL_PROMPTS_KEY} prompts are scored concurrently.
      */
     @Override
     public List<Double> getMetric(List<String> prompts, List<ClassificationTask> examples) {
-        List<Double> scores = new ArrayList<>();
-        for (String prompt : prompts) {
-            scores.add(getMetric(prompt, examples));
-        }
-        return scores;
+        return MetricUtils.getMetricConcurrently(this, prompts, examples, maxParallelPrompts);
     }
 
     /**
@@ -100,8 +100,10 @@ public class PointwiseMetric implements Metric {
      */
     private List<ClassificationResult> classify(String prompt, List<ClassificationTask> examples) {
         List<ClassificationResult> results = new ArrayList<>();
-        classifier.setClassificationPrompt(prompt);
-        List<ClassificationResult> classifications = classifier.classify(examples);
+        // A copy scoped to the prompt, so several prompts can be classified concurrently
+        Classifier promptClassifier = classifier.copyOf();
+        promptClassifier.setClassificationPrompt(prompt);
+        List<ClassificationResult> classifications = promptClassifier.classify(examples);
 
         Map<String, ClassificationResult> classificationMap = new HashMap<>();
         for (ClassificationResult classification : classifications) {
@@ -9,13 +9,22 @@ import static edu.kit.kastel.sdq.lissa.ratlr.utils.ChatLanguageModelUtils.nCache
 import java.util.ArrayList;
 import java.util.Collection;
 import java.util.Collections;
+import java.util.Comparator;
 import java.util.HashMap;
 import java.util.HashSet;
 import java.util.List;
 import java.util.Map;
+import java.util.Optional;
 import java.util.Set;
+import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.concurrent.Semaphore;
+import java.util.function.Supplier;
 import java.util.regex.Pattern;
 import java.util.stream.Collectors;
+import java.util.stream.IntStream;
 
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
@@ -31,6 +40,7 @@ import edu.kit.kastel.sdq.lissa.ratlr.promptmetric.Metric;
 import edu.kit.kastel.sdq.lissa.ratlr.promptoptimizer.samplestrategy.FirstSampler;
 import edu.kit.kastel.sdq.lissa.ratlr.promptoptimizer.samplestrategy.OrderedFirstSampler;
 import edu.kit.kastel.sdq.lissa.ratlr.promptoptimizer.samplestrategy.SampleStrategy;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.Futures;
 import edu.kit.kastel.sdq.lissa.ratlr.utils.Pair;
 
 /**
@@ -47,6 +57,9 @@ public class AutomaticPromptOptimizer extends IterativeOptimizer {
     private static final String END_TAG = "<END>";
     private static final String SECTION_HEADER_PREFIX = "# ";
     private static final String TASK_SECTION = "task";
+    private static final String SAMPLER_RANDOM = "sampler";
+    private static final String EVALUATOR_RANDOM = "evaluator";
+    private static final String FILTER_EVALUATOR_RANDOM = "filter_evaluator";
 
     private static final Pattern SECTION_HEADER_NORMALIZATION_PATTERN =
             Pattern.compile("\\p{Punct}", Pattern.UNICODE_CHARACTER_CLASS);
@@ -63,6 +76,13 @@ public class AutomaticPromptOptimizer extends IterativeOptimizer {
     private final SampleStrategy orderedSampleStrategy;
     private final SampleStrategy firstSampleStrategy;
 
+    /**
+     * Limits the concurrent requests of the candidate expansion to {@link GradientOptimizerConfig#expansionThreads()}.
+     */
+    private final Semaphore requestSlots;
+
+    private CheckpointStore checkpointStore;
+
     public AutomaticPromptOptimizer(
             ModuleConfiguration configuration,
             Set<TraceLink> goldStandard,
@@ -75,6 +95,7 @@ public class AutomaticPromptOptimizer extends IterativeOptimizer {
         this.orderedSampleStrategy = new OrderedFirstSampler();
         this.firstSampleStrategy = new FirstSampler();
         this.bruteForceEvaluator = new BruteForceEvaluator(new ModuleConfiguration("", Collections.emptyMap()));
+        this.requestSlots = new Semaphore(Math.max(1, config.expansionThreads()));
     }
 
     /**
@@ -89,6 +110,9 @@ public class AutomaticPromptOptimizer extends IterativeOptimizer {
      *     <li>Generating synonyms for prompts to explore variations</li>
      * </ul>
      * The scoring of candidates is performed using the provided evaluator and metric.
+     * <br>
+     * If a {@link CheckpointStore} is set, the beam, its scores, and the states of the random generators are saved
+     * after each round, and the optimization continues after the last saved round when resuming.
      *
      * @param sourceStore The source element store
      * @param targetStore The target element store
@@ -98,7 +122,19 @@ public class AutomaticPromptOptimizer extends IterativeOptimizer {
     public String optimize(SourceElementStore sourceStore, TargetElementStore targetStore) {
         List<ClassificationTask> tasks = getClassificationTasks(sourceStore, targetStore, validTraceLinks);
         List<String> candidatePrompts = new ArrayList<>(Collections.singleton(optimizationPrompt));
-        for (int round = 0; round < maximumIterations; round++) {
+        int firstRound = 0;
+        Optional<OptimizationCheckpoint> checkpoint =
+                checkpointStore == null ? Optional.empty() : checkpointStore.load();
+        if (checkpoint.isPresent() && !hasAllRandomStates(checkpoint.get().randomStates())) {
+            LOGGER.warn("The checkpoint lacks random generator states, so the optimization starts at round 0");
+            checkpoint = Optional.empty();
+        }
+        if (checkpoint.isPresent()) {
+            candidatePrompts = checkpoint.get().candidatePrompts();
+            firstRound = checkpoint.get().completedRounds();
+            restoreRandomStates(checkpoint.get().randomStates());
+        }
+        for (int round = firstRound; round < maximumIterations; round++) {
             LOGGER.info("Starting apo iteration {}/{}", round + 1, maximumIterations);
             // expand candidates
             if (round > 0) {
@@ -112,10 +148,44 @@ public class AutomaticPromptOptimizer extends IterativeOptimizer {
             List<Double> scores = candidatesAndScores.second();
             // record candidates, estimated scores, and true scores
             LOGGER.info("Scores: {}", scores);
+            if (checkpointStore != null) {
+                checkpointStore.save(
+                        new OptimizationCheckpoint(round + 1, candidatePrompts, scores, getRandomStates()));
+            }
         }
         return candidatePrompts.getFirst();
     }
 
+    @Override
+    public void setCheckpointStore(CheckpointStore checkpointStore) {
+        this.checkpointStore = checkpointStore;
+    }
+
+    private Map<String, Long> getRandomStates() {
+        return Map.of(
+                SAMPLER_RANDOM, config.samplerRandom().state(),
+                EVALUATOR_RANDOM, evaluator.getRandomState(),
+                FILTER_EVALUATOR_RANDOM, bruteForceEvaluator.getRandomState());
+    }
+
+    private static boolean hasAllRandomStates(Map<String, Long> randomStates) {
+        if (randomStates == null) {
+            return false;
+        }
+        for (String key : List.of(SAMPLER_RANDOM, EVALUATOR_RANDOM, FILTER_EVALUATOR_RANDOM)) {
+            if (randomStates.get(key) == null) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    private void restoreRandomStates(Map<String, Long> randomStates) {
+        config.samplerRandom().restore(randomStates.get(SAMPLER_RANDOM));
+        evaluator.restoreRandomState(randomStates.get(EVALUATOR_RANDOM));
+        bruteForceEvaluator.restoreRandomState(randomStates.get(FILTER_EVALUATOR_RANDOM));
+    }
+
     /**
      * Score a list of prompts using the {@link #scorePrompts(List, List)} function and limit them to the
      * {@link GradientOptimizerConfig#beamSize()} size according to their scores in descending order.
@@ -182,11 +252,19 @@ public class AutomaticPromptOptimizer extends IterativeOptimizer {
      * @return A list of pairs where each pair contains a feedback string and the corresponding error string
      */
     private List<Pair<String, String>> getGradients(String prompt, List<EvaluationResult<Boolean>> evaluation) {
-        List<Pair<String, String>> feedbacks = new ArrayList<>();
+        // Sample the errors first, so the requests can be sent concurrently without affecting the sampling
+        List<String> errorStrings = new ArrayList<>();
         for (int i = 0; i < config.numberOfGradients(); i++) {
-            String errorString = sampleErrorString(evaluation);
-            List<String> gradients = getTextualGradients(prompt, errorString, 1);
-            feedbacks.addAll(gradients.stream()
+            errorStrings.add(sampleErrorString(evaluation));
+        }
+        List<List<String>> gradientsPerError = inParallel(errorStrings.stream()
+                .<Supplier<List<String>>>map(errorString -> () -> getTextualGradients(prompt, errorString, 1))
+                .toList());
+
+        List<Pair<String, String>> feedbacks = new ArrayList<>();
+        for (int i = 0; i < errorStrings.size(); i++) {
+            String errorString = errorStrings.get(i);
+            feedbacks.addAll(gradientsPerError.get(i).stream()
                     .map(gradient -> new Pair<>(gradient, errorString))
                     .collect(Collectors.toSet()));
         }
@@ -235,25 +313,32 @@ public class AutomaticPromptOptimizer extends IterativeOptimizer {
     /**
      * Expand a list of prompts into a larger list of candidate prompts using gradient-based modifications and synonym
      * generation on the tasks.
-     * This method processes each prompt individually, by delegating to {@link #expandCandidates(String, List)}.
+     * The candidates of the prompts are generated concurrently by {@link #generateCandidates(String, List)}, while
+     * the requests to the language model are limited to {@link GradientOptimizerConfig#expansionThreads()}.
+     * Afterward, the candidates of each prompt are selected sequentially in the order of the prompts by
+     * {@link #selectCandidates(Expansion)}, as the selection draws from the seeded samplers. Thus, the candidates are
+     * the same as with a sequential expansion.
      *
      * @param prompts The list of prompts to expand
      * @param tasks The classification tasks to use for generating gradients and evaluating prompts
      * @return A distinct list of expanded candidate prompts
      */
     private List<String> expandCandidates(List<String> prompts, List<ClassificationTask> tasks) {
+        List<Expansion> expansions = inParallel(prompts.stream()
+                .<Supplier<Expansion>>map(prompt -> () -> generateCandidates(prompt, tasks))
+                .toList());
 
         List<String> candidatePrompts = new ArrayList<>();
-        for (String prompt : prompts) {
-            candidatePrompts.addAll(expandCandidates(prompt, tasks));
+        for (Expansion expansion : expansions) {
+            candidatePrompts.addAll(selectCandidates(expansion));
         }
         candidatePrompts.addAll(prompts);
         return candidatePrompts.stream().distinct().toList();
     }
 
     /**
-     * Expand a single prompt into a larger list of candidate prompts using gradient-based modifications and synonym
-     * generation on all provided tasks.
+     * Generate the candidate prompts of a single prompt using gradient-based modifications and synonym generation on
+     * all provided tasks.
      * This includes the following steps:
      * <ul>
      *     <li>Evaluate the prompt on all tasks to identify misclassifications</li>
@@ -261,34 +346,46 @@ public class AutomaticPromptOptimizer extends IterativeOptimizer {
      *     <li>Apply the gradients to create new prompt variations</li>
      *     <li>Generate synonyms for the task section of the prompt to explore variations</li>
      *     <li>Combine the new task sections with the original prompt to form new candidate prompts</li>
-     *     <li>Filter the candidate prompts to limit the total number based on configuration settings</li>
      * </ul>
+     * The synonyms of the original task section do not depend on the evaluation and are generated concurrently.
      *
      * @param originalPrompt The prompt to expand, if it is sectioned (see {@link #parseSectionedPrompt(String)}),
      *                       only the {@value #TASK_SECTION} section is modified
      * @param classificationTasks The classification tasks to use for generating gradients and evaluating the prompt
-     * @return A distinct list of expanded candidate prompts
+     * @return The candidate prompts and the evaluation of the original prompt
      */
-    private List<String> expandCandidates(String originalPrompt, List<ClassificationTask> classificationTasks) {
+    private Expansion generateCandidates(String originalPrompt, List<ClassificationTask> classificationTasks) {
         String taskSection =
                 parseSectionedPrompt(originalPrompt).get(TASK_SECTION).strip();
 
+        CompletableFuture<Collection<String>> sectionSynonyms = CompletableFuture.supplyAsync(
+                () -> generateSynonyms(taskSection, config.mcSamplesPerStep()), Thread::startVirtualThread);
+
         List<EvaluationResult<Boolean>> evaluation = evaluatePrompt(classificationTasks, originalPrompt);
 
         Collection<String> taskVariations = applyGradient(taskSection, evaluation);
         taskVariations.addAll(generateSynonyms(taskVariations, config.mcSamplesPerStep()));
-        taskVariations.addAll(generateSynonyms(taskSection, config.mcSamplesPerStep()));
+        taskVariations.addAll(Futures.getLogged(sectionSynonyms, LOGGER));
 
         List<String> promptCandidates = new ArrayList<>();
         for (String section : taskVariations) {
             promptCandidates.add(originalPrompt.replace(taskSection, section));
         }
         assert taskVariations.size() == promptCandidates.size();
+        return new Expansion(promptCandidates, evaluation);
+    }
 
+    /**
+     * Filter the candidate prompts of a single prompt to limit the total number based on configuration settings.
+     *
+     * @param expansion The candidate prompts and the evaluation of the original prompt
+     * @return The selected candidate prompts
+     */
+    private List<String> selectCandidates(Expansion expansion) {
         if (config.rejectOnErrors()) {
-            return filterCandidatePrompts(promptCandidates, evaluation);
+            return filterCandidatePrompts(expansion.promptCandidates(), expansion.evaluation());
         }
-        return sampleStrategy.sample(promptCandidates, config.maxExpansionFactor());
+        return sampleStrategy.sample(expansion.promptCandidates(), config.maxExpansionFactor());
     }
 
     /**
@@ -315,10 +412,10 @@ public class AutomaticPromptOptimizer extends IterativeOptimizer {
         List<String> sampledPromptCandidates =
                 firstSampleStrategy.sample(promptCandidates, config.maxExpansionFactor() * TODO_JUSTIFY_AND_NAME);
         List<Double> errorScores = bruteForceEvaluator.sampleAndEvaluate(sampledPromptCandidates, missclassifiedTasks, metric);
-        List<Integer> sortedIdxs = errorScores.stream()
-                .sorted()
-                .mapToInt(errorScores::indexOf)
+        // sort the indices rather than the scores, so tied prompts are not selected twice
+        List<Integer> sortedIdxs = IntStream.range(0, errorScores.size())
                 .boxed()
+                .sorted(Comparator.comparingDouble(errorScores::get))
                 .toList();
         return sortedIdxs.stream()
                 .skip(Math.max(0, sortedIdxs.size() - config.maxExpansionFactor()))
@@ -337,11 +434,13 @@ public class AutomaticPromptOptimizer extends IterativeOptimizer {
      */
     private Collection<String> applyGradient(String originalPrompt, List<EvaluationResult<Boolean>> evaluationResults) {
         Collection<Pair<String, String>> gradients = getGradients(originalPrompt, evaluationResults);
+        List<List<String>> variationsPerGradient = inParallel(gradients.stream()
+                .<Supplier<List<String>>>map(feedbackAndError ->
+                        () -> applyGradient(originalPrompt, feedbackAndError.second(), feedbackAndError.first()))
+                .toList());
         Set<String> promptVariations = new HashSet<>();
-        for (Pair<String, String> feedbackAndError : gradients) {
-            String feedback = feedbackAndError.first();
-            String error = feedbackAndError.second();
-            promptVariations.addAll(applyGradient(originalPrompt, error, feedback));
+        for (List<String> variations : variationsPerGradient) {
+            promptVariations.addAll(variations);
         }
         return promptVariations;
     }
@@ -379,9 +478,12 @@ public class AutomaticPromptOptimizer extends IterativeOptimizer {
         if (numberOfSynonymsPerPrompt < 1) {
             return List.of();
         }
+        List<Collection<String>> synonymsPerPrompt = inParallel(prompts.stream()
+                .<Supplier<Collection<String>>>map(prompt -> () -> generateSynonyms(prompt, numberOfSynonymsPerPrompt))
+                .toList());
         List<String> synonyms = new ArrayList<>();
-        for (String prompt : prompts) {
-            synonyms.addAll(generateSynonyms(prompt, numberOfSynonymsPerPrompt));
+        for (Collection<String> promptSynonyms : synonymsPerPrompt) {
+            synonyms.addAll(promptSynonyms);
         }
         return synonyms;
     }
@@ -409,6 +511,8 @@ public class AutomaticPromptOptimizer extends IterativeOptimizer {
      */
     private List<EvaluationResult<Boolean>> evaluatePrompt(
             List<ClassificationTask> classificationTasks, String prompt) {
+        // Classify all tasks at once, so the per-task checks below are served by the metric and classifier caches
+        metric.getMetric(prompt, classificationTasks);
         List<EvaluationResult<Boolean>> evaluation = new ArrayList<>();
         for (ClassificationTask task : classificationTasks) {
             if (isClassifiedCorrectly(prompt, task)) {
@@ -431,7 +535,13 @@ public class AutomaticPromptOptimizer extends IterativeOptimizer {
      */
     private List<String> cachedSanitizedPromptRequest(int n, String prompt) {
         prompt = String.join("\n", prompt.lines().map(String::stripLeading).toList());
-        List<String> responses = nCachedRequest(prompt, provider, llm, cache, n);
+        List<String> responses;
+        requestSlots.acquireUninterruptibly();
+        try {
+            responses = nCachedRequest(prompt, provider, llm, cache, n);
+        } finally {
+            requestSlots.release();
+        }
         List<String> newPrompts = new ArrayList<>();
         for (String result : responses) {
             newPrompts.addAll(parseTaggedText(result, START_TAG, END_TAG));
@@ -439,6 +549,39 @@ public class AutomaticPromptOptimizer extends IterativeOptimizer {
         return sanitizePrompts(newPrompts);
     }
 
+    /**
+     * Runs the given tasks concurrently on virtual threads and returns their results in the order of the tasks.
+     * Tasks may run nested tasks, as only the requests to the language model are limited (see {@link #requestSlots}).
+     *
+     * @param tasks The tasks to run
+     * @return The results of the tasks in the order of the tasks
+     * @param <T> The type of the results
+     */
+    private static <T> List<T> inParallel(List<Supplier<T>> tasks) {
+        if (tasks.size() <= 1) {
+            return tasks.stream().map(Supplier::get).toList();
+        }
+        try (ExecutorService executor = Executors.newVirtualThreadPerTaskExecutor()) {
+            List<Future<T>> futures = new ArrayList<>(tasks.size());
+            for (Supplier<T> task : tasks) {
+                futures.add(executor.submit(task::get));
+            }
+            List<T> results = new ArrayList<>(tasks.size());
+            for (Future<T> future : futures) {
+                results.add(Futures.getLogged(future, LOGGER));
+            }
+            return results;
+        }
+    }
+
+    /**
+     * The candidate prompts generated from a prompt, and the evaluation of the prompt used to select among them.
+     *
+     * @param promptCandidates The generated candidate prompts
+     * @param evaluation The evaluation of the original prompt on the minibatch
+     */
+    private record Expansion(List<String> promptCandidates, List<EvaluationResult<Boolean>> evaluation) {}
+
     /**
      * Parses a sectioned prompt into a map of section headers to their corresponding content.
      * Sections are identified by lines starting with "# " as in the Markdown syntax.
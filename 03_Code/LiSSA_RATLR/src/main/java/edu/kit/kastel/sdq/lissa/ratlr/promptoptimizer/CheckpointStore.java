@@ -0,0 +1,68 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.promptoptimizer;
+
+import java.nio.file.Path;
+import java.util.Optional;
+
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+
+import edu.kit.kastel.sdq.lissa.ratlr.cache.Cache;
+import edu.kit.kastel.sdq.lissa.ratlr.cache.CacheManager;
+import edu.kit.kastel.sdq.lissa.ratlr.cache.CheckpointCacheKey;
+
+/**
+ * Stores the checkpoints of an optimization run in the cache directory.
+ * A checkpoint is written after each completed round, so a run that was aborted can be resumed from its last
+ * completed round. Checkpoints are only read if resuming is requested; otherwise, the run starts from scratch and
+ * overwrites the checkpoint of a previous run with the same configuration.
+ */
+public class CheckpointStore {
+    private static final Logger logger = LoggerFactory.getLogger(CheckpointStore.class);
+    private static final Path CACHE_FILE = Path.of("OptimizationCheckpoints.json");
+
+    private final Cache cache;
+    private final CheckpointCacheKey key;
+    private final boolean resume;
+
+    /**
+     * Creates a new checkpoint store for the run with the given configuration.
+     *
+     * @param serializedConfiguration The serialized configuration of the run that identifies its checkpoint
+     * @param resume Whether the run resumes from an existing checkpoint
+     */
+    public CheckpointStore(String serializedConfiguration, boolean resume) {
+        this.cache = CacheManager.getDefaultInstance().getCache(CACHE_FILE, true);
+        this.key = CheckpointCacheKey.of(serializedConfiguration);
+        this.resume = resume;
+    }
+
+    /**
+     * Returns the checkpoint to resume from.
+     *
+     * @return The last checkpoint of the run, or empty if resuming is not requested or there is no checkpoint
+     */
+    public Optional<OptimizationCheckpoint> load() {
+        if (!resume) {
+            return Optional.empty();
+        }
+        OptimizationCheckpoint checkpoint = cache.get(key, OptimizationCheckpoint.class);
+        if (checkpoint == null) {
+            logger.info("No checkpoint found, starting the optimization from scratch");
+            return Optional.empty();
+        }
+        logger.info("Resuming the optimization after round {}", checkpoint.completedRounds());
+        return Optional.of(checkpoint);
+    }
+
+    /**
+     * Writes the checkpoint of a completed round to disk.
+     *
+     * @param checkpoint The checkpoint to write
+     */
+    public void save(OptimizationCheckpoint checkpoint) {
+        cache.put(key, checkpoint);
+        cache.flush();
+        logger.debug("Saved checkpoint after round {}", checkpoint.completedRounds());
+    }
+}
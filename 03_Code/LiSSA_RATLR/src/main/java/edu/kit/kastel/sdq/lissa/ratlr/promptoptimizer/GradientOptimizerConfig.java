@@ -4,11 +4,10 @@ package edu.kit.kastel.sdq.lissa.ratlr.promptoptimizer;
 import static edu.kit.kastel.sdq.lissa.ratlr.promptoptimizer.IterativeFeedbackOptimizer.FEEDBACK_EXAMPLE_BLOCK_CONFIGURATION_KEY;
 import static edu.kit.kastel.sdq.lissa.ratlr.promptoptimizer.IterativeOptimizer.SAMPLER_CONFIGURATION_KEY;
 
-import java.util.Random;
-
 import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.promptoptimizer.samplestrategy.SampleStrategy;
 import edu.kit.kastel.sdq.lissa.ratlr.promptoptimizer.samplestrategy.SamplerFactory;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.ResumableRandom;
 
 public record GradientOptimizerConfig(
         int numberOfGradients,
@@ -22,11 +21,13 @@ public record GradientOptimizerConfig(
         int evaluationBudget,
         int minibatchSize,
         int beamSize,
+        int expansionThreads,
         String gradientPrompt,
         String transformationPrompt,
         String synonymPrompt,
         String feedbackExampleBlock,
-        SampleStrategy sampleStrategy) {
+        SampleStrategy sampleStrategy,
+        ResumableRandom samplerRandom) {
 
     // Default prompts from the original implementation
 
@@ -110,12 +111,18 @@ public record GradientOptimizerConfig(
     private static final int DEFAULT_MINIBATCH_SIZE = 64;
     private static final String BEAM_SIZE_CONFIGURATION_KEY = "beam_size";
     private static final int BEAM_SIZE = 4;
+    private static final String EXPANSION_THREADS_CONFIGURATION_KEY = "expansion_threads";
+    private static final int EXPANSION_THREADS = 4;
     private static final String SEED_CONFIGURATION_KEY = "seed";
     private static final int DEFAULT_SEED = 133742243;
 
     private static final String DEFAULT_SAMPLER = SamplerFactory.SHUFFLED_SAMPLER;
 
     public GradientOptimizerConfig(ModuleConfiguration configuration) {
+        this(configuration, new ResumableRandom(configuration.argumentAsInt(SEED_CONFIGURATION_KEY, DEFAULT_SEED)));
+    }
+
+    private GradientOptimizerConfig(ModuleConfiguration configuration, ResumableRandom samplerRandom) {
         this(
                 configuration.argumentAsInt(NUMBER_OF_GRADIENTS_CONFIGURATION_KEY, DEFAULT_NUMBER_OF_GRADIENTS),
                 configuration.argumentAsInt(MAX_ERROR_EXAMPLES_CONFIGURATION_KEY, DEFAULT_MAX_ERROR_EXAMPLES),
@@ -131,13 +138,14 @@ public record GradientOptimizerConfig(
                         * configuration.argumentAsInt(EVAL_PROMPTS_PER_ROUND_CONFIGURATION_KEY, EVAL_PROMPTS_PER_ROUND),
                 configuration.argumentAsInt(MINIBATCH_SIZE_CONFIGURATION_KEY, DEFAULT_MINIBATCH_SIZE),
                 configuration.argumentAsInt(BEAM_SIZE_CONFIGURATION_KEY, BEAM_SIZE),
+                configuration.argumentAsInt(EXPANSION_THREADS_CONFIGURATION_KEY, EXPANSION_THREADS),
                 configuration.argumentAsString(GRADIENT_PROMPT_CONFIGURATION_KEY, DEFAULT_GRADIENT_PROMPT),
                 configuration.argumentAsString(TRANSFORMATION_PROMPT_CONFIGURATION_KEY, DEFAULT_TRANSFORMATION_PROMPT),
                 configuration.argumentAsString(SYNONYM_PROMPT_CONFIGURATION_KEY, DEFAULT_SYNONYM_PROMPT),
                 configuration.argumentAsString(
                         FEEDBACK_EXAMPLE_BLOCK_CONFIGURATION_KEY, DEFAULT_FEEDBACK_EXAMPLE_BLOCK),
                 SamplerFactory.createSampler(
-                        configuration.argumentAsString(SAMPLER_CONFIGURATION_KEY, DEFAULT_SAMPLER),
-                        new Random(configuration.argumentAsInt(SEED_CONFIGURATION_KEY, DEFAULT_SEED))));
+                        configuration.argumentAsString(SAMPLER_CONFIGURATION_KEY, DEFAULT_SAMPLER), samplerRandom),
+                samplerRandom);
     }
 }
@@ -0,0 +1,17 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.promptoptimizer;
+
+import java.util.List;
+import java.util.Map;
+
+/**
+ * The state of an optimization run after a completed round, from which the run can be resumed.
+ * The responses of the language models are not part of the checkpoint, as they are cached anyway.
+ *
+ * @param completedRounds The number of completed rounds
+ * @param candidatePrompts The candidate prompts (e.g., the beam) after the last completed round
+ * @param scores The scores of the candidate prompts
+ * @param randomStates The states of the random generators of the optimizer and its components by name
+ */
+public record OptimizationCheckpoint(
+        int completedRounds, List<String> candidatePrompts, List<Double> scores, Map<String, Long> randomStates) {}
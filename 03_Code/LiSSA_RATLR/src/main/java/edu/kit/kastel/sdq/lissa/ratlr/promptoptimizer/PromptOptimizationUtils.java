@@ -113,14 +113,13 @@ public final class PromptOptimizationUtils {
     public static List<ClassificationTask> getClassificationTasks(
             SourceElementStore sourceStore, TargetElementStore targetStore, Collection<TraceLink> validTraceLinks) {
         List<ClassificationTask> tasks = new ArrayList<>();
-        for (Pair<Element, float[]> source : sourceStore.getAllElements(true)) {
-            for (Element target : targetStore.findSimilar(source)) {
-                tasks.add(new ClassificationTask(
-                        source.first(),
-                        target,
-                        validTraceLinks.contains(
-                                TraceLink.of(source.first().getIdentifier(), target.getIdentifier()))));
-            }
+        for (Pair<Element, Element> pair : targetStore.getCandidateMatrix(sourceStore).getPairs()) {
+            Element source = pair.first();
+            Element target = pair.second();
+            tasks.add(new ClassificationTask(
+                    source,
+                    target,
+                    validTraceLinks.contains(TraceLink.of(source.getIdentifier(), target.getIdentifier()))));
         }
         return tasks;
     }
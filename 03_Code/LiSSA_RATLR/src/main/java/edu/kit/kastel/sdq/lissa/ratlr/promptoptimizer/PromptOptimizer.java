@@ -20,4 +20,14 @@ public interface PromptOptimizer {
      * @return A string representing the optimized prompt
      */
     String optimize(SourceElementStore sourceStore, TargetElementStore targetStore);
+
+    /**
+     * Sets the store for the checkpoints of the optimization, which are written after each completed round.
+     * Optimizers that cannot be resumed ignore the store.
+     *
+     * @param checkpointStore The store to read and write the checkpoints
+     */
+    default void setCheckpointStore(CheckpointStore checkpointStore) {
+        // Optimizers without rounds to resume do not write checkpoints
+    }
 }
@@ -1,8 +1,11 @@
 /* Licensed under MIT 2025. */
 package edu.kit.kastel.sdq.lissa.ratlr.resultaggregator;
 
-import java.util.LinkedHashSet;
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.IdentityHashMap;
 import java.util.List;
+import java.util.Map;
 import java.util.Set;
 
 import edu.kit.kastel.sdq.lissa.ratlr.classifier.ClassificationResult;
@@ -10,6 +13,7 @@ import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
 import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
 import edu.kit.kastel.sdq.lissa.ratlr.knowledge.TraceLink;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.TraceLinkSet;
 
 /**
  * A result aggregator that creates trace links when any element in a group has a positive classification.
@@ -78,15 +82,15 @@ public class AnyResultAggregator extends ResultAggregator {
             List<Element> sourceElements,
             List<Element> targetElements,
             List<ClassificationResult> classificationResults) {
-        Set<TraceLink> traceLinks = new LinkedHashSet<>();
+        GranularityIndex sourceIndex = new GranularityIndex(sourceElements, sourceGranularity);
+        GranularityIndex targetIndex = new GranularityIndex(targetElements, targetGranularity);
+        TraceLinkSet traceLinks = new TraceLinkSet();
         for (var result : classificationResults) {
-            var sourceElementsForTraceLink =
-                    buildListOfValidElements(result.source(), sourceGranularity, sourceElements);
-            var target = result.target();
-            var targetElementsForTraceLink = buildListOfValidElements(target, targetGranularity, targetElements);
+            var sourceElementsForTraceLink = sourceIndex.validElements(result.source());
+            var targetElementsForTraceLink = targetIndex.validElements(result.target());
             for (var sourceElement : sourceElementsForTraceLink) {
                 for (var targetElement : targetElementsForTraceLink) {
-                    traceLinks.add(new TraceLink(sourceElement.getIdentifier(), targetElement.getIdentifier()));
+                    traceLinks.add(sourceElement.getIdentifier(), targetElement.getIdentifier());
                 }
             }
         }
@@ -94,67 +98,98 @@ public class AnyResultAggregator extends ResultAggregator {
     }
 
     /**
-     * Builds a list of valid elements at the desired granularity level.
-     * This method handles three cases:
-     * <ol>
-     *     <li>Element is at the desired granularity: Returns the element itself</li>
-     *     <li>Element is at a lower granularity: Returns all children at the desired level</li>
-     *     <li>Element is at a higher granularity: Returns the parent at the desired level</li>
-     * </ol>
-     *
-     * @param element The element to find valid elements for
-     * @param desiredGranularity The desired granularity level
-     * @param allElements The list of all available elements
-     * @return A list of valid elements at the desired granularity level
+     * Index of the elements at a desired granularity level, built once per aggregation.
+     * Instead of filtering all elements and walking parent chains for every classification result, the index maps
+     * each element to its ancestor at the desired granularity and each coarser element to its descendants at the
+     * desired granularity. Both are computed lazily, so each result expands in time proportional to its output.
+     * Elements are compared by identity, as in the parent chains.
      */
-    private static List<Element> buildListOfValidElements(
-            Element element, int desiredGranularity, List<Element> allElements) {
-        if (element.getGranularity() == desiredGranularity) {
-            return List.of(element);
+    private static final class GranularityIndex {
+        private final List<Element> allElements;
+        private final int desiredGranularity;
+        /** The elements at the desired granularity */
+        private Set<Element> elementsAtGranularity;
+        /** The descendants at the desired granularity by (transitive) parent, in the order of all elements */
+        private Map<Element, List<Element>> descendants;
+        /** The ancestors at the desired granularity by element, empty if there is none */
+        private final Map<Element, List<Element>> ancestors = new IdentityHashMap<>();
+
+        /**
+         * Creates a new index.
+         *
+         * @param allElements The list of all available elements
+         * @param desiredGranularity The desired granularity level
+         */
+        private GranularityIndex(List<Element> allElements, int desiredGranularity) {
+            this.allElements = allElements;
+            this.desiredGranularity = desiredGranularity;
         }
 
-        if (element.getGranularity() < desiredGranularity) {
-            // Element is more course grained than the desired granularity -> find all children that are on the desired
-            // granularity
-            List<Element> possibleChildren = allElements.stream()
-                    .filter(it -> it.getGranularity() == desiredGranularity)
-                    .toList();
-            // Filter all children that are not transitive children of the element
-            return possibleChildren.stream()
-                    .filter(it -> isTransitiveChildOf(it, element))
-                    .toList();
+        /**
+         * Builds a list of valid elements at the desired granularity level.
+         * This method handles three cases:
+         * <ol>
+         *     <li>Element is at the desired granularity: Returns the element itself</li>
+         *     <li>Element is at a lower granularity: Returns all children at the desired level</li>
+         *     <li>Element is at a higher granularity: Returns the parent at the desired level</li>
+         * </ol>
+         *
+         * @param element The element to find valid elements for
+         * @return A list of valid elements at the desired granularity level
+         */
+        private List<Element> validElements(Element element) {
+            if (element.getGranularity() == desiredGranularity) {
+                return List.of(element);
+            }
+
+            if (element.getGranularity() < desiredGranularity) {
+                // Element is more course grained than the desired granularity -> all transitive children that are on
+                // the desired granularity
+                return getDescendants().getOrDefault(element, List.of());
+            }
+
+            // Element is more fine-grained than the desired granularity -> the transitive parent that is on the
+            // desired granularity
+            return ancestors.computeIfAbsent(element, this::findAncestors);
         }
 
-        // Element is more fine-grained than the desired granularity -> find all parents that are on the desired
-        // granularity
-        List<Element> possibleParents = allElements.stream()
-                .filter(it -> it.getGranularity() == desiredGranularity)
-                .toList();
-        // Filter all parents that are not transitive parents of the element
-        List<Element> validParents = possibleParents.stream()
-                .filter(it -> isTransitiveChildOf(element, it))
-                .toList();
-        assert validParents.size() <= 1;
-        return validParents;
-    }
+        private List<Element> findAncestors(Element element) {
+            Set<Element> candidates = getElementsAtGranularity();
+            List<Element> validParents = new ArrayList<>(1);
+            for (Element current = element.getParent(); current != null; current = current.getParent()) {
+                if (candidates.contains(current)) {
+                    validParents.add(current);
+                }
+            }
+            assert validParents.size() <= 1;
+            return List.copyOf(validParents);
+        }
 
-    /**
-     * Checks if an element is a transitive child of another element.
-     * This method traverses the parent chain of the possible child element
-     * to determine if the parent element is in its ancestry.
-     *
-     * @param possibleChild The element to check
-     * @param parent The potential parent element
-     * @return true if the possible child is a transitive child of the parent
-     */
-    private static boolean isTransitiveChildOf(Element possibleChild, Element parent) {
-        Element currentElement = possibleChild;
-        while (currentElement != null) {
-            if (parent == currentElement) {
-                return true;
+        private Set<Element> getElementsAtGranularity() {
+            if (elementsAtGranularity == null) {
+                elementsAtGranularity = Collections.newSetFromMap(new IdentityHashMap<>());
+                for (Element element : allElements) {
+                    if (element.getGranularity() == desiredGranularity) {
+                        elementsAtGranularity.add(element);
+                    }
+                }
+            }
+            return elementsAtGranularity;
+        }
+
+        private Map<Element, List<Element>> getDescendants() {
+            if (descendants == null) {
+                descendants = new IdentityHashMap<>();
+                for (Element element : allElements) {
+                    if (element.getGranularity() != desiredGranularity) {
+                        continue;
+                    }
+                    for (Element parent = element.getParent(); parent != null; parent = parent.getParent()) {
+                        descendants.computeIfAbsent(parent, key -> new ArrayList<>()).add(element);
+                    }
+                }
             }
-            currentElement = currentElement.getParent();
+            return descendants;
         }
-        return false;
     }
 }
@@ -10,6 +10,7 @@ import org.slf4j.LoggerFactory;
 
 import edu.kit.kastel.sdq.lissa.ratlr.cache.Cache;
 import edu.kit.kastel.sdq.lissa.ratlr.cache.ClassifierCacheKey;
+import edu.kit.kastel.sdq.lissa.ratlr.cache.SingleFlight;
 import edu.kit.kastel.sdq.lissa.ratlr.classifier.ChatLanguageModelProvider;
 
 import dev.langchain4j.model.chat.ChatModel;
@@ -45,15 +46,15 @@ public final class ChatLanguageModelUtils {
                 provider.temperature(),
                 ClassifierCacheKey.Mode.CHAT,
                 numberOfRequests + " results: \n" + request);
-        List<String> responses = cache.get(cacheKey, List.class);
-        if (responses == null || responses.size() < numberOfRequests) {
-            responses = new ArrayList<>();
-            LOGGER.info("Optimizing ({}) with {} requests", provider.modelName(), numberOfRequests);
-            for (int i = 1; i <= numberOfRequests; i++) {
-                responses.add(llm.chat(request));
-            }
-            cache.put(cacheKey, responses);
-        }
+        List<String> responses = SingleFlight.getOrCompute(
+                cache, cacheKey, List.class, cached -> cached.size() >= numberOfRequests, () -> {
+                    List<String> replies = new ArrayList<>();
+                    LOGGER.info("Optimizing ({}) with {} requests", provider.modelName(), numberOfRequests);
+                    for (int i = 1; i <= numberOfRequests; i++) {
+                        replies.add(llm.chat(request));
+                    }
+                    return replies;
+                });
         LOGGER.debug("Responses: {}", responses);
         return responses;
     }
@@ -0,0 +1,59 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.utils;
+
+import java.net.http.HttpClient;
+import java.time.Duration;
+import java.util.Locale;
+
+import dev.langchain4j.http.client.jdk.JdkHttpClient;
+import dev.langchain4j.http.client.jdk.JdkHttpClientBuilder;
+
+/**
+ * Creates the HTTP clients of the language and embedding models.
+ * <p>
+ * Each model keeps its HTTP client, i.e., its keep-alive connection pool, for its whole lifetime. Thus, models should
+ * be shared between threads instead of being created per thread or task (see
+ * {@link edu.kit.kastel.sdq.lissa.ratlr.classifier.ChatLanguageModelProvider#createChatModel()}).
+ * <p>
+ * The clients of a platform are configured via environment variables, where {@code <PLATFORM>} is the name of the
+ * platform (e.g., {@code OPENAI}):
+ * <ul>
+ *     <li>{@code <PLATFORM>_HTTP_VERSION}: {@code HTTP_2} or {@code HTTP_1_1} (default: {@code HTTP_2}, which
+ *     multiplexes concurrent requests over few connections and falls back to HTTP/1.1 if the server does not support
+ *     it)</li>
+ *     <li>{@code <PLATFORM>_CONNECT_TIMEOUT_SECONDS}: Timeout for establishing a connection (default: 30)</li>
+ * </ul>
+ */
+public final class HttpClients {
+    private static final long DEFAULT_CONNECT_TIMEOUT_SECONDS = 30;
+
+    private HttpClients() {
+        throw new IllegalAccessError("Utility class");
+    }
+
+    /**
+     * Creates a builder for the HTTP client of a model of the given platform.
+     *
+     * @param platform The name of the platform, e.g., "OPENAI"
+     * @return A builder for an HTTP client configured for the platform
+     * @throws IllegalArgumentException If the configuration of the platform is invalid
+     */
+    public static JdkHttpClientBuilder builder(String platform) {
+        String prefix = platform.toUpperCase(Locale.ROOT) + "_";
+        String version = Environment.getenv(prefix + "HTTP_VERSION");
+        String connectTimeout = Environment.getenv(prefix + "CONNECT_TIMEOUT_SECONDS");
+
+        HttpClient.Builder httpClientBuilder = HttpClient.newBuilder()
+                .version(
+                        version == null || version.isBlank()
+                                ? HttpClient.Version.HTTP_2
+                                : HttpClient.Version.valueOf(version.trim()))
+                .followRedirects(HttpClient.Redirect.NORMAL);
+        return JdkHttpClient.builder()
+                .httpClientBuilder(httpClientBuilder)
+                .connectTimeout(Duration.ofSeconds(
+                        connectTimeout == null || connectTimeout.isBlank()
+                                ? DEFAULT_CONNECT_TIMEOUT_SECONDS
+                                : Long.parseLong(connectTimeout.trim())));
+    }
+}
@@ -0,0 +1,68 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.utils;
+
+import java.io.Serial;
+import java.util.Random;
+
+/**
+ * A {@link Random} whose state can be read and restored, e.g., to resume an optimization from a checkpoint.
+ * <p>
+ * It uses the same linear congruential generator as {@link Random}, so it produces the same sequence as a
+ * {@link Random} with the same seed. Only the methods based on {@link #next(int)} are covered by the state;
+ * {@link #nextGaussian()} keeps a cached value that is not part of the state.
+ */
+public final class ResumableRandom extends Random {
+    @Serial
+    private static final long serialVersionUID = 1L;
+
+    private static final long MULTIPLIER = 0x5DEECE66DL;
+    private static final long ADDEND = 0xBL;
+    private static final long MASK = (1L << 48) - 1;
+
+    /**
+     * The state of the generator, set via {@link #setSeed(long)}.
+     */
+    private long state;
+
+    /**
+     * Creates a new random generator with the given seed.
+     *
+     * @param seed The initial seed
+     */
+    public ResumableRandom(long seed) {
+        super(seed);
+        // Field initializers run after the super constructor, so the seed is set again independently of whether
+        // the super constructor uses setSeed
+        setSeed(seed);
+    }
+
+    @Override
+    public synchronized void setSeed(long seed) {
+        this.state = (seed ^ MULTIPLIER) & MASK;
+        super.setSeed(seed);
+    }
+
+    @Override
+    protected synchronized int next(int bits) {
+        state = (state * MULTIPLIER + ADDEND) & MASK;
+        return (int) (state >>> (48 - bits));
+    }
+
+    /**
+     * Returns the current state of the generator.
+     *
+     * @return The state, which can be passed to {@link #restore(long)}
+     */
+    public synchronized long state() {
+        return state;
+    }
+
+    /**
+     * Restores a state previously returned by {@link #state()}.
+     *
+     * @param state The state to restore
+     */
+    public synchronized void restore(long state) {
+        this.state = state & MASK;
+    }
+}
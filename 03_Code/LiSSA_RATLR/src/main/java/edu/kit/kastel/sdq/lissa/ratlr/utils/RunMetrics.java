@@ -0,0 +1,121 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.utils;
+
+import java.lang.management.ManagementFactory;
+import java.lang.management.MemoryPoolMXBean;
+import java.lang.management.MemoryType;
+import java.util.Map;
+import java.util.TreeMap;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.atomic.LongAdder;
+import java.util.function.Supplier;
+
+/**
+ * Collects the time spent in the stages of the pipeline, e.g., loading caches, preprocessing, or classifying, for
+ * benchmarks of whole runs. The timings are shared by the whole process and accumulate until {@link #reset()}.
+ * Stages that run concurrently, e.g., the hops of a transitive run, add up their times.
+ */
+public final class RunMetrics {
+    private static final Map<String, Stage> STAGES = new ConcurrentHashMap<>();
+
+    private RunMetrics() {
+        throw new IllegalAccessError("Utility class");
+    }
+
+    /**
+     * Runs an action and adds its duration to a stage.
+     *
+     * @param stage The name of the stage
+     * @param action The action to run
+     * @return The result of the action
+     */
+    public static <T> T time(String stage, Supplier<T> action) {
+        long start = System.nanoTime();
+        try {
+            return action.get();
+        } finally {
+            record(stage, System.nanoTime() - start);
+        }
+    }
+
+    /**
+     * Runs an action and adds its duration to a stage.
+     *
+     * @param stage The name of the stage
+     * @param action The action to run
+     */
+    public static void time(String stage, Runnable action) {
+        long start = System.nanoTime();
+        try {
+            action.run();
+        } finally {
+            record(stage, System.nanoTime() - start);
+        }
+    }
+
+    /**
+     * Adds a duration to a stage.
+     *
+     * @param stage The name of the stage
+     * @param nanos The duration in nanoseconds
+     */
+    public static void record(String stage, long nanos) {
+        Stage timings = STAGES.computeIfAbsent(stage, key -> new Stage());
+        timings.count.increment();
+        timings.nanos.add(nanos);
+    }
+
+    /**
+     * Returns the timings of all stages recorded since the last reset.
+     *
+     * @return The number of executions and the total time in milliseconds by stage name, ordered by name
+     */
+    public static Map<String, StageTimings> getStages() {
+        Map<String, StageTimings> stages = new TreeMap<>();
+        for (var entry : STAGES.entrySet()) {
+            Stage stage = entry.getValue();
+            stages.put(entry.getKey(), new StageTimings(stage.count.sum(), stage.nanos.sum() / 1_000_000.0));
+        }
+        return stages;
+    }
+
+    /**
+     * Returns the peak usage of the heap since the last reset, summed over all heap memory pools.
+     *
+     * @return The peak heap usage in bytes
+     */
+    public static long getPeakHeapBytes() {
+        long peak = 0;
+        for (MemoryPoolMXBean pool : ManagementFactory.getMemoryPoolMXBeans()) {
+            if (pool.getType() == MemoryType.HEAP && pool.getPeakUsage() != null) {
+                peak += pool.getPeakUsage().getUsed();
+            }
+        }
+        return peak;
+    }
+
+    /**
+     * Forgets all timings and resets the peak heap usage.
+     */
+    public static void reset() {
+        STAGES.clear();
+        for (MemoryPoolMXBean pool : ManagementFactory.getMemoryPoolMXBeans()) {
+            if (pool.getType() == MemoryType.HEAP) {
+                pool.resetPeakUsage();
+            }
+        }
+    }
+
+    private static final class Stage {
+        private final LongAdder count = new LongAdder();
+        private final LongAdder nanos = new LongAdder();
+    }
+
+    /**
+     * The timings of a stage.
+     *
+     * @param count How often the stage was executed
+     * @param totalMillis The total time spent in the stage in milliseconds
+     */
+    public record StageTimings(long count, double totalMillis) {}
+}
@@ -0,0 +1,65 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.utils;
+
+import java.util.concurrent.TimeUnit;
+
+/**
+ * A thread-safe token bucket that limits the rate of permits per minute.
+ * The bucket holds at most one minute worth of permits and refills continuously.
+ * Callers reserve permits in advance: if the bucket does not hold enough permits, the caller sleeps until its
+ * reservation is covered. Callers are thus served in the order of their reservations.
+ */
+public final class TokenBucket {
+    private static final double NANOS_PER_MINUTE = TimeUnit.MINUTES.toNanos(1);
+
+    private final double capacity;
+    private final double permitsPerNano;
+
+    /**
+     * Available permits. Negative values denote permits that are already reserved by waiting callers.
+     */
+    private double available;
+
+    private long lastRefill;
+
+    /**
+     * Creates a new token bucket that starts full.
+     *
+     * @param permitsPerMinute The number of permits per minute, must be positive
+     * @throws IllegalArgumentException If the number of permits is not positive
+     */
+    public TokenBucket(long permitsPerMinute) {
+        if (permitsPerMinute <= 0) {
+            throw new IllegalArgumentException("The number of permits per minute must be positive.");
+        }
+        this.capacity = permitsPerMinute;
+        this.permitsPerNano = permitsPerMinute / NANOS_PER_MINUTE;
+        this.available = capacity;
+        this.lastRefill = System.nanoTime();
+    }
+
+    /**
+     * Acquires the given number of permits, blocking until they are available.
+     * Requests larger than the capacity of the bucket are limited to the capacity.
+     *
+     * @param permits The number of permits to acquire
+     * @throws InterruptedException If the thread is interrupted while waiting
+     */
+    public void acquire(long permits) throws InterruptedException {
+        long waitNanos = reserve(Math.min(permits, (long) capacity));
+        if (waitNanos > 0) {
+            TimeUnit.NANOSECONDS.sleep(waitNanos);
+        }
+    }
+
+    /**
+     * Reserves the permits and returns the time to wait until the reservation is covered.
+     */
+    private synchronized long reserve(long permits) {
+        long now = System.nanoTime();
+        available = Math.min(capacity, available + (now - lastRefill) * permitsPerNano);
+        lastRefill = now;
+        available -= permits;
+        return available >= 0 ? 0 : (long) Math.ceil(-available / permitsPerNano);
+    }
+}
@@ -0,0 +1,45 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.cli.command;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.util.List;
+import java.util.Set;
+
+import org.junit.jupiter.api.Test;
+
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.TraceLink;
+
+/**
+ * Test class for the joins of the {@link TransitiveTraceCommand}.
+ * The hops link documentation to models and models to code.
+ */
+class TransitiveTraceCommandTest {
+    private final List<Set<TraceLink>> hops = List.of(
+            Set.of(new TraceLink("doc1", "model1"), new TraceLink("doc1", "model2"), new TraceLink("doc2", "model3")),
+            Set.of(
+                    new TraceLink("model1", "code1"),
+                    new TraceLink("model2", "code1"),
+                    new TraceLink("model2", "code2"),
+                    new TraceLink("model4", "code3")));
+
+    @Test
+    void joinsHopsOnSharedArtifact() {
+        Set<TraceLink> traceLinks = TransitiveTraceCommand.calculateTransitiveTraceLinks(hops);
+
+        assertEquals(Set.of(new TraceLink("doc1", "code1"), new TraceLink("doc1", "code2")), traceLinks);
+    }
+
+    @Test
+    void keepsPathsOfTransitiveLinks() {
+        List<List<String>> paths = TransitiveTraceCommand.calculateTransitivePaths(hops);
+
+        assertEquals(
+                Set.of(
+                        List.of("doc1", "model1", "code1"),
+                        List.of("doc1", "model2", "code1"),
+                        List.of("doc1", "model2", "code2")),
+                Set.copyOf(paths));
+        assertEquals(3, paths.size());
+    }
+}
@@ -0,0 +1,74 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.cli.server;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.util.List;
+import java.util.Set;
+import java.util.concurrent.CountDownLatch;
+import java.util.concurrent.TimeUnit;
+
+import org.junit.jupiter.api.Test;
+
+/**
+ * Test class for the {@link JobScheduler}.
+ */
+class JobSchedulerTest {
+
+    @Test
+    void runsJobsWithSameCacheDirectoryConcurrently() throws InterruptedException {
+        JobScheduler scheduler = new JobScheduler(2);
+        scheduler.acquire(job("job-1", "cache/a"));
+        scheduler.acquire(job("job-2", "cache/a"));
+        assertEquals(2, scheduler.getRunning());
+        assertEquals(0, scheduler.getQueued());
+    }
+
+    @Test
+    void jobWithOtherCacheDirectoryWaitsForRunningJobs() throws InterruptedException {
+        JobScheduler scheduler = new JobScheduler(2);
+        scheduler.acquire(job("job-1", "cache/a"));
+
+        CountDownLatch started = new CountDownLatch(1);
+        Thread waiting = Thread.startVirtualThread(() -> {
+            try {
+                scheduler.acquire(job("job-2", "cache/b"));
+                started.countDown();
+            } catch (InterruptedException e) {
+                Thread.currentThread().interrupt();
+            }
+        });
+
+        assertFalse(started.await(200, TimeUnit.MILLISECONDS));
+        assertEquals(1, scheduler.getQueued());
+        scheduler.release();
+        assertTrue(started.await(5, TimeUnit.SECONDS));
+        waiting.join();
+        assertEquals(1, scheduler.getRunning());
+    }
+
+    @Test
+    void offlineJobRunsExclusively() throws InterruptedException {
+        JobScheduler scheduler = new JobScheduler(2);
+        scheduler.acquire(new Job("job-1", new JobRequest("eval", List.of("--offline=skip")), Set.of("cache/a")));
+
+        CountDownLatch started = new CountDownLatch(1);
+        Thread waiting = Thread.startVirtualThread(() -> {
+            try {
+                scheduler.acquire(job("job-2", "cache/a"));
+                started.countDown();
+            } catch (InterruptedException e) {
+                Thread.currentThread().interrupt();
+            }
+        });
+
+        assertFalse(started.await(200, TimeUnit.MILLISECONDS));
+        scheduler.release();
+        assertTrue(started.await(5, TimeUnit.SECONDS));
+        waiting.join();
+    }
+
+    private static Job job(String id, String cacheDirectory) {
+        return new Job(id, new JobRequest("eval", List.of()), Set.of(cacheDirectory));
+    }
+}
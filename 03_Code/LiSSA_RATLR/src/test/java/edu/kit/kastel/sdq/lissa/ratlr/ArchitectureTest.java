@@ -129,7 +129,9 @@ class ArchitectureTest {
             .that()
             .areNotAssignableTo(OptimizeCommand.class)
             .should()
-            .callConstructor(Evaluation.class, Path.class, String.class);
+            .callConstructor(Evaluation.class, Path.class, String.class)
+            .orShould()
+            .callConstructor(Evaluation.class, Path.class, String.class, StoreRegistry.class);
 
     /**
      * Futures should be opened with a logger.
@@ -0,0 +1,65 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.artifactprovider;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.io.IOException;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.List;
+import java.util.Map;
+
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.io.TempDir;
+
+import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
+import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Knowledge;
+
+/**
+ * Test class for the loading and fingerprinting of the {@link RecursiveTextArtifactProvider}.
+ */
+class RecursiveTextArtifactProviderTest {
+    @TempDir
+    Path root;
+
+    @Test
+    void loadsMatchingNonEmptyFilesByRelativePath() throws IOException {
+        writeTree();
+
+        List<String> identifiers =
+                provider().getArtifacts().stream().map(Knowledge::getIdentifier).toList();
+
+        assertEquals(List.of("A.java", "sub/B.java"), identifiers);
+    }
+
+    @Test
+    void fingerprintChangesOnlyWithContent() throws IOException {
+        writeTree();
+        RecursiveTextArtifactProvider provider = provider();
+        String fingerprint = provider.getFingerprint();
+
+        assertEquals(fingerprint, provider.getFingerprint());
+        assertEquals(fingerprint, provider().getFingerprint());
+        assertEquals(2, provider.getArtifacts().size());
+
+        Files.writeString(root.resolve("sub/B.java"), "class B { int b; }");
+        assertNotEquals(fingerprint, provider().getFingerprint());
+    }
+
+    private void writeTree() throws IOException {
+        Files.createDirectories(root.resolve("sub"));
+        Files.writeString(root.resolve("A.java"), "class A {}");
+        Files.writeString(root.resolve("sub/B.java"), "class B {}");
+        Files.writeString(root.resolve("sub/Empty.java"), "");
+        Files.writeString(root.resolve("notes.txt"), "ignored");
+    }
+
+    private RecursiveTextArtifactProvider provider() {
+        return new RecursiveTextArtifactProvider(
+                new ModuleConfiguration(
+                        "recursive_text",
+                        Map.of("path", root.toString(), "artifact_type", "source code", "extensions", ".java")),
+                new ContextStore());
+    }
+}
@@ -0,0 +1,62 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.cache;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.io.IOException;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.List;
+
+import org.junit.jupiter.api.AfterEach;
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.io.TempDir;
+
+import com.fasterxml.jackson.databind.JsonNode;
+import com.fasterxml.jackson.databind.ObjectMapper;
+
+/**
+ * Test class for the {@link OfflineReplay}.
+ */
+class OfflineReplayTest {
+    @TempDir
+    Path directory;
+
+    @AfterEach
+    void disable() {
+        OfflineReplay.disable();
+    }
+
+    @Test
+    void recordsDistinctMissesAndReportsThem() throws IOException {
+        OfflineReplay.enable(OfflineReplay.Policy.SKIP);
+        UncachedRequestException miss = OfflineReplay.miss("chat", "gpt-4o", "Are these related?");
+        OfflineReplay.miss("chat", "gpt-4o", "Are these related?");
+        OfflineReplay.miss("embedding", "text-embedding-3-large", "Some requirement");
+
+        assertTrue(OfflineReplay.isSkipped(new IllegalStateException("wrapped", miss)));
+        assertFalse(OfflineReplay.isSkipped(new IllegalStateException("other failure")));
+
+        List<OfflineReplay.Miss> misses = OfflineReplay.getMisses();
+        assertEquals(List.of("chat", "embedding"), misses.stream().map(OfflineReplay.Miss::kind).toList());
+        assertEquals(2, misses.getFirst().count());
+
+        Path report = directory.resolve(OfflineReplay.REPORT_FILE);
+        OfflineReplay.writeReport(report);
+        JsonNode json = new ObjectMapper().readTree(Files.readString(report));
+        assertEquals("SKIP", json.get("policy").asText());
+        assertEquals(2, json.get("distinct_misses").asInt());
+        assertEquals(3, json.get("total_misses").asInt());
+    }
+
+    @Test
+    void failPolicyDoesNotSkip() {
+        OfflineReplay.enable(OfflineReplay.Policy.FAIL);
+        UncachedRequestException miss = OfflineReplay.miss("chat", "gpt-4o", "Are these related?");
+
+        assertTrue(OfflineReplay.isMiss(miss));
+        assertFalse(OfflineReplay.isSkipped(miss));
+        OfflineReplay.enable(OfflineReplay.Policy.FAIL);
+        assertTrue(OfflineReplay.getMisses().isEmpty());
+    }
+}
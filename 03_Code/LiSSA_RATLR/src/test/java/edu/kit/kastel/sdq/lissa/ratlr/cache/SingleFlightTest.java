@@ -0,0 +1,168 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.cache;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.CountDownLatch;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicInteger;
+
+import org.junit.jupiter.api.Test;
+
+/**
+ * Test class for {@link SingleFlight}.
+ * The tests verify that concurrent identical requests are issued only once and that the response is cached.
+ */
+class SingleFlightTest {
+
+    @Test
+    void coalescesConcurrentIdenticalRequests() throws InterruptedException {
+        InMemoryCache cache = new InMemoryCache();
+        ClassifierCacheKey key = ClassifierCacheKey.of("model", 0, 0.0, ClassifierCacheKey.Mode.CHAT, "prompt");
+        AtomicInteger calls = new AtomicInteger();
+        CountDownLatch release = new CountDownLatch(1);
+        long coalescedBefore = SingleFlight.getCoalesced();
+
+        List<Thread> threads = new ArrayList<>();
+        List<String> responses = new ArrayList<>();
+        for (int i = 0; i < 4; i++) {
+            threads.add(Thread.ofVirtual().start(() -> {
+                String response = SingleFlight.getOrCompute(cache, key, String.class, () -> {
+                    calls.incrementAndGet();
+                    awaitUninterruptibly(release);
+                    return "yes";
+                });
+                synchronized (responses) {
+                    responses.add(response);
+                }
+            }));
+        }
+        // Give all callers the chance to join the first request before it completes
+        Thread.sleep(100);
+        release.countDown();
+        for (Thread thread : threads) {
+            thread.join();
+        }
+
+        assertEquals(1, calls.get());
+        assertEquals(List.of("yes", "yes", "yes", "yes"), responses);
+        assertEquals(1, cache.puts.get());
+        assertEquals("yes", cache.get(key, String.class));
+        assertTrue(SingleFlight.getCoalesced() - coalescedBefore <= 3);
+    }
+
+    @Test
+    void servesCachedResponsesWithoutRequest() {
+        InMemoryCache cache = new InMemoryCache();
+        ClassifierCacheKey key = ClassifierCacheKey.of("model", 0, 0.0, ClassifierCacheKey.Mode.CHAT, "cached");
+        cache.put(key, "no");
+
+        String response = SingleFlight.getOrCompute(cache, key, String.class, () -> fail("Request must not be issued"));
+
+        assertEquals("no", response);
+    }
+
+    @Test
+    void doesNotCoalesceRequestsForDifferentCaches() throws InterruptedException {
+        List<InMemoryCache> caches = List.of(new InMemoryCache(), new InMemoryCache());
+        ClassifierCacheKey key = ClassifierCacheKey.of("model", 0, 0.0, ClassifierCacheKey.Mode.CHAT, "shared");
+        AtomicInteger calls = new AtomicInteger();
+        CountDownLatch bothRequested = new CountDownLatch(2);
+
+        List<Thread> threads = new ArrayList<>();
+        for (InMemoryCache cache : caches) {
+            threads.add(Thread.ofVirtual().start(() -> SingleFlight.getOrCompute(cache, key, String.class, () -> {
+                calls.incrementAndGet();
+                bothRequested.countDown();
+                awaitUninterruptibly(bothRequested);
+                return "yes";
+            })));
+        }
+        for (Thread thread : threads) {
+            thread.join();
+        }
+
+        assertEquals(2, calls.get());
+        for (InMemoryCache cache : caches) {
+            assertEquals("yes", cache.get(key, String.class));
+        }
+    }
+
+    @Test
+    void waitingCallersReceiveFailureOfTheFirstCaller() throws InterruptedException {
+        InMemoryCache cache = new InMemoryCache();
+        ClassifierCacheKey key = ClassifierCacheKey.of("model", 0, 0.0, ClassifierCacheKey.Mode.CHAT, "failing");
+        CountDownLatch requested = new CountDownLatch(1);
+        CountDownLatch release = new CountDownLatch(1);
+        IllegalArgumentException failure = new IllegalArgumentException("Request failed");
+
+        Thread leader = Thread.ofVirtual().start(() -> assertThrows(IllegalArgumentException.class, () -> {
+            SingleFlight.getOrCompute(cache, key, String.class, () -> {
+                requested.countDown();
+                awaitUninterruptibly(release);
+                throw failure;
+            });
+        }));
+        awaitUninterruptibly(requested);
+        List<Throwable> waiterFailures = new ArrayList<>();
+        Thread waiter = Thread.ofVirtual().start(() -> {
+            try {
+                SingleFlight.getOrCompute(cache, key, String.class, () -> fail("Request must be coalesced"));
+            } catch (IllegalStateException e) {
+                waiterFailures.add(e.getCause());
+            }
+        });
+        // Give the waiter the chance to join the request of the leader before it fails
+        Thread.sleep(100);
+        release.countDown();
+        leader.join();
+        waiter.join();
+
+        assertEquals(List.of(failure), waiterFailures);
+    }
+
+    private static void awaitUninterruptibly(CountDownLatch latch) {
+        try {
+            assertTrue(latch.await(10, TimeUnit.SECONDS));
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw new IllegalStateException(e);
+        }
+    }
+
+    private static final class InMemoryCache implements Cache {
+        private final Map<String, Object> values = new ConcurrentHashMap<>();
+        private final AtomicInteger puts = new AtomicInteger();
+
+        @Override
+        public <T> T get(CacheKey key, Class<T> clazz) {
+            return clazz.cast(values.get(key.localKey()));
+        }
+
+        @Override
+        public void put(CacheKey key, String value) {
+            puts.incrementAndGet();
+            values.put(key.localKey(), value);
+        }
+
+        @Override
+        public <T> void put(CacheKey key, T value) {
+            puts.incrementAndGet();
+            values.put(key.localKey(), value);
+        }
+
+        @Override
+        public void flush() {
+            // Nothing to flush
+        }
+
+        @Override
+        public boolean containsKey(CacheKey key) {
+            return values.containsKey(key.localKey());
+        }
+    }
+}
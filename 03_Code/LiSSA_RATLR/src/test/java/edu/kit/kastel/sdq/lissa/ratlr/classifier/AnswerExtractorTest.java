@@ -0,0 +1,37 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.classifier;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import org.junit.jupiter.api.Test;
+
+/**
+ * Test class for the {@link AnswerExtractor}.
+ */
+class AnswerExtractorTest {
+
+    @Test
+    void containsAcceptsYesAnywhere() {
+        assertTrue(AnswerExtractor.CONTAINS.extract("Well, yes and no."));
+        assertFalse(AnswerExtractor.CONTAINS.extract("<think>yes?</think> No."));
+    }
+
+    @Test
+    void traceRequiresExactVerdictInTag() {
+        assertTrue(AnswerExtractor.TRACE.extract("The artifacts match. <trace> YES </trace>"));
+        assertFalse(AnswerExtractor.TRACE.extract("Yes, they match. <trace>no</trace>"));
+        assertFalse(AnswerExtractor.TRACE.extract("Yes, they match."));
+    }
+
+    @Test
+    void finalTokenIgnoresEarlierMentions() {
+        assertTrue(AnswerExtractor.FINAL_TOKEN.extract("<think>Maybe no</think>Answer: yes."));
+        assertFalse(AnswerExtractor.FINAL_TOKEN.extract("Expert A says yes, expert B disagrees. Final answer: no"));
+    }
+
+    @Test
+    void resolvesConfigurationNames() {
+        assertEquals(AnswerExtractor.FINAL_TOKEN, AnswerExtractor.fromName("final_token"));
+        assertThrows(IllegalArgumentException.class, () -> AnswerExtractor.fromName("unknown"));
+    }
+}
@@ -0,0 +1,62 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.classifier;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.time.Duration;
+import java.util.concurrent.atomic.AtomicInteger;
+
+import org.junit.jupiter.api.Test;
+
+import dev.langchain4j.exception.RateLimitException;
+
+/**
+ * Test class for the {@link ChatDispatcher}.
+ * The tests simulate a provider that throttles requests and verify that:
+ * <ul>
+ *     <li>Throttled requests are retried until they succeed</li>
+ *     <li>The concurrency limit shrinks on throttling</li>
+ *     <li>Requests fail once the retries are exhausted</li>
+ * </ul>
+ */
+class ChatDispatcherTest {
+
+    private static ChatDispatcher createDispatcher(int maxConcurrency, int maxRetries) {
+        return new ChatDispatcher(
+                "test", 0, 0, maxConcurrency, maxRetries, Duration.ofMillis(1), Duration.ofMillis(5));
+    }
+
+    @Test
+    void retriesThrottledRequests() {
+        ChatDispatcher dispatcher = createDispatcher(8, 5);
+        AtomicInteger attempts = new AtomicInteger();
+
+        String response = dispatcher.execute(
+                () -> {
+                    if (attempts.incrementAndGet() <= 2) {
+                        throw new RateLimitException("429");
+                    }
+                    return "yes";
+                },
+                10);
+
+        assertEquals("yes", response);
+        assertEquals(3, attempts.get());
+        assertEquals(2, dispatcher.getThrottled());
+        assertEquals(2, dispatcher.getRetries());
+        assertTrue(dispatcher.getConcurrencyLimit() < 8, "Throttling should reduce the concurrency limit");
+    }
+
+    @Test
+    void failsAfterMaximumRetries() {
+        ChatDispatcher dispatcher = createDispatcher(1, 2);
+        AtomicInteger attempts = new AtomicInteger();
+
+        assertThrows(RateLimitException.class, () -> dispatcher.execute(() -> {
+            attempts.incrementAndGet();
+            throw new RateLimitException("429");
+        }, 10));
+        assertEquals(3, attempts.get());
+        assertEquals(1, dispatcher.getConcurrencyLimit());
+    }
+}
@@ -0,0 +1,75 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.classifier;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Map;
+import java.util.Optional;
+
+import org.junit.jupiter.api.Test;
+
+import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
+import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
+import edu.kit.kastel.sdq.lissa.ratlr.elementstore.SourceElementStore;
+import edu.kit.kastel.sdq.lissa.ratlr.elementstore.TargetElementStore;
+import edu.kit.kastel.sdq.lissa.ratlr.elementstore.strategy.CosineSimilarity;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.Pair;
+
+/**
+ * Test class for the parallel classification of the {@link Classifier}.
+ */
+class ClassifierTest {
+
+    @Test
+    void parallelClassificationRethrowsFailureOfAWorker() {
+        Classifier classifier = new Classifier(4, new ContextStore()) {
+            @Override
+            protected Optional<ClassificationResult> classify(Element source, Element target) {
+                if (target.getIdentifier().equals("t3")) {
+                    throw new IllegalStateException("Retries exhausted");
+                }
+                return Optional.of(ClassificationResult.of(source, target, 1.0));
+            }
+
+            @Override
+            public Classifier copyOf() {
+                return this;
+            }
+
+            @Override
+            public void setClassificationPrompt(String prompt) {
+                // The results do not depend on a prompt
+            }
+
+            @Override
+            public Map<String, String> getCacheParameters() {
+                return Map.of();
+            }
+        };
+
+        IllegalStateException exception =
+                assertThrows(IllegalStateException.class, () -> classifier.classify(sourceStore(), targetStore()));
+        assertEquals("Retries exhausted", exception.getMessage());
+    }
+
+    private static SourceElementStore sourceStore() {
+        return new SourceElementStore(List.of(new Pair<>(element("s0"), new float[] {1, 1})));
+    }
+
+    private static TargetElementStore targetStore() {
+        List<Pair<Element, float[]>> content = new ArrayList<>();
+        for (int i = 0; i < 8; i++) {
+            content.add(new Pair<>(element("t" + i), new float[] {1, 1 - i * 0.1f}));
+        }
+        return new TargetElementStore(
+                content,
+                new CosineSimilarity(new ModuleConfiguration("cosine_similarity", Map.of("max_results", "infinity"))));
+    }
+
+    private static Element element(String identifier) {
+        return new Element(identifier, "requirement", identifier, 0, null, true);
+    }
+}
@@ -0,0 +1,126 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.classifier;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Map;
+import java.util.Optional;
+import java.util.Set;
+import java.util.concurrent.ConcurrentLinkedQueue;
+
+import org.junit.jupiter.api.Test;
+
+import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
+import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
+import edu.kit.kastel.sdq.lissa.ratlr.elementstore.SourceElementStore;
+import edu.kit.kastel.sdq.lissa.ratlr.elementstore.TargetElementStore;
+import edu.kit.kastel.sdq.lissa.ratlr.elementstore.strategy.CosineSimilarity;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.Pair;
+
+/**
+ * Test class for the {@link PipelineClassifier}.
+ */
+class PipelineClassifierTest {
+    private final ContextStore contextStore = new ContextStore();
+
+    @Test
+    void expensiveVoterOnlyVotesOnUndecidedTasks() {
+        VotingClassifier expensive = new VotingClassifier(Set.of("t0", "t1", "t2"));
+        VotingClassifier medium = new VotingClassifier(Set.of("t0"));
+        VotingClassifier cheap = new VotingClassifier(Set.of("t0", "t1"));
+        PipelineClassifier pipeline = new PipelineClassifier(
+                List.of(List.of(expensive, medium, cheap)), List.of(List.of(3.0, 2.0, 1.0)), 1, contextStore);
+
+        List<ClassificationResult> results = pipeline.classify(sourceStore(), targetStore());
+
+        // t0 is accepted and t2 rejected by the two cheaper voters, only t1 is left to the expensive voter
+        assertEquals(List.of("t0", "t1", "t2"), cheap.votedTargets());
+        assertEquals(List.of("t0", "t1", "t2"), medium.votedTargets());
+        assertEquals(List.of("t1"), expensive.votedTargets());
+        assertEquals(
+                Set.of("t0", "t1"),
+                Set.copyOf(results.stream()
+                        .map(result -> result.target().getIdentifier())
+                        .toList()));
+    }
+
+    @Test
+    void failingVoterFailsTheStage() {
+        VotingClassifier failing = new VotingClassifier(Set.of()) {
+            @Override
+            protected Optional<ClassificationResult> classify(Element source, Element target) {
+                throw new IllegalStateException("Request failed");
+            }
+        };
+        PipelineClassifier pipeline = new PipelineClassifier(
+                List.of(List.of(new VotingClassifier(Set.of("t0", "t1", "t2")), failing)),
+                List.of(List.of(1.0, 0.5)),
+                1,
+                contextStore);
+
+        IllegalStateException exception = assertThrows(
+                IllegalStateException.class, () -> pipeline.classify(sourceStore(), targetStore()));
+        assertEquals("Request failed", exception.getMessage());
+    }
+
+    private static SourceElementStore sourceStore() {
+        return new SourceElementStore(List.of(new Pair<>(element("s0"), new float[] {1, 1})));
+    }
+
+    private static TargetElementStore targetStore() {
+        List<Pair<Element, float[]>> content = new ArrayList<>();
+        for (int i = 0; i < 3; i++) {
+            content.add(new Pair<>(element("t" + i), new float[] {1, 1 - i * 0.1f}));
+        }
+        return new TargetElementStore(
+                content,
+                new CosineSimilarity(new ModuleConfiguration("cosine_similarity", Map.of("max_results", "infinity"))));
+    }
+
+    private static Element element(String identifier) {
+        return new Element(identifier, "requirement", identifier, 0, null, true);
+    }
+
+    /**
+     * Votes for a fixed set of targets and records the targets it voted on.
+     */
+    private class VotingClassifier extends Classifier {
+        private final Set<String> relatedTargets;
+        private final ConcurrentLinkedQueue<String> votedTargets = new ConcurrentLinkedQueue<>();
+
+        private VotingClassifier(Set<String> relatedTargets) {
+            super(1, contextStore);
+            this.relatedTargets = relatedTargets;
+        }
+
+        private List<String> votedTargets() {
+            return votedTargets.stream().sorted().toList();
+        }
+
+        @Override
+        protected Optional<ClassificationResult> classify(Element source, Element target) {
+            votedTargets.add(target.getIdentifier());
+            return relatedTargets.contains(target.getIdentifier())
+                    ? Optional.of(ClassificationResult.of(source, target, 1.0))
+                    : Optional.empty();
+        }
+
+        @Override
+        public Classifier copyOf() {
+            return this;
+        }
+
+        @Override
+        public void setClassificationPrompt(String prompt) {
+            // Votes do not depend on a prompt
+        }
+
+        @Override
+        public Map<String, String> getCacheParameters() {
+            return Map.of();
+        }
+    }
+}
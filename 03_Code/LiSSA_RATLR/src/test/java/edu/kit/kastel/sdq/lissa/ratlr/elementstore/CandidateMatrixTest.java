@@ -0,0 +1,115 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.elementstore;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.io.IOException;
+import java.nio.file.Path;
+import java.util.ArrayList;
+import java.util.List;
+
+import org.junit.jupiter.api.AfterEach;
+import org.junit.jupiter.api.BeforeEach;
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.io.TempDir;
+
+import edu.kit.kastel.sdq.lissa.ratlr.cache.CacheManager;
+import edu.kit.kastel.sdq.lissa.ratlr.elementstore.strategy.RetrievalStrategy;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.Pair;
+
+/**
+ * Test class for the {@link CandidateMatrix}.
+ */
+class CandidateMatrixTest {
+    @TempDir
+    Path cacheDirectory;
+
+    @BeforeEach
+    void setUp() throws IOException {
+        CandidateMatrix.forgetMemoized();
+        CacheManager.setCacheDir(cacheDirectory.toString());
+    }
+
+    @AfterEach
+    void tearDown() {
+        CandidateMatrix.forgetMemoized();
+        CacheManager.resetDefaultInstance();
+    }
+
+    @Test
+    void reusesPersistedMatrixUntilStoreContentChanges() throws IOException {
+        CountingStrategy strategy = new CountingStrategy();
+        CandidateMatrix computed = CandidateMatrix.of(sourceStore(), targetStore(strategy, 1));
+        assertEquals(1, strategy.calls);
+
+        // Equal stores loaded again in a new process read the matrix from the cache directory
+        CandidateMatrix.forgetMemoized();
+        CacheManager.resetDefaultInstance();
+        CacheManager.setCacheDir(cacheDirectory.toString());
+        CandidateMatrix loaded = CandidateMatrix.of(sourceStore(), targetStore(strategy, 1));
+        assertEquals(1, strategy.calls);
+        assertEquals(describe(computed), describe(loaded));
+
+        // Other embeddings change the content hash of the target store, so the matrix is computed again
+        CandidateMatrix.forgetMemoized();
+        CandidateMatrix.of(sourceStore(), targetStore(strategy, 2));
+        assertEquals(2, strategy.calls);
+    }
+
+    private static SourceElementStore sourceStore() {
+        List<Pair<Element, float[]>> content = new ArrayList<>();
+        for (int i = 0; i < 3; i++) {
+            content.add(new Pair<>(element("source" + i), new float[] {1, i}));
+        }
+        return new SourceElementStore(content);
+    }
+
+    private static TargetElementStore targetStore(RetrievalStrategy strategy, float scale) {
+        List<Pair<Element, float[]>> content = new ArrayList<>();
+        for (int i = 0; i < 4; i++) {
+            content.add(new Pair<>(element("target" + i), new float[] {scale, i}));
+        }
+        return new TargetElementStore(content, strategy);
+    }
+
+    private static Element element(String identifier) {
+        return new Element(identifier, "requirement", identifier, 0, null, true);
+    }
+
+    private static List<String> describe(CandidateMatrix matrix) {
+        return matrix.getPairs().stream()
+                .map(pair -> pair.first().getIdentifier() + "->" + pair.second().getIdentifier())
+                .toList();
+    }
+
+    /**
+     * Returns the two elements with the largest second dimension and counts the batched retrievals.
+     */
+    private static final class CountingStrategy implements RetrievalStrategy {
+        private int calls;
+
+        @Override
+        public List<Pair<Element, Float>> findSimilarElements(
+                Pair<Element, float[]> query, List<Pair<Element, float[]>> allElementsInStore) {
+            List<Pair<Element, Float>> similar = new ArrayList<>();
+            for (var element : allElementsInStore) {
+                similar.add(new Pair<>(element.first(), element.second()[1] * query.second()[1]));
+            }
+            similar.sort((a, b) -> Float.compare(b.second(), a.second()));
+            return similar.subList(0, 2);
+        }
+
+        @Override
+        public List<List<Pair<Element, Float>>> findSimilarElements(
+                List<Pair<Element, float[]>> queries, List<Pair<Element, float[]>> allElementsInStore) {
+            calls++;
+            return RetrievalStrategy.super.findSimilarElements(queries, allElementsInStore);
+        }
+
+        @Override
+        public String getIdentifier() {
+            return "counting";
+        }
+    }
+}
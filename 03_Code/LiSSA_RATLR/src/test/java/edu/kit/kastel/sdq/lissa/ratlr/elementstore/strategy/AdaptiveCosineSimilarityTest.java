@@ -0,0 +1,31 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.elementstore.strategy;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.util.Map;
+
+import org.junit.jupiter.api.Test;
+
+import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
+
+/**
+ * Test class for the {@link AdaptiveCosineSimilarity}.
+ */
+class AdaptiveCosineSimilarityTest {
+
+    @Test
+    void rejectsMinimumAboveMaximumResults() {
+        assertThrows(
+                IllegalArgumentException.class,
+                () -> new AdaptiveCosineSimilarity(configuration(Map.of("max_results", "3", "min_results", "4"))));
+        assertDoesNotThrow(
+                () -> new AdaptiveCosineSimilarity(configuration(Map.of("max_results", "3", "min_results", "3"))));
+        assertDoesNotThrow(() ->
+                new AdaptiveCosineSimilarity(configuration(Map.of("max_results", "infinity", "min_results", "50"))));
+    }
+
+    private static ModuleConfiguration configuration(Map<String, String> arguments) {
+        return new ModuleConfiguration("adaptive_cosine_similarity", arguments);
+    }
+}
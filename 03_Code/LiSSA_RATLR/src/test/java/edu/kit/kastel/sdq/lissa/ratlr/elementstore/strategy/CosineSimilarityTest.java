@@ -0,0 +1,74 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.elementstore.strategy;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Map;
+import java.util.Random;
+
+import org.junit.jupiter.params.ParameterizedTest;
+import org.junit.jupiter.params.provider.ValueSource;
+
+import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.Pair;
+
+/**
+ * Test class for the {@link CosineSimilarity}.
+ */
+class CosineSimilarityTest {
+
+    /**
+     * The batched retrieval must return the same elements in the same order as the retrieval per query.
+     * Every target vector occurs several times, so ties have to be resolved by the order in the store as well.
+     * The sizes are no multiples of the block sizes, so partial blocks are covered.
+     */
+    @ParameterizedTest
+    @ValueSource(strings = {"1", "5", "infinity"})
+    void batchedRetrievalEqualsRetrievalPerQuery(String maxResults) {
+        Random random = new Random(42);
+        List<Pair<Element, float[]>> queries = elements("q", 37, random);
+        List<Pair<Element, float[]>> distinctTargets = elements("t", 29, random);
+        List<Pair<Element, float[]>> targets = new ArrayList<>();
+        for (int copy = 0; copy < 3; copy++) {
+            for (var target : distinctTargets) {
+                targets.add(new Pair<>(element(target.first().getIdentifier() + "-" + copy), target.second()));
+            }
+        }
+        CosineSimilarity strategy =
+                new CosineSimilarity(new ModuleConfiguration("cosine_similarity", Map.of("max_results", maxResults)));
+
+        List<List<Pair<Element, Float>>> batched = strategy.findSimilarElements(queries, targets);
+
+        assertEquals(queries.size(), batched.size());
+        for (int i = 0; i < queries.size(); i++) {
+            assertEquals(describe(strategy.findSimilarElements(queries.get(i), targets)), describe(batched.get(i)));
+        }
+    }
+
+    private static List<Pair<Element, float[]>> elements(String prefix, int count, Random random) {
+        List<Pair<Element, float[]>> elements = new ArrayList<>(count);
+        for (int i = 0; i < count; i++) {
+            float[] vector = new float[8];
+            for (int j = 0; j < vector.length; j++) {
+                // Few distinct values, so that some vectors are equal
+                vector[j] = random.nextInt(3);
+            }
+            vector[0] += 1;
+            elements.add(new Pair<>(element(prefix + i), vector));
+        }
+        return elements;
+    }
+
+    private static Element element(String identifier) {
+        return new Element(identifier, "requirement", identifier, 0, null, true);
+    }
+
+    private static List<String> describe(List<Pair<Element, Float>> results) {
+        return results.stream()
+                .map(result -> result.first().getIdentifier() + "=" + result.second())
+                .toList();
+    }
+}
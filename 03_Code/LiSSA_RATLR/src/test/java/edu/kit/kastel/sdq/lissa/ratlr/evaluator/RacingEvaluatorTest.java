@@ -0,0 +1,76 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.evaluator;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.util.ArrayList;
+import java.util.Comparator;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.atomic.AtomicLong;
+import java.util.stream.IntStream;
+
+import org.junit.jupiter.api.Test;
+
+import edu.kit.kastel.sdq.lissa.ratlr.classifier.ClassificationTask;
+import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
+import edu.kit.kastel.sdq.lissa.ratlr.promptmetric.Metric;
+
+/**
+ * Test class for the {@link RacingEvaluator}.
+ * The prompts are named by their quality, and the metric scores a prompt by its quality, so the ranking is known.
+ */
+class RacingEvaluatorTest {
+
+    @Test
+    void keepsBestPromptsWithinBudget() {
+        RacingEvaluator evaluator = new RacingEvaluator(new ModuleConfiguration(
+                "racing",
+                Map.of("samples_per_eval", "8", "survivors", "2", "max_evaluations", "400", "max_threads", "4")));
+        List<String> prompts = List.of("0.3", "0.9", "0.1", "0.8", "0.5", "0.2", "0.7", "0.4");
+        List<ClassificationTask> examples = new ArrayList<>();
+        for (int i = 0; i < 100; i++) {
+            examples.add(task(i));
+        }
+        QualityMetric metric = new QualityMetric();
+
+        List<Double> scores = evaluator.sampleAndEvaluate(prompts, examples, metric);
+
+        List<Integer> ranking = IntStream.range(0, prompts.size())
+                .boxed()
+                .sorted(Comparator.comparingDouble((Integer i) -> scores.get(i)).reversed())
+                .toList();
+        assertEquals(List.of(1, 3), ranking.subList(0, 2));
+        assertTrue(metric.evaluations.get() <= 400);
+        assertTrue(metric.evaluations.get() < (long) prompts.size() * examples.size());
+    }
+
+    private static ClassificationTask task(int index) {
+        return new ClassificationTask(
+                new Element("s" + index, "type", "source", 0, null, true),
+                new Element("t" + index, "type", "target", 0, null, true),
+                index % 2 == 0);
+    }
+
+    private static final class QualityMetric implements Metric {
+        private final AtomicLong evaluations = new AtomicLong();
+
+        @Override
+        public List<Double> getMetric(List<String> prompts, List<ClassificationTask> examples) {
+            return prompts.stream().map(prompt -> getMetric(prompt, examples)).toList();
+        }
+
+        @Override
+        public Double getMetric(String prompt, List<ClassificationTask> examples) {
+            // Every call classifies the examples from scratch
+            evaluations.addAndGet(examples.size());
+            return Double.parseDouble(prompt);
+        }
+
+        @Override
+        public String getName() {
+            return "quality";
+        }
+    }
+}
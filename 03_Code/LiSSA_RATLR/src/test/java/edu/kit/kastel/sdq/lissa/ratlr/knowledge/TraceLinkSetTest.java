@@ -0,0 +1,84 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.knowledge;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.util.ArrayList;
+import java.util.HashSet;
+import java.util.Iterator;
+import java.util.List;
+import java.util.Set;
+
+import org.junit.jupiter.api.Test;
+
+/**
+ * Test class for the {@link TraceLinkSet}.
+ */
+class TraceLinkSetTest {
+
+    @Test
+    void behavesLikeLinkedHashSet() {
+        TraceLinkSet traceLinks = new TraceLinkSet();
+
+        assertTrue(traceLinks.add(new TraceLink("b", "x")));
+        assertTrue(traceLinks.add("a", "y"));
+        assertFalse(traceLinks.add(new TraceLink("b", "x")));
+        assertTrue(traceLinks.add("y", "a"));
+
+        assertEquals(3, traceLinks.size());
+        assertTrue(traceLinks.contains(new TraceLink("a", "y")));
+        assertFalse(traceLinks.contains(new TraceLink("x", "b")));
+        assertFalse(traceLinks.contains(new TraceLink("unknown", "y")));
+        assertEquals(
+                List.of(new TraceLink("b", "x"), new TraceLink("a", "y"), new TraceLink("y", "a")),
+                new ArrayList<>(traceLinks));
+        assertEquals(Set.of(new TraceLink("b", "x"), new TraceLink("a", "y"), new TraceLink("y", "a")), traceLinks);
+        assertEquals(new HashSet<>(traceLinks).hashCode(), traceLinks.hashCode());
+    }
+
+    @Test
+    void removesLinksAndKeepsOrder() {
+        TraceLinkSet traceLinks = new TraceLinkSet();
+        for (int i = 0; i < 1000; i++) {
+            traceLinks.add("s" + (i % 37), "t" + i);
+        }
+
+        Iterator<TraceLink> iterator = traceLinks.iterator();
+        while (iterator.hasNext()) {
+            TraceLink traceLink = iterator.next();
+            if (Integer.parseInt(traceLink.targetId().substring(1)) % 2 == 0) {
+                iterator.remove();
+            }
+        }
+        assertTrue(traceLinks.remove(new TraceLink("s1", "t1")));
+        assertFalse(traceLinks.remove(new TraceLink("s1", "t1")));
+        for (int i = 1000; i < 2000; i++) {
+            traceLinks.add("s" + (i % 37), "t" + i);
+        }
+
+        List<TraceLink> expected = new ArrayList<>();
+        for (int i = 3; i < 1000; i += 2) {
+            expected.add(new TraceLink("s" + (i % 37), "t" + i));
+        }
+        for (int i = 1000; i < 2000; i++) {
+            expected.add(new TraceLink("s" + (i % 37), "t" + i));
+        }
+        assertEquals(expected, new ArrayList<>(traceLinks));
+        for (TraceLink traceLink : expected) {
+            assertTrue(traceLinks.contains(traceLink));
+        }
+    }
+
+    @Test
+    void derivedSetsShareDictionary() {
+        TraceLinkSet traceLinks = new TraceLinkSet(List.of(new TraceLink("a", "b"), new TraceLink("b", "c")));
+        TraceLinkSet derived = TraceLinkSet.derivedFrom(traceLinks);
+        derived.addAll(traceLinks);
+        derived.add("c", "a");
+
+        assertSame(traceLinks.getDictionary(), derived.getDictionary());
+        assertEquals(3, derived.getDictionary().size());
+        assertEquals(3, derived.size());
+        assertTrue(derived.containsAll(traceLinks));
+    }
+}
@@ -0,0 +1,80 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.preprocessor;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.io.IOException;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.HashMap;
+import java.util.List;
+import java.util.stream.Stream;
+
+import org.junit.jupiter.api.AfterEach;
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.io.TempDir;
+
+import edu.kit.kastel.sdq.lissa.ratlr.cache.CacheManager;
+import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
+import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Artifact;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
+
+/**
+ * Test class for the {@link CachedPreprocessor}.
+ * Uses the sentence preprocessor, which handles each artifact on its own.
+ */
+class CachedPreprocessorTest {
+    @TempDir
+    Path cacheDirectory;
+
+    @AfterEach
+    void resetCacheDirectory() {
+        CacheManager.resetDefaultInstance();
+    }
+
+    @Test
+    void reusesElementsPerArtifact() throws IOException {
+        CacheManager.setCacheDir(cacheDirectory.toString());
+        List<Artifact> artifacts = List.of(
+                new Artifact("a.txt", Artifact.ArtifactType.REQUIREMENT, "First sentence. Second sentence."),
+                new Artifact("b.txt", Artifact.ArtifactType.REQUIREMENT, "Only sentence."));
+
+        List<Element> computed = preprocessor().preprocess(artifacts);
+        List<Element> cached = preprocessor().preprocess(artifacts);
+
+        assertEquals(2, countCacheFiles());
+        assertEquals(describe(computed), describe(cached));
+        assertSame(cached.getFirst(), cached.get(1).getParent());
+
+        preprocessor()
+                .preprocess(List.of(
+                        artifacts.getFirst(),
+                        new Artifact("b.txt", Artifact.ArtifactType.REQUIREMENT, "Changed sentence.")));
+        assertEquals(3, countCacheFiles());
+    }
+
+    private static Preprocessor preprocessor() {
+        return Preprocessor.createPreprocessor(
+                new ModuleConfiguration("sentence", new HashMap<>()), new ContextStore());
+    }
+
+    private static List<String> describe(List<Element> elements) {
+        return elements.stream()
+                .map(element -> String.join(
+                        "|",
+                        element.getIdentifier(),
+                        element.getType(),
+                        element.getContent(),
+                        String.valueOf(element.getGranularity()),
+                        element.getParent() == null ? "" : element.getParent().getIdentifier(),
+                        String.valueOf(element.isCompare())))
+                .toList();
+    }
+
+    private long countCacheFiles() throws IOException {
+        try (Stream<Path> files = Files.walk(cacheDirectory.resolve("preprocessing"))) {
+            return files.filter(file -> file.toString().endsWith(".json")).count();
+        }
+    }
+}
@@ -0,0 +1,77 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.promptmetric;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.util.BitSet;
+import java.util.List;
+
+import org.junit.jupiter.api.Test;
+
+import edu.kit.kastel.sdq.lissa.ratlr.classifier.ClassificationTask;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
+import edu.kit.kastel.sdq.lissa.ratlr.utils.Pair;
+
+/**
+ * Test class for the {@link OutcomeMatrix}.
+ */
+class OutcomeMatrixTest {
+    private static final String PROMPT = "prompt";
+
+    private final ClassificationTask relatedAccepted = task("s1", "t1", true);
+    private final ClassificationTask relatedRejected = task("s1", "t2", true);
+    private final ClassificationTask unrelatedAccepted = task("s2", "t1", false);
+    private final ClassificationTask unrelatedRejected = task("s2", "t2", false);
+
+    @Test
+    void countsSubsetsFromRecordedOutcomes() {
+        OutcomeMatrix matrix = new OutcomeMatrix();
+        List<ClassificationTask> all =
+                List.of(relatedAccepted, relatedRejected, unrelatedAccepted, unrelatedRejected);
+        BitSet allIndices = matrix.indicesOf(all);
+        assertEquals(all, matrix.unknownTasks(PROMPT, all));
+
+        matrix.record(
+                PROMPT, all, List.of(OutcomeMatrix.keyOf(relatedAccepted), OutcomeMatrix.keyOf(unrelatedAccepted)));
+
+        assertTrue(matrix.unknownTasks(PROMPT, all).isEmpty());
+        assertArrayEquals(new int[] {1, 1, 1, 1}, matrix.count(PROMPT, allIndices));
+        BitSet single = matrix.indicesOf(List.of(relatedRejected));
+        assertArrayEquals(new int[] {0, 0, 1, 0}, matrix.count(PROMPT, single));
+    }
+
+    @Test
+    void requiresOutcomesOfAllTasks() {
+        OutcomeMatrix matrix = new OutcomeMatrix();
+        List<ClassificationTask> duplicates = List.of(relatedAccepted, relatedAccepted);
+        BitSet indices = matrix.indicesOf(duplicates);
+
+        assertEquals(List.of(relatedAccepted), matrix.unknownTasks(PROMPT, duplicates));
+        assertThrows(IllegalStateException.class, () -> matrix.count(PROMPT, indices));
+        assertTrue(matrix.unknownTasks("other", List.of(relatedAccepted)).contains(relatedAccepted));
+    }
+
+    @Test
+    void attributesResultsOnAncestorTargetsToTheirTasks() {
+        OutcomeMatrix matrix = new OutcomeMatrix();
+        Element source = new Element("s1", "type", "s1", 0, null, true);
+        Element artifact = new Element("artifact", "type", "artifact", 0, null, false);
+        ClassificationTask first =
+                new ClassificationTask(source, new Element("artifact$0", "type", "a", 1, artifact, true), true);
+        ClassificationTask second =
+                new ClassificationTask(source, new Element("artifact$1", "type", "b", 1, artifact, true), false);
+        List<ClassificationTask> all = List.of(first, second, relatedRejected);
+        BitSet indices = matrix.indicesOf(all);
+
+        matrix.record(PROMPT, all, List.of(new Pair<>("s1", "artifact")));
+
+        assertArrayEquals(new int[] {1, 1, 1, 0}, matrix.count(PROMPT, indices));
+    }
+
+    private static ClassificationTask task(String source, String target, boolean label) {
+        return new ClassificationTask(
+                new Element(source, "type", source, 0, null, true),
+                new Element(target, "type", target, 0, null, true),
+                label);
+    }
+}
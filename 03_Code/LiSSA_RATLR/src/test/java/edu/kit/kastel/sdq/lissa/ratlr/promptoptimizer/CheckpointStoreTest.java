@@ -0,0 +1,44 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.promptoptimizer;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.io.IOException;
+import java.nio.file.Path;
+import java.util.List;
+import java.util.Map;
+import java.util.Optional;
+
+import org.junit.jupiter.api.AfterEach;
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.io.TempDir;
+
+import edu.kit.kastel.sdq.lissa.ratlr.cache.CacheManager;
+
+/**
+ * Test class for the {@link CheckpointStore}.
+ */
+class CheckpointStoreTest {
+    @TempDir
+    Path cacheDirectory;
+
+    @AfterEach
+    void resetCacheDirectory() {
+        CacheManager.resetDefaultInstance();
+    }
+
+    @Test
+    void resumesFromSavedCheckpoint() throws IOException {
+        CacheManager.setCacheDir(cacheDirectory.toString());
+        OptimizationCheckpoint checkpoint = new OptimizationCheckpoint(
+                2, List.of("first prompt", "second prompt"), List.of(0.5, 0.75), Map.of("sampler", 123456789L));
+        new CheckpointStore("{\"optimizer\": \"iterative\"}", false).save(checkpoint);
+
+        // A new process reads the checkpoint from the cache directory
+        CacheManager.resetDefaultInstance();
+        CacheManager.setCacheDir(cacheDirectory.toString());
+        assertEquals(Optional.of(checkpoint), new CheckpointStore("{\"optimizer\": \"iterative\"}", true).load());
+        assertTrue(new CheckpointStore("{\"optimizer\": \"iterative\"}", false).load().isEmpty());
+        assertTrue(new CheckpointStore("{\"optimizer\": \"feedback\"}", true).load().isEmpty());
+    }
+}
@@ -0,0 +1,74 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.resultaggregator;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.util.List;
+import java.util.Map;
+import java.util.Set;
+
+import org.junit.jupiter.api.Test;
+
+import edu.kit.kastel.sdq.lissa.ratlr.classifier.ClassificationResult;
+import edu.kit.kastel.sdq.lissa.ratlr.configuration.ModuleConfiguration;
+import edu.kit.kastel.sdq.lissa.ratlr.context.ContextStore;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.Element;
+import edu.kit.kastel.sdq.lissa.ratlr.knowledge.TraceLink;
+
+/**
+ * Test class for the {@link AnyResultAggregator}.
+ * The sources are a document with two sentences, the targets a file with two classes that contain one method each.
+ */
+class AnyResultAggregatorTest {
+    private final Element document = new Element("doc", "document", "", 0, null, false);
+    private final Element sentence1 = new Element("doc$1", "sentence", "", 1, document, true);
+    private final Element sentence2 = new Element("doc$2", "sentence", "", 1, document, true);
+    private final Element file = new Element("File.java", "file", "", 0, null, false);
+    private final Element classA = new Element("File.java$A", "class", "", 1, file, false);
+    private final Element classB = new Element("File.java$B", "class", "", 1, file, false);
+    private final Element methodA = new Element("File.java$A$m", "method", "", 2, classA, true);
+    private final Element methodB = new Element("File.java$B$m", "method", "", 2, classB, true);
+
+    private final List<Element> sources = List.of(document, sentence1, sentence2);
+    private final List<Element> targets = List.of(file, classA, classB, methodA, methodB);
+
+    @Test
+    void expandsToAncestorsAtCoarserGranularity() {
+        AnyResultAggregator aggregator = aggregator(0, 1);
+
+        Set<TraceLink> traceLinks = aggregator.aggregate(
+                sources,
+                targets,
+                List.of(ClassificationResult.of(sentence1, methodA), ClassificationResult.of(sentence2, methodA)));
+
+        assertEquals(Set.of(new TraceLink("doc", "File.java$A")), traceLinks);
+    }
+
+    @Test
+    void expandsToDescendantsAtFinerGranularity() {
+        AnyResultAggregator aggregator = aggregator(1, 2);
+
+        Set<TraceLink> traceLinks =
+                aggregator.aggregate(sources, targets, List.of(ClassificationResult.of(document, file)));
+
+        assertEquals(
+                Set.of(
+                        new TraceLink("doc$1", "File.java$A$m"),
+                        new TraceLink("doc$1", "File.java$B$m"),
+                        new TraceLink("doc$2", "File.java$A$m"),
+                        new TraceLink("doc$2", "File.java$B$m")),
+                traceLinks);
+    }
+
+    private static AnyResultAggregator aggregator(int sourceGranularity, int targetGranularity) {
+        return new AnyResultAggregator(
+                new ModuleConfiguration(
+                        "any_connection",
+                        Map.of(
+                                "source_granularity",
+                                String.valueOf(sourceGranularity),
+                                "target_granularity",
+                                String.valueOf(targetGranularity))),
+                new ContextStore());
+    }
+}
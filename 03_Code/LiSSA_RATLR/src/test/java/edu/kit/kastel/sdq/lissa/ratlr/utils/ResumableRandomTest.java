@@ -0,0 +1,49 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.utils;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.List;
+import java.util.Random;
+import java.util.stream.IntStream;
+
+import org.junit.jupiter.params.ParameterizedTest;
+import org.junit.jupiter.params.provider.ValueSource;
+
+/**
+ * Test class for the {@link ResumableRandom}.
+ */
+class ResumableRandomTest {
+
+    @ParameterizedTest
+    @ValueSource(longs = {0, 42, -7, Long.MAX_VALUE})
+    void producesSameSequenceAsRandom(long seed) {
+        assertEquals(sequence(new Random(seed)), sequence(new ResumableRandom(seed)));
+    }
+
+    @ParameterizedTest
+    @ValueSource(longs = {0, 42})
+    void restoredStateReplaysSequence(long seed) {
+        ResumableRandom random = new ResumableRandom(seed);
+        sequence(random);
+        long state = random.state();
+        List<String> expected = sequence(random);
+
+        ResumableRandom resumed = new ResumableRandom(seed + 1);
+        resumed.restore(state);
+        assertEquals(expected, sequence(resumed));
+    }
+
+    private static List<String> sequence(Random random) {
+        List<String> values = new ArrayList<>();
+        for (int i = 0; i < 20; i++) {
+            values.add(random.nextInt() + "|" + random.nextInt(17) + "|" + random.nextDouble());
+        }
+        List<Integer> shuffled = new ArrayList<>(IntStream.range(0, 30).boxed().toList());
+        Collections.shuffle(shuffled, random);
+        values.add(shuffled.toString());
+        return values;
+    }
+}
@@ -0,0 +1,36 @@
+/* Licensed under MIT 2025. */
+package edu.kit.kastel.sdq.lissa.ratlr.utils;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import java.util.Map;
+
+import org.junit.jupiter.api.AfterEach;
+import org.junit.jupiter.api.Test;
+
+/**
+ * Test class for the {@link RunMetrics}.
+ */
+class RunMetricsTest {
+
+    @AfterEach
+    void reset() {
+        RunMetrics.reset();
+    }
+
+    @Test
+    void accumulatesStagesUntilReset() {
+        RunMetrics.reset();
+        assertEquals(42, RunMetrics.time("classify", () -> 42));
+        RunMetrics.time("classify", () -> {});
+        RunMetrics.record("cache_load", 2_000_000);
+
+        Map<String, RunMetrics.StageTimings> stages = RunMetrics.getStages();
+        assertEquals(2, stages.get("classify").count());
+        assertEquals(2.0, stages.get("cache_load").totalMillis());
+        assertTrue(RunMetrics.getPeakHeapBytes() > 0);
+
+        RunMetrics.reset();
+        assertTrue(RunMetrics.getStages().isEmpty());
+    }
+}
@@ -0,0 +1,427 @@
+"""
+End-to-end scalability benchmark of LiSSA against the local mock server (see mock_llm_server.py).
+
+The benchmark has three steps:
+
+    python benchmark.py generate --out benchmark-data --scales 1 10 100
+    python benchmark.py run --data benchmark-data \
+        --jar ../03_Code/LiSSA_RATLR/target/ratlr-*-jar-with-dependencies.jar \
+        --report benchmark.json
+    python benchmark.py compare baseline.json benchmark.json --threshold wall_time_ms=10
+
+`generate` writes synthetic datasets shaped like the WARC requirements (req2req, 63 high-level and 89 low-level
+requirements, 135 links) and the Dronology documentation and code (doc2code, 211 documents, 423 Java files, 740 links),
+multiplied by each scale. The link density (links per source artifact) can be changed with `--links-per-source`.
+Every dataset gets an evaluation and an optimization configuration.
+
+`run` starts the mock server, runs `eval` and `optimize` on every dataset with `--metrics`, once with an empty cache
+(cold) and once with the cache of the cold run (warm), and writes a JSON report with the wall time, the language model
+calls per second, the peak heap, the cache load time, and the time of each pipeline stage.
+
+`compare` compares two reports and exits with 1 if a metric regressed by more than its threshold (in percent), so it
+can guard performance across commits.
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MOCK_SERVER = os.path.join(SCRIPT_DIR, "mock_llm_server.py")
+MANIFEST_FILE = "benchmark.json"
+METRICS_FILE = "metrics.json"
+
+BASE_PROMPT = ("Question: Here are two parts of software development artifacts.\n\n"
+               "            {source_type}: '''{source_content}'''\n\n"
+               "            {target_type}: '''{target_content}'''\n"
+               "            Are they related?\n\n"
+               "            Answer with 'yes' or 'no'.")
+
+# Sizes of the datasets the profiles are modeled after (per scale 1)
+PROFILES = {
+    "req2req": {"sources": 63, "targets": 89, "links": 135},
+    "doc2code": {"sources": 211, "targets": 423, "links": 740},
+}
+
+# Metrics where a smaller value is a regression; for all other metrics a larger value is
+HIGHER_IS_BETTER = {"requests_per_second", "mock_calls_per_second"}
+DEFAULT_THRESHOLDS = {
+    "wall_time_ms": 10.0,
+    "peak_heap_bytes": 20.0,
+    "mock_calls_per_second": 10.0,
+    "stages.cache_load": 25.0,
+}
+
+WORDS = ("system user data request response archive record crawler storage index query metadata export import "
+         "report schedule session access permission log error message format file network server client cache "
+         "update delete create validate display search filter configuration interface component service event "
+         "drone flight mission route waypoint status monitor vehicle simulation command telemetry map area").split()
+VERBS = "shall must should can will".split()
+
+
+# ----------------------
+# Dataset generation
+# ----------------------
+
+def sentence(rng: random.Random, topic: List[str]) -> str:
+    words = [rng.choice(topic) if rng.random() < 0.4 else rng.choice(WORDS) for _ in range(rng.randint(8, 20))]
+    return f"The {words[0]} {rng.choice(VERBS)} {' '.join(words[1:])}."
+
+
+def topics(rng: random.Random, count: int) -> List[List[str]]:
+    return [rng.sample(WORDS, 5) for _ in range(count)]
+
+
+def links(rng: random.Random, sources: int, targets: int, count: int) -> List[Tuple[int, int]]:
+    """
+    Draws distinct (source, target) pairs, so every source has about the same number of links.
+    """
+    count = min(count, sources * targets)
+    pairs = set()
+    while len(pairs) < count:
+        source = len(pairs) % sources if len(pairs) < sources else rng.randrange(sources)
+        pairs.add((source, rng.randrange(targets)))
+    return sorted(pairs)
+
+
+def write_file(path: str, content: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="\n") as file:
+        file.write(content)
+
+
+def generate_req2req(directory: str, rng: random.Random, sources: int, targets: int, count: int) -> Dict[str, Any]:
+    pairs = links(rng, sources, targets, count)
+    topic_of_target = {target: source for source, target in pairs}
+    source_topics = topics(rng, sources)
+    source_names = [f"FR{i + 1:05d}.txt" for i in range(sources)]
+    target_names = [f"SRS{i + 1:05d}.txt" for i in range(targets)]
+    for i, name in enumerate(source_names):
+        write_file(os.path.join(directory, "high", name), " ".join(sentence(rng, source_topics[i])
+                                                                  for _ in range(rng.randint(1, 3))) + "\n")
+    for i, name in enumerate(target_names):
+        topic = source_topics[topic_of_target.get(i, rng.randrange(sources))]
+        write_file(os.path.join(directory, "low", name), " ".join(sentence(rng, topic)
+                                                                 for _ in range(rng.randint(1, 4))) + "\n")
+    write_file(os.path.join(directory, "answer.csv"),
+               "high,low\n" + "".join(f"{source_names[s]},{target_names[t]}\n" for s, t in pairs))
+
+    providers = {
+        "gold_standard_configuration": {"path": "./answer.csv", "hasHeader": "true"},
+        "source_artifact_provider": {"name": "text", "args": {"artifact_type": "requirement", "path": "./high"}},
+        "target_artifact_provider": {"name": "text", "args": {"artifact_type": "requirement", "path": "./low"}},
+        "source_preprocessor": {"name": "artifact", "args": {}},
+        "target_preprocessor": {"name": "artifact", "args": {}},
+        "target_store": {"name": "cosine_similarity", "args": {"max_results": "4"}},
+        "classifier": {"name": "simple_openai", "args": {"model": "gpt-4o-mini-2024-07-18"}},
+    }
+    return {"links": len(pairs), "modules": providers}
+
+
+def java_class(rng: random.Random, package: str, name: str, topic: List[str]) -> str:
+    methods = []
+    for _ in range(rng.randint(2, 8)):
+        method = rng.choice(topic) + rng.choice(WORDS).capitalize()
+        body = "\n".join(f"        // {sentence(rng, topic)}\n        result.add(\"{rng.choice(topic)}\");"
+                         for _ in range(rng.randint(1, 5)))
+        methods.append(f"    public List<String> {method}() {{\n        List<String> result = new ArrayList<>();\n"
+                       f"{body}\n        return result;\n    }}\n")
+    return (f"package {package};\n\nimport java.util.ArrayList;\nimport java.util.List;\n\n"
+            f"/**\n * {sentence(rng, topic)}\n */\npublic class {name} {{\n" + "\n".join(methods) + "}\n")
+
+
+def generate_doc2code(directory: str, rng: random.Random, sources: int, targets: int, count: int) -> Dict[str, Any]:
+    pairs = links(rng, sources, targets, count)
+    topic_of_target = {target: source for source, target in pairs}
+    source_topics = topics(rng, sources)
+    source_names = [f"DD{i + 1:05d}.txt" for i in range(sources)]
+    target_names = [f"pkg{i % 50:02d}/Class{i + 1:05d}.java" for i in range(targets)]
+    for i, name in enumerate(source_names):
+        write_file(os.path.join(directory, "docs", name), " ".join(sentence(rng, source_topics[i])
+                                                                  for _ in range(rng.randint(2, 5))) + "\n")
+    for i, name in enumerate(target_names):
+        topic = source_topics[topic_of_target.get(i, rng.randrange(sources))]
+        package, file = name.split("/")
+        write_file(os.path.join(directory, "code", name), java_class(rng, package, file[:-len(".java")], topic))
+    write_file(os.path.join(directory, "answer.csv"),
+               "".join(f"{source_names[s]},{target_names[t]}\n" for s, t in pairs))
+
+    providers = {
+        "gold_standard_configuration": {"path": "./answer.csv", "hasHeader": "false"},
+        "source_artifact_provider": {"name": "text",
+                                     "args": {"artifact_type": "software architecture documentation",
+                                              "path": "./docs"}},
+        "target_artifact_provider": {"name": "recursive_text",
+                                     "args": {"artifact_type": "source code", "path": "./code",
+                                              "extensions": ".java"}},
+        "source_preprocessor": {"name": "artifact", "args": {}},
+        "target_preprocessor": {"name": "artifact", "args": {}},
+        "target_store": {"name": "cosine_similarity", "args": {"max_results": "20"}},
+        "classifier": {"name": "reasoning_openai", "args": {"model": "gpt-4o-mini-2024-07-18"}},
+    }
+    return {"links": len(pairs), "modules": providers}
+
+
+GENERATORS = {"req2req": generate_req2req, "doc2code": generate_doc2code}
+
+
+def write_configs(directory: str, modules: Dict[str, Any], iterations: int):
+    evaluation = {
+        "cache_dir": "./cache",
+        **{key: modules[key] for key in ("gold_standard_configuration", "source_artifact_provider",
+                                         "target_artifact_provider", "source_preprocessor", "target_preprocessor")},
+        "embedding_creator": {"name": "openai", "args": {"model": "text-embedding-3-large"}},
+        "source_store": {"name": "custom", "args": {}},
+        "target_store": modules["target_store"],
+        "classifier": modules["classifier"],
+        "result_aggregator": {"name": "any_connection", "args": {}},
+        "tracelinkid_postprocessor": {"name": "identity", "args": {}},
+    }
+    optimization = {
+        **evaluation,
+        "prompt_optimizer": {"name": "iterative_openai",
+                             "args": {"prompt": BASE_PROMPT, "model": "gpt-4o-mini-2024-07-18",
+                                      "maximum_iterations": iterations}},
+        "metric": {"name": "f1", "args": {}},
+        "evaluator": {"name": "mock", "args": {}},
+    }
+    for name, config in (("config-eval.json", evaluation), ("config-optimize.json", optimization)):
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as file:
+            json.dump(config, file, indent=2)
+
+
+def generate(args: argparse.Namespace):
+    datasets = []
+    for profile in args.profiles:
+        base = PROFILES[profile]
+        density = args.links_per_source or base["links"] / base["sources"]
+        for scale in args.scales:
+            name = f"{profile}-x{scale}"
+            directory = os.path.join(args.out, name)
+            if os.path.exists(directory):
+                shutil.rmtree(directory)
+            rng = random.Random(f"{args.seed}:{name}")
+            sources, targets = base["sources"] * scale, base["targets"] * scale
+            result = GENERATORS[profile](directory, rng, sources, targets, round(sources * density))
+            write_configs(directory, result["modules"], args.iterations)
+            datasets.append({"name": name, "profile": profile, "scale": scale, "sources": sources,
+                             "targets": targets, "links": result["links"]})
+            print(f"Generated {name}: {sources} sources, {targets} targets, {result['links']} links")
+    with open(os.path.join(args.out, MANIFEST_FILE), "w", encoding="utf-8") as file:
+        json.dump({"seed": args.seed, "datasets": datasets}, file, indent=2)
+
+
+# ----------------------
+# Benchmark runs
+# ----------------------
+
+def mock_request(url: str, method: str = "GET") -> Dict[str, Any]:
+    request = urllib.request.Request(url, data=b"{}" if method == "POST" else None, method=method,
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.load(response)
+
+
+def start_mock(args: argparse.Namespace) -> Tuple[subprocess.Popen, str]:
+    url = f"http://127.0.0.1:{args.port}"
+    command = [sys.executable, MOCK_SERVER, "--port", str(args.port), "--seed", str(args.seed), *args.mock_args]
+    process = subprocess.Popen(command)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            mock_request(url + "/mock/stats")
+            return process, url
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError(f"The mock server exited with {process.returncode}")
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"The mock server did not start on {url}")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=SCRIPT_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_lissa(args: argparse.Namespace, jar: str, directory: str, mode: str, env: Dict[str, str]) -> Dict[str, Any]:
+    metrics_file = os.path.join(directory, METRICS_FILE)
+    if os.path.exists(metrics_file):
+        os.remove(metrics_file)
+    command = ["java", *args.jvm_args, "-jar", jar]
+    if mode == "eval":
+        command += ["eval", "-c", "config-eval.json"]
+    else:
+        command += ["optimize", "-c", "config-optimize.json", "-e", "config-eval.json"]
+    command += ["--metrics", METRICS_FILE]
+
+    start = time.perf_counter()
+    with open(os.path.join(directory, f"{mode}.log"), "a", encoding="utf-8") as log:
+        exit_code = subprocess.run(command, cwd=directory, env=env, stdout=log, stderr=subprocess.STDOUT).returncode
+    result = {"exit_code": exit_code, "process_wall_ms": (time.perf_counter() - start) * 1000}
+    if os.path.exists(metrics_file):
+        with open(metrics_file, encoding="utf-8") as file:
+            result.update(json.load(file))
+    return result
+
+
+def run(args: argparse.Namespace):
+    with open(os.path.join(args.data, MANIFEST_FILE), encoding="utf-8") as file:
+        manifest = json.load(file)
+    jars = glob.glob(args.jar)
+    if not jars:
+        raise SystemExit(f"No jar matches {args.jar}")
+    jar = os.path.abspath(jars[0])
+
+    process, url = start_mock(args)
+    env = dict(os.environ, OPENAI_BASE_URL=url + "/v1", OPENAI_ORGANIZATION_ID="mock", OPENAI_API_KEY="mock",
+               OLLAMA_HOST=url, OLLAMA_EMBEDDING_HOST=url)
+    runs = []
+    try:
+        for dataset in manifest["datasets"]:
+            if args.scales and dataset["scale"] not in args.scales:
+                continue
+            if args.profiles and dataset["profile"] not in args.profiles:
+                continue
+            directory = os.path.abspath(os.path.join(args.data, dataset["name"]))
+            for mode in args.modes:
+                for phase in ("cold", "warm"):
+                    if phase == "cold":
+                        shutil.rmtree(os.path.join(directory, "cache"), ignore_errors=True)
+                    mock_request(url + "/mock/reset", "POST")
+                    result = run_lissa(args, jar, directory, mode, env)
+                    stats = mock_request(url + "/mock/stats")
+                    wall_seconds = result.get("wall_time_ms", result["process_wall_ms"]) / 1000
+                    entry = {**dataset, "mode": mode, "phase": phase, **result,
+                             "mock_requests": stats.get("requests", 0),
+                             "mock_calls_per_second": stats.get("requests", 0) / wall_seconds if wall_seconds else 0,
+                             "mock_stats": stats}
+                    runs.append(entry)
+                    print(f"{dataset['name']} {mode} {phase}: exit {entry['exit_code']}, "
+                          f"{entry.get('wall_time_ms', entry['process_wall_ms']):.0f} ms, "
+                          f"{entry['mock_requests']} calls ({entry['mock_calls_per_second']:.1f}/s), "
+                          f"peak heap {entry.get('peak_heap_bytes', 0) / 2 ** 20:.0f} MiB")
+    finally:
+        process.terminate()
+        process.wait()
+
+    report = {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "settings": {"seed": args.seed, "mock_args": args.mock_args, "jvm_args": args.jvm_args},
+        "runs": runs,
+    }
+    with open(args.report, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Wrote {args.report}")
+    if any(entry["exit_code"] != 0 for entry in runs):
+        sys.exit(1)
+
+
+# ----------------------
+# Report comparison
+# ----------------------
+
+def metric(entry: Dict[str, Any], name: str) -> Optional[float]:
+    """
+    Returns a metric of a run, where `stages.NAME` is the total time of a pipeline stage in milliseconds.
+    """
+    if name.startswith("stages."):
+        stage = entry.get("stages", {}).get(name[len("stages."):])
+        return stage["totalMillis"] if stage else None
+    return entry.get(name)
+
+
+def compare(args: argparse.Namespace) -> int:
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for threshold in args.threshold:
+        name, _, percent = threshold.partition("=")
+        thresholds[name] = float(percent)
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = {(run["name"], run["mode"], run["phase"]): run for run in json.load(file)["runs"]}
+    with open(args.current, encoding="utf-8") as file:
+        current = {(run["name"], run["mode"], run["phase"]): run for run in json.load(file)["runs"]}
+
+    regressions = 0
+    for key in sorted(baseline.keys() & current.keys()):
+        for name, threshold in sorted(thresholds.items()):
+            old, new = metric(baseline[key], name), metric(current[key], name)
+            if old is None or new is None:
+                continue
+            # Short timings are dominated by noise, so they are not compared
+            if (name.endswith("_ms") or name.startswith("stages.")) and max(old, new) < args.noise_floor_ms:
+                continue
+            change = (new - old) / old * 100 if old else 0.0
+            regressed = -change > threshold if name in HIGHER_IS_BETTER else change > threshold
+            regressions += regressed
+            print(f"{'REGRESSION' if regressed else 'ok':<10} {' '.join(key):<32} {name:<24} "
+                  f"{old:>14.1f} -> {new:>14.1f} ({change:+.1f}%, threshold {threshold:g}%)")
+    for key in sorted(baseline.keys() - current.keys()):
+        print(f"{'missing':<10} {' '.join(key)}")
+    print(f"{regressions} regression(s)")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scalability benchmark of LiSSA against the mock LLM server")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = commands.add_parser("generate", help="generate synthetic scaled datasets and configurations")
+    generate_parser.add_argument("--out", default="benchmark-data", help="output directory (default: benchmark-data)")
+    generate_parser.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), default=sorted(PROFILES))
+    generate_parser.add_argument("--scales", nargs="+", type=int, default=[1, 10, 100],
+                                 help="multiples of the original dataset sizes (default: 1 10 100)")
+    generate_parser.add_argument("--links-per-source", type=float,
+                                 help="trace links per source artifact (default: as in the original dataset)")
+    generate_parser.add_argument("--iterations", type=int, default=3,
+                                 help="maximum iterations of the optimizer configuration (default: 3)")
+    generate_parser.add_argument("--seed", type=int, default=0, help="seed of the generated content (default: 0)")
+
+    run_parser = commands.add_parser("run", help="run eval and optimize on generated datasets and write a report")
+    run_parser.add_argument("--data", default="benchmark-data",
+                            help="directory of `generate` (default: benchmark-data)")
+    run_parser.add_argument("--jar", default=os.path.join(SCRIPT_DIR, "..", "03_Code", "LiSSA_RATLR", "target",
+                                                          "ratlr-*-jar-with-dependencies.jar"),
+                            help="LiSSA jar, may be a glob pattern")
+    run_parser.add_argument("--report", default="benchmark-report.json", help="report file to write")
+    run_parser.add_argument("--modes", nargs="+", choices=["eval", "optimize"], default=["eval", "optimize"])
+    run_parser.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), help="profiles to run (default: all)")
+    run_parser.add_argument("--scales", nargs="+", type=int, help="scales to run (default: all generated)")
+    run_parser.add_argument("--port", type=int, default=8090, help="port of the mock server (default: 8090)")
+    run_parser.add_argument("--seed", type=int, default=0, help="seed of the mock server (default: 0)")
+    run_parser.add_argument("--mock-args", nargs=argparse.REMAINDER, default=[],
+                            help="further arguments of mock_llm_server.py, e.g., --latency lognormal:400:0.5")
+    run_parser.add_argument("--jvm-arg", dest="jvm_args", action="append", default=[],
+                            help="argument of the JVM, e.g., --jvm-arg=-Xmx4g (repeatable)")
+
+    compare_parser = commands.add_parser("compare", help="compare two reports and fail on regressions")
+    compare_parser.add_argument("baseline", help="report of the baseline, e.g., of the previous commit")
+    compare_parser.add_argument("current", help="report to check")
+    compare_parser.add_argument("--threshold", action="append", default=[], metavar="METRIC=PERCENT",
+                                help="allowed change of a metric in percent, e.g., stages.classify=15 (repeatable, "
+                                     f"defaults: {', '.join(f'{k}={v:g}' for k, v in DEFAULT_THRESHOLDS.items())})")
+    compare_parser.add_argument("--noise-floor-ms", type=float, default=200.0,
+                                help="timings below this are not compared (default: 200)")
+
+    args = parser.parse_args()
+    if args.command == "generate":
+        generate(args)
+    elif args.command == "run":
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Thin client for the LiSSA daemon started with `java -jar ratlr-*-jar-with-dependencies.jar serve`.
+
+The daemon keeps one JVM with warm caches and element stores alive, so experiment scripts can submit many
+eval/optimize/transitive jobs without paying for the JVM startup each time. The arguments of a job are the same as on
+the command line, e.g.:
+
+    python ../lissa_client.py optimize -c configs/optimization/MODEL/DATASET -e configs/req2req/MODEL/DATASET
+
+Relative paths are resolved by the daemon, so it has to run in the same working directory as the client.
+"""
+import argparse
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+COMMANDS = ["eval", "optimize", "transitive"]
+FINISHED_STATES = {"SUCCEEDED", "FAILED"}
+
+
+class LissaJobFailed(RuntimeError):
+    """
+    Raised if a job of the daemon did not succeed.
+    """
+
+    def __init__(self, status: Dict[str, Any]):
+        super().__init__(f"Job {status['id']} finished with state {status['state']}")
+        self.status = status
+
+
+class LissaClient:
+    """
+    Client for the JSON API of the LiSSA daemon.
+
+    Args:
+        url: base URL of the daemon (default: $LISSA_DAEMON or http://127.0.0.1:8765)
+    """
+
+    def __init__(self, url: Optional[str] = None):
+        self.url = (url or os.environ.get("LISSA_DAEMON") or DEFAULT_URL).rstrip("/")
+
+    def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        request = urllib.request.Request(self.url + path, data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request) as response:
+                return json.load(response)
+        except urllib.error.HTTPError as e:
+            error = json.load(e).get("error", e.reason)
+            raise RuntimeError(f"{method} {path} failed with {e.code}: {error}") from e
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Returns the working directory of the daemon and the number of running and queued jobs.
+        """
+        return self._request("GET", "/status")
+
+    def check_working_directory(self, directory: Optional[str] = None):
+        """
+        Raises if the daemon resolves relative paths against another directory than the given one (default: cwd).
+        """
+        expected = os.path.realpath(directory or os.getcwd())
+        actual = os.path.realpath(self.status()["working_directory"])
+        if expected != actual:
+            raise RuntimeError(f"The daemon runs in {actual}, but the job would be submitted from {expected}")
+
+    def submit(self, command: str, args: List[str]) -> str:
+        """
+        Submits a job and returns its id.
+        """
+        return self._request("POST", "/jobs", {"command": command, "args": list(args)})["id"]
+
+    def job(self, job_id: str) -> Dict[str, Any]:
+        """
+        Returns the status of a job including all of its events.
+        """
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def events(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the events of a job as they happen, until the job is finished.
+        """
+        with urllib.request.urlopen(f"{self.url}/jobs/{job_id}/events") as response:
+            for line in response:
+                if line.strip():
+                    yield json.loads(line)
+
+    def run(self, command: str, args: List[str], verbose: bool = True) -> Dict[str, Any]:
+        """
+        Submits a job, waits for it, and returns its final status.
+
+        Raises:
+            LissaJobFailed: if the job did not succeed
+        """
+        self.check_working_directory()
+        job_id = self.submit(command, args)
+        for event in self.events(job_id):
+            if verbose:
+                message = f" ({event['message']})" if event.get("message") else ""
+                print(f"[{event['time']}] {job_id} {event['state']}{message}", flush=True)
+        status = self.job(job_id)
+        if status["state"] != "SUCCEEDED":
+            raise LissaJobFailed(status)
+        return status
+
+    def shutdown(self) -> Dict[str, Any]:
+        """
+        Asks the daemon to stop after all submitted jobs are finished.
+        """
+        return self._request("POST", "/shutdown", {})
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Runs LiSSA commands on a running LiSSA daemon")
+    parser.add_argument("--url", help=f"base URL of the daemon (default: $LISSA_DAEMON or {DEFAULT_URL})")
+    parser.add_argument("command", choices=COMMANDS + ["status", "shutdown"])
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments of the command, as for the jar")
+    arguments = parser.parse_args(argv)
+
+    client = LissaClient(arguments.url)
+    if arguments.command == "status":
+        print(json.dumps(client.status(), indent=2))
+        return 0
+    if arguments.command == "shutdown":
+        client.shutdown()
+        return 0
+    try:
+        client.run(arguments.command, arguments.args)
+    except LissaJobFailed as e:
+        print(e, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,562 @@
+"""
+Mock server for the OpenAI and Ollama APIs used by LiSSA, for load tests and benchmarks without a provider.
+
+The server speaks the OpenAI chat completion and embedding API (`/v1/chat/completions`, `/v1/embeddings`) and the
+Ollama chat and embedding API (`/api/chat`, `/api/embed`, `/api/embeddings`). LiSSA is pointed to it with the existing
+settings, e.g.:
+
+    python mock_llm_server.py --port 8090 --cache-dir cache/req2req --latency lognormal:400:0.5 --rate-limit 0.02
+    export OPENAI_BASE_URL=http://127.0.0.1:8090/v1 OPENAI_ORGANIZATION_ID=mock OPENAI_API_KEY=mock
+    export OLLAMA_HOST=http://127.0.0.1:8090 OLLAMA_EMBEDDING_HOST=http://127.0.0.1:8090
+
+Responses are deterministic. Chat requests are answered from the LiSSA cache files in `--cache-dir` if the cache
+contains the request, and by synthetic rules otherwise: the rules of `--rules` (a JSON list of
+`{"pattern": REGEX, "response": TEXT}`), prompt proposals for optimizer requests, and a yes/no verdict derived from the
+hash of the request (`--positive-rate`). Embeddings are read from the cache files as well or derived from the hash of
+the text. Latencies, throttling (HTTP 429), and server errors are drawn from a random generator seeded with `--seed`,
+the request, and the number of previous attempts of the request, so the same run yields the same faults regardless of
+the order of concurrent requests, while retries get a fresh draw.
+
+Every request is appended to `--log` as JSON line, and `GET /mock/stats` returns the counters of the server
+(`POST /mock/reset` resets them).
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import struct
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+DEFAULT_PORT = 8090
+DEFAULT_DIMENSIONS = 1536
+CHARACTERS_PER_TOKEN = 4
+
+# Optimizers expect their proposal between these tags (see IterativeOptimizer and AutomaticPromptOptimizer)
+PROMPT_TAGS = [("<prompt>", "</prompt>"), ("<START>", "<END>")]
+SYNTHETIC_PROMPT = ("Question: Here are two parts of software development artifacts.\n\n"
+                    "{source_type}: '''{source_content}'''\n\n"
+                    "{target_type}: '''{target_content}'''\n"
+                    "Are they related? Answer with 'yes' or 'no' in <trace></trace> tags. (variant %d)")
+
+
+def cache_key(content: str) -> str:
+    """
+    Returns the key LiSSA stores a request under, i.e., the name-based UUID of `KeyGenerator.generateKey`.
+    """
+    digest = hashlib.md5(content.replace("\r\n", "\n").encode("utf-8")).digest()
+    return str(uuid.UUID(bytes=digest, version=3))
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARACTERS_PER_TOKEN + 1
+
+
+class Latency:
+    """
+    Latency distribution of the responses in milliseconds.
+
+    Specs: `0`, `fixed:MS`, `uniform:MIN:MAX`, `normal:MEAN:STD`, `lognormal:MEDIAN:SIGMA`, or `exp:MEAN`.
+    """
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        name, *values = spec.split(":")
+        try:
+            parameters = [float(value) for value in values]
+        except ValueError:
+            raise ValueError(f"Invalid latency spec '{spec}'")
+        samplers: Dict[Tuple[str, int], Callable[[random.Random], float]] = {
+            ("0", 0): lambda rng: 0.0,
+            ("fixed", 1): lambda rng: parameters[0],
+            ("uniform", 2): lambda rng: rng.uniform(parameters[0], parameters[1]),
+            ("normal", 2): lambda rng: rng.gauss(parameters[0], parameters[1]),
+            ("lognormal", 2): lambda rng: parameters[0] * math.exp(rng.gauss(0, parameters[1])),
+            ("exp", 1): lambda rng: rng.expovariate(1 / parameters[0]) if parameters[0] > 0 else 0.0,
+        }
+        sampler = samplers.get((name, len(parameters)))
+        if sampler is None:
+            raise ValueError(f"Invalid latency spec '{spec}'")
+        self._sampler = sampler
+
+    def sample(self, rng: random.Random) -> float:
+        return max(0.0, self._sampler(rng))
+
+
+class CacheIndex:
+    """
+    Index of the chat responses and embeddings in the LiSSA cache files of a directory.
+
+    The cache files map the key of a request to the response, independent of the model. If several files contain a
+    key, the file whose name contains the requested model is preferred.
+    """
+
+    def __init__(self, directories: List[str]):
+        self.chat: Dict[str, List[Tuple[str, str]]] = {}
+        self.embeddings: Dict[str, List[Tuple[str, str]]] = {}
+        for directory in directories:
+            for name in sorted(os.listdir(directory)):
+                path = os.path.join(directory, name)
+                if not name.endswith(".json") or not os.path.isfile(path):
+                    continue
+                try:
+                    with open(path, encoding="utf-8") as file:
+                        entries = json.load(file)
+                except (OSError, ValueError) as e:
+                    print(f"Skipping cache file {path}: {e}", file=sys.stderr)
+                    continue
+                if not isinstance(entries, dict):
+                    continue
+                index = self.embeddings if "Embedding" in name else self.chat
+                for key, value in entries.items():
+                    if isinstance(value, str):
+                        index.setdefault(key, []).append((name, value))
+
+    @staticmethod
+    def _lookup(index: Dict[str, List[Tuple[str, str]]], model: str, key: str) -> Optional[str]:
+        candidates = index.get(key)
+        if not candidates:
+            return None
+        model_name = model.replace(":", "__")
+        for name, value in candidates:
+            if model_name and model_name in name:
+                return value
+        return candidates[0][1]
+
+    def chat_response(self, model: str, messages: List[Dict[str, str]]) -> Optional[str]:
+        for content in self._request_contents(messages):
+            response = self._lookup(self.chat, model, cache_key(content))
+            # Short answers of the simple classifier are stored as JSON objects, which are no chat response
+            if response is not None and not response.startswith("{"):
+                return response
+        return None
+
+    def embedding(self, model: str, text: str) -> Optional[List[float]]:
+        value = self._lookup(self.embeddings, model, cache_key(text))
+        return None if value is None else json.loads(value)
+
+    @staticmethod
+    def _request_contents(messages: List[Dict[str, str]]) -> List[str]:
+        """
+        Returns the contents the classifiers derive their cache keys from: the simple classifier uses the text of its
+        single user message, the reasoning classifier the string form of the langchain4j messages.
+        """
+        contents = []
+        if len(messages) == 1 and messages[0]["role"] == "user":
+            contents.append(messages[0]["content"])
+        rendered = []
+        for message in messages:
+            if message["role"] == "system":
+                rendered.append('SystemMessage { text = "%s" }' % message["content"])
+            elif message["role"] == "user":
+                rendered.append('UserMessage { name = null contents = [TextContent { text = "%s" }] }'
+                                % message["content"])
+            else:
+                rendered.append('AiMessage { text = "%s" }' % message["content"])
+        contents.append("[" + ", ".join(rendered) + "]")
+        return contents
+
+
+class Synthesizer:
+    """
+    Derives deterministic responses for requests that are not cached.
+    """
+
+    def __init__(self, rules: List[Dict[str, str]], positive_rate: float, dimensions: int):
+        self.rules = [(re.compile(rule["pattern"], re.DOTALL), rule["response"]) for rule in rules]
+        self.positive_rate = positive_rate
+        self.dimensions = dimensions
+
+    @staticmethod
+    def _fraction(text: str) -> float:
+        return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big") / 2 ** 64
+
+    def chat(self, messages: List[Dict[str, str]]) -> str:
+        text = "\n".join(message["content"] for message in messages)
+        for pattern, response in self.rules:
+            if pattern.search(text):
+                return response
+        for start, end in PROMPT_TAGS:
+            if start in text and end in text:
+                variant = int(self._fraction(text) * 1000)
+                return f"{start}{SYNTHETIC_PROMPT % variant}{end}"
+        # The trace tag and the final word satisfy all answer extractors of the classifiers
+        verdict = "yes" if self._fraction(text) < self.positive_rate else "no"
+        return f"<trace>{verdict}</trace>\n{verdict}"
+
+    def embedding(self, text: str) -> List[float]:
+        values = []
+        counter = 0
+        seed = hashlib.sha256(text.encode("utf-8")).digest()
+        while len(values) < self.dimensions:
+            block = hashlib.sha256(seed + counter.to_bytes(4, "big")).digest()
+            values.extend(value / 2 ** 31 - 1 for value in struct.unpack(">8I", block))
+            counter += 1
+        values = values[:self.dimensions]
+        norm = math.sqrt(sum(value * value for value in values)) or 1.0
+        return [value / norm for value in values]
+
+
+class Limits:
+    """
+    Emulates the limits of a provider: request and token limits per minute as well as random throttling and errors.
+    """
+
+    def __init__(self, max_rpm: int, max_tpm: int, rate_limit: float, error_rate: float):
+        self.max_rpm = max_rpm
+        self.max_tpm = max_tpm
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._window_tokens = 0
+
+    def check(self, tokens: int, rng: random.Random) -> Optional[Tuple[int, str, float]]:
+        """
+        Returns the status, message, and retry delay in seconds if the request is rejected, None otherwise.
+        """
+        if rng.random() < self.rate_limit:
+            return 429, "Rate limit reached (injected)", 1.0
+        if rng.random() < self.error_rate:
+            return rng.choice([500, 503]), "Server error (injected)", 0.0
+        if self.max_rpm <= 0 and self.max_tpm <= 0:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            while self._window and self._window[0][0] <= now - 60:
+                self._window_tokens -= self._window.popleft()[1]
+            if 0 < self.max_rpm <= len(self._window):
+                return 429, "Request limit per minute reached", self._window[0][0] + 60 - now
+            if 0 < self.max_tpm < self._window_tokens + tokens:
+                delay = self._window[0][0] + 60 - now if self._window else 60.0
+                return 429, "Token limit per minute reached", delay
+            self._window.append((now, tokens))
+            self._window_tokens += tokens
+        return None
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address: Tuple[str, int], arguments: argparse.Namespace):
+        super().__init__(address, MockHandler)
+        try:
+            rules = []
+            if arguments.rules:
+                with open(arguments.rules, encoding="utf-8") as file:
+                    rules = json.load(file)
+            self.cache = CacheIndex(arguments.cache_dir)
+            self.synthesizer = Synthesizer(rules, arguments.positive_rate, arguments.dimensions)
+            self.latency = Latency(arguments.latency)
+            self.ms_per_token = arguments.ms_per_token
+            self.limits = Limits(arguments.max_rpm, arguments.max_tpm, arguments.rate_limit, arguments.error_rate)
+            self.on_miss = arguments.on_miss
+            self.seed = arguments.seed
+            self.log_file = open(arguments.log, "a", encoding="utf-8") if arguments.log else None
+        except (OSError, ValueError):
+            self.server_close()
+            raise
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._attempts: Counter = Counter()
+        self.stats: Counter = Counter()
+
+    def random_for(self, request_key: str) -> random.Random:
+        """
+        Returns the random generator of the next attempt of a request.
+        """
+        with self._lock:
+            attempt = self._attempts[request_key]
+            self._attempts[request_key] += 1
+        return random.Random(f"{self.seed}:{request_key}:{attempt}")
+
+    def record(self, entry: Dict[str, Any]):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats[f"status_{entry['status']}"] += 1
+            if entry.get("source"):
+                self.stats[f"{entry['kind']}_{entry['source']}"] += 1
+            self.stats["latency_ms_total"] += entry["latency_ms"]
+            if self.log_file:
+                self.log_file.write(json.dumps(entry) + "\n")
+                self.log_file.flush()
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+            self._attempts.clear()
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    server: MockServer
+    # Keep-alive connections, as the HTTP clients of LiSSA pool them
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any):
+        pass
+
+    def do_GET(self):
+        path = self.path.rstrip("/")
+        if path == "/mock/stats":
+            with self.server._lock:
+                stats = dict(self.server.stats)
+            stats["uptime_s"] = round(time.time() - self.server.started, 3)
+            self._send(200, stats)
+        elif path in ("/v1/models", "/models"):
+            self._send(200, {"object": "list", "data": []})
+        elif path == "/api/tags":
+            self._send(200, {"models": []})
+        else:
+            self._send(404, {"error": f"Unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"error": "Request body is no valid JSON"})
+            return
+        path = self.path.rstrip("/")
+        if path.startswith("/v1/"):
+            path = path[3:]
+        handlers = {
+            "/chat/completions": ("openai", self._openai_chat),
+            "/embeddings": ("openai", self._openai_embeddings),
+            "/api/chat": ("ollama", self._ollama_chat),
+            "/api/embed": ("ollama", self._ollama_embed),
+            "/api/embeddings": ("ollama", self._ollama_embeddings),
+        }
+        if path == "/mock/reset":
+            self.server.reset()
+            self._send(200, {})
+        elif path in handlers:
+            api, handler = handlers[path]
+            handler(api, body)
+        else:
+            self._send(404, {"error": f"Unknown endpoint {self.path}"})
+
+    # Chat
+
+    def _chat(self, api: str, body: Dict[str, Any]) -> Optional[Tuple[str, int, int]]:
+        messages = [{"role": message.get("role", "user"), "content": self._text(message.get("content"))}
+                    for message in body.get("messages", [])]
+        model = body.get("model", "")
+        text = "\n".join(message["content"] for message in messages)
+        prompt_tokens = estimate_tokens(text)
+        response = self.server.cache.chat_response(model, messages)
+        source = "cache"
+        if response is None:
+            if self.server.on_miss == "error":
+                self._finish(api, "chat", model, cache_key(text), 404, "Request is not cached", 0.0, "miss")
+                return None
+            response = self.server.synthesizer.chat(messages)
+            source = "synthetic"
+        completion_tokens = estimate_tokens(response)
+        if not self._delay_or_reject(api, "chat", model, cache_key(text), prompt_tokens + completion_tokens,
+                                     completion_tokens, source):
+            return None
+        return response, prompt_tokens, completion_tokens
+
+    def _openai_chat(self, api: str, body: Dict[str, Any]):
+        result = self._chat(api, body)
+        if result is None:
+            return
+        response, prompt_tokens, completion_tokens = result
+        self._send(200, {
+            "id": "chatcmpl-" + cache_key(response + str(time.time_ns())),
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", ""),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": response},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    def _ollama_chat(self, api: str, body: Dict[str, Any]):
+        result = self._chat(api, body)
+        if result is None:
+            return
+        response, prompt_tokens, completion_tokens = result
+        self._send(200, {
+            "model": body.get("model", ""),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "message": {"role": "assistant", "content": response},
+            "done": True,
+            "done_reason": "stop",
+            "prompt_eval_count": prompt_tokens,
+            "eval_count": completion_tokens,
+        })
+
+    # Embeddings
+
+    def _embed(self, api: str, model: str, texts: List[str]) -> Optional[List[List[float]]]:
+        embeddings = []
+        sources = set()
+        for text in texts:
+            embedding = self.server.cache.embedding(model, text)
+            if embedding is None:
+                if self.server.on_miss == "error":
+                    self._finish(api, "embedding", model, cache_key(text), 404, "Embedding is not cached", 0.0,
+                                 "miss")
+                    return None
+                embedding = self.server.synthesizer.embedding(text)
+                sources.add("synthetic")
+            else:
+                sources.add("cache")
+            embeddings.append(embedding)
+        tokens = sum(estimate_tokens(text) for text in texts)
+        source = sources.pop() if len(sources) == 1 else "mixed"
+        if not self._delay_or_reject(api, "embedding", model, cache_key("\0".join(texts)), tokens, 0, source):
+            return None
+        return embeddings
+
+    def _openai_embeddings(self, api: str, body: Dict[str, Any]):
+        texts = body.get("input", [])
+        texts = [texts] if isinstance(texts, str) else texts
+        embeddings = self._embed(api, body.get("model", ""), texts)
+        if embeddings is None:
+            return
+        tokens = sum(estimate_tokens(text) for text in texts)
+        self._send(200, {
+            "object": "list",
+            "data": [{"object": "embedding", "index": index, "embedding": embedding}
+                     for index, embedding in enumerate(embeddings)],
+            "model": body.get("model", ""),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        })
+
+    def _ollama_embed(self, api: str, body: Dict[str, Any]):
+        texts = body.get("input", [])
+        texts = [texts] if isinstance(texts, str) else texts
+        embeddings = self._embed(api, body.get("model", ""), texts)
+        if embeddings is not None:
+            self._send(200, {"model": body.get("model", ""), "embeddings": embeddings})
+
+    def _ollama_embeddings(self, api: str, body: Dict[str, Any]):
+        embeddings = self._embed(api, body.get("model", ""), [body.get("prompt", "")])
+        if embeddings is not None:
+            self._send(200, {"embedding": embeddings[0]})
+
+    # Helpers
+
+    def _delay_or_reject(self, api: str, kind: str, model: str, key: str, tokens: int, completion_tokens: int,
+                         source: str) -> bool:
+        """
+        Waits for the latency of the request or rejects it. Returns whether the request may be answered.
+        """
+        rng = self.server.random_for(key)
+        latency = (self.server.latency.sample(rng) + completion_tokens * self.server.ms_per_token) / 1000
+        rejection = self.server.limits.check(tokens, rng)
+        if rejection is not None:
+            status, message, retry_after = rejection
+            self._finish(api, kind, model, key, status, message, 0.0, source, retry_after)
+            return False
+        time.sleep(latency)
+        self._log(api, kind, model, key, 200, latency, source)
+        return True
+
+    def _finish(self, api: str, kind: str, model: str, key: str, status: int, message: str, latency: float,
+                source: str, retry_after: Optional[float] = None):
+        self._log(api, kind, model, key, status, latency, source)
+        headers = {"Retry-After": str(max(1, math.ceil(retry_after)))} if retry_after is not None else {}
+        if api == "openai":
+            error_type = "rate_limit_exceeded" if status == 429 else "server_error"
+            self._send(status, {"error": {"message": message, "type": error_type, "code": error_type}}, headers)
+        else:
+            self._send(status, {"error": message}, headers)
+
+    def _log(self, api: str, kind: str, model: str, key: str, status: int, latency: float, source: str):
+        self.server.record({
+            "time": round(time.time(), 3),
+            "api": api,
+            "kind": kind,
+            "model": model,
+            "key": key,
+            "status": status,
+            "source": source if status == 200 else None,
+            "latency_ms": round(latency * 1000, 1),
+        })
+
+    @staticmethod
+    def _text(content: Any) -> str:
+        if isinstance(content, list):
+            return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+        return content or ""
+
+    def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Mock OpenAI/Ollama server for load tests of LiSSA")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--cache-dir", action="append", default=[],
+                        help="LiSSA cache directory to answer from, can be repeated")
+    parser.add_argument("--rules", help="JSON file with a list of {pattern, response} rules for chat requests")
+    parser.add_argument("--on-miss", choices=["synthetic", "error"], default="synthetic",
+                        help="answer uncached requests synthetically or with HTTP 404 (default: synthetic)")
+    parser.add_argument("--positive-rate", type=float, default=0.1,
+                        help="share of synthetic classification answers that are 'yes' (default: 0.1)")
+    parser.add_argument("--dimensions", type=int, default=DEFAULT_DIMENSIONS,
+                        help=f"dimensions of synthetic embeddings (default: {DEFAULT_DIMENSIONS})")
+    parser.add_argument("--latency", default="0",
+                        help="latency in ms: 0, fixed:MS, uniform:MIN:MAX, normal:MEAN:STD, lognormal:MEDIAN:SIGMA, "
+                             "or exp:MEAN (default: 0)")
+    parser.add_argument("--ms-per-token", type=float, default=0.0,
+                        help="additional latency per generated token in ms (default: 0)")
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="probability of answering a request with HTTP 429 (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="probability of answering a request with HTTP 500 or 503 (default: 0)")
+    parser.add_argument("--max-rpm", type=int, default=0, help="requests per minute before HTTP 429 (default: off)")
+    parser.add_argument("--max-tpm", type=int, default=0, help="tokens per minute before HTTP 429 (default: off)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of latencies and injected faults (default: 0)")
+    parser.add_argument("--log", help="file to append a JSON line per request to")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arguments = create_parser().parse_args(argv)
+    try:
+        server = MockServer((arguments.host, arguments.port), arguments)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 2
+    print(f"Mock server listening on http://{arguments.host}:{server.server_port} "
+          f"({len(server.cache.chat)} cached chat responses, {len(server.cache.embeddings)} cached embeddings)",
+          flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())